@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: create 100 near-identical floating menus.
+
+Compares the existing approach (btt_create_floating_menu followed by one
+btt_add_floating_menu_item call per item, sequentially) with registering a
+template once and creating the menus through btt_clone_menu_template.
+
+BTT itself is replaced by a stub that sleeps for a configurable latency, so
+the benchmark runs anywhere and measures the server-side cost.
+
+Usage:
+    python benchmarks/bench_menu_templates.py [--menus 100] [--items 5] [--latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from btt_mcp.models import (  # noqa: E402
+    AddFloatingMenuItemInput,
+    CloneMenuTemplateInput,
+    CreateFloatingMenuInput,
+    RegisterMenuTemplateInput,
+)
+from btt_mcp.tools import floating_menus  # noqa: E402
+
+
+def install_stub(latency: float) -> list[str]:
+    """Replace btt_request with a stub that simulates BTT latency."""
+    calls: list[str] = []
+
+    async def stub_request(endpoint, params, config):
+        calls.append(endpoint)
+        if latency:
+            await asyncio.sleep(latency)
+        return ""
+
+    floating_menus.btt_request = stub_request
+    return calls
+
+
+async def create_individually(menus: int, items: int) -> None:
+    for index in range(menus):
+        menu_uuid = await floating_menus.btt_create_floating_menu(
+            CreateFloatingMenuInput(
+                name=f"Menu {index}", app_bundle_identifier=f"app.{index}"
+            )
+        )
+        for item in range(items):
+            await floating_menus.btt_add_floating_menu_item(
+                AddFloatingMenuItemInput(
+                    menu_uuid=menu_uuid,
+                    name=f"Item {item}",
+                    sf_symbol_name="star.fill",
+                    background_color="80,80,80,255",
+                )
+            )
+
+
+async def create_from_template(menus: int, items: int) -> None:
+    menu = {
+        "BTTTriggerType": 767,
+        "BTTTriggerClass": "BTTTriggerTypeFloatingMenu",
+        "BTTUUID": "00000000-0000-0000-0000-000000000000",
+        "BTTMenuName": "Template",
+        "BTTMenuConfig": {"BTTMenuFrameWidth": 300, "BTTMenuFrameHeight": 200},
+        "BTTMenuItems": [
+            {
+                "BTTTriggerType": 773,
+                "BTTUUID": f"00000000-0000-0000-0000-{item:012d}",
+                "BTTTriggerParentUUID": "00000000-0000-0000-0000-000000000000",
+                "BTTMenuName": f"Item {item}",
+                "BTTMenuConfig": {
+                    "BTTMenuItemSFSymbolName": "star.fill",
+                    "BTTMenuItemBackgroundColor": "80,80,80,255",
+                },
+            }
+            for item in range(1, items + 1)
+        ],
+    }
+    await floating_menus.btt_register_menu_template(
+        RegisterMenuTemplateInput(template_name="bench", menu_json=json.dumps(menu))
+    )
+    await floating_menus.btt_clone_menu_template(
+        CloneMenuTemplateInput(
+            template_name="bench",
+            names=[f"Menu {index}" for index in range(menus)],
+            app_bundle_identifiers=[f"app.{index}" for index in range(menus)],
+        )
+    )
+
+
+async def run(menus: int, items: int, latency: float) -> None:
+    for label, scenario in (
+        ("create + add items (sequential)", create_individually),
+        ("template clone (concurrent)", create_from_template),
+    ):
+        calls = install_stub(latency)
+        started = time.perf_counter()
+        await scenario(menus, items)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:34s} {elapsed * 1000:9.1f} ms  "
+            f"{len(calls):5d} requests  {elapsed / menus * 1000:7.2f} ms/menu"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--menus", type=int, default=100)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(
+        f"Creating {args.menus} menus with {args.items} items each, "
+        f"simulated BTT latency {args.latency_ms} ms\n"
+    )
+    asyncio.run(run(args.menus, args.items, args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
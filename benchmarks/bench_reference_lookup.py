@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: btt_lookup_reference latency for a mix of topics.
+
+Compares the previous lookup (read the doc file and scan it line by line
+with the heading regex for every matching topic, on every call) with the
+section index that parses the docs once, and with the BM25 search over
+paragraphs and table rows that btt_lookup_reference now runs.
+
+Usage:
+    python benchmarks/bench_reference_lookup.py [--rounds 200]
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from btt_mcp.services.reference_index import (  # noqa: E402
+    DOC_FILES,
+    DOCS_DIR,
+    ReferenceIndex,
+)
+from btt_mcp.tools import reference  # noqa: E402
+from btt_mcp.tools.reference import LookupReferenceInput  # noqa: E402
+
+TOPICS = [
+    "modifier",
+    "keyboard shortcut",
+    "named trigger",
+    "add trigger",
+    "variable list",
+    "clipboard",
+    "floating menu",
+    "condition variable",
+]
+
+
+def legacy_extract_section(content: str, heading_pattern: str) -> str:
+    """The previous per-call section scan."""
+    lines = content.split("\n")
+    start_idx = None
+    start_level = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if start_idx is None:
+            if re.match(heading_pattern, stripped):
+                start_idx = i
+                start_level = len(stripped) - len(stripped.lstrip("#"))
+        elif stripped.startswith("#"):
+            level = len(stripped) - len(stripped.lstrip("#"))
+            if level <= start_level:
+                return "\n".join(lines[start_idx:i]).strip()
+    if start_idx is not None:
+        return "\n".join(lines[start_idx:]).strip()
+    return ""
+
+
+def legacy_lookup(topic: str) -> list[str]:
+    """The previous lookup: file read and scan for each of the top sections."""
+    sections = []
+    for file_key, heading_pattern in scored_sections(topic):
+        content = (DOCS_DIR / DOC_FILES[file_key]).read_text(encoding="utf-8")
+        section = legacy_extract_section(content, heading_pattern)
+        if section:
+            sections.append(section)
+    return sections
+
+
+def scored_sections(topic: str) -> list[tuple[str, str]]:
+    """Topic scoring shared by both variants, so only section access differs."""
+    query = topic.lower()
+    words = set(query.split())
+    scored = []
+    for keywords, file_key, heading_pattern in reference.SECTION_INDEX:
+        score = 0
+        for kw in keywords:
+            if kw in query:
+                score += 10
+            elif any(w in kw for w in words):
+                score += 3
+            elif any(w in query for w in kw.split()):
+                score += 1
+        if score:
+            scored.append((score, file_key, heading_pattern))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [(file_key, pattern) for _, file_key, pattern in scored[:3]]
+
+
+def time_per_call(func, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for topic in TOPICS:
+            func(topic)
+    return (time.perf_counter() - started) / (rounds * len(TOPICS))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    ReferenceIndex().load()
+    build = time.perf_counter() - started
+    asyncio.run(reference._load_reference_index())
+
+    async def lookup_tool(topic: str) -> str:
+        return await reference.btt_lookup_reference(LookupReferenceInput(topic=topic))
+
+    loop = asyncio.new_event_loop()
+    rows = [
+        ("file read + line scan (before)", time_per_call(legacy_lookup, args.rounds)),
+        (
+            "section index (after)",
+            time_per_call(reference._topic_sections, args.rounds),
+        ),
+        (
+            "BM25 block search (after)",
+            time_per_call(reference.reference_index.search, args.rounds),
+        ),
+        (
+            "btt_lookup_reference (after)",
+            time_per_call(
+                lambda t: loop.run_until_complete(lookup_tool(t)), args.rounds
+            ),
+        ),
+    ]
+    loop.close()
+
+    print(
+        f"{len(TOPICS)} topics x {args.rounds} rounds; index built once in "
+        f"{build * 1000:.2f} ms\n"
+    )
+    for label, seconds in rows:
+        print(f"{label:32s} {seconds * 1e6:9.1f} µs/lookup")
+
+
+if __name__ == "__main__":
+    main()
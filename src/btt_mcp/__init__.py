@@ -4,7 +4,41 @@ BetterTouchTool MCP Server
 An MCP server for understanding, explaining, and managing BetterTouchTool configurations.
 """
 
-from btt_mcp.server import main
+import argparse
 
 __version__ = "0.1.0"
 __all__ = ["main"]
+
+
+def main() -> None:
+    """Run the server, or report where its startup time goes.
+
+    Only the command line is parsed here; the server and its dependencies
+    are imported afterwards, so that --profile-startup measures them in a
+    fresh interpreter.
+    """
+    parser = argparse.ArgumentParser(
+        prog="btt-mcp-server", description="BetterTouchTool MCP server"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import times of the server's startup and exit",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of packages and modules listed by --profile-startup",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from btt_mcp.startup_profile import profile_startup
+
+        print(profile_startup(args.top))
+        return
+
+    from btt_mcp.server import main as run_server
+
+    run_server()
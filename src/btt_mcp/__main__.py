@@ -0,0 +1,7 @@
+"""
+Allow running the server with ``python -m btt_mcp``.
+"""
+
+from btt_mcp import main
+
+main()
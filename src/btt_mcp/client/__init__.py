@@ -4,11 +4,20 @@ BTT client utilities for HTTP and CLI communication.
 
 from btt_mcp.client.base import btt_request
 from btt_mcp.client.cli import cli_request
-from btt_mcp.client.http import build_url, http_request
+from btt_mcp.client.http import (
+    build_url,
+    close_http_clients,
+    get_http_client,
+    http_request,
+    http_stream,
+)
 
 __all__ = [
     "btt_request",
     "http_request",
+    "http_stream",
     "build_url",
+    "get_http_client",
+    "close_http_clients",
     "cli_request",
 ]
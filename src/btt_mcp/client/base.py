@@ -2,6 +2,7 @@
 Base request dispatcher for BTT communication.
 """
 
+import asyncio
 from typing import Any
 
 from btt_mcp.client.cli import cli_request
@@ -17,7 +18,8 @@ async def btt_request(
     """Make a request to BTT using configured method (HTTP or CLI).
 
     This is the main entry point for all BTT communication. It dispatches
-    to either the HTTP client or CLI based on the configuration.
+    to either the HTTP client or CLI based on the configuration. CLI calls
+    run in a worker thread so concurrent requests do not block each other.
 
     Args:
         endpoint: The BTT API endpoint
@@ -28,5 +30,5 @@ async def btt_request(
         Response from BTT
     """
     if config.use_cli:
-        return cli_request(endpoint, params)
+        return await asyncio.to_thread(cli_request, endpoint, params)
     return await http_request(endpoint, params, config)
@@ -2,13 +2,25 @@
 HTTP client for BTT webserver communication.
 """
 
+import asyncio
 import urllib.parse
+from collections.abc import Callable
 from typing import Any
 
 import httpx
 
+from btt_mcp.config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT,
+)
 from btt_mcp.models.common import BTTConnectionConfig
 
+# Pooled clients keyed by (host, port). Each entry remembers the event loop it
+# was created on, because httpx connections cannot be shared across loops.
+_PoolEntry = tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]
+_clients: dict[tuple[str, int], _PoolEntry] = {}
+
 
 def build_url(
     endpoint: str,
@@ -43,6 +55,41 @@ def build_url(
     return base_url
 
 
+def get_http_client(config: BTTConnectionConfig) -> httpx.AsyncClient:
+    """Return the pooled HTTP client for the configured BTT webserver.
+
+    Args:
+        config: BTT connection configuration
+
+    Returns:
+        A keep-alive client shared by all requests to the same host and port
+    """
+    loop = asyncio.get_running_loop()
+    key = (config.host, config.port)
+    entry = _clients.get(key)
+    if entry is not None and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+
+    client = httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+    _clients[key] = (loop, client)
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close all pooled HTTP clients created on the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key, (client_loop, client) in list(_clients.items()):
+        if client_loop is loop:
+            del _clients[key]
+            await client.aclose()
+
+
 async def http_request(
     endpoint: str,
     params: dict[str, Any],
@@ -59,20 +106,71 @@ async def http_request(
         Response text from BTT, or error message
     """
     url = build_url(endpoint, params, config)
+    client = get_http_client(config)
+
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.text
+    except httpx.HTTPStatusError as e:
+        return _status_error(e.response.status_code, e.response.text)
+    except httpx.TransportError as e:
+        return _transport_error(e, config)
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.text
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 403:
-                return "Error: Authentication failed. Check your shared_secret configuration."
-            return f"Error: HTTP {e.response.status_code} - {e.response.text}"
-        except httpx.ConnectError:
-            return (
-                f"Error: Could not connect to BTT webserver at {config.host}:{config.port}. "
-                "Is the webserver enabled in BTT preferences?"
-            )
-        except httpx.TimeoutException:
-            return "Error: Request timed out. BTT may be busy or unresponsive."
+
+async def http_stream(
+    endpoint: str,
+    params: dict[str, Any],
+    config: BTTConnectionConfig,
+    sink: Callable[[bytes], None],
+    chunk_size: int = 64 * 1024,
+) -> str | None:
+    """Stream a response body from the BTT webserver in chunks.
+
+    Unlike http_request, the body is never held in memory as a whole; each
+    chunk is handed to sink as it arrives.
+
+    Args:
+        endpoint: The BTT API endpoint
+        params: Query parameters
+        config: BTT connection configuration
+        sink: Called with every chunk of the response body
+        chunk_size: Maximum size of a chunk in bytes
+
+    Returns:
+        None on success, or error message
+    """
+    url = build_url(endpoint, params, config)
+    client = get_http_client(config)
+
+    try:
+        async with client.stream("GET", url) as response:
+            if response.is_error:
+                await response.aread()
+                return _status_error(response.status_code, response.text)
+            async for chunk in response.aiter_bytes(chunk_size):
+                sink(chunk)
+    except httpx.TransportError as e:
+        return _transport_error(e, config)
+    return None
+
+
+def _status_error(status_code: int, text: str) -> str:
+    if status_code == 403:
+        return "Error: Authentication failed. Check your shared_secret configuration."
+    return f"Error: HTTP {status_code} - {text}"
+
+
+def _transport_error(error: httpx.TransportError, config: BTTConnectionConfig) -> str:
+    if isinstance(error, httpx.ConnectError):
+        return (
+            f"Error: Could not connect to BTT webserver at {config.host}:{config.port}. "
+            "Is the webserver enabled in BTT preferences?"
+        )
+    if isinstance(error, httpx.TimeoutException):
+        return "Error: Request timed out. BTT may be busy or unresponsive."
+    # e.g. a pooled keep-alive connection that BTT closed in the meantime
+    return (
+        f"Error: Connection to BTT webserver at {config.host}:{config.port} "
+        f"failed: {type(error).__name__}: {error}"
+    )
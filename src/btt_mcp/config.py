@@ -6,8 +6,6 @@ import os
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 # =============================================================================
 # Config File Path
 # =============================================================================
@@ -15,6 +13,18 @@ import yaml
 CONFIG_DIR = Path.home() / ".config" / "btt-mcp"
 CONFIG_FILE = CONFIG_DIR / "config.yml"
 
+# Names of variables seen by the server (BTT cannot list its variables)
+VARIABLE_REGISTRY_FILE = CONFIG_DIR / "variables.json"
+
+# Action types seen in triggers and presets (BTT does not publish them)
+ACTION_CATALOG_FILE = CONFIG_DIR / "action_types.json"
+
+# Tool and resource schemas listed before the tool modules are imported
+TOOL_SCHEMA_CACHE_FILE = CONFIG_DIR / "tool_schemas.json"
+
+# BTT reference documentation served by btt_get_reference and as resources
+DOCS_DIR = Path(__file__).parent.parent.parent / "docs" / "btt"
+
 # =============================================================================
 # Connection Constants (defaults, can be overridden by config file)
 # =============================================================================
@@ -35,6 +45,9 @@ def _load_config_file() -> dict[str, Any]:
     if not CONFIG_FILE.exists():
         return {}
 
+    # Imported here so that starting the server does not load PyYAML
+    import yaml
+
     try:
         with open(CONFIG_FILE) as f:
             config = yaml.safe_load(f)
@@ -86,6 +99,249 @@ def get_default_use_cli() -> bool:
     return _get_config_value("use_cli", DEFAULT_USE_CLI)
 
 
+# =============================================================================
+# Variable Cache
+# =============================================================================
+
+DEFAULT_VARIABLE_CACHE_ENABLED = True
+DEFAULT_STATIC_VARIABLE_TTL = 60.0
+DEFAULT_VOLATILE_VARIABLE_TTL = 0.0
+
+# Variables BTT computes on the fly; they change without being written
+VOLATILE_VARIABLE_PATTERNS = [
+    "BTTIdleTime",
+    "BTTActiveWindowTitle",
+    "BTTActiveWindowNumber",
+    "BTTActiveAppBundleIdentifier",
+    "BTTCurrentlyPlaying*",
+    "BTTNowPlaying*",
+    "BTTLastTrigger*",
+    "BTTTouchBarVisible",
+    "BTTInternalNightShiftState",
+    "BTTDisabled",
+    "BTTSiriRemoteMouseModeActive",
+    "ActiveSpace",
+    "OutputVolume",
+    "CurrentDisplayBrightness",
+    "BuiltInDisplayBrightness",
+    "SystemDoNotDisturbState",
+    "BluetoothConnectionState-*",
+    "clipboard_content",
+    "selected_text",
+    "hovered_link",
+]
+
+
+def get_variable_cache_enabled() -> bool:
+    """Get whether variable reads are cached from config file or fallback."""
+    return _get_config_value("variable_cache.enabled", DEFAULT_VARIABLE_CACHE_ENABLED)
+
+
+def get_static_variable_ttl() -> float:
+    """Get the TTL in seconds for static (user) variables."""
+    return float(
+        _get_config_value("variable_cache.static_ttl", DEFAULT_STATIC_VARIABLE_TTL)
+    )
+
+
+def get_volatile_variable_ttl() -> float:
+    """Get the TTL in seconds for volatile (dynamic) variables."""
+    return float(
+        _get_config_value("variable_cache.volatile_ttl", DEFAULT_VOLATILE_VARIABLE_TTL)
+    )
+
+
+def get_variable_ttl_overrides() -> dict[str, float]:
+    """Get per-variable TTL overrides (name or glob pattern -> seconds)."""
+    overrides = _get_config_value("variable_cache.ttl_overrides", {})
+    if not isinstance(overrides, dict):
+        return {}
+    return {str(name): float(ttl) for name, ttl in overrides.items()}
+
+
+# =============================================================================
+# Variable Subscriptions
+# =============================================================================
+
+DEFAULT_VARIABLE_POLL_INTERVAL = 1.0
+
+
+def get_variable_poll_interval() -> float:
+    """Get the seconds between samples of subscribed variables."""
+    return float(
+        _get_config_value(
+            "subscriptions.poll_interval", DEFAULT_VARIABLE_POLL_INTERVAL
+        )
+    )
+
+
+# Write-behind buffering of btt_set_variable (off by default)
+DEFAULT_WRITE_BEHIND_ENABLED = False
+DEFAULT_WRITE_BEHIND_FLUSH_INTERVAL = 0.1
+DEFAULT_WRITE_BEHIND_MAX_PENDING = 100
+
+
+def get_write_behind_enabled() -> bool:
+    """Get whether variable writes are buffered and coalesced by default."""
+    return bool(
+        _get_config_value("write_behind.enabled", DEFAULT_WRITE_BEHIND_ENABLED)
+    )
+
+
+def get_write_behind_flush_interval() -> float:
+    """Get the seconds between flushes of buffered variable writes."""
+    return float(
+        _get_config_value(
+            "write_behind.flush_interval", DEFAULT_WRITE_BEHIND_FLUSH_INTERVAL
+        )
+    )
+
+
+def get_write_behind_max_pending() -> int:
+    """Get the number of buffered variables that triggers an immediate flush."""
+    return int(
+        _get_config_value("write_behind.max_pending", DEFAULT_WRITE_BEHIND_MAX_PENDING)
+    )
+
+
+# Time series sampling of numeric variables
+DEFAULT_TIMESERIES_ENABLED = False
+DEFAULT_TIMESERIES_INTERVAL = 5.0
+DEFAULT_TIMESERIES_CAPACITY = 720  # one hour at the default interval
+DEFAULT_TIMESERIES_VARIABLES = [
+    "OutputVolume",
+    "BTTIdleTime",
+    "CurrentDisplayBrightness",
+    "ActiveSpace",
+]
+
+
+def get_timeseries_enabled() -> bool:
+    """Get whether numeric variables are sampled from server start."""
+    return bool(_get_config_value("timeseries.enabled", DEFAULT_TIMESERIES_ENABLED))
+
+
+def get_timeseries_interval() -> float:
+    """Get the seconds between time series samples."""
+    return float(
+        _get_config_value("timeseries.interval", DEFAULT_TIMESERIES_INTERVAL)
+    )
+
+
+def get_timeseries_capacity() -> int:
+    """Get the number of samples kept per variable."""
+    return int(_get_config_value("timeseries.capacity", DEFAULT_TIMESERIES_CAPACITY))
+
+
+def get_timeseries_variables() -> list[str]:
+    """Get the numeric variables sampled into time series."""
+    variables = _get_config_value("timeseries.variables", None)
+    if not isinstance(variables, list):
+        return list(DEFAULT_TIMESERIES_VARIABLES)
+    return [str(name) for name in variables]
+
+
+# Widget updates sent per second per widget; 0 disables rate limiting
+DEFAULT_WIDGET_MAX_UPDATES_PER_SECOND = 10.0
+
+
+def get_widget_max_updates_per_second() -> float:
+    """Get the maximum number of updates sent per second to one widget."""
+    return float(
+        _get_config_value(
+            "widgets.max_updates_per_second", DEFAULT_WIDGET_MAX_UPDATES_PER_SECOND
+        )
+    )
+
+
+# Scheduled widget refreshes: requests slower than the threshold (seconds)
+# shed low-priority refreshes; intervals vary by +/- jitter (fraction)
+DEFAULT_WIDGET_REFRESH_LATENCY_THRESHOLD = 0.5
+DEFAULT_WIDGET_REFRESH_JITTER = 0.1
+
+
+def get_widget_refresh_latency_threshold() -> float:
+    """Get the BTT latency above which scheduled refreshes are shed."""
+    return float(
+        _get_config_value(
+            "widgets.refresh_latency_threshold",
+            DEFAULT_WIDGET_REFRESH_LATENCY_THRESHOLD,
+        )
+    )
+
+
+def get_widget_refresh_jitter() -> float:
+    """Get the fraction of the interval by which refreshes are jittered."""
+    return float(
+        _get_config_value("widgets.refresh_jitter", DEFAULT_WIDGET_REFRESH_JITTER)
+    )
+
+
+# Byte budget of the encoded widget icon cache
+DEFAULT_ICON_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def get_icon_cache_max_bytes() -> int:
+    """Get the maximum size in bytes of cached, encoded icons."""
+    return int(_get_config_value("icons.cache_max_bytes", DEFAULT_ICON_CACHE_MAX_BYTES))
+
+
+# Clipboard watcher: polls between min_interval and max_interval seconds and
+# keeps up to history_size distinct entries within history_max_bytes
+DEFAULT_CLIPBOARD_WATCH_ENABLED = False
+DEFAULT_CLIPBOARD_MIN_INTERVAL = 0.5
+DEFAULT_CLIPBOARD_MAX_INTERVAL = 5.0
+DEFAULT_CLIPBOARD_HISTORY_SIZE = 50
+DEFAULT_CLIPBOARD_HISTORY_MAX_BYTES = 1024 * 1024
+
+
+def get_clipboard_watch_enabled() -> bool:
+    """Get whether the clipboard watcher starts with the server."""
+    return bool(_get_config_value("clipboard.watch", DEFAULT_CLIPBOARD_WATCH_ENABLED))
+
+
+def get_clipboard_min_interval() -> float:
+    """Get the clipboard polling interval right after a change."""
+    return float(
+        _get_config_value("clipboard.min_interval", DEFAULT_CLIPBOARD_MIN_INTERVAL)
+    )
+
+
+def get_clipboard_max_interval() -> float:
+    """Get the clipboard polling interval while the clipboard is unchanged."""
+    return float(
+        _get_config_value("clipboard.max_interval", DEFAULT_CLIPBOARD_MAX_INTERVAL)
+    )
+
+
+def get_clipboard_history_size() -> int:
+    """Get the maximum number of entries in the clipboard history."""
+    return int(
+        _get_config_value("clipboard.history_size", DEFAULT_CLIPBOARD_HISTORY_SIZE)
+    )
+
+
+def get_clipboard_history_max_bytes() -> int:
+    """Get the maximum total size in bytes of the clipboard history."""
+    return int(
+        _get_config_value(
+            "clipboard.history_max_bytes", DEFAULT_CLIPBOARD_HISTORY_MAX_BYTES
+        )
+    )
+
+
+# Directory of content-addressed preset backups
+DEFAULT_BACKUP_DIR = CONFIG_DIR / "backups"
+
+
+def get_backup_dir() -> Path:
+    """Get the directory where preset backups are stored."""
+    directory = _get_config_value("backups.directory", None)
+    if not directory:
+        return DEFAULT_BACKUP_DIR
+    return Path(str(directory)).expanduser()
+
+
 def ensure_config_dir() -> Path:
     """Ensure the config directory exists and return the config file path.
 
@@ -111,11 +367,27 @@ def create_default_config() -> Path:
             "shared_secret": None,
             "use_cli": False,
         }
+        import yaml
+
         with open(config_path, "w") as f:
             yaml.dump(default_config, f, default_flow_style=False, sort_keys=False)
 
     return config_path
 
+
+# =============================================================================
+# HTTP Connection Pool
+# =============================================================================
+
+# Requests to the BTT webserver share one keep-alive connection pool per
+# host/port instead of opening a new connection for every call.
+HTTP_TIMEOUT = 30.0
+HTTP_MAX_CONNECTIONS = 16
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 8
+
+# Upper bound for requests issued in parallel by batch tools
+MAX_BATCH_CONCURRENCY = 8
+
 # CLI paths (checked in order)
 BTTCLI_PATHS = [
     "/Applications/BetterTouchTool.app/Contents/SharedSupport/bin/bttcli",
@@ -3,6 +3,8 @@ Formatters for BTT data.
 """
 
 from btt_mcp.formatters.markdown import (
+    format_action_hints,
+    format_action_type,
     format_floating_menu,
     format_floating_menu_item,
     format_floating_menus_list,
@@ -18,4 +20,6 @@ __all__ = [
     "format_floating_menu",
     "format_floating_menu_item",
     "format_floating_menus_list",
+    "format_action_type",
+    "format_action_hints",
 ]
@@ -2,6 +2,7 @@
 Markdown formatters for BTT data structures.
 """
 
+import json
 from typing import Any
 
 
@@ -260,3 +261,34 @@ def format_floating_menus_list(menus: list[dict[str, Any]]) -> str:
         lines.append("")
 
     return "\n".join(lines)
+
+
+def format_action_type(action_type: dict[str, Any]) -> str:
+    """Format a cataloged action type with its parameters and example.
+
+    Args:
+        action_type: Action type from the action catalog, with type_id, name,
+            count, param_keys and example
+
+    Returns:
+        Markdown-formatted string with the parameter keys and example JSON
+    """
+    name = action_type.get("name") or "(unnamed)"
+    lines = [
+        f"### Action Type {action_type.get('type_id')}: {name}",
+        f"Seen in {action_type.get('count', 0)} action(s).",
+    ]
+    param_keys = action_type.get("param_keys") or {}
+    if param_keys:
+        keys = ", ".join(f"`{key}` ({seen})" for key, seen in param_keys.items())
+        lines.append(f"Parameters (times seen): {keys}")
+    example = json.dumps(action_type.get("example", {}), indent=2)
+    lines.append(f"```json\n{example}\n```")
+    return "\n".join(lines)
+
+
+def format_action_hints(notes: list[str]) -> str:
+    """Format catalog hints to append to a tool result, or '' if none."""
+    if not notes:
+        return ""
+    return "\n\n" + "\n".join(f"Note: {note}." for note in notes)
@@ -2,26 +2,50 @@
 Pydantic input models for BTT MCP tools.
 """
 
-from btt_mcp.models.actions import TriggerActionInput, TriggerNamedInput
-from btt_mcp.models.clipboard import GetClipboardInput, SetClipboardInput
+from btt_mcp.models.actions import (
+    ScanActionTypesInput,
+    TriggerActionInput,
+    TriggerNamedInput,
+)
+from btt_mcp.models.clipboard import (
+    ClipboardItem,
+    GetClipboardFormatsInput,
+    GetClipboardHistoryEntryInput,
+    GetClipboardInput,
+    ListClipboardHistoryInput,
+    SetClipboardContentsInput,
+    SetClipboardInput,
+    WatchClipboardInput,
+)
 from btt_mcp.models.common import BTTConnectionConfig, ResponseFormat
 from btt_mcp.models.floating_menus import (
     AddFloatingMenuItemInput,
+    CloneMenuTemplateInput,
     CreateFloatingMenuInput,
     FloatingMenuTriggerType,
     GetFloatingMenuInput,
     GetFloatingMenusInput,
     HideFloatingMenuInput,
+    ListMenuTemplatesInput,
+    RegisterMenuTemplateInput,
     ShowFloatingMenuInput,
     ToggleFloatingMenuInput,
     UpdateFloatingMenuInput,
+    UpdateWebviewMenuItemInput,
 )
 from btt_mcp.models.presets import (
+    BackupPresetInput,
+    DiffPresetsInput,
     DisplayNotificationInput,
     ExportPresetInput,
     GetPresetDetailsInput,
+    GetPresetFileTriggerInput,
     ImportPresetInput,
+    ListPresetBackupsInput,
+    RestorePresetBackupInput,
     RevealElementInput,
+    SearchPresetFileInput,
+    StagePresetImportInput,
 )
 from btt_mcp.models.triggers import (
     AddTriggerInput,
@@ -32,8 +56,30 @@ from btt_mcp.models.triggers import (
     ListNamedTriggersInput,
     UpdateTriggerInput,
 )
-from btt_mcp.models.variables import GetVariableInput, SetVariableInput
-from btt_mcp.models.widgets import RefreshWidgetInput, UpdateWidgetInput
+from btt_mcp.models.variables import (
+    ExportVariablesInput,
+    FlushVariablesInput,
+    GetVariableInput,
+    GetVariablesInput,
+    ImportVariablesInput,
+    ListVariableSubscriptionsInput,
+    SetVariableInput,
+    VariableCacheStatsInput,
+    VariableRef,
+    VariableStatsInput,
+)
+from btt_mcp.models.widgets import (
+    CacheIconInput,
+    ListCachedIconsInput,
+    ListRefreshScheduleInput,
+    RefreshWidgetInput,
+    ScheduleWidgetRefreshInput,
+    UnscheduleWidgetRefreshInput,
+    UpdateWidgetInput,
+    UpdateWidgetsInput,
+    WidgetUpdate,
+    WidgetUpdateStatsInput,
+)
 
 __all__ = [
     # Common
@@ -50,19 +96,49 @@ __all__ = [
     # Actions
     "TriggerNamedInput",
     "TriggerActionInput",
+    "ScanActionTypesInput",
     # Variables
     "GetVariableInput",
     "SetVariableInput",
+    "VariableRef",
+    "GetVariablesInput",
+    "VariableCacheStatsInput",
+    "ListVariableSubscriptionsInput",
+    "FlushVariablesInput",
+    "ExportVariablesInput",
+    "ImportVariablesInput",
+    "VariableStatsInput",
     # Widgets
     "UpdateWidgetInput",
     "RefreshWidgetInput",
+    "UpdateWidgetsInput",
+    "WidgetUpdate",
+    "WidgetUpdateStatsInput",
+    "CacheIconInput",
+    "ListCachedIconsInput",
+    "ScheduleWidgetRefreshInput",
+    "UnscheduleWidgetRefreshInput",
+    "ListRefreshScheduleInput",
     # Clipboard
     "GetClipboardInput",
     "SetClipboardInput",
+    "GetClipboardFormatsInput",
+    "ClipboardItem",
+    "SetClipboardContentsInput",
+    "WatchClipboardInput",
+    "ListClipboardHistoryInput",
+    "GetClipboardHistoryEntryInput",
     # Presets
     "ExportPresetInput",
     "ImportPresetInput",
     "GetPresetDetailsInput",
+    "SearchPresetFileInput",
+    "GetPresetFileTriggerInput",
+    "DiffPresetsInput",
+    "BackupPresetInput",
+    "ListPresetBackupsInput",
+    "RestorePresetBackupInput",
+    "StagePresetImportInput",
     "DisplayNotificationInput",
     "RevealElementInput",
     # Floating Menus
@@ -75,4 +151,8 @@ __all__ = [
     "ShowFloatingMenuInput",
     "HideFloatingMenuInput",
     "ToggleFloatingMenuInput",
+    "UpdateWebviewMenuItemInput",
+    "RegisterMenuTemplateInput",
+    "CloneMenuTemplateInput",
+    "ListMenuTemplatesInput",
 ]
@@ -4,7 +4,7 @@ Action-related input models for triggering BTT actions.
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.models.common import BTTConnectionConfig, ResponseFormat
 
 
 class TriggerNamedInput(BaseModel):
@@ -48,3 +48,29 @@ class TriggerActionInput(BaseModel):
         default_factory=BTTConnectionConfig,
         description="BTT connection configuration",
     )
+
+
+class ScanActionTypesInput(BaseModel):
+    """Input for adding the action types of BTT and preset files to the catalog."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    preset_paths: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Exported preset files (plain or compressed) or directories of them "
+            "to scan. Files that did not change since their last scan are skipped."
+        ),
+    )
+    include_live: bool = Field(
+        default=True,
+        description="Also scan the triggers currently configured in BTT",
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
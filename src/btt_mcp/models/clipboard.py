@@ -2,9 +2,11 @@
 Clipboard-related input models.
 """
 
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict, Field
 
-from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.models.common import BTTConnectionConfig, ResponseFormat
 
 
 class GetClipboardInput(BaseModel):
@@ -20,6 +22,17 @@ class GetClipboardInput(BaseModel):
         default=False,
         description="Return content as base64 encoded",
     )
+    save_to_file: bool = Field(
+        default=False,
+        description=(
+            "Stream the content into a file and return its path, size and "
+            "SHA-256 instead of the content (use for images and large documents)"
+        ),
+    )
+    directory: Optional[str] = Field(
+        default=None,
+        description="Directory for save_to_file (default: system temp directory)",
+    )
     connection: BTTConnectionConfig = Field(
         default_factory=BTTConnectionConfig,
         description="BTT connection configuration",
@@ -43,3 +56,108 @@ class SetClipboardInput(BaseModel):
         default_factory=BTTConnectionConfig,
         description="BTT connection configuration",
     )
+
+
+class GetClipboardFormatsInput(BaseModel):
+    """Input for getting clipboard content in several formats."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    formats: list[str] = Field(
+        default_factory=lambda: [
+            "NSPasteboardTypeString",
+            "NSPasteboardTypeHTML",
+            "NSPasteboardTypeRTF",
+        ],
+        description="Pasteboard types to fetch (e.g., 'NSPasteboardTypeString')",
+        min_length=1,
+        max_length=16,
+    )
+    as_base64: bool = Field(
+        default=False,
+        description="Return every format as base64 encoded",
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class ClipboardItem(BaseModel):
+    """Content of one pasteboard type."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    content: str = Field(
+        ...,
+        description="Content for this format",
+    )
+    format: str = Field(
+        default="NSPasteboardTypeString",
+        description="Pasteboard type (e.g., 'NSPasteboardTypeHTML')",
+    )
+
+
+class SetClipboardContentsInput(BaseModel):
+    """Input for setting several clipboard formats at once."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    items: list[ClipboardItem] = Field(
+        ...,
+        description="Content per pasteboard type, e.g. plain text plus HTML",
+        min_length=1,
+        max_length=16,
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class WatchClipboardInput(BaseModel):
+    """Input for starting or stopping the clipboard watcher."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    enabled: bool = Field(
+        default=True,
+        description="Start (true) or stop (false) watching the clipboard",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class ListClipboardHistoryInput(BaseModel):
+    """Input for listing the clipboard history."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    limit: int = Field(
+        default=20,
+        description="Maximum number of entries to list, most recent first",
+        ge=1,
+        le=500,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
+class GetClipboardHistoryEntryInput(BaseModel):
+    """Input for fetching one clipboard history entry."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    entry_id: int = Field(
+        ...,
+        description="Entry ID from btt_list_clipboard_history",
+        ge=1,
+    )
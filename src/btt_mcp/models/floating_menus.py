@@ -416,3 +416,113 @@ class ToggleFloatingMenuInput(BaseModel):
         default_factory=BTTConnectionConfig,
         description="BTT connection configuration",
     )
+
+
+class UpdateWebviewMenuItemInput(BaseModel):
+    """Input for pushing new HTML to a floating menu webview item."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    uuid: str = Field(
+        ...,
+        description="UUID of the webview menu item to update",
+        min_length=36,
+        max_length=36,
+    )
+    html: str = Field(
+        ...,
+        description=(
+            "Full HTML the webview should display. Changes confined to elements "
+            "with an id (or to <body>) are sent as a small JavaScript patch"
+        ),
+    )
+    force_full_reload: bool = Field(
+        default=False,
+        description="Always reload the complete HTML instead of patching",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class RegisterMenuTemplateInput(BaseModel):
+    """Input for registering a floating menu template for cloning."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    template_name: str = Field(
+        ...,
+        description="Name to register the template under (replaces an existing one)",
+        min_length=1,
+    )
+    source_uuid: Optional[str] = Field(
+        default=None,
+        description="UUID of an existing floating menu to use as the template",
+        min_length=36,
+        max_length=36,
+    )
+    menu_json: Optional[str] = Field(
+        default=None,
+        description=(
+            "Floating menu trigger JSON to use as the template, with items nested "
+            "in BTTMenuItems. Used when source_uuid is not given"
+        ),
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class CloneMenuTemplateInput(BaseModel):
+    """Input for creating floating menus from a registered template."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    template_name: str = Field(
+        ...,
+        description="Name of the registered template to clone",
+        min_length=1,
+    )
+    names: list[str] = Field(
+        ...,
+        description="Menu name for each clone; one menu is created per name",
+        min_length=1,
+        max_length=500,
+    )
+    app_bundle_identifiers: Optional[list[str]] = Field(
+        default=None,
+        description=(
+            "App bundle identifier for each clone, in the same order as names "
+            "(e.g., ['com.apple.Safari', 'com.apple.mail'])"
+        ),
+    )
+    overrides_json: Optional[str] = Field(
+        default=None,
+        description=(
+            "JSON object of top-level trigger fields applied to every clone. "
+            "A BTTMenuConfig object is merged into the template's config"
+        ),
+    )
+    max_concurrency: int = Field(
+        default=8,
+        description="Maximum number of menus created in parallel",
+        ge=1,
+        le=32,
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class ListMenuTemplatesInput(BaseModel):
+    """Input for listing registered floating menu templates."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
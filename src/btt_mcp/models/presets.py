@@ -115,3 +115,180 @@ class RevealElementInput(BaseModel):
         default_factory=BTTConnectionConfig,
         description="BTT connection configuration",
     )
+
+
+class SearchPresetFileInput(BaseModel):
+    """Input for searching the triggers of an exported preset file."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    path: str = Field(
+        ...,
+        description="Path to a preset file written by btt_export_preset",
+        min_length=1,
+    )
+    query: Optional[str] = Field(
+        default=None,
+        description="Part of the trigger name (case-insensitive), or a trigger UUID",
+    )
+    trigger_class: Optional[str] = Field(
+        default=None,
+        description="Only triggers of this class, e.g. BTTTriggerTypeKeyboardShortcut",
+    )
+    app: Optional[str] = Field(
+        default=None,
+        description="Only triggers of this app name or bundle identifier",
+    )
+    limit: int = Field(
+        default=50,
+        description="Maximum number of triggers to list",
+        ge=1,
+        le=1000,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
+class GetPresetFileTriggerInput(BaseModel):
+    """Input for reading one trigger from an exported preset file."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    path: str = Field(
+        ...,
+        description="Path to a preset file written by btt_export_preset",
+        min_length=1,
+    )
+    uuid: str = Field(
+        ...,
+        description="UUID of the trigger to read",
+        min_length=36,
+        max_length=36,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json' for the full trigger",
+    )
+
+
+class DiffPresetsInput(BaseModel):
+    """Input for comparing two presets."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    old_path: str = Field(
+        ...,
+        description="Preset file to compare from, written by btt_export_preset",
+        min_length=1,
+    )
+    new_path: Optional[str] = Field(
+        default=None,
+        description="Preset file to compare to (default: the live BTT configuration)",
+    )
+    max_changes: int = Field(
+        default=50,
+        description="Maximum number of triggers listed per kind of change",
+        ge=1,
+        le=1000,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class BackupPresetInput(BaseModel):
+    """Input for backing up a preset."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    name: Optional[str] = Field(
+        default=None,
+        description="Name of a BTT preset to export and back up",
+    )
+    path: Optional[str] = Field(
+        default=None,
+        description="Existing preset file to back up instead (plain or compressed)",
+    )
+    include_settings: bool = Field(
+        default=False,
+        description="Include BTT settings when exporting by name",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class ListPresetBackupsInput(BaseModel):
+    """Input for listing preset backups."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    limit: int = Field(
+        default=20,
+        description="Maximum number of backups to list, newest first",
+        ge=1,
+        le=1000,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
+class RestorePresetBackupInput(BaseModel):
+    """Input for restoring a preset backup to a file."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    backup_id: str = Field(
+        ...,
+        description="Backup ID from btt_list_preset_backups",
+        min_length=1,
+    )
+    output_path: str = Field(
+        ...,
+        description="Preset file to write; import it with btt_import_preset",
+        min_length=1,
+    )
+    overwrite: bool = Field(
+        default=False,
+        description="Replace output_path if it exists",
+    )
+
+
+class StagePresetImportInput(BaseModel):
+    """Input for importing only the changed triggers of a preset."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    path: str = Field(
+        ...,
+        description="Preset file to import (plain or compressed)",
+        min_length=1,
+    )
+    dry_run: bool = Field(
+        default=False,
+        description="Only validate and list the changes, without applying them",
+    )
+    max_concurrency: int = Field(
+        default=8,
+        description="Maximum number of trigger requests sent in parallel",
+        ge=1,
+        le=32,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
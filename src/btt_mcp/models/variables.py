@@ -2,9 +2,11 @@
 Variable-related input models.
 """
 
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict, Field
 
-from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.models.common import BTTConnectionConfig, ResponseFormat
 
 
 class GetVariableInput(BaseModel):
@@ -21,6 +23,10 @@ class GetVariableInput(BaseModel):
         default="string",
         description="Type of variable: 'string' or 'number'",
     )
+    bypass_cache: bool = Field(
+        default=False,
+        description="Always read the value from BTT instead of the variable cache",
+    )
     connection: BTTConnectionConfig = Field(
         default_factory=BTTConnectionConfig,
         description="BTT connection configuration",
@@ -49,7 +55,208 @@ class SetVariableInput(BaseModel):
         default=False,
         description="If True, variable persists across BTT restarts",
     )
+    write_behind: bool | None = Field(
+        default=None,
+        description=(
+            "Buffer the write and return immediately; only the latest value per "
+            "variable is sent. Defaults to the write_behind.enabled setting"
+        ),
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class VariableRef(BaseModel):
+    """A variable name and type, as used by batch variable tools."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    name: str = Field(
+        ...,
+        description="Name of the variable (e.g., 'BTTActiveAppBundleIdentifier')",
+        min_length=1,
+    )
+    variable_type: str = Field(
+        default="string",
+        description="Type of variable: 'string' or 'number'",
+    )
+
+
+class GetVariablesInput(BaseModel):
+    """Input for reading several BTT variables in one call."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    variables: list[VariableRef] = Field(
+        ...,
+        description=(
+            "Variables to read, e.g. [{'name': 'BTTActiveWindowTitle'}, "
+            "{'name': 'OutputVolume', 'variable_type': 'number'}]"
+        ),
+        min_length=1,
+        max_length=100,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' table or 'json' object",
+    )
+    bypass_cache: bool = Field(
+        default=False,
+        description="Always read values from BTT instead of the variable cache",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class VariableCacheStatsInput(BaseModel):
+    """Input for inspecting the variable cache."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    variable_names: list[str] = Field(
+        default_factory=list,
+        description="Variable names to show the volatility class and TTL for",
+    )
+    clear: bool = Field(
+        default=False,
+        description="Drop all cached values after reporting",
+    )
+    reset_stats: bool = Field(
+        default=False,
+        description="Reset hit/miss counters after reporting",
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
+class ListVariableSubscriptionsInput(BaseModel):
+    """Input for listing subscribed variable resources."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
+class FlushVariablesInput(BaseModel):
+    """Input for flushing buffered variable writes."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
+class ExportVariablesInput(BaseModel):
+    """Input for exporting tracked variables to a JSON snapshot."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    output_path: str = Field(
+        ...,
+        description="Path of the JSON file to write (e.g., '~/btt-variables.json')",
+        min_length=1,
+    )
+    name_patterns: list[str] = Field(
+        default_factory=list,
+        description="Glob patterns selecting variables to export (default: all)",
+    )
+    persistent_only: bool = Field(
+        default=False,
+        description=(
+            "Skip variables written as runtime-only through this server. "
+            "Variables that have only been read are kept"
+        ),
+    )
+    max_concurrency: int = Field(
+        default=8,
+        description="Maximum number of variables read in parallel",
+        ge=1,
+        le=32,
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class ImportVariablesInput(BaseModel):
+    """Input for restoring variables from a JSON snapshot."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    path: str = Field(
+        ...,
+        description="Path of a snapshot written by btt_export_variables",
+        min_length=1,
+    )
+    name_patterns: list[str] = Field(
+        default_factory=list,
+        description="Glob patterns selecting variables to restore (default: all)",
+    )
+    persistent: Optional[bool] = Field(
+        default=None,
+        description=(
+            "Write all variables as persistent (True) or runtime-only (False). "
+            "Defaults to the persistence recorded in the snapshot; variables "
+            "with unknown persistence are written as persistent"
+        ),
+    )
+    max_concurrency: int = Field(
+        default=8,
+        description="Maximum number of variables written in parallel",
+        ge=1,
+        le=32,
+    )
     connection: BTTConnectionConfig = Field(
         default_factory=BTTConnectionConfig,
         description="BTT connection configuration",
     )
+
+
+class VariableStatsInput(BaseModel):
+    """Input for statistics over sampled numeric variables."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    variable_names: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Numeric variables to report (default: all sampled variables). "
+            "Variables not sampled yet are added to the sampler"
+        ),
+    )
+    window_seconds: Optional[float] = Field(
+        default=None,
+        description="Only use samples from the last N seconds (default: all kept)",
+        gt=0,
+    )
+    percentiles: list[float] = Field(
+        default_factory=lambda: [50.0, 90.0, 99.0],
+        description="Percentiles to compute, each between 0 and 100",
+    )
+    min_change: float = Field(
+        default=0.0,
+        description="Minimum step between samples reported as a change point",
+        ge=0,
+    )
+    max_change_points: int = Field(
+        default=10,
+        description="Maximum number of most recent change points to list",
+        ge=0,
+        le=100,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
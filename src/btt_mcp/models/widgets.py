@@ -2,11 +2,11 @@
 Widget-related input models (Touch Bar, Menubar, Stream Deck).
 """
 
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.models.common import BTTConnectionConfig, ResponseFormat
 
 
 class UpdateWidgetInput(BaseModel):
@@ -34,7 +34,11 @@ class UpdateWidgetInput(BaseModel):
     )
     icon_data: Optional[str] = Field(
         default=None,
-        description="Base64-encoded icon data",
+        description="Base64-encoded icon data (cached; the reply includes its key)",
+    )
+    icon_key: Optional[str] = Field(
+        default=None,
+        description="Key returned by btt_cache_icon (e.g., 'icon:3f2a9c1b0d4e')",
     )
     background_color: Optional[str] = Field(
         default=None,
@@ -61,3 +65,176 @@ class RefreshWidgetInput(BaseModel):
         default_factory=BTTConnectionConfig,
         description="BTT connection configuration",
     )
+
+
+class WidgetUpdateStatsInput(BaseModel):
+    """Input for widget update scheduler statistics."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    flush: bool = Field(
+        default=False,
+        description="Send all pending (rate-limited) updates now",
+    )
+    reset_stats: bool = Field(
+        default=False,
+        description="Reset counters after reporting",
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
+class CacheIconInput(BaseModel):
+    """Input for caching an encoded widget icon."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    icon_path: Optional[str] = Field(
+        default=None,
+        description="Path to an image file to encode",
+    )
+    icon_data: Optional[str] = Field(
+        default=None,
+        description="Base64-encoded image data",
+    )
+    max_size: Optional[int] = Field(
+        default=None,
+        description="Downscale so the longest side is at most this many pixels",
+        ge=16,
+        le=1024,
+    )
+
+
+class ListCachedIconsInput(BaseModel):
+    """Input for listing cached widget icons."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    clear: bool = Field(
+        default=False,
+        description="Drop all cached icons after reporting",
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+
+
+class WidgetUpdate(BaseModel):
+    """One widget update in a btt_update_widgets batch."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    uuid: str = Field(
+        ...,
+        description="UUID of the widget to update",
+        min_length=36,
+        max_length=36,
+    )
+    widget_type: str = Field(
+        default="touch_bar",
+        description="Type of widget: 'touch_bar', 'menubar', or 'stream_deck'",
+    )
+    text: Optional[str] = Field(
+        default=None,
+        description="New text to display on the widget",
+    )
+    icon_path: Optional[str] = Field(
+        default=None,
+        description="Path to icon file to display",
+    )
+    icon_data: Optional[str] = Field(
+        default=None,
+        description="Base64-encoded icon data",
+    )
+    icon_key: Optional[str] = Field(
+        default=None,
+        description="Key returned by btt_cache_icon",
+    )
+    background_color: Optional[str] = Field(
+        default=None,
+        description="Background color as 'R,G,B,A' (e.g., '200,100,100,255')",
+    )
+
+
+class UpdateWidgetsInput(BaseModel):
+    """Input for updating many widgets at once."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    updates: list[WidgetUpdate] = Field(
+        ...,
+        description="Widget updates, e.g. every button of a Stream Deck page",
+        min_length=1,
+        max_length=128,
+    )
+    max_concurrency: int = Field(
+        default=16,
+        description="Maximum number of updates sent in parallel",
+        ge=1,
+        le=32,
+    )
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class ScheduleWidgetRefreshInput(BaseModel):
+    """Input for refreshing a script widget on an interval."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    uuid: str = Field(
+        ...,
+        description="UUID of the widget to refresh",
+        min_length=36,
+        max_length=36,
+    )
+    interval_seconds: float = Field(
+        ...,
+        description="Seconds between refreshes",
+        ge=0.5,
+        le=86400,
+    )
+    priority: Literal["high", "normal", "low"] = Field(
+        default="normal",
+        description=(
+            "When BTT is slow, 'low' refreshes are skipped and 'normal' ones "
+            "delayed; 'high' refreshes always run"
+        ),
+    )
+    connection: BTTConnectionConfig = Field(
+        default_factory=BTTConnectionConfig,
+        description="BTT connection configuration",
+    )
+
+
+class UnscheduleWidgetRefreshInput(BaseModel):
+    """Input for stopping scheduled refreshes of a widget."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    uuid: str = Field(
+        ...,
+        description="UUID of the widget to stop refreshing",
+        min_length=36,
+        max_length=36,
+    )
+
+
+class ListRefreshScheduleInput(BaseModel):
+    """Input for listing scheduled widget refreshes."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    response_format: ResponseFormat = Field(
+        default="markdown",
+        description="Output format: 'markdown' or 'json'",
+    )
@@ -1,21 +1,329 @@
 """
 MCP Server initialization and entry point.
+
+The tool modules (with their models, services and clients) are not
+imported when the server starts, but on the first request that needs them
+(see load_tools), or right away when a background service is configured to
+start with the server. Until then, tools/list, resources/list and
+resources/templates/list are answered from a cache of the schemas, kept in
+the config directory and rebuilt whenever the package's source files or
+docs change.
 """
 
+import asyncio
+import hashlib
+import importlib
+import json
 import sys
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from importlib import metadata
+from pathlib import Path
+from typing import Any
 
+from mcp import types
 from mcp.server.fastmcp import FastMCP
 
+from btt_mcp.config import (
+    CONFIG_FILE,
+    DOCS_DIR,
+    TOOL_SCHEMA_CACHE_FILE,
+    get_clipboard_watch_enabled,
+    get_timeseries_enabled,
+)
+
+# Coroutines run when the server starts, in registration order
+_startup_hooks: list[Callable[[], Awaitable[None]]] = []
+
+# Coroutines run when the server shuts down, most recently registered first
+_shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+
+# Resource subscription handlers keyed by URI prefix. Each handler receives
+# the resource URI and the subscribing session.
+SubscriptionHandler = Callable[[str, Any], Awaitable[None]]
+_subscribe_handlers: dict[str, SubscriptionHandler] = {}
+_unsubscribe_handlers: dict[str, SubscriptionHandler] = {}
+
+# Set while the server runs, between its startup and shutdown hooks
+_started = False
+
+# Whether btt_mcp.tools has been imported through load_tools
+_tools_loaded = False
+_tools_lock = asyncio.Lock()
+
+
+def on_startup(hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Register a coroutine function to run when the server starts.
+
+    Use this to start background tasks, which need the server's event loop.
+    Can be used as a decorator.
+    """
+    _startup_hooks.append(hook)
+    return hook
+
+
+def on_shutdown(hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Register a coroutine function to run when the server shuts down.
+
+    Can be used as a decorator. Hooks run in reverse registration order, so
+    services registered later (which may still send requests) stop before
+    the shared HTTP clients are closed.
+    """
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+def register_subscription_handlers(
+    uri_prefix: str,
+    subscribe: SubscriptionHandler,
+    unsubscribe: SubscriptionHandler,
+) -> None:
+    """Route resources/subscribe and resources/unsubscribe for a URI prefix.
+
+    Args:
+        uri_prefix: Resource URIs starting with this prefix are handled
+        subscribe: Called with (uri, session) when a client subscribes
+        unsubscribe: Called with (uri, session) when a client unsubscribes
+    """
+    _subscribe_handlers[uri_prefix] = subscribe
+    _unsubscribe_handlers[uri_prefix] = unsubscribe
+
+
+def _find_handler(
+    handlers: dict[str, SubscriptionHandler], uri: str
+) -> SubscriptionHandler | None:
+    for prefix, handler in handlers.items():
+        if uri.startswith(prefix):
+            return handler
+    return None
+
+
+async def _run_startup_hooks(hooks: list[Callable[[], Awaitable[None]]]) -> None:
+    for hook in hooks:
+        try:
+            await hook()
+        except Exception as e:  # noqa: BLE001 - start without the service
+            print(f"BTT MCP Server startup hook failed: {e}", file=sys.stderr)
+
+
+def _background_services_enabled() -> bool:
+    """Return whether a service is configured to start with the server."""
+    return get_timeseries_enabled() or get_clipboard_watch_enabled()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Run registered startup and shutdown hooks.
+
+    The tool modules are loaded right away when one of their background
+    services (time series sampling, clipboard watching) is enabled in the
+    config file, so that it starts with the server.
+    """
+    global _started
+    _started = True
+    await _run_startup_hooks(list(_startup_hooks))
+    if _background_services_enabled():
+        await load_tools()
+    try:
+        yield
+    finally:
+        _started = False
+        for hook in reversed(_shutdown_hooks):
+            try:
+                await hook()
+            except Exception as e:  # noqa: BLE001 - keep shutting down
+                print(f"BTT MCP Server shutdown hook failed: {e}", file=sys.stderr)
+
+
+async def load_tools() -> None:
+    """Import the tool modules, registering their tools and resources.
+
+    Called by every request that needs the tools. Startup hooks registered
+    by the modules run right away when the server is already running.
+    """
+    global _tools_loaded
+    if _tools_loaded:
+        return
+    async with _tools_lock:
+        if _tools_loaded:
+            return
+        registered = len(_startup_hooks)
+        importlib.import_module("btt_mcp.tools")
+        if _started:
+            await _run_startup_hooks(_startup_hooks[registered:])
+        _tools_loaded = True
+
+
+async def _close_http_clients() -> None:
+    # Imported here so that starting the server does not load the clients
+    from btt_mcp.client import close_http_clients
+
+    await close_http_clients()
+
+
+on_shutdown(_close_http_clients)
+
 # Initialize the MCP server - this is imported by tool modules
-mcp = FastMCP("btt_mcp")
+mcp = FastMCP("btt_mcp", lifespan=lifespan)
+
+
+def tool_sources_key() -> str:
+    """Return a fingerprint of everything the tool schemas are built from.
+
+    Covers the package's source files, the reference docs, the config file
+    and the versions of mcp and pydantic, using file sizes and modification
+    times.
+    """
+    digest = hashlib.sha256()
+    for package in ("mcp", "pydantic"):
+        digest.update(f"{package}={metadata.version(package)};".encode())
+    root = Path(__file__).parent
+    for path in sorted([*root.rglob("*.py"), *DOCS_DIR.glob("*.md"), CONFIG_FILE]):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return digest.hexdigest()
+
+
+# Schemas kept in the cache, by the list request that returns them
+_SCHEMA_TYPES = {
+    "tools": types.Tool,
+    "resources": types.Resource,
+    "resource_templates": types.ResourceTemplate,
+}
+
+
+def _read_schema_cache(key: str) -> dict[str, list[Any]] | None:
+    try:
+        data = json.loads(TOOL_SCHEMA_CACHE_FILE.read_text())
+        if data.get("key") != key:
+            return None
+        return {
+            kind: [schema.model_validate(item) for item in data[kind]]
+            for kind, schema in _SCHEMA_TYPES.items()
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_schema_cache(key: str, schemas: dict[str, list[Any]]) -> None:
+    data: dict[str, Any] = {"key": key}
+    for kind in _SCHEMA_TYPES:
+        data[kind] = [
+            item.model_dump(mode="json", by_alias=True, exclude_none=True)
+            for item in schemas[kind]
+        ]
+    try:
+        TOOL_SCHEMA_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        TOOL_SCHEMA_CACHE_FILE.write_text(json.dumps(data))
+    except OSError as e:
+        print(f"Could not save tool schema cache: {e}", file=sys.stderr)
+
+
+async def _list_loaded_resources() -> list[types.Resource]:
+    # FastMCP lists resources without their size or _meta; pass them on for
+    # resources that define them, such as the reference docs with their
+    # hashes.
+    listed = await mcp.list_resources()
+    resources = {str(r.uri): r for r in mcp._resource_manager.list_resources()}
+    for item in listed:
+        resource = resources.get(str(item.uri))
+        item.size = getattr(resource, "size", None)
+        item.meta = getattr(resource, "meta", None)
+    return listed
+
+
+async def _list_cached(kind: str) -> list[Any]:
+    """Answer a list request from the schema cache, loading the tools on a miss.
+
+    On a miss, the tool modules are loaded and the tools, resources and
+    resource templates they register are cached together.
+    """
+    key = tool_sources_key()
+    cached = _read_schema_cache(key)
+    if cached is None:
+        await load_tools()
+        cached = {
+            "tools": await mcp.list_tools(),
+            "resources": await _list_loaded_resources(),
+            "resource_templates": await mcp.list_resource_templates(),
+        }
+        _write_schema_cache(key, cached)
+    return cached[kind]
+
+
+@mcp._mcp_server.list_tools()
+async def _list_tools() -> list[types.Tool]:
+    if _tools_loaded:
+        return await mcp.list_tools()
+    return await _list_cached("tools")
+
+
+@mcp._mcp_server.call_tool(validate_input=False)
+async def _call_tool(name: str, arguments: dict[str, Any]) -> Any:
+    await load_tools()
+    return await mcp.call_tool(name, arguments)
+
+
+@mcp._mcp_server.list_resources()
+async def _list_resources() -> list[types.Resource]:
+    if _tools_loaded:
+        return await _list_loaded_resources()
+    return await _list_cached("resources")
+
+
+@mcp._mcp_server.list_resource_templates()
+async def _list_resource_templates() -> list[types.ResourceTemplate]:
+    if _tools_loaded:
+        return await mcp.list_resource_templates()
+    return await _list_cached("resource_templates")
+
+
+@mcp._mcp_server.read_resource()
+async def _read_resource(uri) -> Any:
+    await load_tools()
+    return await mcp.read_resource(uri)
+
+
+@mcp._mcp_server.subscribe_resource()
+async def _subscribe_resource(uri) -> None:
+    await load_tools()
+    handler = _find_handler(_subscribe_handlers, str(uri))
+    if handler is None:
+        raise ValueError(f"Resource does not support subscriptions: {uri}")
+    await handler(str(uri), mcp._mcp_server.request_context.session)
+
+
+@mcp._mcp_server.unsubscribe_resource()
+async def _unsubscribe_resource(uri) -> None:
+    await load_tools()
+    handler = _find_handler(_unsubscribe_handlers, str(uri))
+    if handler is not None:
+        await handler(str(uri), mcp._mcp_server.request_context.session)
+
+
+# FastMCP always advertises resources without subscribe support; announce it
+# since the handlers above are registered.
+_get_capabilities = mcp._mcp_server.get_capabilities
+
+
+def _get_capabilities_with_subscribe(*args, **kwargs) -> types.ServerCapabilities:
+    capabilities = _get_capabilities(*args, **kwargs)
+    if capabilities.resources is not None:
+        capabilities.resources.subscribe = True
+    return capabilities
+
+
+mcp._mcp_server.get_capabilities = _get_capabilities_with_subscribe
 
 
 def main():
-    """Run the BetterTouchTool MCP server."""
-    # Import tools to register them with the MCP server
-    # This must happen before mcp.run()
-    import btt_mcp.tools  # noqa: F401
+    """Run the BetterTouchTool MCP server.
 
+    The tool modules are imported on first use, see load_tools.
+    """
     print("BTT MCP Server starting...", file=sys.stderr)
     mcp.run()
 
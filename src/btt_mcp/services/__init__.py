@@ -0,0 +1,63 @@
+"""
+In-process services that sit between the MCP tools and the BTT client.
+"""
+
+from btt_mcp.services.clipboard_watcher import ClipboardWatcher, clipboard_watcher
+from btt_mcp.services.icon_cache import IconCache, icon_cache
+from btt_mcp.services.menu_templates import (
+    MenuTemplate,
+    MenuTemplateRegistry,
+    menu_templates,
+)
+from btt_mcp.services.refresh_scheduler import RefreshScheduler, refresh_scheduler
+from btt_mcp.services.timeseries import TimeSeriesSampler, timeseries_sampler
+from btt_mcp.services.variable_cache import VariableCache, variable_cache
+from btt_mcp.services.variable_registry import VariableRegistry, variable_registry
+from btt_mcp.services.variable_sampler import (
+    VariableSampler,
+    parse_variable_uri,
+    variable_sampler,
+    variable_uri,
+)
+from btt_mcp.services.variables import (
+    get_variable,
+    get_variables,
+    set_variable,
+    set_variables,
+)
+from btt_mcp.services.webview import WebviewPatcher, diff_html, webview_patcher
+from btt_mcp.services.widget_updates import WidgetUpdateScheduler, widget_scheduler
+from btt_mcp.services.write_behind import VariableWriteBuffer, write_buffer
+
+__all__ = [
+    "ClipboardWatcher",
+    "clipboard_watcher",
+    "IconCache",
+    "icon_cache",
+    "MenuTemplate",
+    "MenuTemplateRegistry",
+    "menu_templates",
+    "RefreshScheduler",
+    "refresh_scheduler",
+    "TimeSeriesSampler",
+    "timeseries_sampler",
+    "VariableCache",
+    "variable_cache",
+    "VariableRegistry",
+    "variable_registry",
+    "VariableSampler",
+    "variable_sampler",
+    "variable_uri",
+    "parse_variable_uri",
+    "get_variable",
+    "get_variables",
+    "set_variable",
+    "set_variables",
+    "WebviewPatcher",
+    "diff_html",
+    "webview_patcher",
+    "WidgetUpdateScheduler",
+    "widget_scheduler",
+    "VariableWriteBuffer",
+    "write_buffer",
+]
@@ -0,0 +1,352 @@
+"""
+Catalog of BTT action types seen in the live configuration and presets.
+
+BTT does not publish its list of predefined action types, and the bundled
+actions doc only names a handful. The catalog collects every
+BTTPredefinedActionType found in get_triggers results and exported preset
+files, with the action's name, the parameter keys used with it and an
+example. It is updated incrementally: each action is counted once, however
+often the same triggers are read, and preset files are only scanned again
+when they change. Lookups by type ID or name are dictionary lookups.
+
+The catalog is kept in memory and saved to ``action_types.json`` in the
+config directory on shutdown and after scans. Only the most recently seen
+MAX_SEEN_FINGERPRINTS actions are remembered for deduplication.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from btt_mcp.config import ACTION_CATALOG_FILE
+from btt_mcp.services.preset_index import (
+    index_trigger,
+    iter_preset_file,
+    resolve_preset_path,
+)
+
+# Keys every action may have; they are not parameters of the action type
+GENERIC_ACTION_KEYS = frozenset(
+    {
+        "BTTUUID",
+        "BTTOrder",
+        "BTTPredefinedActionType",
+        "BTTPredefinedActionName",
+        "BTTEnabled",
+        "BTTEnabled2",
+        "BTTLastUpdatedAt",
+        "BTTTriggerParentUUID",
+        "BTTIsPureAction",
+    }
+)
+
+# Keys left out of examples and fingerprints since they differ per copy
+_VOLATILE_KEYS = frozenset(
+    {"BTTUUID", "BTTOrder", "BTTLastUpdatedAt", "BTTTriggerParentUUID"}
+)
+
+# Longest string value kept in an example (scripts and icons can be huge)
+MAX_EXAMPLE_VALUE_LENGTH = 200
+
+# Share of an action type's actions a key must appear in to be "usual"
+COMMON_KEY_SHARE = 0.5
+
+# Actions remembered to count each once; older ones may be counted again
+MAX_SEEN_FINGERPRINTS = 20_000
+
+# File name suffixes scanned when a directory of presets is given
+PRESET_SUFFIXES = (".json", ".bttpreset", ".bttpresetzip", ".gz", ".zip")
+
+
+@dataclass
+class ActionType:
+    """What is known about one BTTPredefinedActionType."""
+
+    type_id: int
+    name: str = ""
+    # Number of distinct actions of this type seen
+    count: int = 0
+    # Parameter key -> number of those actions that had it
+    param_keys: dict[str, int] = field(default_factory=dict)
+    # The action seen with the most parameters, long values cut
+    example: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def common_keys(self) -> list[str]:
+        """Parameter keys used by at least COMMON_KEY_SHARE of the actions."""
+        return [
+            key
+            for key, seen in self.param_keys.items()
+            if seen >= self.count * COMMON_KEY_SHARE
+        ]
+
+
+@dataclass
+class ScanResult:
+    """What a scan added to the catalog."""
+
+    new_actions: int = 0
+    new_types: list[int] = field(default_factory=list)
+    files_scanned: int = 0
+    files_unchanged: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def action_type_id(action: dict[str, Any]) -> int | None:
+    """Return the BTTPredefinedActionType of an action, or None."""
+    value = action.get("BTTPredefinedActionType")
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return None
+
+
+def _shorten(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_EXAMPLE_VALUE_LENGTH:
+        return value[:MAX_EXAMPLE_VALUE_LENGTH] + "…"
+    return value
+
+
+def _fingerprint(action: dict[str, Any]) -> str:
+    stable = {k: v for k, v in action.items() if k not in _VOLATILE_KEYS}
+    encoded = json.dumps(stable, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def iter_actions(triggers: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Yield the actions of triggers, including those of nested menu items."""
+    for trigger in triggers:
+        if not isinstance(trigger, dict):
+            continue
+        for _entry, nested in index_trigger(trigger, {}):
+            actions = nested.get("BTTActionsToExecute")
+            if isinstance(actions, list):
+                for action in actions:
+                    if isinstance(action, dict):
+                        yield action
+
+
+def definition_actions(definition: str) -> list[dict[str, Any]]:
+    """Return the actions of a trigger or action JSON definition.
+
+    Invalid JSON gives no actions; BTT reports its own errors for it.
+    """
+    try:
+        data = json.loads(definition)
+    except ValueError:
+        return []
+    if not isinstance(data, dict):
+        return []
+    actions = data.get("BTTActionsToExecute")
+    if isinstance(actions, list):
+        return [action for action in actions if isinstance(action, dict)]
+    return [data] if "BTTPredefinedActionType" in data else []
+
+
+def _preset_files(path: str) -> list[str]:
+    path = resolve_preset_path(path)
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(
+        os.path.join(path, name)
+        for name in os.listdir(path)
+        if name.lower().endswith(PRESET_SUFFIXES)
+    )
+
+
+class ActionCatalog:
+    """Action types by ID and by name, built from the actions seen."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        self._types: dict[int, ActionType] = {}
+        self._by_name: dict[str, int] = {}
+        # Fingerprints of the actions seen, least recently seen first
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        # Preset file -> (mtime_ns, size) when it was last scanned
+        self._files: dict[str, tuple[int, int]] = {}
+        self._dirty = False
+        self._loaded = False
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._types)
+
+    def get(self, type_id: int) -> ActionType | None:
+        """Return an action type by its BTTPredefinedActionType."""
+        self._ensure_loaded()
+        return self._types.get(type_id)
+
+    def find(self, name: str) -> ActionType | None:
+        """Return an action type by its name (case-insensitive)."""
+        self._ensure_loaded()
+        type_id = self._by_name.get(name.strip().lower())
+        return None if type_id is None else self._types[type_id]
+
+    def all(self) -> list[ActionType]:
+        """Return all action types by ID."""
+        self._ensure_loaded()
+        return [self._types[type_id] for type_id in sorted(self._types)]
+
+    def add_action(self, action: dict[str, Any]) -> bool:
+        """Record an action unless it was seen before.
+
+        Returns:
+            True if the action was new
+        """
+        type_id = action_type_id(action)
+        if type_id is None:
+            return False
+        self._ensure_loaded()
+        fingerprint = _fingerprint(action)
+        if fingerprint in self._seen:
+            self._seen.move_to_end(fingerprint)
+            return False
+        self._seen[fingerprint] = None
+        if len(self._seen) > MAX_SEEN_FINGERPRINTS:
+            self._seen.popitem(last=False)
+        self._dirty = True
+
+        action_type = self._types.get(type_id)
+        if action_type is None:
+            action_type = self._types[type_id] = ActionType(type_id)
+        action_type.count += 1
+        name = action.get("BTTPredefinedActionName")
+        if isinstance(name, str) and name and not action_type.name:
+            action_type.name = name
+            self._by_name.setdefault(name.lower(), type_id)
+
+        params = [key for key in action if key not in GENERIC_ACTION_KEYS]
+        for key in params:
+            action_type.param_keys[key] = action_type.param_keys.get(key, 0) + 1
+        example_params = sum(
+            key not in GENERIC_ACTION_KEYS for key in action_type.example
+        )
+        if not action_type.example or len(params) > example_params:
+            action_type.example = {
+                key: _shorten(value)
+                for key, value in action.items()
+                if key not in _VOLATILE_KEYS
+            }
+        return True
+
+    def add_triggers(self, triggers: Iterable[dict[str, Any]]) -> ScanResult:
+        """Record the actions of triggers, e.g. a get_triggers result."""
+        self._ensure_loaded()
+        result = ScanResult()
+        known = set(self._types)
+        for action in iter_actions(triggers):
+            if self.add_action(action):
+                result.new_actions += 1
+        result.new_types = sorted(set(self._types) - known)
+        return result
+
+    def add_preset_files(self, paths: Iterable[str]) -> ScanResult:
+        """Record the actions of preset files, skipping files that did not change.
+
+        Args:
+            paths: Preset files (plain or compressed) or directories of them
+        """
+        self._ensure_loaded()
+        result = ScanResult()
+        known = set(self._types)
+        for path in (file for path in paths for file in _preset_files(path)):
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                result.errors.append(f"Could not read preset file {path}: {e}")
+                continue
+            version = (stat.st_mtime_ns, stat.st_size)
+            if self._files.get(path) == version:
+                result.files_unchanged += 1
+                continue
+            try:
+                # Nested menu items are yielded as triggers of their own
+                for _entry, trigger in iter_preset_file(path):
+                    actions = trigger.get("BTTActionsToExecute")
+                    for action in actions if isinstance(actions, list) else ():
+                        if isinstance(action, dict) and self.add_action(action):
+                            result.new_actions += 1
+            except ValueError as e:
+                result.errors.append(str(e))
+                continue
+            self._files[path] = version
+            self._dirty = True
+            result.files_scanned += 1
+        result.new_types = sorted(set(self._types) - known)
+        return result
+
+    def hints(self, actions: Iterable[dict[str, Any]]) -> list[str]:
+        """Describe known action types used without any of their usual keys."""
+        notes = []
+        for action in actions:
+            type_id = action_type_id(action)
+            action_type = None if type_id is None else self.get(type_id)
+            if action_type is None:
+                continue
+            usual = action_type.common_keys
+            if usual and not any(key in action for key in usual):
+                label = (
+                    f"{type_id} ({action_type.name})" if action_type.name else type_id
+                )
+                notes.append(
+                    f"action type {label} is usually configured with "
+                    + ", ".join(usual)
+                )
+        return notes
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        for entry in data.get("action_types", []):
+            try:
+                action_type = ActionType(**entry)
+            except TypeError:
+                continue
+            self._types.setdefault(action_type.type_id, action_type)
+            if action_type.name:
+                self._by_name.setdefault(action_type.name.lower(), action_type.type_id)
+        for fingerprint in data.get("seen", [])[-MAX_SEEN_FINGERPRINTS:]:
+            self._seen[fingerprint] = None
+        for path, version in data.get("files", {}).items():
+            self._files[path] = tuple(version)
+
+    def save(self) -> None:
+        """Write the catalog to disk if it changed."""
+        if self.path is None or not self._dirty:
+            return
+        data = {
+            "action_types": [asdict(t) for t in self.all()],
+            "seen": list(self._seen),
+            "files": {path: list(version) for path, version in self._files.items()},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(data, indent=2))
+            self._dirty = False
+        except OSError as e:
+            print(f"Could not save action catalog: {e}", file=sys.stderr)
+
+    async def close(self) -> None:
+        """Save the catalog; registered as a shutdown hook."""
+        self.save()
+
+
+# Shared catalog fed by the trigger tools and btt_scan_action_types
+action_catalog = ActionCatalog(ACTION_CATALOG_FILE)
@@ -0,0 +1,226 @@
+"""
+Shared access to the clipboard through BTT.
+
+Clipboard tools and the clipboard watcher read and write through this
+module so request parameters are built in one place.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from btt_mcp.client import btt_request, http_stream
+from btt_mcp.models.common import BTTConnectionConfig
+
+# Formats fetched by default when reading several at once
+DEFAULT_CLIPBOARD_FORMATS = [
+    "NSPasteboardTypeString",
+    "NSPasteboardTypeHTML",
+    "NSPasteboardTypeRTF",
+]
+
+# File suffixes for clipboard content saved to disk
+CLIPBOARD_FILE_SUFFIXES = {
+    "NSPasteboardTypeString": ".txt",
+    "public.utf8-plain-text": ".txt",
+    "NSPasteboardTypeHTML": ".html",
+    "public.html": ".html",
+    "NSPasteboardTypeRTF": ".rtf",
+    "public.rtf": ".rtf",
+    "NSPasteboardTypePNG": ".png",
+    "public.png": ".png",
+    "NSPasteboardTypeTIFF": ".tiff",
+    "public.tiff": ".tiff",
+    "NSPasteboardTypePDF": ".pdf",
+    "com.adobe.pdf": ".pdf",
+    "public.jpeg": ".jpg",
+}
+
+# Size of the response chunks decoded at a time
+CLIPBOARD_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class SavedClipboard:
+    """Clipboard content decoded into a file."""
+
+    path: str
+    format: str
+    size: int
+    sha256: str
+
+
+class Base64StreamDecoder:
+    """Incrementally decode base64 text that arrives in arbitrary chunks.
+
+    Decoded bytes are passed to a callback as soon as a complete 4-character
+    group is available, so at most three characters are held back between
+    chunks. Whitespace, e.g. line breaks in wrapped output, is ignored.
+    """
+
+    def __init__(self, write: Callable[[bytes], None]):
+        self._write = write
+        self._pending = b""
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Decode a chunk. Raises ValueError on invalid base64."""
+        data = self._pending + chunk.translate(None, b" \t\r\n")
+        usable = len(data) - len(data) % 4
+        self._pending = data[usable:]
+        if usable:
+            self._emit(data[:usable])
+
+    def close(self) -> None:
+        """Decode the remaining input. Raises ValueError if it is incomplete."""
+        if self._pending:
+            raise ValueError("Truncated base64 data")
+
+    def _emit(self, data: bytes) -> None:
+        try:
+            decoded = base64.b64decode(data, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 data: {e}") from e
+        self.size += len(decoded)
+        self._write(decoded)
+
+
+def get_clipboard_params(
+    format: str, as_base64: bool, exclude_concealed: bool = False
+) -> dict[str, str]:
+    """Return the get_clipboard_content request parameters.
+
+    With exclude_concealed, BTT leaves out content marked as concealed, such
+    as passwords copied from a password manager.
+    """
+    params = {"format": format, "asBase64": "true" if as_base64 else "false"}
+    if exclude_concealed:
+        params["excludeConcealed"] = "1"
+    return params
+
+
+async def get_clipboard(
+    format: str,
+    as_base64: bool,
+    config: BTTConnectionConfig,
+    exclude_concealed: bool = False,
+) -> str:
+    """Read the clipboard in one format.
+
+    Returns:
+        Clipboard content (empty if the format is not on the clipboard),
+        or error message
+    """
+    return await btt_request(
+        "get_clipboard_content",
+        get_clipboard_params(format, as_base64, exclude_concealed),
+        config,
+    )
+
+
+async def get_clipboard_formats(
+    formats: list[str], as_base64: bool, config: BTTConnectionConfig
+) -> dict[str, str]:
+    """Read the clipboard in several formats concurrently.
+
+    Returns:
+        Mapping of format to content or error message
+    """
+    unique = list(dict.fromkeys(formats))
+    results = await asyncio.gather(
+        *(get_clipboard(format, as_base64, config) for format in unique)
+    )
+    return dict(zip(unique, results))
+
+
+async def set_clipboard_contents(
+    items: list[tuple[str, str]], config: BTTConnectionConfig
+) -> str:
+    """Put several formats on the clipboard in one request.
+
+    Args:
+        items: List of (content, format) pairs
+        config: BTT connection configuration
+
+    Returns:
+        Response from BTT, or error message
+    """
+    request_params = {
+        "contents": json.dumps([content for content, _ in items]),
+        "formats": json.dumps([format for _, format in items]),
+    }
+    return await btt_request("set_clipboard_contents", request_params, config)
+
+
+async def save_clipboard(
+    format: str,
+    config: BTTConnectionConfig,
+    directory: str | None = None,
+) -> SavedClipboard:
+    """Stream the clipboard content in one format into a file.
+
+    BTT returns the content base64 encoded. Over HTTP the response is decoded
+    chunk by chunk while it arrives, so memory use stays bounded regardless
+    of the content size. bttcli output cannot be streamed and is decoded
+    after the command finishes.
+
+    Args:
+        format: Pasteboard type to save
+        config: BTT connection configuration
+        directory: Directory for the file (default: the system temp directory)
+
+    Returns:
+        Path, decoded size and SHA-256 of the saved content
+
+    Raises:
+        ValueError: If BTT returns an error, no content or invalid base64
+    """
+    suffix = CLIPBOARD_FILE_SUFFIXES.get(format, ".bin")
+    try:
+        fd, path = tempfile.mkstemp(
+            prefix="btt-clipboard-", suffix=suffix, dir=directory
+        )
+    except OSError as e:
+        raise ValueError(f"Could not create clipboard file: {e}") from e
+
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as file:
+
+            def write(data: bytes) -> None:
+                digest.update(data)
+                file.write(data)
+
+            decoder = Base64StreamDecoder(write)
+            params = get_clipboard_params(format, as_base64=True)
+            if config.use_cli:
+                result = await btt_request("get_clipboard_content", params, config)
+                error = result if result.startswith("Error:") else None
+                if error is None:
+                    text = result.encode()
+                    for start in range(0, len(text), CLIPBOARD_CHUNK_SIZE):
+                        decoder.feed(text[start : start + CLIPBOARD_CHUNK_SIZE])
+            else:
+                error = await http_stream(
+                    "get_clipboard_content",
+                    params,
+                    config,
+                    decoder.feed,
+                    CLIPBOARD_CHUNK_SIZE,
+                )
+            if error is not None:
+                raise ValueError(error.removeprefix("Error: "))
+            decoder.close()
+            if decoder.size == 0:
+                raise ValueError(f"No {format} content on the clipboard")
+    except BaseException:
+        os.unlink(path)
+        raise
+
+    return SavedClipboard(path, format, decoder.size, digest.hexdigest())
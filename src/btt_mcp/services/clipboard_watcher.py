@@ -0,0 +1,287 @@
+"""
+Background clipboard watcher with a bounded history.
+
+The watcher polls the clipboard and adapts its rate: right after a change
+it polls every min_interval seconds, and every unchanged sample stretches
+the interval until it reaches max_interval. Content is fingerprinted with
+its length and CRC-32, so an unchanged clipboard costs one comparison after
+the read; the content itself is compared when fingerprints match. Distinct
+contents are kept in a ring ordered by recency that is bounded both by
+entry count and total size; copying an earlier entry again moves it to the
+front instead of storing it twice. Content marked as concealed (passwords
+copied from password managers) is never read.
+
+Clients subscribed to btt://clipboard/latest receive
+``notifications/resources/updated`` when the clipboard changes.
+"""
+
+import asyncio
+import sys
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import AnyUrl
+
+from btt_mcp.config import (
+    get_clipboard_history_max_bytes,
+    get_clipboard_history_size,
+    get_clipboard_max_interval,
+    get_clipboard_min_interval,
+)
+from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.services.clipboard import get_clipboard
+from btt_mcp.services.variable_sampler import Subscriber
+
+CLIPBOARD_URI_PREFIX = "btt://clipboard/"
+CLIPBOARD_LATEST_URI = CLIPBOARD_URI_PREFIX + "latest"
+
+# Factor by which the polling interval grows while the clipboard is unchanged
+INTERVAL_BACKOFF = 1.5
+
+# (size in bytes, CRC-32)
+Fingerprint = tuple[int, int]
+
+
+def fingerprint(data: bytes) -> Fingerprint:
+    """Return a cheap fingerprint of clipboard content."""
+    return len(data), zlib.crc32(data)
+
+
+@dataclass
+class ClipboardEntry:
+    """A distinct clipboard content seen by the watcher.
+
+    Content larger than the history budget is not kept; such entries only
+    record size and fingerprint.
+    """
+
+    id: int
+    format: str
+    fingerprint: Fingerprint
+    first_seen: float
+    last_seen: float
+    content: str | None
+    copies: int = 1
+
+    @property
+    def size(self) -> int:
+        return self.fingerprint[0]
+
+    @property
+    def stored_bytes(self) -> int:
+        return self.size if self.content is not None else 0
+
+
+@dataclass
+class ClipboardWatcherStats:
+    """Counters describing the watcher's work."""
+
+    samples: int = 0
+    changes: int = 0
+    repeats: int = 0
+    evictions: int = 0
+    notifications: int = 0
+    errors: int = 0
+
+
+class ClipboardWatcher:
+    """Poll the clipboard at an adaptive rate and keep a deduplicated history."""
+
+    def __init__(
+        self,
+        format: str = "NSPasteboardTypeString",
+        min_interval: float = 0.5,
+        max_interval: float = 5.0,
+        history_size: int = 50,
+        max_bytes: int = 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.format = format
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.history_size = history_size
+        self.max_bytes = max_bytes
+        self.interval = min_interval
+        self.stats = ClipboardWatcherStats()
+        self.total_bytes = 0
+        self._clock = clock
+        self._config: BTTConnectionConfig | None = None
+        # Oldest first; the most recent content is at the end
+        self._entries: OrderedDict[Fingerprint, ClipboardEntry] = OrderedDict()
+        self._ids: dict[int, Fingerprint] = {}
+        self._next_id = 1
+        self._last: Fingerprint | None = None
+        self._last_content: str | None = None
+        self._watching = False
+        self._subscribers: set[Any] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def history(self, limit: int | None = None) -> list[ClipboardEntry]:
+        """Return history entries, most recent first."""
+        entries = list(reversed(self._entries.values()))
+        return entries if limit is None else entries[:limit]
+
+    def latest(self) -> ClipboardEntry | None:
+        """Return the most recent entry."""
+        if not self._entries:
+            return None
+        return next(reversed(self._entries.values()))
+
+    def get(self, entry_id: int) -> ClipboardEntry | None:
+        """Return a history entry by ID."""
+        key = self._ids.get(entry_id)
+        return self._entries.get(key) if key is not None else None
+
+    async def start(self, config: BTTConnectionConfig | None = None) -> None:
+        """Watch the clipboard until stop() is called."""
+        if config is not None:
+            self._config = config
+        self._watching = True
+        self._ensure_running()
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        """Notify a subscriber on changes; watches while subscribers exist."""
+        self._subscribers.add(subscriber)
+        self._ensure_running()
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber."""
+        self._subscribers.discard(subscriber)
+
+    def _ensure_running(self) -> None:
+        if not self.running:
+            self.interval = self.min_interval
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def record(self, content: str) -> ClipboardEntry | None:
+        """Record clipboard content.
+
+        Returns:
+            The entry if the content differs from the previous sample
+        """
+        data = content.encode()
+        key = fingerprint(data)
+        if key == self._last and content == self._last_content:
+            return None
+        self._last = key
+        self._last_content = content
+        if not data:
+            return None
+
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry.content not in (None, content):
+            # Different content with the same fingerprint replaces the entry
+            self._remove(key)
+            entry = None
+        if entry is not None:
+            # Copied again: move it to the front
+            self._entries.move_to_end(key)
+            entry.last_seen = now
+            entry.copies += 1
+            self.stats.repeats += 1
+            return entry
+
+        stored = content if len(data) <= self.max_bytes else None
+        entry = ClipboardEntry(self._next_id, self.format, key, now, now, stored)
+        self._next_id += 1
+        self._entries[key] = entry
+        self._ids[entry.id] = key
+        self.total_bytes += entry.stored_bytes
+        self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.history_size or self.total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _remove(self, key: Fingerprint) -> None:
+        entry = self._entries.pop(key)
+        del self._ids[entry.id]
+        self.total_bytes -= entry.stored_bytes
+
+    async def sample_once(self) -> ClipboardEntry | None:
+        """Read the clipboard once and record it.
+
+        Returns:
+            The entry if the clipboard changed since the previous sample
+        """
+        first = self._last is None
+        config = self._config or BTTConnectionConfig()
+        content = await get_clipboard(
+            self.format, False, config, exclude_concealed=True
+        )
+        self.stats.samples += 1
+        if content.startswith("Error:"):
+            self.stats.errors += 1
+            return None
+
+        entry = self.record(content)
+        if entry is None or first:
+            # The first reading only establishes the baseline
+            return None
+        self.stats.changes += 1
+        await self._notify()
+        return entry
+
+    async def _notify(self) -> None:
+        uri = AnyUrl(CLIPBOARD_LATEST_URI)
+        for subscriber in list(self._subscribers):
+            try:
+                await subscriber.send_resource_updated(uri)
+                self.stats.notifications += 1
+            except Exception:  # noqa: BLE001 - session went away
+                self._subscribers.discard(subscriber)
+
+    async def _run(self) -> None:
+        while self._watching or self._subscribers:
+            try:
+                changed = await self.sample_once() is not None
+            except Exception as e:  # noqa: BLE001 - keep watching
+                self.stats.errors += 1
+                changed = False
+                print(f"Clipboard watcher sample failed: {e}", file=sys.stderr)
+            if changed:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.max_interval, self.interval * INTERVAL_BACKOFF)
+            await asyncio.sleep(self.interval)
+
+    async def stop(self) -> None:
+        """Stop watching and drop all subscriptions. The history is kept."""
+        self._watching = False
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Shared watcher used by the clipboard tools and resources
+clipboard_watcher = ClipboardWatcher(
+    min_interval=get_clipboard_min_interval(),
+    max_interval=get_clipboard_max_interval(),
+    history_size=get_clipboard_history_size(),
+    max_bytes=get_clipboard_history_max_bytes(),
+)
@@ -0,0 +1,200 @@
+"""
+Cache of encoded widget icons.
+
+Widgets that show the same few icons again and again should not re-read,
+re-encode and re-send the same base64 data with every update. Icons are
+encoded (and optionally downscaled) once, stored under a short key derived
+from their content hash, and evicted least recently used once the cache
+exceeds its byte budget. Icons loaded from a file are also indexed by path,
+modification time and size, so an unchanged file is never read twice.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import shutil
+import subprocess
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from btt_mcp.config import get_icon_cache_max_bytes
+
+ICON_KEY_PREFIX = "icon:"
+
+# (resolved path, mtime_ns, file size, max_size)
+PathKey = tuple[str, int, int, int | None]
+
+# Removed from icon data before decoding, so line-wrapped base64 (such as
+# base64.encodebytes output) is accepted
+_BASE64_WHITESPACE = str.maketrans("", "", " \t\n\r\v\f")
+
+
+@dataclass
+class CachedIcon:
+    """An encoded icon ready to send as icon_data."""
+
+    key: str
+    data: str
+    source: str
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+@dataclass
+class IconCacheStats:
+    """Counters describing icon cache use."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def icon_key(raw: bytes) -> str:
+    """Return the short cache key for encoded icon bytes."""
+    return ICON_KEY_PREFIX + hashlib.sha256(raw).hexdigest()[:12]
+
+
+def downscale(raw: bytes, max_size: int, suffix: str = ".png") -> bytes:
+    """Scale an image down so its longest side is at most max_size pixels.
+
+    Uses the macOS ``sips`` tool and always returns PNG data.
+
+    Raises:
+        ValueError: If sips is not available or cannot read the image
+    """
+    sips = shutil.which("sips")
+    if sips is None:
+        raise ValueError("Downscaling icons requires the macOS 'sips' tool")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / f"icon{suffix or '.png'}"
+        target = Path(tmp) / "scaled.png"
+        source.write_bytes(raw)
+        cmd = [sips, "-Z", str(max_size), "-s", "format", "png"]
+        cmd += [str(source), "--out", str(target)]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        except subprocess.TimeoutExpired:
+            raise ValueError("sips timed out while scaling the icon") from None
+        if result.returncode != 0 or not target.exists():
+            raise ValueError(f"sips could not scale the icon - {result.stderr}")
+        return target.read_bytes()
+
+
+class IconCache:
+    """Byte-bounded LRU cache of base64-encoded icons."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.stats = IconCacheStats()
+        self._icons: OrderedDict[str, CachedIcon] = OrderedDict()
+        self._paths: dict[PathKey, str] = {}
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._icons)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def icons(self) -> list[CachedIcon]:
+        """Return cached icons, most recently used last."""
+        return list(self._icons.values())
+
+    def get(self, key: str) -> CachedIcon | None:
+        """Return a cached icon by key and mark it as recently used."""
+        icon = self._icons.get(key)
+        if icon is None:
+            self.stats.misses += 1
+            return None
+        self._icons.move_to_end(key)
+        self.stats.hits += 1
+        return icon
+
+    async def load_path(self, path: str, max_size: int | None = None) -> CachedIcon:
+        """Return the cached icon for a file, encoding it on first use.
+
+        Raises:
+            ValueError: If the file cannot be read or scaled
+        """
+        resolved = Path(path).expanduser().resolve()
+        try:
+            stat = resolved.stat()
+        except OSError as e:
+            raise ValueError(f"Could not read icon {resolved}: {e}") from None
+        path_key = (str(resolved), stat.st_mtime_ns, stat.st_size, max_size)
+
+        key = self._paths.get(path_key)
+        if key is not None:
+            icon = self.get(key)
+            if icon is not None:
+                return icon
+            del self._paths[path_key]
+
+        try:
+            raw = await asyncio.to_thread(resolved.read_bytes)
+        except OSError as e:
+            raise ValueError(f"Could not read icon {resolved}: {e}") from None
+        icon = await self._store(raw, max_size, resolved.suffix, str(resolved))
+        self._paths[path_key] = icon.key
+        return icon
+
+    async def add_data(
+        self, data: str, max_size: int | None = None, source: str = "icon_data"
+    ) -> CachedIcon:
+        """Cache base64 icon data, returning the existing entry if known.
+
+        Raises:
+            ValueError: If the data is not valid base64 or cannot be scaled
+        """
+        try:
+            raw = base64.b64decode(data.translate(_BASE64_WHITESPACE), validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError("icon_data is not valid base64") from None
+        return await self._store(raw, max_size, ".png", source)
+
+    async def _store(
+        self, raw: bytes, max_size: int | None, suffix: str, source: str
+    ) -> CachedIcon:
+        # Key by the original content and target size, so downscaled
+        # variants of the same image are cached separately
+        key = icon_key(raw if max_size is None else raw + f"@{max_size}".encode())
+        icon = self._icons.get(key)
+        if icon is not None:
+            self._icons.move_to_end(key)
+            self.stats.hits += 1
+            return icon
+
+        self.stats.misses += 1
+        if max_size is not None:
+            raw = await asyncio.to_thread(downscale, raw, max_size, suffix)
+        icon = CachedIcon(key, base64.b64encode(raw).decode("ascii"), source)
+        self._icons[key] = icon
+        self._bytes += icon.size
+        self._evict()
+        return icon
+
+    def _evict(self) -> None:
+        # Always keep the most recent icon, even if it exceeds the budget
+        while self._bytes > self.max_bytes and len(self._icons) > 1:
+            _, icon = self._icons.popitem(last=False)
+            self._bytes -= icon.size
+            self.stats.evictions += 1
+        if len(self._paths) > 4 * len(self._icons):
+            self._paths = {p: k for p, k in self._paths.items() if k in self._icons}
+
+    def clear(self) -> None:
+        """Drop all cached icons."""
+        self._icons.clear()
+        self._paths.clear()
+        self._bytes = 0
+
+
+# Shared cache used by the widget tools
+icon_cache = IconCache(max_bytes=get_icon_cache_max_bytes())
@@ -0,0 +1,148 @@
+"""
+Floating menu templates for fast server-side cloning.
+
+A template is a floating menu trigger (including its nested items) that is
+serialized once when registered. Every UUID inside it is replaced by a
+numbered placeholder, and each top-level field is kept as its own
+pre-serialized JSON fragment. Cloning only generates fresh UUIDs, swaps the
+placeholders and re-serializes the fields that are overridden.
+"""
+
+import json
+import re
+import uuid as uuid_lib
+from dataclasses import dataclass
+from typing import Any
+
+# Placeholder used for the n-th UUID found in a template
+_PLACEHOLDER = "@@BTTMCP_UUID_{}@@"
+_PLACEHOLDER_RE = re.compile(r"@@BTTMCP_UUID_(\d+)@@")
+
+# Keys whose values are UUIDs that must be unique per clone
+_UUID_KEYS = ("BTTUUID",)
+
+
+def _fragment(key: str, value: Any) -> str:
+    """Serialize a single top-level ``"key":value`` JSON member."""
+    return f"{json.dumps(key)}:{json.dumps(value, separators=(',', ':'))}"
+
+
+def _collect_uuids(node: Any, found: dict[str, int]) -> None:
+    """Number every BTTUUID value in the tree in depth-first order."""
+    if isinstance(node, dict):
+        for key in _UUID_KEYS:
+            value = node.get(key)
+            if isinstance(value, str) and value and value not in found:
+                found[value] = len(found)
+        for value in node.values():
+            _collect_uuids(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_uuids(value, found)
+
+
+def _substitute(node: Any, index: dict[str, int]) -> Any:
+    """Replace every string equal to a known UUID with its placeholder.
+
+    This also rewrites references such as BTTTriggerParentUUID or an
+    action's BTTFloatingMenuUUID, so clones point at their own elements.
+    """
+    if isinstance(node, dict):
+        return {key: _substitute(value, index) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_substitute(value, index) for value in node]
+    if isinstance(node, str) and node in index:
+        return _PLACEHOLDER.format(index[node])
+    return node
+
+
+@dataclass
+class MenuTemplate:
+    """A pre-serialized floating menu that can be cloned cheaply."""
+
+    name: str
+    fragments: dict[str, str]
+    config: dict[str, Any]
+    uuid_count: int
+    item_count: int
+
+    @classmethod
+    def from_trigger(cls, name: str, trigger: dict[str, Any]) -> "MenuTemplate":
+        """Build a template from floating menu trigger JSON.
+
+        Args:
+            name: Name to register the template under
+            trigger: Floating menu trigger, optionally with nested BTTMenuItems
+
+        Returns:
+            The compiled template
+        """
+        found: dict[str, int] = {}
+        # The menu's own UUID is always placeholder 0
+        menu_uuid = trigger.get("BTTUUID") or "BTTMCP-TEMPLATE-MENU"
+        found[menu_uuid] = 0
+        _collect_uuids(trigger, found)
+
+        compiled = _substitute({**trigger, "BTTUUID": menu_uuid}, found)
+        config = compiled.get("BTTMenuConfig")
+
+        return cls(
+            name=name,
+            fragments={key: _fragment(key, value) for key, value in compiled.items()},
+            config=config if isinstance(config, dict) else {},
+            uuid_count=len(found),
+            item_count=len(trigger.get("BTTMenuItems") or []),
+        )
+
+    def render(self, overrides: dict[str, Any] | None = None) -> tuple[str, str]:
+        """Produce the JSON for a new clone of this template.
+
+        Args:
+            overrides: Top-level trigger fields to replace. A dict given for
+                BTTMenuConfig is merged into the template's config.
+
+        Returns:
+            Tuple of (menu UUID, trigger JSON) for the clone
+        """
+        fragments = self.fragments
+        if overrides:
+            fragments = dict(fragments)
+            for key, value in overrides.items():
+                if key == "BTTMenuConfig" and isinstance(value, dict):
+                    value = {**self.config, **value}
+                fragments[key] = _fragment(key, value)
+
+        new_uuids = [str(uuid_lib.uuid4()).upper() for _ in range(self.uuid_count)]
+        text = "{" + ",".join(fragments.values()) + "}"
+        return new_uuids[0], _PLACEHOLDER_RE.sub(
+            lambda match: new_uuids[int(match.group(1))], text
+        )
+
+
+class MenuTemplateRegistry:
+    """Named collection of menu templates kept for the server's lifetime."""
+
+    def __init__(self):
+        self._templates: dict[str, MenuTemplate] = {}
+
+    def register(self, name: str, trigger: dict[str, Any]) -> MenuTemplate:
+        """Compile and store a template, replacing any with the same name."""
+        template = MenuTemplate.from_trigger(name, trigger)
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> MenuTemplate | None:
+        """Return the template registered under ``name``, if any."""
+        return self._templates.get(name)
+
+    def remove(self, name: str) -> bool:
+        """Remove a template. Returns True if it existed."""
+        return self._templates.pop(name, None) is not None
+
+    def list(self) -> list[MenuTemplate]:
+        """Return all registered templates sorted by name."""
+        return [self._templates[name] for name in sorted(self._templates)]
+
+
+# Shared registry used by the floating menu tools
+menu_templates = MenuTemplateRegistry()
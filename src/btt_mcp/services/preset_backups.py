@@ -0,0 +1,288 @@
+"""
+Content-addressed, incremental preset backups.
+
+A backup stores every trigger as a blob named after the SHA-256 of its
+canonical JSON, plus a small manifest listing the blobs in preset order.
+Triggers that did not change since an earlier backup already have a blob,
+so a repeated backup only writes the changed triggers and its manifest.
+App settings and top-level preset fields are stored as blobs the same way.
+
+Layout of the backup directory::
+
+    blobs/ab/abcdef....json      canonical JSON of a trigger or app
+    manifests/<backup id>.json   one per backup
+
+Backups are read from exported preset files with the streaming reader, and
+restored by streaming the blobs back into a preset file, so neither holds
+more than one trigger in memory.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+from btt_mcp.config import get_backup_dir
+from btt_mcp.services.preset_index import JsonStreamReader, open_preset
+
+MANIFEST_FORMAT = "btt-mcp-preset-backup"
+MANIFEST_VERSION = 1
+
+
+def canonical_json(value: Any) -> bytes:
+    """Return the canonical JSON encoding used for blob hashes."""
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def _temporary_file(path: Path, mode: str = "wb", **kwargs: Any):
+    # Unique per call: backups run in threads and may write the same blob
+    return tempfile.NamedTemporaryFile(
+        mode,
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+        delete=False,
+        **kwargs,
+    )
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _temporary_file(path) as file:
+        file.write(data)
+    try:
+        os.replace(file.name, path)
+    except OSError:
+        os.unlink(file.name)
+        raise
+
+
+@dataclass
+class BackupSummary:
+    """Summary of a backup manifest."""
+
+    id: str
+    created_at: str
+    source: str
+    name: str
+    triggers: int
+    new_blobs: int
+    new_bytes: int
+
+
+class PresetBackupStore:
+    """Content-addressed store of preset backups."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @property
+    def blob_dir(self) -> Path:
+        return self.root / "blobs"
+
+    @property
+    def manifest_dir(self) -> Path:
+        return self.root / "manifests"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.json"
+
+    def put(self, value: Any, stats: dict[str, int] | None = None) -> str:
+        """Store a JSON value unless it is already stored. Returns its hash.
+
+        Raises:
+            ValueError: If the blob cannot be written
+        """
+        data = canonical_json(value)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            try:
+                _write_atomic(path, data)
+            except OSError as e:
+                raise ValueError(f"Could not write backup: {e}") from e
+            if stats is not None:
+                stats["new_blobs"] += 1
+                stats["new_bytes"] += len(data)
+        return digest
+
+    def get(self, digest: str) -> Any:
+        """Load a stored JSON value.
+
+        Raises:
+            ValueError: If the blob is missing or corrupt
+        """
+        try:
+            data = self._blob_path(digest).read_bytes()
+        except OSError as e:
+            raise ValueError(f"Backup blob {digest} is missing") from e
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Backup blob {digest} is corrupt")
+        return json.loads(data)
+
+    def backup_file(self, path: str, source: str | None = None) -> BackupSummary:
+        """Back up an exported preset file.
+
+        Args:
+            path: Preset file, plain or compressed
+            source: Description of where the preset came from (default: path)
+
+        Returns:
+            Summary of the new backup
+
+        Raises:
+            ValueError: If the preset cannot be read or the backup written
+        """
+        stats = {"new_blobs": 0, "new_bytes": 0}
+        metadata: dict[str, Any] = {}
+        apps: list[dict[str, Any]] = []
+        trigger_count = 0
+
+        try:
+            with open_preset(path) as stream:
+                reader = JsonStreamReader(stream)
+                if reader.peek() != "{":
+                    raise ValueError(f"{path} is not an exported BTT preset")
+                for key in reader.iter_object():
+                    if key != "BTTPresetContent":
+                        metadata[key] = reader.read_value()
+                        continue
+                    for _ in reader.iter_array():
+                        app: dict[str, Any] = {}
+                        triggers: list[str] = []
+                        for app_key in reader.iter_object():
+                            if app_key != "BTTTriggers":
+                                app[app_key] = reader.read_value()
+                                continue
+                            for _ in reader.iter_array():
+                                triggers.append(self.put(reader.read_value(), stats))
+                        trigger_count += len(triggers)
+                        apps.append({"app": self.put(app, stats), "triggers": triggers})
+        except (OSError, EOFError, zlib.error) as e:
+            raise ValueError(f"Could not read preset file {path}: {e}") from e
+
+        created = time.gmtime()
+        manifest = {
+            "format": MANIFEST_FORMAT,
+            "version": MANIFEST_VERSION,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", created),
+            "source": source or path,
+            "name": str(metadata.get("BTTPresetName", "")),
+            "triggers": trigger_count,
+            "metadata": self.put(metadata, stats),
+            "apps": apps,
+            **stats,
+        }
+        data = json.dumps(manifest, indent=1).encode()
+        backup_id = (
+            time.strftime("%Y%m%dT%H%M%SZ", created)
+            + "-"
+            + hashlib.sha256(data).hexdigest()[:8]
+        )
+        try:
+            _write_atomic(self.manifest_dir / f"{backup_id}.json", data)
+        except OSError as e:
+            raise ValueError(f"Could not write backup: {e}") from e
+
+        return self._summary(backup_id, manifest)
+
+    def _summary(self, backup_id: str, manifest: dict[str, Any]) -> BackupSummary:
+        return BackupSummary(
+            id=backup_id,
+            created_at=manifest.get("created_at", ""),
+            source=manifest.get("source", ""),
+            name=manifest.get("name", ""),
+            triggers=manifest.get("triggers", 0),
+            new_blobs=manifest.get("new_blobs", 0),
+            new_bytes=manifest.get("new_bytes", 0),
+        )
+
+    def load_manifest(self, backup_id: str) -> dict[str, Any]:
+        """Load a backup manifest.
+
+        Raises:
+            ValueError: If the backup does not exist or is not a backup
+        """
+        if not backup_id or "/" in backup_id or backup_id.startswith("."):
+            raise ValueError(f"Invalid backup ID: {backup_id}")
+        try:
+            manifest = json.loads((self.manifest_dir / f"{backup_id}.json").read_text())
+        except FileNotFoundError as e:
+            raise ValueError(f"Backup {backup_id} not found") from e
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Could not read backup {backup_id}: {e}") from e
+        if manifest.get("format") != MANIFEST_FORMAT:
+            raise ValueError(f"{backup_id} is not a preset backup")
+        return manifest
+
+    def list_backups(self) -> list[BackupSummary]:
+        """Return all backups, newest first."""
+        if not self.manifest_dir.is_dir():
+            return []
+        summaries = []
+        for path in sorted(self.manifest_dir.glob("*.json"), reverse=True):
+            try:
+                summaries.append(
+                    self._summary(path.stem, self.load_manifest(path.stem))
+                )
+            except ValueError:
+                continue
+        return summaries
+
+    def restore(self, backup_id: str, output_path: str, overwrite: bool = False) -> int:
+        """Rebuild the preset file of a backup.
+
+        Returns:
+            Number of triggers written
+
+        Raises:
+            ValueError: If the backup is incomplete or the file cannot be written
+        """
+        manifest = self.load_manifest(backup_id)
+        output = Path(output_path).expanduser()
+        if output.exists() and not overwrite:
+            raise ValueError(f"{output} already exists")
+
+        temporary = None
+        try:
+            with _temporary_file(output, "w", encoding="utf-8") as file:
+                temporary = Path(file.name)
+                count = self._write_preset(manifest, file)
+            os.replace(temporary, output)
+        except OSError as e:
+            raise ValueError(f"Could not write {output}: {e}") from e
+        finally:
+            if temporary is not None:
+                temporary.unlink(missing_ok=True)
+        return count
+
+    def _write_preset(self, manifest: dict[str, Any], file: TextIO) -> int:
+        count = 0
+        file.write("{")
+        for key, value in self.get(manifest["metadata"]).items():
+            file.write(f"{json.dumps(key)}:{json.dumps(value, ensure_ascii=False)},")
+        file.write('"BTTPresetContent":[')
+        for i, app in enumerate(manifest["apps"]):
+            fields = self.get(app["app"])
+            fields["BTTTriggers"] = []
+            # Write the app without its triggers, then stream them in
+            head = json.dumps(fields, ensure_ascii=False)[: -len("[]}")]
+            file.write(("," if i else "") + head + "[")
+            for j, digest in enumerate(app["triggers"]):
+                trigger = json.dumps(self.get(digest), ensure_ascii=False)
+                file.write(("," if j else "") + trigger)
+                count += 1
+            file.write("]}")
+        file.write("]}")
+        return count
+
+
+# Shared store used by the preset tools
+preset_backups = PresetBackupStore(get_backup_dir())
@@ -0,0 +1,243 @@
+"""
+Structural diff between two sets of triggers.
+
+Either side can be an exported preset file or the live configuration. Each
+trigger is reduced to a hash of its canonical JSON, ignoring timestamps and
+UUIDs, plus its parent's UUID, so only summaries of the old side are held in
+memory. A trigger matched by UUID is modified if its content or its parent
+changed (e.g. a menu item moved to another menu):
+
+1. the old side is streamed once and summarized,
+2. the new side is streamed and matched by UUID; unmatched triggers are
+   then matched by content hash (same content under a new UUID),
+3. only if triggers were modified, the old side is streamed again to pick
+   up those triggers for a field-level diff.
+
+The work is linear in the number of triggers on both sides.
+"""
+
+import hashlib
+import json
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from btt_mcp.services.preset_index import IndexedTrigger, index_trigger
+
+TriggerSource = Callable[[], Iterable[tuple[IndexedTrigger, dict[str, Any]]]]
+
+# Keys that change without the trigger changing
+IGNORED_KEYS = frozenset({"BTTLastUpdatedAt"})
+
+# Keys that identify a trigger rather than describe it
+IDENTITY_KEYS = frozenset({"BTTUUID", "BTTTriggerParentUUID"})
+
+# Nested triggers are indexed and compared on their own
+NESTED_TRIGGER_KEYS = frozenset({"BTTMenuItems"})
+
+# Field changes reported per modified trigger
+MAX_FIELD_CHANGES = 20
+
+
+def _strip(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _strip(item)
+            for key, item in value.items()
+            if key not in IGNORED_KEYS and key not in IDENTITY_KEYS
+        }
+    if isinstance(value, list):
+        return [_strip(item) for item in value]
+    return value
+
+
+def comparable(trigger: dict[str, Any]) -> dict[str, Any]:
+    """Return the parts of a trigger that are compared."""
+    return _strip(
+        {key: v for key, v in trigger.items() if key not in NESTED_TRIGGER_KEYS}
+    )
+
+
+def parent_of(entry: IndexedTrigger, trigger: dict[str, Any]) -> str | None:
+    """Return the UUID of a trigger's parent, from nesting or BTTTriggerParentUUID."""
+    parent = entry.parent_uuid or trigger.get("BTTTriggerParentUUID")
+    return str(parent) if parent else None
+
+
+def content_hash(trigger: dict[str, Any]) -> str:
+    """Return the hash of a trigger's canonical JSON, ignoring UUIDs."""
+    canonical = json.dumps(
+        comparable(trigger), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class FieldChange:
+    """A changed value at a path inside a trigger, e.g. 'BTTActions[0].BTTUUID'."""
+
+    path: str
+    change: Literal["added", "removed", "changed"]
+    old: Any = None
+    new: Any = None
+
+
+def diff_fields(
+    old: Any, new: Any, path: str = "", limit: int = MAX_FIELD_CHANGES
+) -> list[FieldChange]:
+    """Return the differences between two JSON values, at most limit."""
+    changes: list[FieldChange] = []
+
+    def walk(old: Any, new: Any, path: str) -> None:
+        if len(changes) >= limit or old == new:
+            return
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key in sorted(old.keys() | new.keys()):
+                child = f"{path}.{key}" if path else key
+                if key not in new:
+                    changes.append(FieldChange(child, "removed", old=old[key]))
+                elif key not in old:
+                    changes.append(FieldChange(child, "added", new=new[key]))
+                else:
+                    walk(old[key], new[key], child)
+                if len(changes) >= limit:
+                    return
+        elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+            for i, (a, b) in enumerate(zip(old, new)):
+                walk(a, b, f"{path}[{i}]")
+        else:
+            changes.append(FieldChange(path, "changed", old, new))
+
+    walk(old, new, path)
+    return changes
+
+
+@dataclass
+class TriggerChange:
+    """An added, removed, modified or re-identified trigger."""
+
+    uuid: str
+    name: str
+    trigger_class: str
+    app_name: str
+    old_uuid: str | None = None
+    fields: list[FieldChange] = field(default_factory=list)
+
+    @classmethod
+    def from_entry(cls, entry: IndexedTrigger, **kwargs: Any) -> "TriggerChange":
+        return cls(
+            entry.uuid, entry.name, entry.trigger_class, entry.app_name, **kwargs
+        )
+
+
+@dataclass
+class PresetDiff:
+    """Differences between an old and a new set of triggers."""
+
+    old_count: int = 0
+    new_count: int = 0
+    unchanged: int = 0
+    added: list[TriggerChange] = field(default_factory=list)
+    removed: list[TriggerChange] = field(default_factory=list)
+    modified: list[TriggerChange] = field(default_factory=list)
+    uuid_changed: list[TriggerChange] = field(default_factory=list)
+
+    @property
+    def identical(self) -> bool:
+        return not (self.added or self.removed or self.modified or self.uuid_changed)
+
+
+def _key(entry: IndexedTrigger, position: int) -> str:
+    # Triggers without a UUID can only be matched by content
+    return entry.uuid or f"#{position}"
+
+
+def diff_triggers(old: TriggerSource, new: TriggerSource) -> PresetDiff:
+    """Compare two trigger sources.
+
+    Args:
+        old: Returns an iterable of (index entry, trigger); called up to twice
+        new: Returns an iterable of (index entry, trigger); called once
+
+    Returns:
+        The differences from old to new
+    """
+    diff = PresetDiff()
+
+    old_summary: dict[str, tuple[IndexedTrigger, str, str | None]] = {}
+    for position, (entry, trigger) in enumerate(old()):
+        old_summary[_key(entry, position)] = (
+            entry,
+            content_hash(trigger),
+            parent_of(entry, trigger),
+        )
+    diff.old_count = len(old_summary)
+
+    matched: set[str] = set()
+    # New triggers without a UUID match, in order; None once matched by hash
+    added: list[IndexedTrigger | None] = []
+    added_by_hash: dict[str, deque[int]] = {}
+    modified: dict[str, tuple[IndexedTrigger, dict[str, Any]]] = {}
+    for position, (entry, trigger) in enumerate(new()):
+        diff.new_count += 1
+        key = _key(entry, position)
+        digest = content_hash(trigger)
+        previous = old_summary.get(key) if entry.uuid else None
+        if previous is None:
+            added_by_hash.setdefault(digest, deque()).append(len(added))
+            added.append(entry)
+            continue
+        matched.add(key)
+        if previous[1:] == (digest, parent_of(entry, trigger)):
+            diff.unchanged += 1
+        else:
+            modified[key] = (entry, trigger)
+
+    for key, (entry, digest, _parent) in old_summary.items():
+        if key in matched:
+            continue
+        candidates = added_by_hash.get(digest)
+        if candidates:
+            position = candidates.popleft()
+            diff.uuid_changed.append(
+                TriggerChange.from_entry(added[position], old_uuid=entry.uuid)
+            )
+            added[position] = None
+        else:
+            diff.removed.append(TriggerChange.from_entry(entry))
+    diff.added = [TriggerChange.from_entry(e) for e in added if e is not None]
+
+    if modified:
+        for position, (entry, trigger) in enumerate(old()):
+            key = _key(entry, position)
+            if key not in modified:
+                continue
+            new_entry, new_trigger = modified.pop(key)
+            fields = []
+            old_parent = parent_of(entry, trigger)
+            new_parent = parent_of(new_entry, new_trigger)
+            if old_parent != new_parent:
+                fields.append(
+                    FieldChange(
+                        "BTTTriggerParentUUID", "changed", old_parent, new_parent
+                    )
+                )
+            fields += diff_fields(
+                comparable(trigger),
+                comparable(new_trigger),
+                limit=MAX_FIELD_CHANGES - len(fields),
+            )
+            diff.modified.append(TriggerChange.from_entry(new_entry, fields=fields))
+            if not modified:
+                break
+    return diff
+
+
+def iter_triggers(
+    triggers: Iterable[dict[str, Any]],
+) -> Iterator[tuple[IndexedTrigger, dict[str, Any]]]:
+    """Yield (index entry, trigger) for triggers returned by get_triggers."""
+    for trigger in triggers:
+        if isinstance(trigger, dict):
+            yield from index_trigger(trigger, {})
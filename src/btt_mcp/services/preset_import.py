@@ -0,0 +1,165 @@
+"""
+Staged preset import.
+
+BTT's import_preset loads a whole preset at once. A staged import instead
+validates the preset file locally, diffs it against the live triggers and
+sends only the triggers that are new or changed, as concurrent
+add_new_trigger and update_trigger requests. Triggers that are only in BTT
+are left alone.
+"""
+
+import asyncio
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from btt_mcp.client import btt_request
+from btt_mcp.config import MAX_BATCH_CONCURRENCY
+from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.services.preset_diff import (
+    IGNORED_KEYS,
+    NESTED_TRIGGER_KEYS,
+    PresetDiff,
+    diff_triggers,
+    iter_triggers,
+)
+from btt_mcp.services.preset_index import IndexedTrigger, iter_preset_file
+
+
+@dataclass
+class ImportStep:
+    """One request needed to bring BTT in line with the preset."""
+
+    action: Literal["add", "update"]
+    uuid: str
+    name: str
+    trigger_class: str
+    app_name: str
+    params: dict[str, str] = field(repr=False)
+    result: str | None = None
+
+    @property
+    def endpoint(self) -> str:
+        return "add_new_trigger" if self.action == "add" else "update_trigger"
+
+    @property
+    def failed(self) -> bool:
+        return self.result is not None and self.result.startswith("Error:")
+
+
+@dataclass
+class ImportPlan:
+    """Validation problems, the diff and the requests of a staged import."""
+
+    path: str
+    diff: PresetDiff = field(default_factory=PresetDiff)
+    problems: list[str] = field(default_factory=list)
+    steps: list[ImportStep] = field(default_factory=list)
+
+
+def validate_trigger(entry: IndexedTrigger, trigger: dict[str, Any]) -> list[str]:
+    """Return the problems that would stop BTT from accepting a trigger."""
+    label = f"Trigger {entry.uuid or entry.name or '(unnamed)'}"
+    problems = []
+    if not entry.uuid:
+        problems.append(f"{label} has no BTTUUID")
+    if not entry.trigger_class and entry.parent_uuid is None:
+        problems.append(f"{label} has no BTTTriggerClass")
+    for key in ("BTTActionsToExecute", *NESTED_TRIGGER_KEYS):
+        if key in trigger and not isinstance(trigger[key], list):
+            problems.append(f"{label}: {key} must be a list")
+    return problems
+
+
+def _validated(
+    path: str, problems: list[str]
+) -> Iterator[tuple[IndexedTrigger, dict[str, Any]]]:
+    seen: set[str] = set()
+    for entry, trigger in iter_preset_file(path):
+        problems.extend(validate_trigger(entry, trigger))
+        if entry.uuid in seen:
+            problems.append(f"Trigger {entry.uuid} appears more than once")
+        seen.add(entry.uuid)
+        yield entry, trigger
+
+
+def _step(
+    action: Literal["add", "update"], entry: IndexedTrigger, params: dict[str, str]
+) -> ImportStep:
+    return ImportStep(
+        action, entry.uuid, entry.name, entry.trigger_class, entry.app_name, params
+    )
+
+
+def plan_import(path: str, live: list[dict[str, Any]]) -> ImportPlan:
+    """Validate a preset file and work out the requests that import it.
+
+    New triggers are added with their nested menu items; a nested item is
+    only added on its own when its parent already exists. Modified
+    triggers are updated without their nested items, which get their own
+    update if they changed.
+
+    Args:
+        path: Preset file, plain or compressed
+        live: Triggers returned by get_triggers
+
+    Returns:
+        The plan; it has no steps if the preset failed validation
+
+    Raises:
+        ValueError: If the file cannot be read or is not a preset
+    """
+    plan = ImportPlan(path)
+    plan.diff = diff_triggers(
+        lambda: iter_triggers(live), lambda: _validated(path, plan.problems)
+    )
+    if plan.problems:
+        return plan
+
+    added = {change.uuid for change in plan.diff.added}
+    modified = {change.uuid for change in plan.diff.modified}
+    if not added and not modified:
+        return plan
+
+    for entry, trigger in iter_preset_file(path):
+        if entry.uuid in added:
+            if entry.parent_uuid in added:
+                continue
+            new = dict(trigger)
+            if entry.parent_uuid is None and entry.bundle_id:
+                new.setdefault("BTTAppBundleIdentifier", entry.bundle_id)
+            elif entry.parent_uuid is None and entry.activation_group:
+                new.setdefault("BTTActivationGroupName", entry.activation_group)
+            params = {"json": json.dumps(new)}
+            if entry.parent_uuid:
+                params["trigger_parent_uuid"] = entry.parent_uuid
+            plan.steps.append(_step("add", entry, params))
+        elif entry.uuid in modified:
+            update = {
+                key: value
+                for key, value in trigger.items()
+                if key not in NESTED_TRIGGER_KEYS and key not in IGNORED_KEYS
+            }
+            if entry.parent_uuid:
+                # Nested items carry their parent implicitly; moves need it
+                update["BTTTriggerParentUUID"] = entry.parent_uuid
+            params = {"uuid": entry.uuid, "json": json.dumps(update)}
+            plan.steps.append(_step("update", entry, params))
+    return plan
+
+
+async def apply_import(
+    plan: ImportPlan,
+    config: BTTConnectionConfig,
+    max_concurrency: int = MAX_BATCH_CONCURRENCY,
+) -> None:
+    """Send the requests of a plan concurrently, storing each result."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def send(step: ImportStep) -> None:
+        async with semaphore:
+            result = await btt_request(step.endpoint, step.params, config)
+        step.result = result.strip()
+
+    await asyncio.gather(*(send(step) for step in plan.steps))
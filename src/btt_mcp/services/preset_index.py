@@ -0,0 +1,472 @@
+"""
+Offline index of exported preset files.
+
+Preset files written by btt_export_preset can be large, so they are read
+as a stream: the file is decompressed on the fly, and only one trigger at a
+time is materialized from the JSON while its index entry is built. Triggers
+are indexed by UUID, class, app and name, which lets agents search and
+inspect presets without BTT running. Floating menu items (BTTMenuItems) are
+indexed as triggers with a parent UUID.
+"""
+
+import asyncio
+import gzip
+import io
+import json
+import os
+import zipfile
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+
+# Characters read from the preset file at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# Keys that may hold the display name of a trigger, in order of preference
+TRIGGER_NAME_KEYS = (
+    "BTTTriggerName",
+    "BTTTouchBarButtonName",
+    "BTTWidgetName",
+    "BTTMenuName",
+    "BTTGestureNotes",
+)
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _ZlibReader(io.RawIOBase):
+    """Decompress a raw zlib stream while it is read."""
+
+    def __init__(self, file: io.BufferedReader):
+        self._file = file
+        self._decompressor = zlib.decompressobj()
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self._buffer:
+            if self._decompressor.eof:
+                return 0
+            data = self._file.read(READ_CHUNK_SIZE)
+            if not data:
+                self._buffer = self._decompressor.flush()
+                if not self._buffer:
+                    return 0
+                break
+            self._buffer = self._decompressor.decompress(data)
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _zip_member(archive: zipfile.ZipFile) -> str:
+    names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    for name in names:
+        if name.endswith((".bttpreset", ".json")):
+            return name
+    if not names:
+        raise ValueError("Zip archive contains no preset")
+    return names[0]
+
+
+@contextmanager
+def open_preset(path: str) -> Iterator[TextIO]:
+    """Open a preset file as text, decompressing it on the fly.
+
+    Plain JSON as well as gzip, zlib and zip compressed presets are
+    supported.
+
+    Raises:
+        ValueError: If the file cannot be opened
+    """
+    with ExitStack() as stack:
+        try:
+            with open(path, "rb") as file:
+                magic = file.read(4)
+
+            if magic[:2] == b"\x1f\x8b":
+                stream = gzip.open(path, "rt", encoding="utf-8")
+            elif magic == b"PK\x03\x04":
+                archive = stack.enter_context(zipfile.ZipFile(path))
+                member = archive.open(_zip_member(archive))
+                stream = io.TextIOWrapper(member, encoding="utf-8")
+            elif magic[:1] == b"\x78":
+                reader = io.BufferedReader(_ZlibReader(open(path, "rb")))
+                stream = io.TextIOWrapper(reader, encoding="utf-8")
+            else:
+                stream = open(path, encoding="utf-8")
+        except (OSError, zipfile.BadZipFile) as e:
+            raise ValueError(f"Could not open preset file {path}: {e}") from e
+
+        yield stack.enter_context(stream)
+
+
+class JsonStreamReader:
+    """Pull parser that walks JSON structure without reading it all.
+
+    Objects and arrays can be iterated key by key and item by item; values
+    that are needed are decoded with read_value(), which only holds that
+    value in memory.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = READ_CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, minimum: int = 0) -> bool:
+        if self._eof:
+            return False
+        data = self._stream.read(max(self._chunk_size, minimum))
+        if not data:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or '' at the end."""
+        while True:
+            buffer = self._buffer
+            while self._pos < len(buffer) and buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buffer):
+                return buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid preset JSON: expected '{char}', found '{found}'")
+        self._pos += 1
+
+    def _separator(self, close: str) -> bool:
+        char = self.peek()
+        self._pos += 1
+        if char == ",":
+            return True
+        if char == close:
+            return False
+        raise ValueError(f"Invalid preset JSON: expected ',' or '{close}'")
+
+    def read_value(self) -> Any:
+        """Decode the next value completely."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Grow geometrically so large values are not re-parsed often
+                if self._fill(len(self._buffer) - self._pos):
+                    continue
+                raise ValueError(f"Invalid preset JSON: {e}") from e
+            # A number may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of an object. Each value must be consumed."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid preset JSON: object key is not a string")
+            self._expect(":")
+            yield key
+            if not self._separator("}"):
+                return
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per array item. Each item must be consumed."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            if not self._separator("]"):
+                return
+
+
+@dataclass
+class IndexedTrigger:
+    """Index entry of a trigger in a preset file."""
+
+    uuid: str
+    trigger_class: str
+    name: str
+    app_name: str
+    # Bundle identifier, or the activation group name for activation groups
+    app_id: str
+    bundle_id: str
+    activation_group: str
+    enabled: bool
+    action_count: int
+    parent_uuid: str | None = None
+
+
+@dataclass
+class PresetIndex:
+    """Triggers of a preset file indexed by UUID, class, app and name."""
+
+    path: str
+    name: str = ""
+    uuid: str = ""
+    triggers: list[IndexedTrigger] = field(default_factory=list)
+    by_uuid: dict[str, IndexedTrigger] = field(default_factory=dict)
+    by_class: dict[str, list[IndexedTrigger]] = field(default_factory=dict)
+    by_app: dict[str, list[IndexedTrigger]] = field(default_factory=dict)
+    by_name: dict[str, list[IndexedTrigger]] = field(default_factory=dict)
+
+    def add(self, entry: IndexedTrigger) -> None:
+        self.triggers.append(entry)
+        if entry.uuid:
+            self.by_uuid[entry.uuid] = entry
+        self.by_class.setdefault(entry.trigger_class, []).append(entry)
+        for app in {entry.app_name.lower(), entry.app_id.lower()} - {""}:
+            self.by_app.setdefault(app, []).append(entry)
+        if entry.name:
+            self.by_name.setdefault(entry.name.lower(), []).append(entry)
+
+    def search(
+        self,
+        query: str | None = None,
+        trigger_class: str | None = None,
+        app: str | None = None,
+    ) -> list[IndexedTrigger]:
+        """Find triggers matching all given filters.
+
+        Args:
+            query: Case-insensitive substring of the trigger name, or a UUID
+            trigger_class: Exact trigger class
+            app: App name or bundle identifier (case-insensitive)
+
+        Returns:
+            Matching triggers in file order
+        """
+        if query and query in self.by_uuid:
+            candidates = [self.by_uuid[query]]
+        elif query:
+            needle = query.lower()
+            candidates = [
+                entry
+                for name, entries in self.by_name.items()
+                if needle in name
+                for entry in entries
+            ]
+        else:
+            candidates = self.triggers
+
+        if trigger_class is not None:
+            candidates = [e for e in candidates if e.trigger_class == trigger_class]
+        if app is not None:
+            in_app = {id(e) for e in self.by_app.get(app.lower(), [])}
+            candidates = [e for e in candidates if id(e) in in_app]
+        if query and len(candidates) > 1:
+            order = {id(e): i for i, e in enumerate(self.triggers)}
+            candidates.sort(key=lambda e: order[id(e)])
+        return candidates
+
+
+def trigger_name(trigger: dict[str, Any]) -> str:
+    """Return the display name of a trigger, or an empty string."""
+    for key in TRIGGER_NAME_KEYS:
+        value = trigger.get(key)
+        if isinstance(value, str) and value:
+            return value
+    return ""
+
+
+def index_trigger(
+    trigger: dict[str, Any], app: dict[str, Any], parent_uuid: str | None = None
+) -> Iterator[tuple[IndexedTrigger, dict[str, Any]]]:
+    """Yield (index entry, trigger) for a trigger and its nested menu items."""
+    actions = trigger.get("BTTActionsToExecute")
+    bundle_id = str(app.get("BTTAppBundleIdentifier") or "")
+    activation_group = str(app.get("BTTActivationGroupName") or "")
+    entry = IndexedTrigger(
+        uuid=str(trigger.get("BTTUUID", "")),
+        trigger_class=str(trigger.get("BTTTriggerClass", "")),
+        name=trigger_name(trigger),
+        app_name=str(app.get("BTTAppName", "")),
+        app_id=bundle_id or activation_group,
+        bundle_id=bundle_id,
+        activation_group=activation_group,
+        enabled=bool(trigger.get("BTTEnabled", 1)),
+        action_count=len(actions) if isinstance(actions, list) else 0,
+        parent_uuid=parent_uuid,
+    )
+    yield entry, trigger
+    for item in trigger.get("BTTMenuItems") or ():
+        if isinstance(item, dict):
+            yield from index_trigger(item, app, entry.uuid)
+
+
+def iter_preset_triggers(
+    reader: JsonStreamReader, metadata: dict[str, Any]
+) -> Iterator[tuple[IndexedTrigger, dict[str, Any]]]:
+    """Yield (index entry, trigger) for every trigger in a preset.
+
+    Top-level preset fields other than the content (e.g. BTTPresetName) are
+    stored in metadata. App fields are read before the triggers when the
+    file lists them first; otherwise triggers are buffered until the app's
+    fields are known.
+    """
+    for key in reader.iter_object():
+        if key != "BTTPresetContent":
+            value = reader.read_value()
+            if not isinstance(value, (dict, list)):
+                metadata[key] = value
+            continue
+
+        for _ in reader.iter_array():
+            app: dict[str, Any] = {}
+            pending: list[dict[str, Any]] = []
+            for app_key in reader.iter_object():
+                if app_key != "BTTTriggers":
+                    app[app_key] = reader.read_value()
+                    continue
+                for _ in reader.iter_array():
+                    trigger = reader.read_value()
+                    if not isinstance(trigger, dict):
+                        continue
+                    if "BTTAppName" in app:
+                        yield from index_trigger(trigger, app)
+                    else:
+                        pending.append(trigger)
+            for trigger in pending:
+                yield from index_trigger(trigger, app)
+
+
+def iter_preset_file(
+    path: str, metadata: dict[str, Any] | None = None
+) -> Iterator[tuple[IndexedTrigger, dict[str, Any]]]:
+    """Stream a preset file and yield (index entry, trigger) per trigger.
+
+    Raises:
+        ValueError: If the file cannot be read or is not a preset
+    """
+    if metadata is None:
+        metadata = {}
+    try:
+        with open_preset(path) as stream:
+            reader = JsonStreamReader(stream)
+            if reader.peek() != "{":
+                raise ValueError(f"{path} is not an exported BTT preset")
+            yield from iter_preset_triggers(reader, metadata)
+    except (OSError, EOFError, zlib.error) as e:
+        raise ValueError(f"Could not read preset file {path}: {e}") from e
+
+
+def build_preset_index(path: str) -> PresetIndex:
+    """Stream a preset file and index its triggers.
+
+    Raises:
+        ValueError: If the file cannot be read or is not a preset
+    """
+    index = PresetIndex(path)
+    metadata: dict[str, Any] = {}
+    for entry, _ in iter_preset_file(path, metadata):
+        index.add(entry)
+    index.name = str(metadata.get("BTTPresetName", ""))
+    index.uuid = str(metadata.get("BTTPresetUUID", ""))
+    return index
+
+
+def load_preset_trigger(
+    path: str, uuid: str
+) -> tuple[IndexedTrigger, dict[str, Any]] | None:
+    """Stream a preset file and return (index entry, trigger) for a UUID.
+
+    Reading stops at the matching trigger. Triggers before it are decoded
+    one at a time and dropped.
+
+    Raises:
+        ValueError: If the file cannot be read or is not a preset
+    """
+    for entry, trigger in iter_preset_file(path):
+        if entry.uuid == uuid:
+            return entry, trigger
+    return None
+
+
+def resolve_preset_path(path: str) -> str:
+    """Return the absolute path of a preset file, expanding '~'."""
+    return os.path.abspath(os.path.expanduser(path))
+
+
+class PresetIndexCache:
+    """Indexes of recently used preset files, rebuilt when a file changes."""
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._indexes: OrderedDict[str, tuple[tuple[int, int], PresetIndex]] = (
+            OrderedDict()
+        )
+
+    async def get(self, path: str) -> PresetIndex:
+        """Return the index of a preset file, building it if needed.
+
+        Raises:
+            ValueError: If the file cannot be read or is not a preset
+        """
+        path = resolve_preset_path(path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise ValueError(f"Could not read preset file {path}: {e}") from e
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._lookup(path, version)
+        if cached is not None:
+            return cached
+
+        index = await asyncio.to_thread(build_preset_index, path)
+        self._indexes[path] = (version, index)
+        self._indexes.move_to_end(path)
+        while len(self._indexes) > self.max_entries:
+            self._indexes.popitem(last=False)
+        return index
+
+    def cached(self, path: str) -> PresetIndex | None:
+        """Return the index of a preset file if it is cached and unchanged."""
+        path = resolve_preset_path(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return self._lookup(path, (stat.st_mtime_ns, stat.st_size))
+
+    def _lookup(self, path: str, version: tuple[int, int]) -> PresetIndex | None:
+        cached = self._indexes.get(path)
+        if cached is None or cached[0] != version:
+            return None
+        self._indexes.move_to_end(path)
+        return cached[1]
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+# Shared cache used by the preset tools
+preset_indexes = PresetIndexCache()
@@ -0,0 +1,435 @@
+"""
+In-memory index of the BTT reference documentation.
+
+The markdown files in docs/btt are read and split into a tree of sections
+once. Section lookups by heading pattern are resolved against that tree
+and cached, so answering a reference query does no file I/O and no
+line-by-line scanning.
+
+Each section is further split into blocks (paragraphs, list items, table
+rows and code blocks), which are indexed for full-text search with BM25
+ranking. Identifiers are kept whole as well as split into their parts, so
+'paste_text' and 'BTTNowPlaying' match exactly while 'paste' or 'playing'
+still find them.
+
+Every file and section carries a SHA-256 hash of its text, so clients
+reading them as MCP resources can tell when their cached copy is stale.
+"""
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+from btt_mcp.config import DOCS_DIR
+
+# Map of doc files to load
+DOC_FILES = {
+    "triggers": "btt_trigger_docs.md",
+    "cli": "btt_cli_docs.md",
+    "variables": "btt_vars_docs.md",
+    "actions": "btt_cli_actions_docs.md",
+}
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+_FENCE = re.compile(r"^(```|~~~)")
+_LIST_ITEM = re.compile(r"^([-*+]|\d+\.)\s")
+_TABLE_SEPARATOR = re.compile(r"^\|[\s:|-]+\|$")
+_WORD = re.compile(r"[A-Za-z0-9_]+")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_SLUG_SEPARATOR = re.compile(r"[^a-z0-9]+")
+_CAMEL_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Longest heading slug used in section IDs
+MAX_SLUG_LENGTH = 40
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+@dataclass(eq=False)
+class DocSection:
+    """A heading and everything up to the next heading of equal or higher level."""
+
+    file_key: str
+    heading: str
+    title: str
+    level: int
+    start: int
+    end: int = 0
+    content: str = ""
+    parent: "DocSection | None" = field(default=None, repr=False)
+    children: list["DocSection"] = field(default_factory=list, repr=False)
+    # Stable ID, e.g. 'cli/variables/special-writable-number-variables'
+    id: str = ""
+    sha256: str = ""
+
+
+@dataclass
+class DocBlock:
+    """A paragraph, list item, table row or code block of a section."""
+
+    section: DocSection
+    kind: Literal["paragraph", "item", "row", "code"]
+    line: int
+    text: str
+    # Header and separator lines of the table a row belongs to
+    table_header: str = ""
+
+
+@dataclass
+class ReferenceDoc:
+    """A parsed documentation file."""
+
+    file_key: str
+    path: Path
+    text: str
+    sections: list[DocSection] = field(default_factory=list)
+    blocks: list[DocBlock] = field(default_factory=list)
+    sha256: str = ""
+
+
+@dataclass
+class SearchHit:
+    """A block matching a search, with its BM25 score."""
+
+    block: DocBlock
+    score: float
+
+
+def content_hash(text: str) -> str:
+    """Return the hex SHA-256 of text encoded as UTF-8."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _term(word: str) -> str:
+    # Plural 's' is dropped so 'keys' finds 'Key Flags'
+    word = word.lower()
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase search terms.
+
+    Identifiers are kept whole and also split at underscores and case
+    changes, e.g. 'BTTNowPlaying' gives 'bttnowplaying', 'btt', 'now' and
+    'playing'. A plural 's' is dropped.
+    """
+    tokens = []
+    # Markdown escapes such as 'selected\\_text' are not part of the word
+    for word in _WORD.findall(text.replace("\\", "")):
+        tokens.append(_term(word))
+        parts = [
+            _term(part)
+            for piece in word.split("_")
+            for part in _CAMEL_PART.findall(piece)
+        ]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def _strip_front_matter(lines: list[str]) -> int:
+    """Return the index of the first line after a leading '---' block."""
+    if not lines or lines[0].strip() != "---":
+        return 0
+    for i in range(1, len(lines)):
+        if lines[i].strip() == "---":
+            return i + 1
+    return 0
+
+
+def slugify(title: str) -> str:
+    """Return a short URL-safe slug of a heading.
+
+    Only link text and the part before a colon are used ('Named Trigger:
+    643' gives 'named-trigger'), cut to MAX_SLUG_LENGTH at a word break.
+    """
+    title = _LINK.sub(r"\1", title).split(":")[0]
+    slug = _SLUG_SEPARATOR.sub("-", title.lower()).strip("-")
+    if len(slug) > MAX_SLUG_LENGTH:
+        slug = slug[: MAX_SLUG_LENGTH + 1].rsplit("-", 1)[0]
+    return slug
+
+
+def _section_id(section: DocSection, used: set[str]) -> str:
+    # Document titles (level 1) are left out of their subsections' IDs
+    slugs = []
+    current: DocSection | None = section
+    while current is not None:
+        if current.level > 1 or current is section:
+            slugs.append(slugify(current.title) or "section")
+        current = current.parent
+    base = "/".join([section.file_key, *reversed(slugs)])
+    section_id, n = base, 1
+    while section_id in used:
+        n += 1
+        section_id = f"{base}-{n}"
+    used.add(section_id)
+    return section_id
+
+
+def parse_sections(file_key: str, text: str) -> list[DocSection]:
+    """Split markdown into sections, in document order.
+
+    Headings inside fenced code blocks are ignored. Each section's content
+    runs from its heading to the next heading of equal or higher level, so
+    it includes its subsections. Each section gets an ID made of the file
+    key and the slugs of its headings.
+    """
+    lines = text.split("\n")
+    sections: list[DocSection] = []
+    open_sections: list[DocSection] = []
+    used_ids: set[str] = set()
+    in_fence = False
+
+    def close(section: DocSection, end: int) -> None:
+        section.end = end
+        section.content = "\n".join(lines[section.start : end]).strip()
+        section.sha256 = content_hash(section.content)
+
+    for i in range(_strip_front_matter(lines), len(lines)):
+        stripped = lines[i].strip()
+        if _FENCE.match(stripped):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else _HEADING.match(stripped)
+        if match is None:
+            continue
+        level = len(match.group(1))
+        while open_sections and open_sections[-1].level >= level:
+            close(open_sections.pop(), i)
+        section = DocSection(file_key, stripped, match.group(2), level, i)
+        if open_sections:
+            section.parent = open_sections[-1]
+            section.parent.children.append(section)
+        section.id = _section_id(section, used_ids)
+        open_sections.append(section)
+        sections.append(section)
+
+    for section in open_sections:
+        close(section, len(lines))
+    return sections
+
+
+def parse_blocks(sections: list[DocSection], text: str) -> list[DocBlock]:
+    """Split the text of each section, excluding subsections, into blocks."""
+    lines = text.split("\n")
+    blocks: list[DocBlock] = []
+    for section in sections:
+        end = section.children[0].start if section.children else section.end
+        i = section.start + 1
+        while i < end:
+            stripped = lines[i].strip()
+            if not stripped:
+                i += 1
+                continue
+            start = i
+            if _FENCE.match(stripped):
+                i += 1
+                while i < end and not _FENCE.match(lines[i].strip()):
+                    i += 1
+                i = min(i + 1, end)
+                kind = "code"
+            elif stripped.startswith("|"):
+                # A table: its header and separator give context to each row
+                header_end = start
+                if i + 1 < end and _TABLE_SEPARATOR.match(lines[i + 1].strip()):
+                    header_end = i + 2
+                header = "\n".join(lines[start:header_end])
+                i = header_end
+                while i < end and lines[i].strip().startswith("|"):
+                    blocks.append(DocBlock(section, "row", i, lines[i].strip(), header))
+                    i += 1
+                continue
+            elif _LIST_ITEM.match(stripped):
+                i += 1
+                while i < end and lines[i].startswith((" ", "\t")) and lines[i].strip():
+                    i += 1
+                kind = "item"
+            else:
+                i += 1
+                while i < end:
+                    line = lines[i].strip()
+                    if not line or line.startswith("|") or _LIST_ITEM.match(line):
+                        break
+                    if _FENCE.match(line):
+                        break
+                    i += 1
+                kind = "paragraph"
+            block_text = "\n".join(lines[start:i]).strip()
+            blocks.append(DocBlock(section, kind, start, block_text))
+    return blocks
+
+
+class ReferenceIndex:
+    """The reference docs, parsed once into sections."""
+
+    def __init__(
+        self, docs_dir: Path = DOCS_DIR, doc_files: dict[str, str] = DOC_FILES
+    ):
+        self.docs_dir = Path(docs_dir)
+        self.doc_files = doc_files
+        self.docs: dict[str, ReferenceDoc] = {}
+        self.sections: dict[str, DocSection] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._patterns: dict[str, re.Pattern[str]] = {}
+        self._found: dict[tuple[str, str], DocSection | None] = {}
+        # Search index: blocks, their lengths, and term -> [(block, count)]
+        self.blocks: list[DocBlock] = []
+        self._lengths: list[int] = []
+        self._average_length = 0.0
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        # Blocks of each section, including those of its subsections
+        self._section_blocks: dict[DocSection, list[int]] = {}
+
+    def _doc_paths(self) -> dict[str, Path]:
+        """Return the doc files by key: the known files, then any other *.md."""
+        paths = {key: self.docs_dir / name for key, name in self.doc_files.items()}
+        known = set(self.doc_files.values())
+        if self.docs_dir.is_dir():
+            for path in sorted(self.docs_dir.glob("*.md")):
+                if path.name not in known:
+                    paths.setdefault(path.stem, path)
+        return paths
+
+    def load(self) -> None:
+        """Read, parse and index the doc files, once. Missing files are skipped."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for file_key, path in self._doc_paths().items():
+                try:
+                    text = path.read_text(encoding="utf-8")
+                except OSError:
+                    continue
+                sections = parse_sections(file_key, text)
+                self.docs[file_key] = ReferenceDoc(
+                    file_key,
+                    path,
+                    text,
+                    sections,
+                    parse_blocks(sections, text),
+                    content_hash(text),
+                )
+                self.sections.update((section.id, section) for section in sections)
+            self._build_search_index()
+            self._loaded = True
+
+    def _build_search_index(self) -> None:
+        self.blocks = [block for doc in self.docs.values() for block in doc.blocks]
+        self._lengths = []
+        self._postings = {}
+        self._section_blocks = {}
+        for position, block in enumerate(self.blocks):
+            section: DocSection | None = block.section
+            while section is not None:
+                self._section_blocks.setdefault(section, []).append(position)
+                section = section.parent
+            # Headings describe every block under them
+            terms = Counter(tokenize(block.text))
+            terms.update(tokenize(block.section.title))
+            self._lengths.append(sum(terms.values()))
+            for term, count in terms.items():
+                self._postings.setdefault(term, []).append((position, count))
+        self._average_length = (
+            sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        )
+
+    def search(
+        self, query: str, limit: int = 8, boost: Iterable[DocSection] = ()
+    ) -> list[SearchHit]:
+        """Rank blocks against a query with BM25.
+
+        Args:
+            query: Free text
+            limit: Maximum number of hits
+            boost: Sections whose blocks (and their subsections' blocks) are
+                ranked as if they half-matched the best hit, so they are
+                found even when the query uses none of their words
+
+        Returns:
+            Best hits first; ties keep document order
+        """
+        self.load()
+        scores: dict[int, float] = {}
+        total = len(self.blocks)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, count in postings:
+                norm = (
+                    1
+                    - BM25_B
+                    + BM25_B * self._lengths[position] / (self._average_length or 1)
+                )
+                scores[position] = scores.get(position, 0.0) + idf * (
+                    count * (BM25_K1 + 1) / (count + BM25_K1 * norm)
+                )
+
+        boosted = {
+            position
+            for section in boost
+            for position in self._section_blocks.get(section, ())
+        }
+        if boosted:
+            bonus = max(scores.values(), default=2.0) / 2
+            for position in boosted:
+                scores[position] = scores.get(position, 0.0) + bonus
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [SearchHit(self.blocks[i], score) for i, score in ranked[:limit]]
+
+    def find(self, file_key: str, heading_pattern: str) -> DocSection | None:
+        """Return the first section of a file whose heading matches a pattern.
+
+        The pattern is matched against the stripped heading line, e.g.
+        '## Colors'. Results are cached per (file, pattern).
+        """
+        key = (file_key, heading_pattern)
+        if key in self._found:
+            return self._found[key]
+
+        self.load()
+        pattern = self._patterns.get(heading_pattern)
+        if pattern is None:
+            pattern = self._patterns[heading_pattern] = re.compile(heading_pattern)
+        doc = self.docs.get(file_key)
+        section = None
+        if doc is not None:
+            section = next((s for s in doc.sections if pattern.match(s.heading)), None)
+        self._found[key] = section
+        return section
+
+    def get_section(self, section_id: str) -> DocSection | None:
+        """Return a section by its ID."""
+        self.load()
+        return self.sections.get(section_id)
+
+    def clear(self) -> None:
+        """Forget the parsed docs; they are read again on next use."""
+        with self._lock:
+            self.docs = {}
+            self.sections = {}
+            self._found = {}
+            self.blocks = []
+            self._postings = {}
+            self._section_blocks = {}
+            self._loaded = False
+
+
+# Shared index used by the reference tool
+reference_index = ReferenceIndex()
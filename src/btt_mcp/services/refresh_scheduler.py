@@ -0,0 +1,233 @@
+"""
+Periodic refresh of script widgets.
+
+Widgets are registered with a refresh interval and kept in a heap ordered
+by their next due time. Each widget starts at a random phase and every
+interval is jittered, so widgets with the same interval do not all fire at
+once. The latency of refresh_widget requests is tracked as a moving
+average; while it is above the threshold, low-priority refreshes are shed
+and normal ones are delayed, so BTT gets room to catch up. To keep
+measuring, a widget is never shed or delayed twice in a row.
+"""
+
+import asyncio
+import heapq
+import random
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from btt_mcp.client import btt_request
+from btt_mcp.config import (
+    get_widget_refresh_jitter,
+    get_widget_refresh_latency_threshold,
+)
+from btt_mcp.models.common import BTTConnectionConfig
+
+PRIORITIES = ("high", "normal", "low")
+
+# Weight of the newest latency sample in the moving average
+LATENCY_SMOOTHING = 0.3
+
+# Maximum number of refresh requests in flight
+MAX_CONCURRENT_REFRESHES = 4
+
+
+@dataclass
+class ScheduledRefresh:
+    """A widget refreshed on an interval, with its observed behaviour."""
+
+    uuid: str
+    interval: float
+    priority: str
+    config: BTTConnectionConfig
+    next_due: float = 0.0
+    generation: int = 0
+    runs: int = 0
+    shed: int = 0
+    delayed: int = 0
+    errors: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    total_lag: float = 0.0
+    last_latency: float = 0.0
+    in_flight: bool = False
+    backed_off: bool = False
+
+    @property
+    def mean_lag(self) -> float:
+        return self.total_lag / self.runs if self.runs else 0.0
+
+
+class RefreshScheduler:
+    """Heap-based scheduler for periodic refresh_widget calls."""
+
+    def __init__(
+        self,
+        latency_threshold: float = 0.5,
+        jitter: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        self.latency_threshold = latency_threshold
+        self.jitter = jitter
+        self.latency = 0.0
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._entries: dict[str, ScheduledRefresh] = {}
+        # (due, sequence, uuid, generation); stale generations are skipped
+        self._heap: list[tuple[float, int, str, int]] = []
+        self._sequence = 0
+        # Never reused, so items left in the heap by an unregistered widget
+        # stay stale when the same UUID is registered again
+        self._generation = 0
+        self._wake = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REFRESHES)
+        self._task: asyncio.Task | None = None
+        self._requests: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def overloaded(self) -> bool:
+        return self.latency > self.latency_threshold
+
+    def entries(self) -> list[ScheduledRefresh]:
+        """Return scheduled widgets ordered by next due time."""
+        return sorted(self._entries.values(), key=lambda entry: entry.next_due)
+
+    def register(
+        self,
+        uuid: str,
+        interval: float,
+        priority: str = "normal",
+        config: BTTConnectionConfig | None = None,
+    ) -> ScheduledRefresh:
+        """Schedule a widget refresh, replacing any existing schedule."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}")
+        self._generation += 1
+        entry = ScheduledRefresh(
+            uuid,
+            interval,
+            priority,
+            config or BTTConnectionConfig(),
+            generation=self._generation,
+        )
+        self._entries[uuid] = entry
+        # Random initial phase spreads widgets registered together
+        self._push(entry, self._clock() + self._rng.uniform(0, interval))
+
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wake.set()
+        return entry
+
+    def unregister(self, uuid: str) -> bool:
+        """Stop refreshing a widget. Returns False if it was not scheduled."""
+        return self._entries.pop(uuid, None) is not None
+
+    def _push(self, entry: ScheduledRefresh, due: float) -> None:
+        entry.next_due = due
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, entry.uuid, entry.generation))
+
+    def _reschedule(self, entry: ScheduledRefresh, due: float, now: float) -> None:
+        spread = entry.interval * self.jitter
+        next_due = due + entry.interval + self._rng.uniform(-spread, spread)
+        # After a long stall, continue from now instead of catching up
+        self._push(entry, max(next_due, now))
+
+    async def _run(self) -> None:
+        while self._heap:
+            due, _, uuid, generation = self._heap[0]
+            entry = self._entries.get(uuid)
+            if entry is None or entry.generation != generation:
+                heapq.heappop(self._heap)
+                continue
+
+            delay = due - self._clock()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            self._dispatch(entry, due)
+
+    def _dispatch(self, entry: ScheduledRefresh, due: float) -> None:
+        now = self._clock()
+
+        if self.overloaded and not entry.backed_off:
+            if entry.priority == "low":
+                entry.shed += 1
+                entry.backed_off = True
+                self._reschedule(entry, due, now)
+                return
+            if entry.priority == "normal":
+                entry.delayed += 1
+                entry.backed_off = True
+                self._push(entry, now + min(self.latency, entry.interval))
+                return
+
+        if entry.in_flight:
+            # The previous refresh has not finished yet
+            entry.shed += 1
+            self._reschedule(entry, due, now)
+            return
+
+        lag = now - due
+        entry.backed_off = False
+        entry.last_lag = lag
+        entry.max_lag = max(entry.max_lag, lag)
+        entry.total_lag += lag
+        entry.runs += 1
+        entry.in_flight = True
+        self._reschedule(entry, due, now)
+
+        task = asyncio.get_running_loop().create_task(self._refresh(entry))
+        self._requests.add(task)
+        task.add_done_callback(self._requests.discard)
+
+    async def _refresh(self, entry: ScheduledRefresh) -> None:
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                result = await btt_request(
+                    "refresh_widget", {"uuid": entry.uuid}, entry.config
+                )
+                latency = time.perf_counter() - started
+            entry.last_latency = latency
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+            if result.startswith("Error:"):
+                entry.errors += 1
+        except Exception as e:  # noqa: BLE001 - runs in a background task
+            entry.errors += 1
+            print(f"Refreshing widget {entry.uuid} failed: {e}", file=sys.stderr)
+        finally:
+            entry.in_flight = False
+
+    async def stop(self) -> None:
+        """Stop the scheduler and drop all scheduled widgets."""
+        self._entries.clear()
+        self._heap.clear()
+        tasks = list(self._requests)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Shared scheduler used by the widget tools
+refresh_scheduler = RefreshScheduler(
+    latency_threshold=get_widget_refresh_latency_threshold(),
+    jitter=get_widget_refresh_jitter(),
+)
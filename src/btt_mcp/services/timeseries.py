@@ -0,0 +1,256 @@
+"""
+Sampled time series of numeric BTT variables.
+
+A background task reads numeric variables (OutputVolume, BTTIdleTime, ...)
+in one concurrent batch per tick and appends each reading to a fixed-size
+ring buffer backed by ``array('d')``. Memory is allocated once per variable
+and stays constant however long the sampler runs; the oldest samples are
+overwritten. Statistics (min, max, mean, percentiles, change points) are
+computed on demand over any trailing window.
+"""
+
+import asyncio
+import bisect
+import statistics
+import sys
+import time
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from btt_mcp.config import (
+    get_timeseries_capacity,
+    get_timeseries_interval,
+    get_timeseries_variables,
+)
+from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.services.variables import get_variables
+
+# Upper bound on the number of sampled variables, keeps memory bounded
+MAX_SERIES = 32
+
+# A step counts as a change point when it exceeds this many times the
+# median absolute step of the window
+CHANGE_POINT_FACTOR = 3.0
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of (timestamp, value) samples."""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def samples(self, since: float | None = None) -> tuple[array, array]:
+        """Return (timestamps, values) in chronological order.
+
+        Args:
+            since: Only return samples taken at or after this timestamp
+        """
+        start = (self._next - self._count) % self.capacity
+        if start + self._count <= self.capacity:
+            times = self._times[start : start + self._count]
+            values = self._values[start : start + self._count]
+        else:
+            times = self._times[start:] + self._times[: self._next]
+            values = self._values[start:] + self._values[: self._next]
+
+        if since is not None:
+            first = bisect.bisect_left(times, since)
+            times, values = times[first:], values[first:]
+        return times, values
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Return the p-th percentile (0-100) using linear interpolation."""
+    if not sorted_values:
+        raise ValueError("percentile of empty data")
+    rank = (len(sorted_values) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    low, high = sorted_values[lower], sorted_values[upper]
+    return low + (high - low) * (rank - lower)
+
+
+@dataclass
+class ChangePoint:
+    """A step between consecutive samples that stands out from the rest."""
+
+    timestamp: float
+    before: float
+    after: float
+
+
+@dataclass
+class SeriesStats:
+    """Statistics over a window of samples."""
+
+    count: int
+    first_timestamp: float
+    last_timestamp: float
+    last: float
+    min: float
+    max: float
+    mean: float
+    percentiles: dict[float, float] = field(default_factory=dict)
+    change_points: list[ChangePoint] = field(default_factory=list)
+
+
+def compute_stats(
+    times: array,
+    values: array,
+    percentiles: list[float],
+    min_change: float = 0.0,
+) -> SeriesStats | None:
+    """Compute window statistics, or None if the window is empty.
+
+    A change point is a step larger than both ``min_change`` and
+    CHANGE_POINT_FACTOR times the median absolute step, so steady drift
+    (such as BTTIdleTime counting up) is ignored while resets and level
+    shifts are reported.
+    """
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    steps = [abs(b - a) for a, b in zip(values, values[1:])]
+    threshold = min_change
+    if steps:
+        threshold = max(threshold, CHANGE_POINT_FACTOR * statistics.median(steps))
+    change_points = [
+        ChangePoint(times[i + 1], values[i], values[i + 1])
+        for i, step in enumerate(steps)
+        if step > threshold
+    ]
+
+    return SeriesStats(
+        count=len(values),
+        first_timestamp=times[0],
+        last_timestamp=times[-1],
+        last=values[-1],
+        min=ordered[0],
+        max=ordered[-1],
+        mean=statistics.fmean(values),
+        percentiles={p: percentile(ordered, p) for p in percentiles},
+        change_points=change_points,
+    )
+
+
+class TimeSeriesSampler:
+    """Sample numeric variables on an interval into per-variable ring buffers."""
+
+    def __init__(
+        self,
+        variables: list[str],
+        interval: float = 5.0,
+        capacity: int = 720,
+        config: BTTConnectionConfig | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.interval = interval
+        self.capacity = capacity
+        self.errors = 0
+        self.ticks = 0
+        self._config = config
+        self._clock = clock
+        self._series: dict[str, RingBuffer] = {}
+        self._task: asyncio.Task | None = None
+        for name in variables:
+            self.track(name)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def variables(self) -> list[str]:
+        return list(self._series)
+
+    def track(self, name: str) -> bool:
+        """Start sampling a variable. Returns False if the limit is reached."""
+        if name in self._series:
+            return True
+        if len(self._series) >= MAX_SERIES:
+            return False
+        self._series[name] = RingBuffer(self.capacity)
+        return True
+
+    def series(self, name: str) -> RingBuffer | None:
+        return self._series.get(name)
+
+    async def sample_once(self) -> int:
+        """Read every tracked variable once.
+
+        Returns:
+            Number of samples recorded
+        """
+        names = list(self._series)
+        if not names:
+            return 0
+        config = self._config or BTTConnectionConfig()
+        values = await get_variables(
+            [(name, "number") for name in names], config, use_cache=False
+        )
+        now = self._clock()
+
+        recorded = 0
+        for name in names:
+            try:
+                value = float(values[(name, "number")])
+            except ValueError:
+                # Error message or a variable BTT does not know
+                self.errors += 1
+                continue
+            self._series[name].append(now, value)
+            recorded += 1
+        self.ticks += 1
+        return recorded
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await self.sample_once()
+            except Exception as e:  # noqa: BLE001 - keep sampling
+                self.errors += 1
+                print(f"Time series sampler tick failed: {e}", file=sys.stderr)
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, self.interval - elapsed))
+
+    async def start(self) -> None:
+        """Start the background sampling task if it is not running."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background sampling task. Collected samples are kept."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Shared sampler used by btt_variable_stats
+timeseries_sampler = TimeSeriesSampler(
+    get_timeseries_variables(),
+    interval=get_timeseries_interval(),
+    capacity=get_timeseries_capacity(),
+)
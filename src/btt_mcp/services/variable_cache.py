@@ -0,0 +1,173 @@
+"""
+Read-through cache for BTT variable values.
+
+Each variable gets a time-to-live from its volatility class:
+
+- volatile: values BTT computes on the fly (idle time, active window, volume,
+  now playing, ...). Not cached by default.
+- static: everything else, i.e. user-defined variables that only change when
+  written. Cached for a long time and invalidated when set through this server.
+
+TTLs for individual variables or name patterns can be overridden in the
+config file (see config.get_variable_ttl_overrides).
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+
+from btt_mcp.config import (
+    VOLATILE_VARIABLE_PATTERNS,
+    get_static_variable_ttl,
+    get_variable_cache_enabled,
+    get_variable_ttl_overrides,
+    get_volatile_variable_ttl,
+)
+
+# (host, port, variable name, variable type)
+CacheKey = tuple[str, int, str, str]
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how the cache has been used."""
+
+    hits: int = 0
+    misses: int = 0
+    uncached: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class VariableCache:
+    """TTL cache for variable reads with per-variable policies."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        static_ttl: float = 60.0,
+        volatile_ttl: float = 0.0,
+        volatile_patterns: list[str] | None = None,
+        ttl_overrides: dict[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = enabled
+        self.static_ttl = static_ttl
+        self.volatile_ttl = volatile_ttl
+        self.volatile_patterns = list(volatile_patterns or [])
+        self.ttl_overrides = dict(ttl_overrides or {})
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: dict[CacheKey, tuple[str, float]] = {}
+        self._in_flight: dict[CacheKey, asyncio.Future[str]] = {}
+
+    def volatility(self, name: str) -> str:
+        """Return 'volatile' or 'static' for a variable name."""
+        for pattern in self.volatile_patterns:
+            if fnmatchcase(name, pattern):
+                return "volatile"
+        return "static"
+
+    def ttl_for(self, name: str) -> float:
+        """Return the TTL in seconds for a variable (0 means never cached)."""
+        if name in self.ttl_overrides:
+            return self.ttl_overrides[name]
+        for pattern, ttl in self.ttl_overrides.items():
+            if fnmatchcase(name, pattern):
+                return ttl
+        if self.volatility(name) == "volatile":
+            return self.volatile_ttl
+        return self.static_ttl
+
+    async def get(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Return a cached value or fetch and cache it.
+
+        Concurrent misses for the same key share one request. Error
+        responses are returned but never cached.
+
+        Args:
+            key: Cache key (host, port, name, type)
+            fetch: Coroutine function that reads the value from BTT
+
+        Returns:
+            Variable value or error message
+        """
+        ttl = self.ttl_for(key[2]) if self.enabled else 0.0
+        if ttl <= 0:
+            self.stats.uncached += 1
+            return await fetch()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > self._clock():
+            self.stats.hits += 1
+            return entry[0]
+
+        self.stats.misses += 1
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve the exception so waiters-less futures do not warn
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            # Only store if no write invalidated the key while fetching
+            if self._in_flight.get(key) is future and not value.startswith("Error:"):
+                self._entries[key] = (value, self._clock() + ttl)
+            return value
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def invalidate(self, host: str, port: int, name: str) -> None:
+        """Drop cached values of a variable (of any type) after a write."""
+        for key in [k for k in self._entries if k[:3] == (host, port, name)]:
+            del self._entries[key]
+        # Reads already in flight may return the old value; do not cache them
+        for key in [k for k in self._in_flight if k[:3] == (host, port, name)]:
+            del self._in_flight[key]
+        self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all cached values."""
+        self._entries.clear()
+
+    def reset_stats(self) -> None:
+        """Reset hit/miss counters."""
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        now = self._clock()
+        return sum(1 for _, expires in self._entries.values() if expires > now)
+
+
+def _create_default_cache() -> VariableCache:
+    """Create the shared cache from the config file settings."""
+    return VariableCache(
+        enabled=get_variable_cache_enabled(),
+        static_ttl=get_static_variable_ttl(),
+        volatile_ttl=get_volatile_variable_ttl(),
+        volatile_patterns=VOLATILE_VARIABLE_PATTERNS,
+        ttl_overrides=get_variable_ttl_overrides(),
+    )
+
+
+# Shared cache used by all variable reads
+variable_cache = _create_default_cache()
@@ -0,0 +1,129 @@
+"""
+Registry of BTT variables seen by the server.
+
+BTT has no API to list variables, so the server records the name, type and
+persistence of every variable it reads or writes. BTT's built-in volatile
+variables (idle time, active window, now playing, ...) are not recorded:
+they are read-only or computed on the fly, so they do not belong in
+snapshots. The registry is the basis for exporting and restoring sets of
+variables. It is kept in memory and
+saved to ``variables.json`` in the config directory on shutdown and after
+exports and imports.
+"""
+
+import fnmatch
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from btt_mcp.config import VARIABLE_REGISTRY_FILE, VOLATILE_VARIABLE_PATTERNS
+
+
+@dataclass
+class TrackedVariable:
+    """A variable the server has read or written."""
+
+    name: str
+    variable_type: str = "string"
+    # None until the variable has been written through the server
+    persistent: bool | None = None
+
+
+class VariableRegistry:
+    """Names, types and persistence of variables seen by the server."""
+
+    def __init__(
+        self, path: Path | None = None, ignored_patterns: list[str] | None = None
+    ):
+        self.path = path
+        self.ignored_patterns = list(ignored_patterns or [])
+        self._variables: dict[str, TrackedVariable] = {}
+        self._dirty = False
+        self._loaded = False
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._variables)
+
+    def ignores(self, name: str) -> bool:
+        """Return whether a variable matches one of the ignored patterns."""
+        return any(fnmatch.fnmatchcase(name, p) for p in self.ignored_patterns)
+
+    def record(
+        self, name: str, variable_type: str, persistent: bool | None = None
+    ) -> None:
+        """Record that a variable was read (persistent=None) or written."""
+        if self.ignores(name):
+            return
+        self._ensure_loaded()
+        tracked = self._variables.get(name)
+        if tracked is None:
+            self._variables[name] = TrackedVariable(name, variable_type, persistent)
+            self._dirty = True
+            return
+        if tracked.variable_type != variable_type:
+            tracked.variable_type = variable_type
+            self._dirty = True
+        if persistent is not None and tracked.persistent != persistent:
+            tracked.persistent = persistent
+            self._dirty = True
+
+    def select(
+        self, patterns: list[str] | None = None, persistent_only: bool = False
+    ) -> list[TrackedVariable]:
+        """Return tracked variables matching any of the glob patterns, by name.
+
+        persistent_only skips variables known to be runtime-only; variables
+        that have only been read (persistence unknown) are kept.
+        """
+        self._ensure_loaded()
+        selected = []
+        for name in sorted(self._variables):
+            tracked = self._variables[name]
+            if persistent_only and tracked.persistent is False:
+                continue
+            if patterns and not any(fnmatch.fnmatchcase(name, p) for p in patterns):
+                continue
+            selected.append(tracked)
+        return selected
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        for entry in data.get("variables", []):
+            try:
+                tracked = TrackedVariable(**entry)
+            except TypeError:
+                continue
+            if not self.ignores(tracked.name):
+                self._variables.setdefault(tracked.name, tracked)
+
+    def save(self) -> None:
+        """Write the registry to disk if it changed."""
+        if self.path is None or not self._dirty:
+            return
+        data = {"variables": [asdict(v) for v in self.select()]}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(data, indent=2))
+            self._dirty = False
+        except OSError as e:
+            print(f"Could not save variable registry: {e}", file=sys.stderr)
+
+    async def close(self) -> None:
+        """Save the registry; registered as a shutdown hook."""
+        self.save()
+
+
+# Shared registry fed by every variable read and write
+variable_registry = VariableRegistry(
+    VARIABLE_REGISTRY_FILE, ignored_patterns=VOLATILE_VARIABLE_PATTERNS
+)
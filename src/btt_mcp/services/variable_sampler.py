@@ -0,0 +1,179 @@
+"""
+Variable subscriptions backed by a single background sampler.
+
+Clients subscribe to BTT variables exposed as MCP resources
+(btt://variables/{variable_type}/{name}). One background task polls every
+subscribed variable in a single concurrent batch per tick and sends
+``notifications/resources/updated`` to the subscribers of each variable
+whose value changed. The cost per tick depends on the number of distinct
+variables, not on the number of subscribers.
+"""
+
+import asyncio
+import sys
+import time
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from pydantic import AnyUrl
+
+from btt_mcp.config import get_variable_poll_interval
+from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.services.variables import get_variables
+
+VARIABLE_URI_PREFIX = "btt://variables/"
+
+# (variable name, variable type)
+VariableKey = tuple[str, str]
+
+
+class Subscriber(Protocol):
+    """Anything that can receive resource update notifications.
+
+    ServerSession satisfies this protocol.
+    """
+
+    async def send_resource_updated(self, uri: AnyUrl) -> None: ...
+
+
+def variable_uri(name: str, variable_type: str = "string") -> str:
+    """Return the resource URI for a BTT variable."""
+    return f"{VARIABLE_URI_PREFIX}{variable_type}/{urllib.parse.quote(name, safe='')}"
+
+
+def parse_variable_uri(uri: str) -> VariableKey | None:
+    """Return (name, variable_type) for a variable resource URI, or None."""
+    if not uri.startswith(VARIABLE_URI_PREFIX):
+        return None
+    variable_type, _, name = uri[len(VARIABLE_URI_PREFIX) :].partition("/")
+    if variable_type not in ("string", "number") or not name or "/" in name:
+        return None
+    return urllib.parse.unquote(name), variable_type
+
+
+@dataclass
+class SamplerStats:
+    """Counters describing the sampler's work."""
+
+    ticks: int = 0
+    reads: int = 0
+    changes: int = 0
+    notifications: int = 0
+    last_tick_seconds: float = 0.0
+
+
+class VariableSampler:
+    """Poll subscribed variables in one batch per tick and notify on change."""
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        config: BTTConnectionConfig | None = None,
+    ):
+        self.interval = interval
+        self.stats = SamplerStats()
+        self._config = config
+        self._subscribers: dict[VariableKey, set[Any]] = {}
+        self._last_values: dict[VariableKey, str] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscriptions(self) -> dict[VariableKey, int]:
+        """Return the number of subscribers per subscribed variable."""
+        return {key: len(sessions) for key, sessions in self._subscribers.items()}
+
+    def last_value(self, key: VariableKey) -> str | None:
+        """Return the last sampled value of a subscribed variable."""
+        return self._last_values.get(key)
+
+    def subscribe(self, key: VariableKey, subscriber: Subscriber) -> None:
+        """Subscribe to changes of a variable and start sampling if needed."""
+        self._subscribers.setdefault(key, set()).add(subscriber)
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def unsubscribe(self, key: VariableKey, subscriber: Subscriber) -> None:
+        """Remove a subscription. Sampling stops when none are left."""
+        sessions = self._subscribers.get(key)
+        if sessions is None:
+            return
+        sessions.discard(subscriber)
+        if not sessions:
+            del self._subscribers[key]
+            self._last_values.pop(key, None)
+
+    def remove_subscriber(self, subscriber: Subscriber) -> None:
+        """Drop every subscription of a subscriber (e.g. a closed session)."""
+        for key in list(self._subscribers):
+            self.unsubscribe(key, subscriber)
+
+    async def sample_once(self) -> list[VariableKey]:
+        """Read all subscribed variables once and notify about changes.
+
+        Returns:
+            Keys of the variables whose value changed
+        """
+        keys = list(self._subscribers)
+        if not keys:
+            return []
+
+        config = self._config or BTTConnectionConfig()
+        values = await get_variables(keys, config, use_cache=False)
+        self.stats.reads += len(keys)
+
+        changed = []
+        for key in keys:
+            value = values[key]
+            if value.startswith("Error:"):
+                continue
+            previous = self._last_values.get(key)
+            self._last_values[key] = value
+            # The first reading only establishes the baseline
+            if previous is not None and previous != value:
+                changed.append(key)
+
+        self.stats.changes += len(changed)
+        for key in changed:
+            await self._notify(key)
+        return changed
+
+    async def _notify(self, key: VariableKey) -> None:
+        uri = AnyUrl(variable_uri(*key))
+        for subscriber in list(self._subscribers.get(key, ())):
+            try:
+                await subscriber.send_resource_updated(uri)
+                self.stats.notifications += 1
+            except Exception:  # noqa: BLE001 - session went away
+                self.remove_subscriber(subscriber)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            started = time.monotonic()
+            try:
+                await self.sample_once()
+            except Exception as e:  # noqa: BLE001 - keep sampling
+                print(f"Variable sampler tick failed: {e}", file=sys.stderr)
+            elapsed = time.monotonic() - started
+            self.stats.ticks += 1
+            self.stats.last_tick_seconds = elapsed
+            await asyncio.sleep(max(0.0, self.interval - elapsed))
+
+    async def stop(self) -> None:
+        """Stop the background task and drop all subscriptions."""
+        self._subscribers.clear()
+        self._last_values.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Shared sampler used by the variable resources
+variable_sampler = VariableSampler(interval=get_variable_poll_interval())
@@ -0,0 +1,159 @@
+"""
+Shared access to BTT variables.
+
+All variable reads and writes go through this module so single reads, batch
+reads and other services use the same endpoint selection, the shared
+read-through cache, and invalidate it consistently on writes.
+"""
+
+import asyncio
+
+from btt_mcp.client import btt_request
+from btt_mcp.config import MAX_BATCH_CONCURRENCY
+from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.services.variable_cache import variable_cache
+from btt_mcp.services.variable_registry import variable_registry
+from btt_mcp.services.write_behind import write_buffer
+
+
+def get_endpoint(variable_type: str) -> str:
+    """Return the BTT endpoint that reads a variable of the given type."""
+    if variable_type == "string":
+        return "get_string_variable"
+    return "get_number_variable"
+
+
+def set_endpoint(variable_type: str, persistent: bool) -> str:
+    """Return the BTT endpoint that writes a variable of the given type."""
+    kind = "string" if variable_type == "string" else "number"
+    prefix = "set_persistent" if persistent else "set"
+    return f"{prefix}_{kind}_variable"
+
+
+async def get_variable(
+    name: str,
+    variable_type: str,
+    config: BTTConnectionConfig,
+    use_cache: bool = True,
+) -> str:
+    """Read a single BTT variable.
+
+    Args:
+        name: Variable name
+        variable_type: 'string' or 'number'
+        config: BTT connection configuration
+        use_cache: Serve the value from the variable cache if still fresh
+
+    Returns:
+        Raw value from BTT, or error message
+    """
+    # A buffered write that has not reached BTT yet is the current value
+    pending = write_buffer.pending_value(config, name)
+    if pending is not None:
+        return pending
+
+    async def fetch() -> str:
+        return await btt_request(
+            get_endpoint(variable_type), {"variableName": name}, config
+        )
+
+    if use_cache:
+        key = (config.host, config.port, name, variable_type)
+        result = await variable_cache.get(key, fetch)
+    else:
+        result = await fetch()
+
+    if not result.startswith("Error:"):
+        variable_registry.record(name, variable_type)
+    return result
+
+
+async def set_variable(
+    name: str,
+    value: str,
+    variable_type: str,
+    persistent: bool,
+    config: BTTConnectionConfig,
+) -> str:
+    """Write a BTT variable and invalidate its cached value.
+
+    Args:
+        name: Variable name
+        value: New value
+        variable_type: 'string' or 'number'
+        persistent: Whether the variable survives BTT restarts
+        config: BTT connection configuration
+
+    Returns:
+        Response from BTT, or error message
+    """
+    result = await btt_request(
+        set_endpoint(variable_type, persistent),
+        {"variableName": name, "to": value},
+        config,
+    )
+    # Invalidate after the write so reads racing with it cannot re-cache
+    # the old value; in-flight reads are discarded by invalidate()
+    variable_cache.invalidate(config.host, config.port, name)
+    if not result.startswith("Error:"):
+        variable_registry.record(name, variable_type, persistent)
+    return result
+
+
+async def get_variables(
+    variables: list[tuple[str, str]],
+    config: BTTConnectionConfig,
+    max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    use_cache: bool = True,
+) -> dict[tuple[str, str], str]:
+    """Read several BTT variables concurrently.
+
+    Duplicate (name, type) pairs are fetched once.
+
+    Args:
+        variables: List of (name, variable_type) pairs
+        config: BTT connection configuration
+        max_concurrency: Maximum number of requests in flight
+        use_cache: Serve values from the variable cache if still fresh
+
+    Returns:
+        Mapping of (name, variable_type) to raw value or error message
+    """
+    unique = list(dict.fromkeys(variables))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(name: str, variable_type: str) -> str:
+        async with semaphore:
+            return await get_variable(name, variable_type, config, use_cache)
+
+    values = await asyncio.gather(*(fetch(name, kind) for name, kind in unique))
+    return dict(zip(unique, values))
+
+
+async def set_variables(
+    writes: list[tuple[str, str, str, bool]],
+    config: BTTConnectionConfig,
+    max_concurrency: int = MAX_BATCH_CONCURRENCY,
+) -> dict[str, str]:
+    """Write several BTT variables concurrently.
+
+    Buffered write-behind values of the same variables are dropped, so
+    they cannot overwrite these writes later.
+
+    Args:
+        writes: List of (name, value, variable_type, persistent) tuples
+        config: BTT connection configuration
+        max_concurrency: Maximum number of requests in flight
+
+    Returns:
+        Mapping of variable name to BTT response or error message
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def send(name: str, value: str, variable_type: str, persistent: bool):
+        await write_buffer.discard(config, name)
+        async with semaphore:
+            return await set_variable(name, value, variable_type, persistent, config)
+
+    results = await asyncio.gather(*(send(*write) for write in writes))
+    return {write[0]: result for write, result in zip(writes, results)}
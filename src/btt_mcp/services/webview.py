@@ -0,0 +1,261 @@
+"""
+Incremental updates for floating menu webview items.
+
+BTT's webview_menu_item_load_html_url_js endpoint can either reload an item
+with new HTML or run JavaScript inside the already loaded page. This module
+remembers the last HTML pushed to each webview item and, when the new HTML
+only differs inside elements that carry an ``id`` (or inside ``<body>``),
+turns the change into a small JavaScript patch instead of a full reload.
+"""
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Literal, Optional
+
+# Elements that never have a closing tag and therefore no inner content
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+# Maximum number of webview items whose last HTML is remembered
+DEFAULT_MAX_ITEMS = 256
+
+# Patch target for <body>, which is addressed via document.body in JS
+BODY_TARGET: None = None
+
+# JS applied in the webview: each patch is [target, content, is_text]
+_PATCH_SCRIPT = (
+    "(function(){{var p={patches};for(var i=0;i<p.length;i++){{"
+    "var e=p[i][0]===null?document.body:document.getElementById(p[i][0]);"
+    "if(!e)continue;if(p[i][2]){{e.textContent=p[i][1];}}"
+    "else{{e.innerHTML=p[i][1];}}}}}})();"
+)
+
+
+@dataclass
+class _Anchor:
+    """An addressable element found in an HTML fragment."""
+
+    target: Optional[str]
+    inner_start: int
+    inner_end: int
+
+
+class _AnchorParser(HTMLParser):
+    """Collect the outermost addressable elements of an HTML fragment.
+
+    An element is addressable if it has an ``id`` attribute or is ``<body>``.
+    Elements nested inside another addressable element are not reported;
+    they are found when the parent's inner HTML is diffed in turn. The ids
+    of all elements, nested or not, are collected in ``ids``.
+    """
+
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=False)
+        self._line_offsets = [0]
+        for line in source.splitlines(keepends=True):
+            self._line_offsets.append(self._line_offsets[-1] + len(line))
+        # Stack of (tag, anchor-or-None) for open elements
+        self._stack: list[tuple[str, Optional[_Anchor]]] = []
+        self._open_anchors = 0
+        self.anchors: list[_Anchor] = []
+        self.ids: list[str] = []
+        self.malformed = False
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self._line_offsets[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        element_id = dict(attrs).get("id")
+        if element_id:
+            self.ids.append(element_id)
+        if tag in VOID_ELEMENTS:
+            return
+        anchor = None
+        if self._open_anchors == 0:
+            if element_id or tag == "body":
+                start = self._offset() + len(self.get_starttag_text() or "")
+                target = element_id if element_id else BODY_TARGET
+                anchor = _Anchor(target=target, inner_start=start, inner_end=-1)
+                self._open_anchors += 1
+        self._stack.append((tag, anchor))
+
+    def handle_endtag(self, tag):
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            # Stray end tag: browsers ignore it, but offsets are now suspect
+            self.malformed = True
+            return
+        end = self._offset()
+        while self._stack:
+            open_tag, anchor = self._stack.pop()
+            if anchor is not None:
+                self._open_anchors -= 1
+                if open_tag == tag:
+                    anchor.inner_end = end
+                    self.anchors.append(anchor)
+                else:
+                    # Implicitly closed anchor: span is ambiguous
+                    self.malformed = True
+            if open_tag == tag:
+                break
+
+    def close(self):
+        super().close()
+        if self._open_anchors:
+            self.malformed = True
+
+
+def _find_anchors(source: str) -> Optional[list[_Anchor]]:
+    """Return the outermost anchors of a fragment, or None if unusable."""
+    parser = _AnchorParser(source)
+    try:
+        parser.feed(source)
+        parser.close()
+    except AssertionError:
+        return None
+    if parser.malformed:
+        return None
+    targets = [anchor.target for anchor in parser.anchors]
+    if len(targets) != len(set(targets)) or len(parser.ids) != len(set(parser.ids)):
+        # Duplicate ids cannot be addressed unambiguously: getElementById
+        # returns the first match, wherever it is nested
+        return None
+    return sorted(parser.anchors, key=lambda anchor: anchor.inner_start)
+
+
+def _skeleton(source: str, anchors: list[_Anchor]) -> list[str]:
+    """Return the fragment with each anchor's inner HTML cut out."""
+    parts = []
+    position = 0
+    for anchor in anchors:
+        parts.append(source[position : anchor.inner_start])
+        position = anchor.inner_end
+    parts.append(source[position:])
+    return parts
+
+
+def diff_html(
+    old: str, new: str
+) -> Optional[list[tuple[Optional[str], str, bool]]]:
+    """Compute the element-level patches that turn ``old`` into ``new``.
+
+    Args:
+        old: HTML currently loaded in the webview
+        new: HTML that should be displayed
+
+    Returns:
+        List of (target, content, is_text) patches where target is an element
+        id (None for <body>), or None if the change is not confined to the
+        inner HTML of addressable elements.
+    """
+    old_anchors = _find_anchors(old)
+    new_anchors = _find_anchors(new)
+    if old_anchors is None or new_anchors is None:
+        return None
+    if [a.target for a in old_anchors] != [a.target for a in new_anchors]:
+        return None
+    if _skeleton(old, old_anchors) != _skeleton(new, new_anchors):
+        return None
+
+    patches: list[tuple[Optional[str], str, bool]] = []
+    for old_anchor, new_anchor in zip(old_anchors, new_anchors):
+        old_inner = old[old_anchor.inner_start : old_anchor.inner_end]
+        new_inner = new[new_anchor.inner_start : new_anchor.inner_end]
+        if old_inner == new_inner:
+            continue
+        nested = diff_html(old_inner, new_inner)
+        if nested:
+            patches.extend(nested)
+        elif "<" not in new_inner and "&" not in new_inner:
+            patches.append((new_anchor.target, new_inner, True))
+        else:
+            patches.append((new_anchor.target, new_inner, False))
+    return patches
+
+
+def build_patch_script(patches: list[tuple[Optional[str], str, bool]]) -> str:
+    """Render element patches as a self-contained JavaScript snippet."""
+    encoded = json.dumps(
+        [[target, content, int(is_text)] for target, content, is_text in patches],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return _PATCH_SCRIPT.format(patches=encoded)
+
+
+@dataclass
+class WebviewUpdate:
+    """What needs to be sent to BTT to display new webview HTML."""
+
+    kind: Literal["noop", "full", "patch"]
+    html: str
+    script: str = ""
+    patches: list[tuple[Optional[str], str, bool]] = field(default_factory=list)
+
+
+class WebviewPatcher:
+    """Track the last HTML per webview item and plan minimal updates."""
+
+    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS):
+        self.max_items = max_items
+        self._last_html: OrderedDict[str, str] = OrderedDict()
+
+    def plan(self, uuid: str, html: str, force_full: bool = False) -> WebviewUpdate:
+        """Decide how to bring a webview item from its last HTML to ``html``.
+
+        Args:
+            uuid: UUID of the webview menu item
+            html: New HTML for the item
+            force_full: Always reload the full HTML
+
+        Returns:
+            A WebviewUpdate describing the request to send
+        """
+        previous = self._last_html.get(uuid)
+        if force_full or previous is None:
+            return WebviewUpdate(kind="full", html=html)
+        if previous == html:
+            return WebviewUpdate(kind="noop", html=html)
+
+        patches = diff_html(previous, html)
+        if not patches:
+            return WebviewUpdate(kind="full", html=html)
+
+        script = build_patch_script(patches)
+        if len(script) >= len(html):
+            # Patch would not be smaller than simply reloading
+            return WebviewUpdate(kind="full", html=html)
+        return WebviewUpdate(kind="patch", html=html, script=script, patches=patches)
+
+    def commit(self, uuid: str, html: str) -> None:
+        """Record ``html`` as what is now displayed by the webview item."""
+        self._last_html[uuid] = html
+        self._last_html.move_to_end(uuid)
+        while len(self._last_html) > self.max_items:
+            self._last_html.popitem(last=False)
+
+    def forget(self, uuid: str) -> None:
+        """Drop the remembered HTML so the next update is a full reload."""
+        self._last_html.pop(uuid, None)
+
+
+# Shared instance used by the floating menu tools
+webview_patcher = WebviewPatcher()
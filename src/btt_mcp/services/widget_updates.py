@@ -0,0 +1,184 @@
+"""
+Rate-limited, coalescing widget updates.
+
+btt_update_widget used to send one request per call. When a widget is
+updated in a tight loop most of those updates are superseded before anyone
+sees them. The scheduler sends at most ``max_rate`` updates per second per
+widget: the first update goes out immediately, later ones within the rate
+window are merged into one pending update (the latest text, icon and color
+win) that is sent when the window ends.
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from btt_mcp.client import btt_request
+from btt_mcp.config import get_widget_max_updates_per_second
+from btt_mcp.models.common import BTTConnectionConfig
+
+# (host, port, widget uuid)
+WidgetKey = tuple[str, int, str]
+
+# Request parameters that set the widget icon; a new icon replaces both
+ICON_FIELDS = ("icon_path", "icon_data")
+
+
+@dataclass
+class WidgetUpdateStats:
+    """Counters describing scheduled widget updates."""
+
+    submitted: int = 0
+    sent: int = 0
+    merged: int = 0
+    dropped: int = 0
+    errors: int = 0
+    last_error: str | None = None
+
+
+@dataclass
+class _PendingUpdate:
+    endpoint: str
+    config: BTTConnectionConfig
+    # request parameter -> (value, index of the update that set it)
+    fields: dict[str, tuple[str, int]] = field(default_factory=dict)
+    updates: int = 0
+
+
+@dataclass
+class WidgetUpdateResult:
+    """Outcome of submitting an update.
+
+    ``status`` is 'sent' when the update was sent right away (``response``
+    holds BTT's answer) or 'queued' when it was merged into a pending update.
+    """
+
+    status: str
+    response: str = ""
+    delay: float = 0.0
+
+
+class WidgetUpdateScheduler:
+    """Merge widget updates per UUID and limit how often each is sent."""
+
+    def __init__(
+        self,
+        max_rate: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_rate = max_rate
+        self.stats = WidgetUpdateStats()
+        self._clock = clock
+        self._last_sent: dict[WidgetKey, float] = {}
+        self._pending: dict[WidgetKey, _PendingUpdate] = {}
+        self._timers: dict[WidgetKey, asyncio.Task] = {}
+
+    @property
+    def min_interval(self) -> float:
+        return 1.0 / self.max_rate if self.max_rate > 0 else 0.0
+
+    def pending(self) -> dict[WidgetKey, int]:
+        """Return the number of merged updates waiting per widget."""
+        return {key: update.updates for key, update in self._pending.items()}
+
+    async def submit(
+        self,
+        endpoint: str,
+        uuid: str,
+        request_params: dict[str, str],
+        config: BTTConnectionConfig,
+    ) -> WidgetUpdateResult:
+        """Send an update now or merge it into the widget's pending update.
+
+        Args:
+            endpoint: BTT endpoint for the widget type
+            uuid: Widget UUID
+            request_params: Update parameters without the uuid
+            config: BTT connection configuration
+        """
+        self.stats.submitted += 1
+        key = (config.host, config.port, uuid)
+        now = self._clock()
+        due = self._last_sent.get(key, float("-inf")) + self.min_interval
+
+        if key not in self._pending and now >= due:
+            self._last_sent[key] = now
+            response = await self._send(endpoint, uuid, request_params, config)
+            return WidgetUpdateResult("sent", response)
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingUpdate(endpoint, config)
+        pending.endpoint = endpoint
+        pending.config = config
+        if any(name in request_params for name in ICON_FIELDS):
+            for name in ICON_FIELDS:
+                pending.fields.pop(name, None)
+        for name, value in request_params.items():
+            pending.fields[name] = (value, pending.updates)
+        pending.updates += 1
+
+        if key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().create_task(
+                self._send_later(key, uuid, max(0.0, due - now))
+            )
+        return WidgetUpdateResult("queued", delay=max(0.0, due - now))
+
+    async def _send(
+        self,
+        endpoint: str,
+        uuid: str,
+        request_params: dict[str, str],
+        config: BTTConnectionConfig,
+    ) -> str:
+        response = await btt_request(
+            endpoint, {"uuid": uuid, **request_params}, config
+        )
+        if response.startswith("Error:"):
+            self.stats.errors += 1
+            self.stats.last_error = response
+        else:
+            self.stats.sent += 1
+        return response
+
+    async def _send_later(self, key: WidgetKey, uuid: str, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            # flush() may have replaced this timer with a new one by now
+            if self._timers.get(key) is asyncio.current_task():
+                del self._timers[key]
+        await self._send_pending(key, uuid)
+
+    async def _send_pending(self, key: WidgetKey, uuid: str) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        visible = {index for _, index in pending.fields.values()}
+        self.stats.merged += pending.updates - 1
+        self.stats.dropped += pending.updates - len(visible)
+        self._last_sent[key] = self._clock()
+        request_params = {name: value for name, (value, _) in pending.fields.items()}
+        try:
+            await self._send(pending.endpoint, uuid, request_params, pending.config)
+        except Exception as e:  # noqa: BLE001 - runs in a background task
+            self.stats.errors += 1
+            self.stats.last_error = str(e)
+            print(f"Widget update for {uuid} failed: {e}", file=sys.stderr)
+
+    async def flush(self) -> None:
+        """Send all pending updates now."""
+        timers = list(self._timers.values())
+        self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+        await asyncio.gather(*timers, return_exceptions=True)
+        await asyncio.gather(
+            *(self._send_pending(key, key[2]) for key in list(self._pending))
+        )
+
+
+# Shared scheduler used by the widget tools
+widget_scheduler = WidgetUpdateScheduler(max_rate=get_widget_max_updates_per_second())
@@ -0,0 +1,199 @@
+"""
+Write-behind buffering for high-frequency variable writes.
+
+When enabled, btt_set_variable does not wait for BTT. Writes are buffered
+per variable, only the latest value of each variable is kept, and the buffer
+is flushed concurrently on a short interval or as soon as it holds
+``max_pending`` distinct variables. Buffered values are visible to reads
+through this server immediately, and a direct write of a variable drops
+its buffered value. The buffer is always flushed on shutdown, and
+btt_flush_variables acts as a synchronous barrier.
+"""
+
+import asyncio
+import sys
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from btt_mcp.config import (
+    MAX_BATCH_CONCURRENCY,
+    get_write_behind_enabled,
+    get_write_behind_flush_interval,
+    get_write_behind_max_pending,
+)
+from btt_mcp.models.common import BTTConnectionConfig
+
+# (host, port, variable name)
+WriteKey = tuple[str, int, str]
+
+# Number of recent write errors kept for reporting
+MAX_RECENT_ERRORS = 20
+
+
+@dataclass
+class PendingWrite:
+    """Latest buffered value of a variable."""
+
+    value: str
+    variable_type: str
+    persistent: bool
+    config: BTTConnectionConfig
+
+
+@dataclass
+class WriteBehindStats:
+    """Counters describing buffered writes."""
+
+    enqueued: int = 0
+    coalesced: int = 0
+    sent: int = 0
+    failed: int = 0
+    flushes: int = 0
+    recent_errors: deque = field(
+        default_factory=lambda: deque(maxlen=MAX_RECENT_ERRORS)
+    )
+
+
+@dataclass
+class FlushResult:
+    """Outcome of a single flush."""
+
+    sent: int = 0
+    errors: list[tuple[str, str]] = field(default_factory=list)
+
+
+class VariableWriteBuffer:
+    """Coalescing write-behind buffer for BTT variable sets."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        flush_interval: float = 0.1,
+        max_pending: int = 100,
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+    ):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_concurrency = max_concurrency
+        self.stats = WriteBehindStats()
+        self._pending: OrderedDict[WriteKey, PendingWrite] = OrderedDict()
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def pending_value(self, config: BTTConnectionConfig, name: str) -> str | None:
+        """Return the buffered value of a variable that has not been sent yet."""
+        pending = self._pending.get((config.host, config.port, name))
+        return pending.value if pending is not None else None
+
+    async def discard(self, config: BTTConnectionConfig, name: str) -> bool:
+        """Drop the buffered value of a variable that is about to be written directly.
+
+        Also waits for a flush in progress, so a value it is still sending
+        cannot reach BTT after the direct write.
+
+        Returns:
+            True if a buffered value was dropped
+        """
+        dropped = self._pending.pop((config.host, config.port, name), None)
+        async with self._flush_lock:
+            pass
+        return dropped is not None
+
+    def enqueue(
+        self,
+        name: str,
+        value: str,
+        variable_type: str,
+        persistent: bool,
+        config: BTTConnectionConfig,
+    ) -> None:
+        """Buffer a write, replacing any pending value of the same variable."""
+        key = (config.host, config.port, name)
+        if key in self._pending:
+            self.stats.coalesced += 1
+        self._pending[key] = PendingWrite(value, variable_type, persistent, config)
+        self.stats.enqueued += 1
+
+        if len(self._pending) >= self.max_pending:
+            self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def flush(self) -> FlushResult:
+        """Send every buffered write and wait until BTT has answered.
+
+        Writes enqueued before this call are guaranteed to be sent when it
+        returns. Failed writes are reported and dropped.
+        """
+        # Imported here to avoid a cycle: variables reads pending values
+        from btt_mcp.services.variables import set_variable
+
+        async with self._flush_lock:
+            batch = self._pending
+            self._pending = OrderedDict()
+            result = FlushResult()
+            if not batch:
+                return result
+
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def send(key: WriteKey, write: PendingWrite) -> None:
+                try:
+                    async with semaphore:
+                        response = await set_variable(
+                            key[2],
+                            write.value,
+                            write.variable_type,
+                            write.persistent,
+                            write.config,
+                        )
+                except Exception as e:  # noqa: BLE001 - report like a BTT error
+                    response = f"Error: {type(e).__name__}: {e}"
+                if response.startswith("Error:"):
+                    result.errors.append((key[2], response))
+                else:
+                    result.sent += 1
+
+            await asyncio.gather(*(send(key, write) for key, write in batch.items()))
+
+            self.stats.flushes += 1
+            self.stats.sent += result.sent
+            self.stats.failed += len(result.errors)
+            self.stats.recent_errors.extend(result.errors)
+            return result
+
+    async def _run(self) -> None:
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:  # noqa: BLE001 - keep flushing later writes
+                print(f"Variable write-behind flush failed: {e}", file=sys.stderr)
+
+    async def close(self) -> None:
+        """Flush everything that is still buffered and stop the flusher."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush()
+
+
+# Shared buffer used by btt_set_variable
+write_buffer = VariableWriteBuffer(
+    enabled=get_write_behind_enabled(),
+    flush_interval=get_write_behind_flush_interval(),
+    max_pending=get_write_behind_max_pending(),
+)
@@ -0,0 +1,158 @@
+"""
+Startup profiler behind ``btt-mcp-server --profile-startup``.
+
+Runs a fresh interpreter with ``python -X importtime`` through the stages
+of the server's startup and reports how long each stage took, which
+packages the time went to and the slowest modules:
+
+- interpreter: Python's own startup (site, encodings)
+- server: importing btt_mcp.server, everything needed before the stdio
+  loop answers the first request
+- tools: importing the tool modules, which the server defers until the
+  first request that needs them
+"""
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# Stages in the order the profiled interpreter goes through them
+STAGES = {
+    "interpreter": "Python startup",
+    "server": "btt_mcp.server (before the stdio loop)",
+    "tools": "Tool modules (deferred to first use)",
+}
+
+# Printed to stderr between stages, among the -X importtime lines
+_STAGE_MARKER = "btt-mcp-profile-stage: "
+
+_PROFILE_SCRIPT = f"""
+import json, sys, time
+marker = {_STAGE_MARKER!r}
+times = {{}}
+print(marker + "server", file=sys.stderr, flush=True)
+started = time.perf_counter()
+import btt_mcp.server
+times["server"] = time.perf_counter() - started
+print(marker + "tools", file=sys.stderr, flush=True)
+started = time.perf_counter()
+import btt_mcp.tools
+times["tools"] = time.perf_counter() - started
+print(json.dumps(times))
+"""
+
+
+@dataclass
+class ImportTiming:
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    stage: str
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".")[0]
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse ``-X importtime`` lines, tagging each with its startup stage.
+
+    Lines that are not import times switch the stage when they are stage
+    markers and are ignored otherwise.
+    """
+    timings = []
+    stage = "interpreter"
+    for line in output.splitlines():
+        if line.startswith(_STAGE_MARKER):
+            stage = line[len(_STAGE_MARKER) :].strip()
+            continue
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        timings.append(
+            ImportTiming(module, int(fields[0]), int(fields[1]), depth, stage)
+        )
+    return timings
+
+
+def run_profile() -> tuple[dict[str, float], list[ImportTiming]]:
+    """Profile the startup stages in a fresh interpreter.
+
+    Returns:
+        Wall time of each stage in seconds, and the import timings
+
+    Raises:
+        RuntimeError: If the profiled interpreter fails
+    """
+    env = dict(os.environ)
+    source = str(Path(__file__).parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (source, env.get("PYTHONPATH")) if path
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROFILE_SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+        # '-c' puts the working directory first on sys.path; make sure it
+        # holds this package rather than something that shadows it
+        cwd=source,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    return json.loads(process.stdout), parse_importtime(process.stderr)
+
+
+def format_profile(
+    stage_times: dict[str, float], timings: list[ImportTiming], top: int = 15
+) -> str:
+    """Render the stage times, the packages and the slowest modules."""
+    lines = ["Startup profile (python -X importtime, fresh interpreter)", ""]
+    lines.append(f"{'Stage':44s} {'Imports':>8s} {'Import ms':>10s} {'Wall ms':>9s}")
+    for stage, label in STAGES.items():
+        in_stage = [t for t in timings if t.stage == stage]
+        imported = sum(t.self_us for t in in_stage) / 1000
+        wall = stage_times.get(stage)
+        wall_text = f"{wall * 1000:9.1f}" if wall is not None else f"{'':9s}"
+        lines.append(f"{label:44s} {len(in_stage):8d} {imported:10.1f} {wall_text}")
+
+    by_package: dict[tuple[str, str], list[ImportTiming]] = {}
+    for timing in timings:
+        by_package.setdefault((timing.package, timing.stage), []).append(timing)
+    packages = sorted(
+        by_package.items(), key=lambda item: -sum(t.self_us for t in item[1])
+    )
+    lines.extend(["", "Packages by import time (self time of their modules)"])
+    lines.append(f"{'Package':32s} {'Stage':12s} {'Modules':>8s} {'ms':>9s}")
+    for (package, stage), modules in packages[:top]:
+        total = sum(t.self_us for t in modules) / 1000
+        lines.append(f"{package:32s} {stage:12s} {len(modules):8d} {total:9.1f}")
+
+    lines.extend(["", "Slowest modules (self time)"])
+    lines.append(f"{'Module':48s} {'Stage':12s} {'Self ms':>9s} {'Cumul. ms':>10s}")
+    for timing in sorted(timings, key=lambda t: -t.self_us)[:top]:
+        lines.append(
+            f"{timing.module:48s} {timing.stage:12s} "
+            f"{timing.self_us / 1000:9.1f} {timing.cumulative_us / 1000:10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def profile_startup(top: int = 15) -> str:
+    """Profile the server's startup and return the report."""
+    try:
+        stage_times, timings = run_profile()
+    except RuntimeError as e:
+        return f"Error: Profiling failed: {e}"
+    return format_profile(stage_times, timings, top)
@@ -1,10 +1,24 @@
 """
-Action triggering tools.
+Action triggering tools and the catalog of action types.
 """
 
+import asyncio
+import json
+from dataclasses import asdict
+
 from btt_mcp.client import btt_request
-from btt_mcp.models import TriggerActionInput, TriggerNamedInput
-from btt_mcp.server import mcp
+from btt_mcp.formatters import format_action_hints
+from btt_mcp.models import (
+    ScanActionTypesInput,
+    TriggerActionInput,
+    TriggerNamedInput,
+)
+from btt_mcp.server import mcp, on_shutdown
+from btt_mcp.services.action_catalog import (
+    ScanResult,
+    action_catalog,
+    definition_actions,
+)
 
 
 @mcp.tool(
@@ -69,6 +83,94 @@ async def btt_trigger_action(params: TriggerActionInput) -> str:
     )
 
     if not result or result.strip() == "":
-        return "Action triggered successfully."
+        result = "Action triggered successfully."
+
+    notes = action_catalog.hints(definition_actions(params.action_json))
+    return result + format_action_hints(notes)
+
+
+def _format_scan(result: ScanResult) -> str:
+    lines = [
+        "## Action Type Catalog",
+        "",
+        f"**New actions:** {result.new_actions} | "
+        f"**New action types:** {len(result.new_types)} | "
+        f"**Action types known:** {len(action_catalog)}",
+    ]
+    if result.files_scanned or result.files_unchanged:
+        lines.append(
+            f"**Preset files scanned:** {result.files_scanned} "
+            f"({result.files_unchanged} unchanged, skipped)"
+        )
+    for error in result.errors:
+        lines.append(f"- {error}")
+    if result.new_types:
+        lines.extend(
+            ["", "| ID | Name | Seen | Usual parameters |", "|---|---|---|---|"]
+        )
+        for type_id in result.new_types:
+            action_type = action_catalog.get(type_id)
+            lines.append(
+                f"| {type_id} | {action_type.name} | {action_type.count} | "
+                f"{', '.join(action_type.common_keys)} |"
+            )
+    return "\n".join(lines)
 
-    return result
+
+@mcp.tool(
+    name="btt_scan_action_types",
+    annotations={
+        "title": "Scan Action Types",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_scan_action_types(params: ScanActionTypesInput) -> str:
+    """Add the action types used in BTT and in preset files to the catalog.
+
+    BTT does not publish its list of BTTPredefinedActionType IDs. The
+    catalog records each type's name, the parameter keys used with it and
+    an example action. Once scanned, btt_lookup_reference answers queries
+    such as "action 153" or an action's name from the catalog.
+
+    The catalog is also fed by btt_get_triggers and btt_get_trigger. Only
+    new actions and changed preset files add to it.
+
+    Args:
+        params: Preset files or directories, and whether to scan live triggers.
+
+    Returns:
+        Counts of new actions and types, and the new types.
+    """
+    result = ScanResult()
+    if params.preset_paths:
+        result = await asyncio.to_thread(
+            action_catalog.add_preset_files, params.preset_paths
+        )
+
+    if params.include_live:
+        response = await btt_request("get_triggers", {}, params.connection)
+        if response.startswith("Error:"):
+            return response
+        try:
+            triggers = json.loads(response)
+        except json.JSONDecodeError:
+            return f"Error parsing response: {response}"
+        live = action_catalog.add_triggers(
+            triggers if isinstance(triggers, list) else [triggers]
+        )
+        result.new_actions += live.new_actions
+        result.new_types = sorted({*result.new_types, *live.new_types})
+
+    action_catalog.save()
+
+    if params.response_format == "json":
+        data = asdict(result)
+        data["action_types"] = len(action_catalog)
+        return json.dumps(data, indent=2)
+    return _format_scan(result)
+
+
+on_shutdown(action_catalog.close)
@@ -2,9 +2,42 @@
 Clipboard management tools.
 """
 
+import json
+from datetime import datetime
+
 from btt_mcp.client import btt_request
-from btt_mcp.models import GetClipboardInput, SetClipboardInput
-from btt_mcp.server import mcp
+from btt_mcp.config import get_clipboard_watch_enabled
+from btt_mcp.models import (
+    BTTConnectionConfig,
+    GetClipboardFormatsInput,
+    GetClipboardHistoryEntryInput,
+    GetClipboardInput,
+    ListClipboardHistoryInput,
+    SetClipboardContentsInput,
+    SetClipboardInput,
+    WatchClipboardInput,
+)
+from btt_mcp.server import (
+    mcp,
+    on_shutdown,
+    on_startup,
+    register_subscription_handlers,
+)
+from btt_mcp.services.clipboard import (
+    get_clipboard,
+    get_clipboard_formats,
+    save_clipboard,
+    set_clipboard_contents,
+)
+from btt_mcp.services.clipboard_watcher import (
+    CLIPBOARD_LATEST_URI,
+    CLIPBOARD_URI_PREFIX,
+    ClipboardEntry,
+    clipboard_watcher,
+)
+
+# Characters of content shown per entry in the history listing
+PREVIEW_LENGTH = 60
 
 
 @mcp.tool(
@@ -21,21 +54,107 @@ async def btt_get_clipboard(params: GetClipboardInput) -> str:
     """Get the current clipboard content.
 
     Can retrieve content in various formats including plain text, HTML,
-    images (as base64), and more.
+    images (as base64), and more. With save_to_file the content is streamed
+    into a file instead, and only its path, size and SHA-256 are returned;
+    use this for images and large documents.
 
     Args:
-        params: Format to retrieve and whether to return as base64.
+        params: Format to retrieve, whether to return as base64 and whether
+            to save to a file.
 
     Returns:
-        Clipboard content.
+        Clipboard content, or details of the saved file.
     """
-    request_params = {
-        "format": params.format,
-        "asBase64": "true" if params.as_base64 else "false",
-    }
+    if not params.save_to_file:
+        return await get_clipboard(params.format, params.as_base64, params.connection)
+
+    try:
+        saved = await save_clipboard(
+            params.format, params.connection, params.directory
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+
+    return (
+        f"Clipboard content saved to `{saved.path}`\n\n"
+        f"- **Format:** {saved.format}\n"
+        f"- **Size:** {saved.size} bytes\n"
+        f"- **SHA-256:** {saved.sha256}"
+    )
+
+
+@mcp.tool(
+    name="btt_get_clipboard_formats",
+    annotations={
+        "title": "Get Clipboard Content in Several Formats",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_get_clipboard_formats(params: GetClipboardFormatsInput) -> str:
+    """Get the clipboard content in several formats with one call.
+
+    All formats are fetched concurrently, e.g. plain text, HTML and RTF
+    together instead of three btt_get_clipboard calls. Formats that are not
+    on the clipboard are returned empty.
+
+    Args:
+        params: Pasteboard types to fetch and whether to return base64.
+
+    Returns:
+        Content per format in markdown or JSON format.
+    """
+    contents = await get_clipboard_formats(
+        params.formats, params.as_base64, params.connection
+    )
+
+    if params.response_format == "json":
+        return json.dumps(contents, indent=2)
+
+    sections = []
+    for format, content in contents.items():
+        if content.startswith("Error:"):
+            body = content
+        elif not content:
+            body = "_Not on the clipboard._"
+        else:
+            body = f"```\n{content}\n```"
+        sections.append(f"### {format}\n\n{body}")
+    return "\n\n".join(sections)
+
+
+@mcp.tool(
+    name="btt_set_clipboard_contents",
+    annotations={
+        "title": "Set Clipboard Content in Several Formats",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_set_clipboard_contents(params: SetClipboardContentsInput) -> str:
+    """Put content in several formats on the clipboard with one request.
 
-    result = await btt_request("get_clipboard_content", request_params, params.connection)
-    return result
+    Use this to provide e.g. plain text and HTML versions of the same
+    content, so each app pastes the richest format it understands.
+
+    Args:
+        params: Content per pasteboard type.
+
+    Returns:
+        Confirmation of clipboard being set.
+    """
+    items = [(item.content, item.format) for item in params.items]
+    result = await set_clipboard_contents(items, params.connection)
+
+    if result.startswith("Error:"):
+        return result
+
+    formats = ", ".join(format for _, format in items)
+    return f"Clipboard content set in {len(items)} format(s): {formats}."
 
 
 @mcp.tool(
@@ -67,3 +186,191 @@ async def btt_set_clipboard(params: SetClipboardInput) -> str:
         return result
 
     return "Clipboard content set successfully."
+
+
+def _entry_data(entry: ClipboardEntry) -> dict:
+    return {
+        "id": entry.id,
+        "format": entry.format,
+        "size": entry.size,
+        "copies": entry.copies,
+        "first_seen": datetime.fromtimestamp(entry.first_seen).isoformat(),
+        "last_seen": datetime.fromtimestamp(entry.last_seen).isoformat(),
+        "stored": entry.content is not None,
+    }
+
+
+def _preview(entry: ClipboardEntry) -> str:
+    if entry.content is None:
+        return "_too large to keep_"
+    text = " ".join(entry.content.split())
+    if len(text) > PREVIEW_LENGTH:
+        text = text[: PREVIEW_LENGTH - 1] + "…"
+    return text.replace("|", "\\|")
+
+
+def _watcher_status() -> str:
+    state = "running" if clipboard_watcher.running else "stopped"
+    stats = clipboard_watcher.stats
+    return (
+        f"Watcher {state}, polling every {clipboard_watcher.interval:.2g}s "
+        f"({clipboard_watcher.min_interval:g}-{clipboard_watcher.max_interval:g}s); "
+        f"{stats.samples} sample(s), {stats.changes} change(s), "
+        f"{clipboard_watcher.subscriber_count} subscriber(s)."
+    )
+
+
+@mcp.tool(
+    name="btt_watch_clipboard",
+    annotations={
+        "title": "Watch Clipboard",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_watch_clipboard(params: WatchClipboardInput) -> str:
+    """Start or stop the background clipboard watcher.
+
+    The watcher polls the clipboard (quickly after a change, slower while it
+    stays the same) and keeps a history of distinct copied texts. Instead of
+    polling btt_get_clipboard, subscribe to the resource
+    btt://clipboard/latest to be notified when the clipboard changes;
+    subscribing also starts the watcher.
+
+    Args:
+        params: Whether to start or stop watching.
+
+    Returns:
+        Watcher status.
+    """
+    if params.enabled:
+        await clipboard_watcher.start(params.connection)
+    else:
+        await clipboard_watcher.stop()
+    return _watcher_status()
+
+
+@mcp.tool(
+    name="btt_list_clipboard_history",
+    annotations={
+        "title": "List Clipboard History",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_list_clipboard_history(params: ListClipboardHistoryInput) -> str:
+    """List texts copied while the clipboard watcher was running.
+
+    Each distinct text appears once; copying it again moves it to the top.
+
+    Args:
+        params: Maximum number of entries and response format.
+
+    Returns:
+        History entries with IDs, sizes and previews, most recent first.
+    """
+    entries = clipboard_watcher.history(params.limit)
+
+    if params.response_format == "json":
+        return json.dumps(
+            {
+                "running": clipboard_watcher.running,
+                "interval": clipboard_watcher.interval,
+                "entries": len(clipboard_watcher),
+                "total_bytes": clipboard_watcher.total_bytes,
+                "history": [_entry_data(entry) for entry in entries],
+            },
+            indent=2,
+        )
+
+    lines = ["## Clipboard History", f"\n{_watcher_status()}\n"]
+    if not entries:
+        lines.append("No entries yet. Start the watcher with btt_watch_clipboard.")
+        return "\n".join(lines)
+
+    lines.append("| ID | Last copied | Size | Copies | Preview |")
+    lines.append("|---|---|---|---|---|")
+    for entry in entries:
+        copied = datetime.fromtimestamp(entry.last_seen).strftime("%Y-%m-%d %H:%M:%S")
+        lines.append(
+            f"| {entry.id} | {copied} | {entry.size} B | {entry.copies} | "
+            f"{_preview(entry)} |"
+        )
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_get_clipboard_history_entry",
+    annotations={
+        "title": "Get Clipboard History Entry",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_get_clipboard_history_entry(
+    params: GetClipboardHistoryEntryInput,
+) -> str:
+    """Get the full content of a clipboard history entry.
+
+    Args:
+        params: Entry ID from btt_list_clipboard_history.
+
+    Returns:
+        The copied content.
+    """
+    entry = clipboard_watcher.get(params.entry_id)
+    if entry is None:
+        return f"Error: No clipboard history entry {params.entry_id}"
+    if entry.content is None:
+        return (
+            f"Error: Clipboard history entry {params.entry_id} ({entry.size} bytes) "
+            "was too large to keep"
+        )
+    return entry.content
+
+
+@mcp.resource(
+    CLIPBOARD_LATEST_URI,
+    name="btt_clipboard",
+    title="BTT Clipboard",
+    description=(
+        "Current plain-text clipboard content. Subscribe to receive "
+        "resources/updated notifications when the clipboard changes."
+    ),
+    mime_type="text/plain",
+)
+async def btt_clipboard_resource() -> str:
+    """Read the clipboard exposed as an MCP resource.
+
+    Concealed content (passwords) is excluded, as it is by the watcher.
+    """
+    return await get_clipboard(
+        clipboard_watcher.format,
+        False,
+        BTTConnectionConfig(),
+        exclude_concealed=True,
+    )
+
+
+async def _subscribe_clipboard(uri: str, session) -> None:
+    if uri != CLIPBOARD_LATEST_URI:
+        raise ValueError(f"Invalid BTT clipboard resource URI: {uri}")
+    clipboard_watcher.subscribe(session)
+
+
+async def _unsubscribe_clipboard(uri: str, session) -> None:
+    clipboard_watcher.unsubscribe(session)
+
+
+register_subscription_handlers(
+    CLIPBOARD_URI_PREFIX, _subscribe_clipboard, _unsubscribe_clipboard
+)
+if get_clipboard_watch_enabled():
+    on_startup(clipboard_watcher.start)
+on_shutdown(clipboard_watcher.stop)
@@ -5,22 +5,29 @@ These tools provide a higher-level interface for creating and managing
 floating menus compared to the raw trigger JSON approach.
 """
 
+import asyncio
 import json
+import time
 import uuid as uuid_lib
 
 from btt_mcp.client import btt_request
 from btt_mcp.formatters import format_floating_menu, format_floating_menus_list
 from btt_mcp.models.floating_menus import (
     AddFloatingMenuItemInput,
+    CloneMenuTemplateInput,
     CreateFloatingMenuInput,
     GetFloatingMenuInput,
     GetFloatingMenusInput,
     HideFloatingMenuInput,
+    ListMenuTemplatesInput,
+    RegisterMenuTemplateInput,
     ShowFloatingMenuInput,
     ToggleFloatingMenuInput,
     UpdateFloatingMenuInput,
+    UpdateWebviewMenuItemInput,
 )
 from btt_mcp.server import mcp
+from btt_mcp.services import menu_templates, webview_patcher
 
 # Floating menu trigger type ID
 FLOATING_MENU_TRIGGER_TYPE = 767
@@ -433,3 +440,239 @@ async def btt_toggle_floating_menu(params: ToggleFloatingMenuInput) -> str:
         return result
 
     return "Floating menu toggled."
+
+
+@mcp.tool(
+    name="btt_update_webview_menu_item",
+    annotations={
+        "title": "Update Webview Menu Item",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_update_webview_menu_item(params: UpdateWebviewMenuItemInput) -> str:
+    """Display new HTML in a floating menu webview item.
+
+    The last HTML pushed to each webview item is remembered. When the new
+    HTML only changes the content of elements with an id (or of <body>),
+    a small JavaScript patch is executed in the webview instead of
+    reloading the whole page, which keeps frequently updated status
+    webviews cheap.
+
+    Args:
+        params: Contains the webview item UUID and the HTML to display.
+
+    Returns:
+        Summary of what was sent to BTT.
+    """
+    update = webview_patcher.plan(
+        params.uuid, params.html, force_full=params.force_full_reload
+    )
+
+    if update.kind == "noop":
+        return f"Webview {params.uuid} already shows this HTML; nothing sent."
+
+    request_params = {"uuid": params.uuid}
+    if update.kind == "patch":
+        request_params["javascript_to_execute"] = update.script
+    else:
+        request_params["html_or_url"] = update.html
+
+    result = await btt_request(
+        "webview_menu_item_load_html_url_js", request_params, params.connection
+    )
+
+    if result.startswith("Error:"):
+        # The webview state is unknown now, so reload fully next time
+        webview_patcher.forget(params.uuid)
+        return result
+
+    webview_patcher.commit(params.uuid, params.html)
+
+    if update.kind == "patch":
+        return (
+            f"Webview {params.uuid} patched: {len(update.patches)} element(s), "
+            f"{len(update.script)} bytes of JS instead of "
+            f"{len(update.html)} bytes of HTML."
+        )
+    return f"Webview {params.uuid} reloaded with {len(update.html)} bytes of HTML."
+
+
+@mcp.tool(
+    name="btt_register_menu_template",
+    annotations={
+        "title": "Register Floating Menu Template",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_register_menu_template(params: RegisterMenuTemplateInput) -> str:
+    """Register a floating menu as a template for fast cloning.
+
+    The menu (from an existing menu UUID or from trigger JSON) and all of its
+    nested items are serialized once and kept in memory. Use
+    btt_clone_menu_template to stamp out copies with fresh UUIDs.
+
+    Args:
+        params: Template name and either a source menu UUID or menu JSON.
+
+    Returns:
+        Summary of the registered template, or error message.
+    """
+    if params.source_uuid:
+        result = await btt_request(
+            "get_trigger", {"uuid": params.source_uuid}, params.connection
+        )
+        if result.startswith("Error:"):
+            return result
+        source = result
+    elif params.menu_json:
+        source = params.menu_json
+    else:
+        return "Error: Provide either source_uuid or menu_json"
+
+    try:
+        trigger = json.loads(source)
+    except json.JSONDecodeError:
+        return f"Error parsing menu JSON: {source}"
+
+    if not isinstance(trigger, dict):
+        return "Error: Menu JSON must be a single floating menu object"
+
+    template = menu_templates.register(params.template_name, trigger)
+    return (
+        f"Registered template '{template.name}' with {template.item_count} "
+        f"top-level item(s) and {template.uuid_count} UUID(s) to reassign per clone."
+    )
+
+
+@mcp.tool(
+    name="btt_clone_menu_template",
+    annotations={
+        "title": "Clone Floating Menu Template",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": False,
+    },
+)
+async def btt_clone_menu_template(params: CloneMenuTemplateInput) -> str:
+    """Create floating menus from a registered template.
+
+    Each clone gets fresh UUIDs for the menu and all of its items, its own
+    name and optionally its own app bundle identifier. Clones are created
+    concurrently, one add_new_trigger request per menu.
+
+    Args:
+        params: Template name, clone names, per-clone apps and shared overrides.
+
+    Returns:
+        Created menu UUIDs, or error message.
+    """
+    template = menu_templates.get(params.template_name)
+    if template is None:
+        return f"Error: No menu template named '{params.template_name}'"
+
+    apps = params.app_bundle_identifiers
+    if apps is not None and len(apps) != len(params.names):
+        return "Error: app_bundle_identifiers must have one entry per name"
+
+    shared_overrides: dict = {}
+    if params.overrides_json:
+        try:
+            shared_overrides = json.loads(params.overrides_json)
+        except json.JSONDecodeError:
+            return "Error: Invalid overrides_json - must be a valid JSON object"
+        if not isinstance(shared_overrides, dict):
+            return "Error: Invalid overrides_json - must be a valid JSON object"
+
+    semaphore = asyncio.Semaphore(params.max_concurrency)
+
+    async def create_clone(index: int, name: str) -> tuple[str, str]:
+        overrides = {
+            **shared_overrides,
+            "BTTMenuName": name,
+            "BTTTriggerName": f"Floating Menu: {name}",
+        }
+        if apps is not None:
+            overrides["BTTAppBundleIdentifier"] = apps[index]
+        menu_uuid, trigger_json = template.render(overrides)
+
+        async with semaphore:
+            result = await btt_request(
+                "add_new_trigger", {"json": trigger_json}, params.connection
+            )
+
+        if result.startswith("Error:"):
+            return name, result
+        return name, result.strip() or menu_uuid
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(create_clone(index, name) for index, name in enumerate(params.names))
+    )
+    elapsed = time.perf_counter() - started
+
+    created = sum(1 for _, outcome in results if not outcome.startswith("Error:"))
+    lines = [
+        f"## Cloned template '{template.name}'",
+        f"\nCreated {created}/{len(results)} menu(s) in {elapsed:.2f}s:\n",
+    ]
+    for name, outcome in results:
+        if outcome.startswith("Error:"):
+            lines.append(f"- **{name}**: {outcome}")
+        else:
+            lines.append(f"- **{name}**: `{outcome}`")
+
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_list_menu_templates",
+    annotations={
+        "title": "List Floating Menu Templates",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_list_menu_templates(params: ListMenuTemplatesInput) -> str:
+    """List the floating menu templates registered in this server session.
+
+    Args:
+        params: Response format options.
+
+    Returns:
+        Registered templates in markdown or JSON format.
+    """
+    templates = menu_templates.list()
+
+    if params.response_format == "json":
+        return json.dumps(
+            [
+                {
+                    "name": template.name,
+                    "item_count": template.item_count,
+                    "uuid_count": template.uuid_count,
+                }
+                for template in templates
+            ],
+            indent=2,
+        )
+
+    if not templates:
+        return "## Menu Templates\n\nNo templates registered."
+
+    lines = ["## Menu Templates", f"\nFound {len(templates)} template(s):\n"]
+    for template in templates:
+        lines.append(f"- **{template.name}**")
+        lines.append(f"  - Items: {template.item_count}")
+        lines.append(f"  - UUIDs per clone: {template.uuid_count}")
+        lines.append("")
+
+    return "\n".join(lines)
@@ -2,18 +2,47 @@
 Preset, notification, and UI tools.
 """
 
+import asyncio
 import json
+import os
+import tempfile
+import time
+from dataclasses import asdict
 
 from btt_mcp.client import btt_request
-from btt_mcp.formatters import format_preset_details
+from btt_mcp.formatters import format_preset_details, format_trigger
 from btt_mcp.models import (
+    BackupPresetInput,
+    DiffPresetsInput,
     DisplayNotificationInput,
     ExportPresetInput,
     GetPresetDetailsInput,
+    GetPresetFileTriggerInput,
     ImportPresetInput,
+    ListPresetBackupsInput,
+    RestorePresetBackupInput,
     RevealElementInput,
+    SearchPresetFileInput,
+    StagePresetImportInput,
 )
 from btt_mcp.server import mcp
+from btt_mcp.services.preset_backups import preset_backups
+from btt_mcp.services.preset_diff import (
+    FieldChange,
+    TriggerChange,
+    diff_triggers,
+    iter_triggers,
+)
+from btt_mcp.services.preset_import import apply_import, plan_import
+from btt_mcp.services.preset_index import (
+    iter_preset_file,
+    load_preset_trigger,
+    preset_indexes,
+    resolve_preset_path,
+)
+
+# Characters shown per value in field-level changes
+DIFF_VALUE_LENGTH = 60
 
 
 @mcp.tool(
@@ -65,6 +94,9 @@ async def btt_export_preset(params: ExportPresetInput) -> str:
 async def btt_import_preset(params: ImportPresetInput) -> str:
     """Import a BTT preset from a file.
 
+    BTT loads the whole preset. To send only new and changed triggers, use
+    btt_stage_preset_import.
+
     Args:
         params: Path to the preset file.
 
@@ -119,6 +151,493 @@ async def btt_get_preset_details(params: GetPresetDetailsInput) -> str:
         return f"Error parsing response: {result}"
 
 
+@mcp.tool(
+    name="btt_search_preset_file",
+    annotations={
+        "title": "Search Preset File",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_search_preset_file(params: SearchPresetFileInput) -> str:
+    """Search the triggers of an exported preset file without BTT.
+
+    The file (compressed or not) is streamed once and indexed by trigger
+    UUID, class, app and name; the index is reused until the file changes.
+    Use btt_get_preset_file_trigger to inspect a trigger found here.
+
+    Args:
+        params: Preset file path and optional name, class and app filters.
+
+    Returns:
+        Matching triggers in markdown or JSON format.
+    """
+    try:
+        index = await preset_indexes.get(params.path)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    matches = index.search(params.query, params.trigger_class, params.app)
+    shown = matches[: params.limit]
+
+    if params.response_format == "json":
+        return json.dumps(
+            {
+                "path": index.path,
+                "name": index.name,
+                "uuid": index.uuid,
+                "total": len(index.triggers),
+                "matches": len(matches),
+                "triggers": [asdict(entry) for entry in shown],
+            },
+            indent=2,
+        )
+
+    lines = [
+        f"## Preset '{index.name or index.path}'",
+        f"\n**Path:** {index.path}",
+        f"**Triggers:** {len(index.triggers)} | **Matches:** {len(matches)}",
+    ]
+    if not matches:
+        lines.append("\nNo matching triggers.")
+        return "\n".join(lines)
+
+    lines.append("\n| Name | Class | App | UUID | Actions |")
+    lines.append("|---|---|---|---|---|")
+    for entry in shown:
+        name = entry.name or "Unnamed"
+        if not entry.enabled:
+            name += " (disabled)"
+        lines.append(
+            f"| {name} | {entry.trigger_class} | {entry.app_name} | "
+            f"`{entry.uuid}` | {entry.action_count} |"
+        )
+    if len(matches) > len(shown):
+        lines.append(f"\n{len(matches) - len(shown)} more; raise limit to see them.")
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_get_preset_file_trigger",
+    annotations={
+        "title": "Get Trigger from Preset File",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_get_preset_file_trigger(params: GetPresetFileTriggerInput) -> str:
+    """Read one trigger from an exported preset file without BTT.
+
+    The file is streamed until the trigger is found, holding one trigger in
+    memory at a time; no index is built. If the file has been searched with
+    btt_search_preset_file and not changed since, its index is used to
+    reject unknown UUIDs without reading the file.
+
+    Args:
+        params: Preset file path and trigger UUID.
+
+    Returns:
+        Trigger configuration in markdown or JSON format.
+    """
+    path = resolve_preset_path(params.path)
+    index = preset_indexes.cached(path)
+    if index is not None and params.uuid not in index.by_uuid:
+        return f"Error: Trigger {params.uuid} not found in {path}"
+    try:
+        found = await asyncio.to_thread(load_preset_trigger, path, params.uuid)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    if found is None:
+        return f"Error: Trigger {params.uuid} not found in {path}"
+    entry, trigger = found
+
+    if params.response_format == "json":
+        return json.dumps(trigger, indent=2)
+
+    return f"{format_trigger(trigger)}\n  - App: {entry.app_name}"
+
+
+def _diff_value(value) -> str:
+    text = json.dumps(value, ensure_ascii=False)
+    if len(text) > DIFF_VALUE_LENGTH:
+        text = text[: DIFF_VALUE_LENGTH - 1] + "…"
+    return text
+
+
+def _field_change_line(change: FieldChange) -> str:
+    if change.change == "added":
+        return f"  - `{change.path}` added: {_diff_value(change.new)}"
+    if change.change == "removed":
+        return f"  - `{change.path}` removed (was {_diff_value(change.old)})"
+    return f"  - `{change.path}`: {_diff_value(change.old)} → {_diff_value(change.new)}"
+
+
+def _trigger_change_line(change: TriggerChange) -> str:
+    details = ", ".join(filter(None, [change.trigger_class, change.app_name]))
+    line = f"- **{change.name or 'Unnamed'}** `{change.uuid}`"
+    return f"{line} ({details})" if details else line
+
+
+@mcp.tool(
+    name="btt_diff_presets",
+    annotations={
+        "title": "Diff Presets",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_diff_presets(params: DiffPresetsInput) -> str:
+    """Show what changed between two preset exports, or an export and BTT.
+
+    Triggers are matched by UUID, and triggers whose UUID changed are
+    matched by a hash of their content. Modified triggers list the changed
+    fields. Timestamps such as BTTLastUpdatedAt are ignored.
+
+    Args:
+        params: Old preset file, and new preset file or none for the live
+            configuration.
+
+    Returns:
+        Added, removed, modified and re-identified triggers in markdown or
+        JSON format.
+    """
+    old_path = resolve_preset_path(params.old_path)
+    if params.new_path:
+        new_path = resolve_preset_path(params.new_path)
+        new_label = new_path
+
+        def new_source():
+            return iter_preset_file(new_path)
+
+    else:
+        result = await btt_request("get_triggers", {}, params.connection)
+        if result.startswith("Error:"):
+            return result
+        try:
+            live = json.loads(result)
+        except json.JSONDecodeError:
+            return f"Error parsing response: {result}"
+        if not isinstance(live, list):
+            live = [live]
+        new_label = "live configuration"
+
+        def new_source():
+            return iter_triggers(live)
+
+    try:
+        diff = await asyncio.to_thread(
+            diff_triggers, lambda: iter_preset_file(old_path), new_source
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+
+    limit = params.max_changes
+    sections = {
+        "added": diff.added,
+        "removed": diff.removed,
+        "modified": diff.modified,
+        "uuid_changed": diff.uuid_changed,
+    }
+
+    if params.response_format == "json":
+        data = {
+            "old": old_path,
+            "new": new_label,
+            "old_count": diff.old_count,
+            "new_count": diff.new_count,
+            "unchanged": diff.unchanged,
+        }
+        for kind, changes in sections.items():
+            data[f"{kind}_count"] = len(changes)
+            data[kind] = [asdict(change) for change in changes[:limit]]
+        return json.dumps(data, indent=2, default=str)
+
+    lines = [
+        "## Preset Diff",
+        f"\n**Old:** {old_path} ({diff.old_count} triggers)",
+        f"**New:** {new_label} ({diff.new_count} triggers)",
+        f"\n**Added:** {len(diff.added)} | **Removed:** {len(diff.removed)} | "
+        f"**Modified:** {len(diff.modified)} | "
+        f"**UUID changed:** {len(diff.uuid_changed)} | "
+        f"**Unchanged:** {diff.unchanged}",
+    ]
+    if diff.identical:
+        lines.append("\nNo differences.")
+        return "\n".join(lines)
+
+    titles = {
+        "added": "Added",
+        "removed": "Removed",
+        "modified": "Modified",
+        "uuid_changed": "UUID Changed",
+    }
+    for kind, changes in sections.items():
+        if not changes:
+            continue
+        lines.append(f"\n### {titles[kind]} ({len(changes)})\n")
+        for change in changes[:limit]:
+            lines.append(_trigger_change_line(change))
+            if kind == "uuid_changed":
+                lines.append(f"  - was `{change.old_uuid}`")
+            lines.extend(_field_change_line(field) for field in change.fields)
+        if len(changes) > limit:
+            lines.append(f"- … {len(changes) - limit} more")
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_backup_preset",
+    annotations={
+        "title": "Back Up Preset",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": False,
+    },
+)
+async def btt_backup_preset(params: BackupPresetInput) -> str:
+    """Back up a preset into the local backup store.
+
+    Each trigger is stored once under the hash of its content, so backing
+    up a preset again only stores the triggers that changed.
+
+    Args:
+        params: Preset name to export from BTT, or an existing preset file.
+
+    Returns:
+        Backup ID and how much new data was stored.
+    """
+    if bool(params.name) == bool(params.path):
+        return "Error: Provide exactly one of name or path"
+
+    try:
+        if params.path:
+            path = resolve_preset_path(params.path)
+            summary = await asyncio.to_thread(preset_backups.backup_file, path)
+        else:
+            with tempfile.TemporaryDirectory(prefix="btt-backup-") as directory:
+                path = os.path.join(directory, "preset.bttpreset")
+                request_params = {
+                    "name": params.name,
+                    "outputPath": path,
+                    "compress": "0",
+                    "includeSettings": "1" if params.include_settings else "0",
+                }
+                result = await btt_request(
+                    "export_preset", request_params, params.connection
+                )
+                if result.startswith("Error:"):
+                    return result
+                summary = await asyncio.to_thread(
+                    preset_backups.backup_file, path, f"preset '{params.name}'"
+                )
+    except ValueError as e:
+        return f"Error: {e}"
+
+    return (
+        f"Backed up {summary.name or summary.source} as `{summary.id}`\n"
+        f"- Triggers: {summary.triggers}\n"
+        f"- New blobs: {summary.new_blobs} ({summary.new_bytes} bytes)"
+    )
+
+
+@mcp.tool(
+    name="btt_list_preset_backups",
+    annotations={
+        "title": "List Preset Backups",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_list_preset_backups(params: ListPresetBackupsInput) -> str:
+    """List preset backups, newest first.
+
+    Args:
+        params: Limit and output format.
+
+    Returns:
+        Backups in markdown or JSON format.
+    """
+    backups = await asyncio.to_thread(preset_backups.list_backups)
+    shown = backups[: params.limit]
+
+    if params.response_format == "json":
+        return json.dumps(
+            {
+                "directory": str(preset_backups.root),
+                "total": len(backups),
+                "backups": [asdict(summary) for summary in shown],
+            },
+            indent=2,
+        )
+
+    if not backups:
+        return f"No preset backups in {preset_backups.root}."
+
+    lines = [
+        "## Preset Backups",
+        f"\n**Directory:** {preset_backups.root} | **Total:** {len(backups)}",
+        "\n| ID | Created | Preset | Triggers | New Blobs |",
+        "|---|---|---|---|---|",
+    ]
+    for summary in shown:
+        lines.append(
+            f"| `{summary.id}` | {summary.created_at} | "
+            f"{summary.name or summary.source} | {summary.triggers} | "
+            f"{summary.new_blobs} |"
+        )
+    if len(backups) > len(shown):
+        lines.append(f"\n{len(backups) - len(shown)} more; raise limit to see them.")
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_restore_preset_backup",
+    annotations={
+        "title": "Restore Preset Backup",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": False,
+    },
+)
+async def btt_restore_preset_backup(params: RestorePresetBackupInput) -> str:
+    """Rebuild the preset file of a backup.
+
+    The file is written locally; use btt_import_preset to load it into BTT.
+
+    Args:
+        params: Backup ID, output path and whether to overwrite.
+
+    Returns:
+        Path of the restored preset file.
+    """
+    try:
+        count = await asyncio.to_thread(
+            preset_backups.restore,
+            params.backup_id,
+            params.output_path,
+            params.overwrite,
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+
+    return (
+        f"Restored backup `{params.backup_id}` ({count} triggers) "
+        f"to {params.output_path}"
+    )
+
+
+@mcp.tool(
+    name="btt_stage_preset_import",
+    annotations={
+        "title": "Import Preset Changes",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_stage_preset_import(params: StagePresetImportInput) -> str:
+    """Import only the new and changed triggers of a preset file.
+
+    The preset is validated locally and compared with the live triggers.
+    New triggers are added and changed triggers updated with concurrent
+    add_new_trigger and update_trigger requests, so a large preset with a
+    few changes imports without a full reload. Triggers that exist only in
+    BTT are left alone, and nothing is sent if validation fails.
+
+    Args:
+        params: Preset file, dry run flag and request concurrency.
+
+    Returns:
+        Validation problems, or the changes and their results, in markdown
+        or JSON format.
+    """
+    path = resolve_preset_path(params.path)
+    result = await btt_request("get_triggers", {}, params.connection)
+    if result.startswith("Error:"):
+        return result
+    try:
+        live = json.loads(result)
+    except json.JSONDecodeError:
+        return f"Error parsing response: {result}"
+    if not isinstance(live, list):
+        live = [live]
+
+    try:
+        plan = await asyncio.to_thread(plan_import, path, live)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    if plan.problems:
+        lines = [f"Error: {path} failed validation; nothing was imported."]
+        lines.extend(f"- {problem}" for problem in plan.problems[:20])
+        if len(plan.problems) > 20:
+            lines.append(f"- … {len(plan.problems) - 20} more")
+        return "\n".join(lines)
+
+    started = time.perf_counter()
+    if not params.dry_run:
+        await apply_import(plan, params.connection, params.max_concurrency)
+    elapsed = time.perf_counter() - started
+
+    diff = plan.diff
+    failed = [step for step in plan.steps if step.failed]
+    if params.response_format == "json":
+        return json.dumps(
+            {
+                "path": path,
+                "dry_run": params.dry_run,
+                "added": sum(1 for step in plan.steps if step.action == "add"),
+                "updated": sum(1 for step in plan.steps if step.action == "update"),
+                "failed": len(failed),
+                "unchanged": diff.unchanged,
+                "only_in_btt": len(diff.removed),
+                "uuid_changed": len(diff.uuid_changed),
+                "seconds": round(elapsed, 3),
+                "steps": [
+                    {k: v for k, v in asdict(step).items() if k != "params"}
+                    for step in plan.steps
+                ],
+            },
+            indent=2,
+        )
+
+    lines = [
+        f"## {'Planned' if params.dry_run else 'Staged'} Import of {path}",
+        f"\n**Changes:** {len(plan.steps)} | **Unchanged:** {diff.unchanged} | "
+        f"**Only in BTT:** {len(diff.removed)} (left alone) | "
+        f"**UUID changed:** {len(diff.uuid_changed)} (skipped)",
+    ]
+    if not plan.steps:
+        lines.append("\nBTT already matches the preset.")
+        return "\n".join(lines)
+
+    if not params.dry_run:
+        applied = len(plan.steps) - len(failed)
+        lines.append(f"\nApplied {applied}/{len(plan.steps)} in {elapsed:.2f}s.")
+    lines.append("")
+    for step in plan.steps:
+        details = ", ".join(filter(None, [step.trigger_class, step.app_name]))
+        line = f"- {step.action} **{step.name or 'Unnamed'}** `{step.uuid}`"
+        if details:
+            line += f" ({details})"
+        if step.failed:
+            line += f" — {step.result}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
 @mcp.tool(
     name="btt_display_notification",
     annotations={
@@ -2,25 +2,53 @@
 BTT documentation reference lookup tool.
 
 Provides access to BTT trigger, action, CLI, and variable documentation
-so the LLM can construct accurate JSON for trigger/action creation.
+so the LLM can construct accurate JSON for trigger/action creation. Each
+doc file and section is also exposed as an MCP resource.
 """
 
+import asyncio
+import functools
 import re
-from pathlib import Path
-from typing import Optional
+from dataclasses import asdict, replace
+from typing import Any, Optional
 
+from mcp.server.fastmcp.resources import TextResource
 from pydantic import BaseModel, ConfigDict, Field
 
-from btt_mcp.server import mcp
+from btt_mcp.formatters import format_action_type
+from btt_mcp.server import mcp, on_startup
+from btt_mcp.services.action_catalog import action_catalog
+from btt_mcp.services.reference_index import (
+    DocBlock,
+    DocSection,
+    ReferenceDoc,
+    SearchHit,
+    reference_index,
+)
+
+# Doc files are btt://docs/<file key>, sections btt://docs/<section ID>
+DOCS_URI_PREFIX = "btt://docs/"
+
+# Paragraphs, list items and table rows considered per lookup, and the
+# lowest score kept relative to the best match
+MAX_SEARCH_HITS = 40
+MIN_RELATIVE_SCORE = 0.25
+
+# Response size when neither max_chars nor max_tokens is given
+DEFAULT_MAX_CHARS = 4000
 
-DOCS_DIR = Path(__file__).parent.parent.parent.parent / "docs" / "btt"
+# Rough size of a token, used to turn max_tokens into characters
+CHARS_PER_TOKEN = 4
 
-# Map of doc files to load
-DOC_FILES = {
-    "triggers": "btt_trigger_docs.md",
-    "cli": "btt_cli_docs.md",
-    "variables": "btt_vars_docs.md",
-    "actions": "btt_cli_actions_docs.md",
+# Topics asking for action types in general, answered with the catalog
+_ACTION_TYPES_TOPIC = re.compile(r"\baction\s*(types?|ids?|list)\b", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+\b")
+
+SOURCE_LABELS = {
+    "triggers": "Trigger JSON Reference",
+    "cli": "CLI Command Reference",
+    "variables": "Variables Reference",
+    "actions": "Actions Reference",
 }
 
 # Section index: maps topic keywords to (file_key, section_heading) pairs.
@@ -31,133 +59,149 @@ SECTION_INDEX: list[tuple[list[str], str, str]] = [
     (
         ["trigger structure", "required fields", "basic trigger", "trigger json"],
         "triggers",
-        r"^# BetterTouchTool Trigger JSON Reference$",
+        r"^# BTT Trigger JSON Reference$",
     ),
     (
         ["named trigger", "reusable trigger", "named"],
         "triggers",
-        r"^### 3\.\s*Other Triggers",
+        r"^### Named Trigger",
     ),
     (
         ["keyboard shortcut", "keyboard", "shortcut", "hotkey", "key combo"],
         "triggers",
-        r"^### 4\.\s*Keyboard Shortcuts",
+        r"^## 4\.\s*Keyboard Shortcuts",
     ),
     (
         ["key sequence", "typed word", "key seq"],
         "triggers",
-        r"^### 5\.\s*Key Sequences",
+        r"^## 5\.\s*Key Sequences",
     ),
     (
         ["trackpad", "gesture", "swipe", "pinch", "tap"],
         "triggers",
-        r"^### 1\.\s*Trackpad Gestures",
+        r"^## 1\.\s*Trackpad Gestures",
     ),
     (
         ["magic mouse", "mouse gesture"],
         "triggers",
-        r"^### 2\.\s*Magic Mouse",
+        r"^## 2\.\s*Magic Mouse",
+    ),
+    (
+        ["other triggers", "automation", "app event", "window event", "system event"],
+        "triggers",
+        r"^## 3\.\s*Other Triggers",
     ),
     (
         ["touch bar", "touchbar"],
         "triggers",
-        r"^### 9\.\s*Touch Bar",
+        r"^## 9\.\s*Touch Bar",
     ),
     (
         ["stream deck", "streamdeck"],
         "triggers",
-        r"^### 10\.\s*Stream Deck",
+        r"^## 10\.\s*Stream Deck",
     ),
     (
         ["notch bar", "notchbar"],
         "triggers",
-        r"^### 11\.\s*Notch Bar",
+        r"^## 11\.\s*Notch Bar",
     ),
     (
         ["floating menu", "menu item"],
         "triggers",
-        r"^### 12\.\s*Floating Menu",
+        r"^## 12\.\s*Floating Menu",
     ),
     (
         ["midi"],
         "triggers",
-        r"^### 13\.\s*MIDI",
+        r"^## 13\.\s*MIDI",
     ),
     (
         ["siri remote", "apple tv remote"],
         "triggers",
-        r"^### 8\.\s*Siri Remote",
+        r"^## 8\.\s*Siri Remote",
     ),
     (
         ["drawing"],
         "triggers",
-        r"^### 6\.\s*Drawings",
+        r"^## 6\.\s*Drawings",
     ),
     (
         ["modifier", "modifier key", "command", "option", "control", "shift"],
         "triggers",
-        r"^### Modifier Keys",
+        r"^## Modifier Key Flags",
     ),
     (
-        ["color", "rgba", "icon", "sf symbol"],
+        ["color", "rgba"],
         "triggers",
-        r"^## Special Configurations",
+        r"^## Colors",
     ),
     (
-        ["example", "complete example", "sample"],
+        ["icon", "sf symbol"],
         "triggers",
-        r"^## Complete Examples",
+        r"^## Icons",
     ),
     (
-        ["tips", "best practice"],
+        ["example", "complete example", "sample", "optional fields"],
         "triggers",
-        r"^## Tips",
+        r"^## Required Structure",
     ),
     # CLI docs
     (
         ["cli", "socket", "bttcli", "command line"],
         "cli",
-        r"^## Overview",
+        r"^# BTT CLI / Socket Server Reference",
     ),
     (
         ["trigger_action", "trigger action", "execute action"],
         "cli",
-        r"^### 24\.\s*trigger_action",
+        r"^## Triggers & Actions",
     ),
     (
         ["trigger_named", "trigger named", "call named"],
         "cli",
-        r"^### 26\.\s*trigger_named",
+        r"^## Triggers & Actions",
     ),
     (
         ["add_new_trigger", "add trigger", "create trigger"],
         "cli",
-        r"^### 33\.\s*add_new_trigger",
+        r"^## Triggers & Actions",
     ),
     (
         ["update_trigger", "update trigger", "modify trigger"],
         "cli",
-        r"^### 36\.\s*update_trigger",
+        r"^## Triggers & Actions",
     ),
     (
         ["notification", "display_notification"],
         "cli",
-        r"^### 6\.\s*display_notification",
+        r"^## UI & Widgets",
     ),
     (
         ["clipboard", "paste"],
         "cli",
-        r"^### 2\.\s*get_clipboard_content",
+        r"^## Clipboard & Selection",
     ),
     (
-        ["variable", "set variable", "get variable", "string variable", "number variable"],
+        [
+            "variable",
+            "set variable",
+            "get variable",
+            "string variable",
+            "number variable",
+        ],
         "cli",
-        r"^### 12\.\s*set_persistent_string_variable",
+        r"^## Variables",
     ),
     (
         ["widget", "update widget", "touch bar widget", "stream deck widget"],
         "cli",
-        r"^### 40\.\s*refresh_widget",
+        r"^## UI & Widgets",
+    ),
+    (
+        ["preset", "import preset", "export preset"],
+        "cli",
+        r"^## Presets",
     ),
     # Variables docs
     (
@@ -170,62 +214,25 @@ SECTION_INDEX: list[tuple[list[str], str, str]] = [
         "variables",
         r"^## Advanced Trigger Condition Variables",
     ),
+    # Actions docs
+    (
+        ["action type", "action id", "predefined action"],
+        "actions",
+        r"^# BTT Predefined Action Types",
+    ),
 ]
 
 
-def _load_doc(file_key: str) -> str | None:
-    """Load a documentation file by key."""
-    filename = DOC_FILES.get(file_key)
-    if not filename:
-        return None
-    filepath = DOCS_DIR / filename
-    if not filepath.exists():
-        return None
-    return filepath.read_text(encoding="utf-8")
-
+@functools.lru_cache(maxsize=256)
+def _rank_topics(query_lower: str) -> tuple[tuple[str, str], ...]:
+    """Return (file_key, heading_pattern) of the best matching topics.
 
-def _extract_section(content: str, heading_pattern: str) -> str:
-    """Extract a section from markdown content starting at the given heading.
-
-    Returns content from the matched heading up to the next heading of equal
-    or higher level (fewer #'s), or end of file.
-    """
-    lines = content.split("\n")
-    start_idx = None
-    start_level = None
-
-    for i, line in enumerate(lines):
-        if start_idx is None:
-            if re.match(heading_pattern, line.strip()):
-                start_idx = i
-                # Determine heading level
-                stripped = line.strip()
-                start_level = len(stripped) - len(stripped.lstrip("#"))
-        else:
-            stripped = line.strip()
-            if stripped.startswith("#"):
-                level = len(stripped) - len(stripped.lstrip("#"))
-                if level <= start_level:
-                    return "\n".join(lines[start_idx:i]).strip()
-
-    if start_idx is not None:
-        return "\n".join(lines[start_idx:]).strip()
-
-    return ""
-
-
-def _search_sections(query: str) -> list[tuple[str, str]]:
-    """Find matching sections for a query.
-
-    Returns list of (section_heading, content) tuples.
+    SECTION_INDEX is fixed, so rankings are cached per query.
     """
-    query_lower = query.lower()
     query_words = set(query_lower.split())
-    results = []
-    seen_keys = set()
 
     # Score each section by keyword match
-    scored: list[tuple[int, list[str], str, str]] = []
+    scored: list[tuple[int, str, str]] = []
     for keywords, file_key, heading_pattern in SECTION_INDEX:
         # Exact phrase match in keywords gets highest score
         score = 0
@@ -237,24 +244,190 @@ def _search_sections(query: str) -> list[tuple[str, str]]:
             elif any(w in query_lower for w in kw.split()):
                 score += 1
         if score > 0:
-            scored.append((score, keywords, file_key, heading_pattern))
+            scored.append((score, file_key, heading_pattern))
 
     scored.sort(key=lambda x: x[0], reverse=True)
+    return tuple((file_key, pattern) for _score, file_key, pattern in scored[:3])
 
-    for _score, _kw, file_key, heading_pattern in scored[:3]:
-        dedup_key = f"{file_key}:{heading_pattern}"
-        if dedup_key in seen_keys:
-            continue
-        seen_keys.add(dedup_key)
 
-        content = _load_doc(file_key)
-        if not content:
-            continue
-        section = _extract_section(content, heading_pattern)
-        if section:
-            results.append((file_key, section))
+def _topic_sections(query: str) -> list[DocSection]:
+    """Return the sections of the curated topics that best match a query."""
+    sections: list[DocSection] = []
+    for file_key, heading_pattern in _rank_topics(query.lower()):
+        section = reference_index.find(file_key, heading_pattern)
+        # Several topics can resolve to the same section
+        if section is not None and section not in sections:
+            sections.append(section)
+    return sections
 
-    return results
+
+def _section_path(section: DocSection) -> str:
+    """Return 'Parent › Section', leaving out the document title."""
+    titles = []
+    current: DocSection | None = section
+    while current is not None:
+        if current.level > 1 or current is section:
+            titles.append(current.title)
+        current = current.parent
+    return " › ".join(reversed(titles))
+
+
+def _source_line(section: DocSection) -> str:
+    source_label = SOURCE_LABELS.get(section.file_key, section.file_key)
+    return f"**Source: {source_label} › {_section_path(section)}**"
+
+
+def _format_blocks(blocks: list[DocBlock]) -> str:
+    """Render blocks grouped by section, first section first, in document order.
+
+    Each group ends with the ID to fetch its full section.
+    """
+    groups: dict[DocSection, list[DocBlock]] = {}
+    for block in blocks:
+        groups.setdefault(block.section, []).append(block)
+
+    output_parts = []
+    for section, section_blocks in groups.items():
+        lines = [_source_line(section), ""]
+        table_header = None
+        for block in sorted(section_blocks, key=lambda b: b.line):
+            if block.kind == "row":
+                if block.table_header != table_header:
+                    table_header = block.table_header
+                    lines.append(table_header)
+                lines.append(block.text)
+                continue
+            if table_header is not None:
+                lines.append("")
+                table_header = None
+            lines.extend([block.text, ""])
+        if table_header is not None:
+            lines.append("")
+        lines.append(f'_Full section: section="{section.id}"_')
+        output_parts.append("\n".join(lines))
+    return "\n\n---\n\n".join(output_parts)
+
+
+def _select_blocks(hits: list[SearchHit], max_chars: int) -> tuple[list[DocBlock], int]:
+    """Pick the best hits whose rendering fits in max_chars.
+
+    Hits are taken best first; a hit that does not fit is skipped so that
+    smaller ones further down can still be used. If not even the best hit
+    fits, it is cut to the budget.
+
+    Returns:
+        The chosen blocks and the number of hits left out
+    """
+    chosen: list[DocBlock] = []
+    for hit in hits:
+        if len(_format_blocks([*chosen, hit.block])) <= max_chars:
+            chosen.append(hit.block)
+    if not chosen and hits:
+        block = hits[0].block
+        overhead = len(_format_blocks([replace(block, text="")]))
+        if overhead >= max_chars:
+            block = replace(block, table_header="")
+            overhead = len(_format_blocks([replace(block, text="")]))
+        text = block.text[: max(max_chars - overhead - 1, 0)] + "…"
+        chosen.append(replace(block, text=text))
+    return chosen, len(hits) - len(chosen)
+
+
+class DocResource(TextResource):
+    """A doc file or section, listed with its size and content hash."""
+
+    size: int
+    meta: dict[str, Any]
+
+
+def _doc_resource(
+    uri: str, name: str, title: str, text: str, sha256: str
+) -> DocResource:
+    return DocResource(
+        uri=uri,
+        name=name,
+        title=title,
+        description=f"BTT reference: {title}",
+        mime_type="text/markdown",
+        text=text,
+        size=len(text.encode("utf-8")),
+        meta={"sha256": sha256},
+    )
+
+
+def doc_resources(doc: ReferenceDoc) -> list[DocResource]:
+    """Return the resources of a parsed doc file: the file, then its sections.
+
+    The resources hold the index's text, so reads are served from memory.
+    The SHA-256 of each text is listed in the resource's _meta, so clients
+    can skip reading content they already have.
+    """
+    label = SOURCE_LABELS.get(doc.file_key, doc.file_key)
+    resources = [
+        _doc_resource(
+            DOCS_URI_PREFIX + doc.file_key, doc.file_key, label, doc.text, doc.sha256
+        )
+    ]
+    for section in doc.sections:
+        resources.append(
+            _doc_resource(
+                DOCS_URI_PREFIX + section.id,
+                section.id,
+                f"{label} › {_section_path(section)}",
+                section.content,
+                section.sha256,
+            )
+        )
+    return resources
+
+
+@on_startup
+async def _load_reference_index() -> None:
+    """Parse the docs, resolve every topic and register the doc resources."""
+    await asyncio.to_thread(reference_index.load)
+    for _keywords, file_key, heading_pattern in SECTION_INDEX:
+        reference_index.find(file_key, heading_pattern)
+    registered = {
+        str(resource.uri) for resource in mcp._resource_manager.list_resources()
+    }
+    for doc in reference_index.docs.values():
+        for resource in doc_resources(doc):
+            if str(resource.uri) not in registered:
+                mcp.add_resource(resource)
+
+
+def _action_types_text(topic: str) -> str:
+    """Return what the action catalog knows about a topic, or ''.
+
+    Action type IDs (in a topic mentioning 'action', or on their own) and
+    exact action names are looked up directly. A topic such as 'action
+    types' lists the whole catalog.
+    """
+    matches = []
+    if topic.strip().isdigit() or "action" in topic.lower():
+        for number in _NUMBER.findall(topic):
+            action_type = action_catalog.get(int(number))
+            if action_type is not None and action_type not in matches:
+                matches.append(action_type)
+    named = action_catalog.find(topic)
+    if named is not None and named not in matches:
+        matches.append(named)
+    if matches:
+        return "\n\n".join(format_action_type(asdict(t)) for t in matches)
+
+    if not _ACTION_TYPES_TOPIC.search(topic) or not len(action_catalog):
+        return ""
+    lines = [
+        "### Action Types Seen in Your Configuration",
+        "| ID | Name | Seen | Usual parameters |",
+        "|---|---|---|---|",
+    ]
+    for action_type in action_catalog.all():
+        lines.append(
+            f"| {action_type.type_id} | {action_type.name} | {action_type.count} "
+            f"| {', '.join(action_type.common_keys)} |"
+        )
+    return "\n".join(lines)
 
 
 def _list_available_topics() -> str:
@@ -277,10 +450,10 @@ Query any of these topics for detailed documentation:
 - "midi" - MIDI triggers
 - "siri remote" - Siri Remote triggers
 - "key sequence" - Key sequence / typed word triggers
-- "example" - Complete trigger JSON examples
+- "other triggers" - App, window, system and other automation trigger types
+- "example" - Required trigger JSON structure with an example
 - "modifier" - Modifier key codes (Cmd, Opt, Ctrl, Shift)
 - "color" / "icon" - Color format and icon configuration
-- "tips" - Best practices for trigger JSON
 
 **CLI & Actions:**
 - "cli" - CLI/socket overview and command format
@@ -291,6 +464,8 @@ Query any of these topics for detailed documentation:
 - "clipboard" - Clipboard commands
 - "variable" - Variable get/set commands
 - "widget" - Widget update commands
+- "preset" - Preset import/export commands
+- "action type" - Known BTTPredefinedActionType IDs
 
 **Variables:**
 - "variable list" / "dynamic variable" - All available BTT variables
@@ -311,6 +486,35 @@ class LookupReferenceInput(BaseModel):
             "Leave empty to see all available topics."
         ),
     )
+    section: Optional[str] = Field(
+        default=None,
+        description=(
+            "ID of a section to return in full, as given after each lookup "
+            "result, e.g. 'cli/ui-widgets'. Takes precedence over topic."
+        ),
+    )
+    max_chars: Optional[int] = Field(
+        default=None,
+        description=(
+            f"Maximum response size in characters (default {DEFAULT_MAX_CHARS})"
+        ),
+        ge=200,
+        le=100_000,
+    )
+    max_tokens: Optional[int] = Field(
+        default=None,
+        description="Maximum response size in tokens (about 4 characters each)",
+        ge=50,
+        le=25_000,
+    )
+
+    @property
+    def budget(self) -> int:
+        """Response size in characters allowed by max_chars and max_tokens."""
+        limits = [self.max_chars]
+        if self.max_tokens is not None:
+            limits.append(self.max_tokens * CHARS_PER_TOKEN)
+        return min((limit for limit in limits if limit), default=DEFAULT_MAX_CHARS)
 
 
 @mcp.tool(
@@ -330,38 +534,71 @@ async def btt_lookup_reference(params: LookupReferenceInput) -> str:
     IMPORTANT: Call this tool BEFORE creating or updating triggers to get the correct
     JSON format, trigger type IDs, action type IDs, and required fields.
 
+    Any words work: topics, endpoint names such as "paste_text" or variable
+    names such as "BTTNowPlaying" are matched against every paragraph and
+    table row of the docs.
+
+    Responses stay within max_chars or max_tokens: the best-matching parts
+    are returned, each with the ID of its section so the full section can
+    be fetched with the section parameter.
+
+    Action type IDs and names found in the user's triggers and presets (see
+    btt_scan_action_types) are answered from the action catalog first, with
+    their parameter keys and an example action.
+
     Examples:
     - Query "named trigger" to get the JSON format for named/reusable triggers
     - Query "keyboard shortcut" to get key codes and modifier flags
     - Query "example" to see complete working trigger JSON examples
     - Query "trigger structure" to get required/optional field reference
+    - Query "action 153" or "action types" for cataloged action types
     - Query with no topic to see all available documentation topics
 
     Args:
-        params: Contains the topic to look up.
+        params: Topic or section ID, and an optional response size budget.
 
     Returns:
-        Relevant BTT documentation section(s).
+        The best-matching paragraphs, list items, table rows and code
+        blocks grouped by section, or a full section.
     """
+    if params.section:
+        section = reference_index.get_section(params.section)
+        if section is None:
+            return (
+                f"Error: Unknown section '{params.section}'. Section IDs are "
+                "shown after each lookup result."
+            )
+        return f"{_source_line(section)}\n\n{section.content}"
+
     if not params.topic:
         return _list_available_topics()
 
-    results = _search_sections(params.topic)
+    # Action types from the user's configuration come before the docs
+    action_types = _action_types_text(params.topic)
+    if action_types:
+        action_types += "\n\n---\n\n"
+    hits = reference_index.search(
+        params.topic, MAX_SEARCH_HITS, boost=_topic_sections(params.topic)
+    )
 
-    if not results:
+    if not hits and not action_types:
         return (
             f"No documentation found for '{params.topic}'.\n\n"
             + _list_available_topics()
         )
 
-    output_parts = []
-    for file_key, section in results:
-        source_label = {
-            "triggers": "Trigger JSON Reference",
-            "cli": "CLI Command Reference",
-            "variables": "Variables Reference",
-            "actions": "Actions Reference",
-        }.get(file_key, file_key)
-        output_parts.append(f"**Source: {source_label}**\n\n{section}")
-
-    return "\n\n---\n\n".join(output_parts)
+    hits = [hit for hit in hits if hit.score >= hits[0].score * MIN_RELATIVE_SCORE]
+    budget = params.budget
+    note = (
+        "\n\n_{} more matches left out to stay within {} characters; raise "
+        "max_chars or fetch a full section._"
+    )
+    # Leave room for the note in case matches are left out
+    blocks, omitted = _select_blocks(hits, budget - len(action_types) - len(note) - 10)
+    output = (action_types + _format_blocks(blocks)).removesuffix("\n\n---\n\n")
+    if omitted:
+        output += note.format(omitted, budget)
+    if len(output) > budget:
+        # Only for budgets too small for the source and section lines
+        output = output[: budget - 1] + "…"
+    return output
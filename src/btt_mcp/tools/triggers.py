@@ -6,7 +6,11 @@ import json
 
 from btt_mcp.client import btt_request
 from btt_mcp.config import NAMED_TRIGGER_ID
-from btt_mcp.formatters import format_trigger, format_triggers_list
+from btt_mcp.formatters import (
+    format_action_hints,
+    format_trigger,
+    format_triggers_list,
+)
 from btt_mcp.models import (
     AddTriggerInput,
     DeleteTriggerInput,
@@ -17,6 +21,16 @@ from btt_mcp.models import (
     UpdateTriggerInput,
 )
 from btt_mcp.server import mcp
+from btt_mcp.services.action_catalog import action_catalog, definition_actions
+
+
+def _record_actions(result: str) -> None:
+    """Add the actions of a get_triggers or get_trigger response to the catalog."""
+    try:
+        triggers = json.loads(result)
+    except json.JSONDecodeError:
+        return
+    action_catalog.add_triggers(triggers if isinstance(triggers, list) else [triggers])
 
 
 @mcp.tool(
@@ -60,12 +74,14 @@ async def btt_get_triggers(params: GetTriggersInput) -> str:
         return result
 
     if params.response_format == "json":
+        _record_actions(result)
         return result
 
     try:
         triggers = json.loads(result)
         if not isinstance(triggers, list):
             triggers = [triggers]
+        action_catalog.add_triggers(triggers)
         return format_triggers_list(triggers)
     except json.JSONDecodeError:
         return f"Error parsing response: {result}"
@@ -99,10 +115,12 @@ async def btt_get_trigger(params: GetTriggerInput) -> str:
         return result
 
     if params.response_format == "json":
+        _record_actions(result)
         return result
 
     try:
         trigger = json.loads(result)
+        action_catalog.add_triggers([trigger])
         return format_trigger(trigger)
     except json.JSONDecodeError:
         return f"Error parsing response: {result}"
@@ -160,7 +178,9 @@ async def btt_add_trigger(params: AddTriggerInput) -> str:
     """Add a new trigger to BetterTouchTool.
 
     IMPORTANT: Use btt_lookup_reference to get full documentation on trigger types,
-    action IDs, and JSON format before constructing trigger_json.
+    action IDs, and JSON format before constructing trigger_json. Querying an
+    action type ID or name there returns the parameters and an example seen in
+    the user's own triggers (see btt_scan_action_types).
 
     Every trigger requires BTTTriggerType (int) and BTTTriggerClass (string).
     Actions go in BTTActionsToExecute array with BTTPredefinedActionType.
@@ -194,9 +214,10 @@ async def btt_add_trigger(params: AddTriggerInput) -> str:
     result = await btt_request("add_new_trigger", request_params, params.connection)
 
     if not result or result.strip() == "":
-        return "Trigger added successfully."
+        result = "Trigger added successfully."
 
-    return result
+    notes = action_catalog.hints(definition_actions(params.trigger_json))
+    return result + format_action_hints(notes)
 
 
 @mcp.tool(
@@ -226,9 +247,10 @@ async def btt_update_trigger(params: UpdateTriggerInput) -> str:
     result = await btt_request("update_trigger", request_params, params.connection)
 
     if not result or result.strip() == "":
-        return f"Trigger {params.uuid} updated successfully."
+        result = f"Trigger {params.uuid} updated successfully."
 
-    return result
+    notes = action_catalog.hints(definition_actions(params.update_json))
+    return result + format_action_hints(notes)
 
 
 @mcp.tool(
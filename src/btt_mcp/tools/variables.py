@@ -2,9 +2,48 @@
 Variable management tools.
 """
 
-from btt_mcp.client import btt_request
-from btt_mcp.models import GetVariableInput, SetVariableInput
-from btt_mcp.server import mcp
+import fnmatch
+import json
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from btt_mcp.config import get_timeseries_enabled
+from btt_mcp.models import (
+    BTTConnectionConfig,
+    ExportVariablesInput,
+    FlushVariablesInput,
+    GetVariableInput,
+    GetVariablesInput,
+    ImportVariablesInput,
+    ListVariableSubscriptionsInput,
+    SetVariableInput,
+    VariableCacheStatsInput,
+    VariableStatsInput,
+)
+from btt_mcp.server import (
+    mcp,
+    on_shutdown,
+    on_startup,
+    register_subscription_handlers,
+)
+from btt_mcp.services.timeseries import compute_stats, timeseries_sampler
+from btt_mcp.services.variable_cache import variable_cache
+from btt_mcp.services.variable_registry import variable_registry
+from btt_mcp.services.variable_sampler import (
+    VARIABLE_URI_PREFIX,
+    parse_variable_uri,
+    variable_sampler,
+    variable_uri,
+)
+from btt_mcp.services.variables import (
+    get_variable,
+    get_variables,
+    set_variable,
+    set_variables,
+)
+from btt_mcp.services.write_behind import write_buffer
 
 
 @mcp.tool(
@@ -29,13 +68,11 @@ async def btt_get_variable(params: GetVariableInput) -> str:
     Returns:
         Current value of the variable.
     """
-    endpoint = (
-        "get_string_variable"
-        if params.variable_type == "string"
-        else "get_number_variable"
-    )
-    result = await btt_request(
-        endpoint, {"variableName": params.variable_name}, params.connection
+    result = await get_variable(
+        params.variable_name,
+        params.variable_type,
+        params.connection,
+        use_cache=not params.bypass_cache,
     )
 
     if result.startswith("Error:"):
@@ -44,6 +81,47 @@ async def btt_get_variable(params: GetVariableInput) -> str:
     return f"**{params.variable_name}** = `{result}`"
 
 
+@mcp.tool(
+    name="btt_get_variables",
+    annotations={
+        "title": "Get Multiple BTT Variables",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_get_variables(params: GetVariablesInput) -> str:
+    """Get the values of several BTT variables in one call.
+
+    Variables are fetched concurrently, so reading 10-20 variables takes
+    about as long as reading one. Use this instead of repeated
+    btt_get_variable calls when gathering context.
+
+    Args:
+        params: List of variable names and types.
+
+    Returns:
+        Table of variable values in markdown or JSON format.
+    """
+    refs = [(ref.name, ref.variable_type) for ref in params.variables]
+    values = await get_variables(
+        refs, params.connection, use_cache=not params.bypass_cache
+    )
+
+    if params.response_format == "json":
+        return json.dumps({name: values[(name, kind)] for name, kind in refs}, indent=2)
+
+    lines = ["| Variable | Type | Value |", "|---|---|---|"]
+    for name, kind in dict.fromkeys(refs):
+        value = values[(name, kind)].replace("|", "\\|").replace("\n", " ")
+        if not value.startswith("Error:"):
+            value = f"`{value}`"
+        lines.append(f"| {name} | {kind} | {value} |")
+
+    return "\n".join(lines)
+
+
 @mcp.tool(
     name="btt_set_variable",
     annotations={
@@ -59,31 +137,585 @@ async def btt_set_variable(params: SetVariableInput) -> str:
 
     Variables can be persistent (survive BTT restart) or runtime-only.
 
+    With write_behind, the write is buffered and the call returns without
+    waiting for BTT. Repeated writes to the same variable are coalesced and
+    only the latest value is sent. Use btt_flush_variables when the values
+    must have reached BTT before continuing.
+
     Args:
         params: Variable name, value, type, and persistence setting.
 
     Returns:
         Confirmation of variable being set.
     """
-    if params.variable_type == "string":
-        endpoint = (
-            "set_persistent_string_variable"
-            if params.persistent
-            else "set_string_variable"
+    persistence = "persistent " if params.persistent else ""
+    write_behind = params.write_behind
+    if write_behind is None:
+        write_behind = write_buffer.enabled
+
+    if write_behind:
+        write_buffer.enqueue(
+            params.variable_name,
+            params.value,
+            params.variable_type,
+            params.persistent,
+            params.connection,
         )
-    else:
-        endpoint = (
-            "set_persistent_number_variable"
-            if params.persistent
-            else "set_number_variable"
+        return (
+            f"Queued {persistence}variable **{params.variable_name}** = "
+            f"`{params.value}` (write-behind)"
         )
 
-    request_params = {"variableName": params.variable_name, "to": params.value}
-
-    result = await btt_request(endpoint, request_params, params.connection)
+    # A buffered older value must not be sent after this one
+    await write_buffer.discard(params.connection, params.variable_name)
+    result = await set_variable(
+        params.variable_name,
+        params.value,
+        params.variable_type,
+        params.persistent,
+        params.connection,
+    )
 
     if result.startswith("Error:"):
         return result
 
-    persistence = "persistent " if params.persistent else ""
     return f"Set {persistence}variable **{params.variable_name}** to `{params.value}`"
+
+
+@mcp.tool(
+    name="btt_flush_variables",
+    annotations={
+        "title": "Flush Buffered Variable Writes",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_flush_variables(params: FlushVariablesInput) -> str:
+    """Send all buffered (write-behind) variable writes to BTT and wait.
+
+    Acts as a barrier: every btt_set_variable call made with write_behind
+    before this call has reached BTT when it returns.
+
+    Args:
+        params: Response format options.
+
+    Returns:
+        Number of writes sent, failures, and write-behind statistics.
+    """
+    result = await write_buffer.flush()
+    stats = write_buffer.stats
+
+    if params.response_format == "json":
+        return json.dumps(
+            {
+                "sent": result.sent,
+                "errors": [
+                    {"variable": name, "error": error} for name, error in result.errors
+                ],
+                "enabled": write_buffer.enabled,
+                "flush_interval": write_buffer.flush_interval,
+                "max_pending": write_buffer.max_pending,
+                "enqueued": stats.enqueued,
+                "coalesced": stats.coalesced,
+                "total_sent": stats.sent,
+                "total_failed": stats.failed,
+                "flushes": stats.flushes,
+            },
+            indent=2,
+        )
+
+    lines = [
+        f"Flushed {result.sent} variable write(s).",
+        f"\n**Write-behind:** {'enabled' if write_buffer.enabled else 'per call'} "
+        f"(every {write_buffer.flush_interval:g}s or "
+        f"{write_buffer.max_pending} pending variables)",
+        f"**Enqueued:** {stats.enqueued} | **Coalesced:** {stats.coalesced} | "
+        f"**Sent:** {stats.sent} | **Failed:** {stats.failed}",
+    ]
+    if result.errors:
+        lines.append("\n**Failed writes:**")
+        for name, error in result.errors:
+            lines.append(f"- {name}: {error}")
+
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_variable_cache_stats",
+    annotations={
+        "title": "Variable Cache Statistics",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": False,
+    },
+)
+async def btt_variable_cache_stats(params: VariableCacheStatsInput) -> str:
+    """Show hit/miss counters and TTL policy of the variable cache.
+
+    Variable reads are cached per volatility class: dynamic BTT variables
+    (idle time, active window, volume, ...) are volatile and not cached by
+    default, user variables are static and cached until written.
+
+    Args:
+        params: Optional variable names to show the TTL for, and reset flags.
+
+    Returns:
+        Cache statistics in markdown or JSON format.
+    """
+    stats = variable_cache.stats
+    data = {
+        "enabled": variable_cache.enabled,
+        "entries": len(variable_cache),
+        "hits": stats.hits,
+        "misses": stats.misses,
+        "uncached": stats.uncached,
+        "invalidations": stats.invalidations,
+        "hit_rate": round(stats.hit_rate, 3),
+        "static_ttl": variable_cache.static_ttl,
+        "volatile_ttl": variable_cache.volatile_ttl,
+        "ttl_overrides": variable_cache.ttl_overrides,
+        "policies": {
+            name: {
+                "volatility": variable_cache.volatility(name),
+                "ttl": variable_cache.ttl_for(name),
+            }
+            for name in params.variable_names
+        },
+    }
+
+    if params.clear:
+        variable_cache.clear()
+    if params.reset_stats:
+        variable_cache.reset_stats()
+
+    if params.response_format == "json":
+        return json.dumps(data, indent=2)
+
+    lines = [
+        "## Variable Cache",
+        f"\n**Enabled:** {'Yes' if data['enabled'] else 'No'}",
+        f"**Entries:** {data['entries']}",
+        f"**Hits:** {stats.hits} | **Misses:** {stats.misses} | "
+        f"**Uncached reads:** {stats.uncached} | "
+        f"**Invalidations:** {stats.invalidations}",
+        f"**Hit rate:** {stats.hit_rate:.1%}",
+        f"**TTL:** static {variable_cache.static_ttl:g}s, "
+        f"volatile {variable_cache.volatile_ttl:g}s",
+    ]
+    if data["policies"]:
+        lines.append("\n| Variable | Class | TTL |")
+        lines.append("|---|---|---|")
+        for name, policy in data["policies"].items():
+            lines.append(f"| {name} | {policy['volatility']} | {policy['ttl']:g}s |")
+    if params.clear:
+        lines.append("\nCache cleared.")
+    if params.reset_stats:
+        lines.append("\nCounters reset.")
+
+    return "\n".join(lines)
+
+
+@mcp.resource(
+    VARIABLE_URI_PREFIX + "{variable_type}/{name}",
+    name="btt_variable",
+    title="BTT Variable",
+    description=(
+        "Current value of a BTT variable; variable_type is 'string' or 'number'. "
+        "Subscribe to receive resources/updated notifications when it changes."
+    ),
+    mime_type="text/plain",
+)
+async def btt_variable_resource(variable_type: str, name: str) -> str:
+    """Read a BTT variable exposed as an MCP resource."""
+    return await get_variable(
+        urllib.parse.unquote(name), variable_type, BTTConnectionConfig()
+    )
+
+
+async def _subscribe_variable(uri: str, session) -> None:
+    key = parse_variable_uri(uri)
+    if key is None:
+        raise ValueError(f"Invalid BTT variable resource URI: {uri}")
+    variable_sampler.subscribe(key, session)
+
+
+async def _unsubscribe_variable(uri: str, session) -> None:
+    key = parse_variable_uri(uri)
+    if key is not None:
+        variable_sampler.unsubscribe(key, session)
+
+
+register_subscription_handlers(
+    VARIABLE_URI_PREFIX, _subscribe_variable, _unsubscribe_variable
+)
+on_shutdown(variable_sampler.stop)
+on_shutdown(write_buffer.close)
+on_shutdown(variable_registry.close)
+
+# Identifies snapshot files written by btt_export_variables
+SNAPSHOT_FORMAT = "btt-mcp-variables"
+SNAPSHOT_VERSION = 1
+
+
+@mcp.tool(
+    name="btt_list_variable_subscriptions",
+    annotations={
+        "title": "List Variable Subscriptions",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_list_variable_subscriptions(
+    params: ListVariableSubscriptionsInput,
+) -> str:
+    """List BTT variables that clients are subscribed to.
+
+    Instead of polling btt_get_variable in a loop, subscribe to the resource
+    btt://variables/{variable_type}/{name}. The server samples all subscribed
+    variables in one batch per tick and sends resources/updated notifications
+    when a value changes.
+
+    Args:
+        params: Response format options.
+
+    Returns:
+        Subscribed variables with subscriber counts and sampler statistics.
+    """
+    subscriptions = variable_sampler.subscriptions()
+    stats = variable_sampler.stats
+
+    if params.response_format == "json":
+        return json.dumps(
+            {
+                "interval": variable_sampler.interval,
+                "running": variable_sampler.running,
+                "ticks": stats.ticks,
+                "reads": stats.reads,
+                "changes": stats.changes,
+                "notifications": stats.notifications,
+                "last_tick_seconds": stats.last_tick_seconds,
+                "subscriptions": [
+                    {
+                        "uri": variable_uri(name, kind),
+                        "subscribers": count,
+                        "last_value": variable_sampler.last_value((name, kind)),
+                    }
+                    for (name, kind), count in subscriptions.items()
+                ],
+            },
+            indent=2,
+        )
+
+    lines = [
+        "## Variable Subscriptions",
+        f"\nSampling every {variable_sampler.interval:g}s "
+        f"({'running' if variable_sampler.running else 'idle'}); "
+        f"{stats.ticks} tick(s), {stats.changes} change(s), "
+        f"{stats.notifications} notification(s) sent.\n",
+    ]
+    if not subscriptions:
+        lines.append("No variables subscribed.")
+        return "\n".join(lines)
+
+    lines.append("| Resource | Subscribers | Last value |")
+    lines.append("|---|---|---|")
+    for (name, kind), count in subscriptions.items():
+        last = variable_sampler.last_value((name, kind))
+        shown = "–" if last is None else f"`{last}`"
+        lines.append(f"| {variable_uri(name, kind)} | {count} | {shown} |")
+
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_export_variables",
+    annotations={
+        "title": "Export BTT Variables",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_export_variables(params: ExportVariablesInput) -> str:
+    """Snapshot tracked BTT variables to a JSON file.
+
+    BTT cannot list its variables, so the server tracks every variable it
+    has read or written. All tracked variables (or those matching
+    name_patterns) are read concurrently and written to the file together
+    with their type and persistence (null for variables that have only been
+    read). Restore them with btt_import_variables.
+
+    Args:
+        params: Output path, name filters, and concurrency.
+
+    Returns:
+        Number of exported variables and any read failures.
+    """
+    tracked = variable_registry.select(params.name_patterns, params.persistent_only)
+    if not tracked:
+        return (
+            "No tracked variables match. Variables are tracked once they have "
+            "been read or written through this server."
+        )
+
+    refs = [(v.name, v.variable_type) for v in tracked]
+    values = await get_variables(
+        refs,
+        params.connection,
+        max_concurrency=params.max_concurrency,
+        use_cache=False,
+    )
+
+    exported = []
+    failed = []
+    for variable in tracked:
+        value = values[(variable.name, variable.variable_type)]
+        if value.startswith("Error:"):
+            failed.append((variable.name, value))
+            continue
+        exported.append(
+            {
+                "name": variable.name,
+                "type": variable.variable_type,
+                # None (null) when the variable has only been read
+                "persistent": variable.persistent,
+                "value": value,
+            }
+        )
+
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "variables": exported,
+    }
+    path = Path(params.output_path).expanduser()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(snapshot, indent=2))
+    except OSError as e:
+        return f"Error: Could not write {path}: {e}"
+    variable_registry.save()
+
+    lines = [f"Exported {len(exported)} variable(s) to {path}"]
+    if failed:
+        lines.append(f"\n**Failed to read {len(failed)} variable(s):**")
+        for name, error in failed:
+            lines.append(f"- {name}: {error}")
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_import_variables",
+    annotations={
+        "title": "Import BTT Variables",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_import_variables(params: ImportVariablesInput) -> str:
+    """Restore BTT variables from a snapshot written by btt_export_variables.
+
+    Variables are written concurrently (bounded by max_concurrency) with the
+    type and persistence recorded in the snapshot. Variables with unknown
+    persistence are written as persistent unless params.persistent is set.
+    BTT's built-in volatile variables are skipped.
+
+    Args:
+        params: Snapshot path, name filters, persistence override, concurrency.
+
+    Returns:
+        Number of restored variables, failures, and elapsed time.
+    """
+    path = Path(params.path).expanduser()
+    try:
+        snapshot = json.loads(path.read_text())
+    except OSError as e:
+        return f"Error: Could not read {path}: {e}"
+    except json.JSONDecodeError as e:
+        return f"Error: Invalid JSON in {path}: {e}"
+
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        return f"Error: {path} is not a variable snapshot from btt_export_variables"
+
+    writes = []
+    for entry in snapshot.get("variables", []):
+        if not isinstance(entry, dict) or "name" not in entry or "value" not in entry:
+            return f"Error: Invalid variable entry in {path}: {entry!r}"
+        name = str(entry["name"])
+        if variable_registry.ignores(name):
+            continue  # built-in volatile variable, e.g. from an older snapshot
+        if params.name_patterns and not any(
+            fnmatch.fnmatchcase(name, pattern) for pattern in params.name_patterns
+        ):
+            continue
+        persistent = params.persistent
+        if persistent is None:
+            # Unknown persistence is restored as persistent so that a
+            # persistent variable is not lost on the next BTT restart
+            persistent = entry.get("persistent") is not False
+        writes.append(
+            (name, str(entry["value"]), entry.get("type", "string"), persistent)
+        )
+
+    if not writes:
+        return f"No variables to restore from {path}"
+
+    started = time.perf_counter()
+    results = await set_variables(
+        writes, params.connection, max_concurrency=params.max_concurrency
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    variable_registry.save()
+
+    failed = [(name, r) for name, r in results.items() if r.startswith("Error:")]
+    lines = [
+        f"Restored {len(results) - len(failed)} of {len(writes)} variable(s) "
+        f"from {path} in {elapsed_ms:.0f} ms"
+    ]
+    if failed:
+        lines.append(f"\n**Failed to write {len(failed)} variable(s):**")
+        for name, error in failed:
+            lines.append(f"- {name}: {error}")
+    return "\n".join(lines)
+
+
+if get_timeseries_enabled():
+    on_startup(timeseries_sampler.start)
+on_shutdown(timeseries_sampler.stop)
+
+
+@mcp.tool(
+    name="btt_variable_stats",
+    annotations={
+        "title": "Numeric Variable Statistics",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": False,
+    },
+)
+async def btt_variable_stats(params: VariableStatsInput) -> str:
+    """Show trends of numeric BTT variables sampled over time.
+
+    Variables such as OutputVolume, BTTIdleTime, CurrentDisplayBrightness
+    and ActiveSpace are sampled in the background into fixed-size ring
+    buffers. Returns min, max, mean, percentiles and change points (resets,
+    level shifts) over the requested window. Sampling starts with the first
+    call if it is not enabled in the config file.
+
+    Args:
+        params: Variables, window, percentiles, and change point options.
+
+    Returns:
+        Per-variable statistics in markdown or JSON format.
+    """
+    if any(not 0 <= p <= 100 for p in params.percentiles):
+        return "Error: percentiles must be between 0 and 100"
+
+    names = params.variable_names or timeseries_sampler.variables
+    rejected = [name for name in names if not timeseries_sampler.track(name)]
+    started = not timeseries_sampler.running
+    await timeseries_sampler.start()
+
+    since = None
+    if params.window_seconds is not None:
+        since = time.time() - params.window_seconds
+
+    report = {}
+    for name in names:
+        series = timeseries_sampler.series(name)
+        stats = None
+        if series is not None:
+            times, values = series.samples(since)
+            stats = compute_stats(times, values, params.percentiles, params.min_change)
+        report[name] = stats
+
+    if params.response_format == "json":
+        data = {
+            "interval": timeseries_sampler.interval,
+            "capacity": timeseries_sampler.capacity,
+            "window_seconds": params.window_seconds,
+            "sampling_started": started,
+            "not_sampled": rejected,
+            "variables": {},
+        }
+        for name, stats in report.items():
+            if stats is None:
+                data["variables"][name] = None
+                continue
+            points = stats.change_points[-params.max_change_points :]
+            if not params.max_change_points:
+                points = []
+            data["variables"][name] = {
+                "count": stats.count,
+                "first_timestamp": stats.first_timestamp,
+                "last_timestamp": stats.last_timestamp,
+                "last": stats.last,
+                "min": stats.min,
+                "max": stats.max,
+                "mean": stats.mean,
+                "percentiles": {f"p{p:g}": v for p, v in stats.percentiles.items()},
+                "change_points": [
+                    {"timestamp": c.timestamp, "before": c.before, "after": c.after}
+                    for c in points
+                ],
+                "change_point_count": len(stats.change_points),
+            }
+        return json.dumps(data, indent=2)
+
+    window = (
+        f"last {params.window_seconds:g}s"
+        if params.window_seconds is not None
+        else "all samples"
+    )
+    lines = [
+        "## Variable Statistics",
+        f"\nSampling every {timeseries_sampler.interval:g}s, "
+        f"keeping {timeseries_sampler.capacity} samples per variable ({window}).",
+    ]
+    if started:
+        lines.append(
+            "\nSampling started now; statistics become available after the "
+            "first samples."
+        )
+    if rejected:
+        lines.append(f"\nNot sampled (limit reached): {', '.join(rejected)}")
+
+    percentile_headers = [f"p{p:g}" for p in params.percentiles]
+    lines.append(
+        "\n| Variable | Samples | Last | Min | Max | Mean | "
+        + " | ".join(percentile_headers + ["Changes"])
+        + " |"
+    )
+    lines.append("|---" * (7 + len(percentile_headers)) + "|")
+    for name, stats in report.items():
+        if stats is None:
+            empty = " | ".join(["–"] * (5 + len(percentile_headers)))
+            lines.append(f"| {name} | 0 | {empty} |")
+            continue
+        cells = [stats.last, stats.min, stats.max, stats.mean]
+        cells += list(stats.percentiles.values())
+        lines.append(
+            f"| {name} | {stats.count} | "
+            + " | ".join(f"{v:g}" for v in cells)
+            + f" | {len(stats.change_points)} |"
+        )
+
+    for name, stats in report.items():
+        if stats is None or not stats.change_points or not params.max_change_points:
+            continue
+        lines.append(f"\n**{name} change points:**")
+        for point in stats.change_points[-params.max_change_points :]:
+            stamp = datetime.fromtimestamp(point.timestamp).strftime("%H:%M:%S")
+            lines.append(f"- {stamp}: {point.before:g} → {point.after:g}")
+
+    return "\n".join(lines)
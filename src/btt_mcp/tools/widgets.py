@@ -2,10 +2,66 @@
 Widget management tools (Touch Bar, Menubar, Stream Deck).
 """
 
+import asyncio
+import json
+import time
+
 from btt_mcp.client import btt_request
 from btt_mcp.config import WIDGET_ENDPOINT_MAP
-from btt_mcp.models import RefreshWidgetInput, UpdateWidgetInput
-from btt_mcp.server import mcp
+from btt_mcp.models import (
+    CacheIconInput,
+    ListCachedIconsInput,
+    ListRefreshScheduleInput,
+    RefreshWidgetInput,
+    ScheduleWidgetRefreshInput,
+    UnscheduleWidgetRefreshInput,
+    UpdateWidgetInput,
+    UpdateWidgetsInput,
+    WidgetUpdate,
+    WidgetUpdateStatsInput,
+)
+from btt_mcp.server import mcp, on_shutdown
+from btt_mcp.services.icon_cache import icon_cache
+from btt_mcp.services.refresh_scheduler import refresh_scheduler
+from btt_mcp.services.widget_updates import WidgetUpdateStats, widget_scheduler
+
+on_shutdown(widget_scheduler.flush)
+on_shutdown(refresh_scheduler.stop)
+
+
+async def _widget_request_params(
+    params: UpdateWidgetInput | WidgetUpdate,
+) -> tuple[dict[str, str], str | None]:
+    """Build update parameters, resolving and caching icons.
+
+    Returns:
+        Request parameters without the uuid, and the cache key of a newly
+        passed icon_data (None otherwise)
+
+    Raises:
+        ValueError: If icon_key is unknown or icon_data is not valid base64
+    """
+    request_params = {}
+    new_icon_key = None
+    if params.text:
+        request_params["text"] = params.text
+    if params.icon_path:
+        request_params["icon_path"] = params.icon_path
+    if params.icon_key:
+        icon = icon_cache.get(params.icon_key)
+        if icon is None:
+            raise ValueError(
+                f"Unknown icon key '{params.icon_key}'. It may have been evicted; "
+                "cache the icon again with btt_cache_icon."
+            )
+        request_params["icon_data"] = icon.data
+    if params.icon_data:
+        icon = await icon_cache.add_data(params.icon_data)
+        request_params["icon_data"] = icon.data
+        new_icon_key = icon.key
+    if params.background_color:
+        request_params["background_color"] = params.background_color
+    return request_params, new_icon_key
 
 
 @mcp.tool(
@@ -24,6 +80,13 @@ async def btt_update_widget(params: UpdateWidgetInput) -> str:
     This allows temporary updates to widget appearance without changing
     the underlying configuration.
 
+    Icons can be passed as icon_path, icon_data or the icon_key of an icon
+    cached with btt_cache_icon. Prefer icon_key for icons used repeatedly.
+
+    Each widget receives a limited number of updates per second. Updates
+    arriving faster are merged (the latest text, icon and color win) and
+    sent once the rate limit allows, so calling this in a tight loop is safe.
+
     Args:
         params: Widget UUID, type, and display properties to update.
 
@@ -32,22 +95,128 @@ async def btt_update_widget(params: UpdateWidgetInput) -> str:
     """
     endpoint = WIDGET_ENDPOINT_MAP.get(params.widget_type, "update_touch_bar_widget")
 
-    request_params = {"uuid": params.uuid}
-    if params.text:
-        request_params["text"] = params.text
-    if params.icon_path:
-        request_params["icon_path"] = params.icon_path
-    if params.icon_data:
-        request_params["icon_data"] = params.icon_data
-    if params.background_color:
-        request_params["background_color"] = params.background_color
+    try:
+        request_params, new_icon_key = await _widget_request_params(params)
+    except ValueError as e:
+        return f"Error: {e}"
 
-    result = await btt_request(endpoint, request_params, params.connection)
+    result = await widget_scheduler.submit(
+        endpoint, params.uuid, request_params, params.connection
+    )
 
-    if result.startswith("Error:"):
-        return result
+    if result.status == "queued":
+        message = (
+            f"Widget {params.uuid} update queued; rate limited, sending in "
+            f"{result.delay * 1000:.0f} ms with any newer changes merged."
+        )
+    elif result.response.startswith("Error:"):
+        return result.response
+    else:
+        message = f"Widget {params.uuid} updated successfully."
 
-    return f"Widget {params.uuid} updated successfully."
+    if new_icon_key:
+        message += f" Icon cached as `{new_icon_key}`; pass icon_key next time."
+    return message
+
+
+@mcp.tool(
+    name="btt_update_widgets",
+    annotations={
+        "title": "Update Multiple Widgets",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_update_widgets(params: UpdateWidgetsInput) -> str:
+    """Update many Touch Bar, Menubar, or Stream Deck widgets in one call.
+
+    Updates are grouped by BTT endpoint and sent concurrently over pooled
+    connections, so a whole Stream Deck page or Touch Bar group repaints in
+    about the latency of a single update. Use this instead of repeated
+    btt_update_widget calls.
+
+    Args:
+        params: List of widget updates and concurrency limit.
+
+    Returns:
+        Per-widget status and timing in markdown or JSON format.
+    """
+    groups: dict[str, list[WidgetUpdate]] = {}
+    for update in params.updates:
+        endpoint = WIDGET_ENDPOINT_MAP.get(
+            update.widget_type, "update_touch_bar_widget"
+        )
+        groups.setdefault(endpoint, []).append(update)
+
+    semaphore = asyncio.Semaphore(params.max_concurrency)
+
+    async def send(endpoint: str, update: WidgetUpdate) -> dict:
+        row = {"uuid": update.uuid, "endpoint": endpoint}
+        try:
+            request_params, _ = await _widget_request_params(update)
+        except ValueError as e:
+            return {**row, "status": "error", "error": str(e), "ms": 0.0}
+        async with semaphore:
+            started = time.perf_counter()
+            result = await widget_scheduler.submit(
+                endpoint, update.uuid, request_params, params.connection
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        row["ms"] = round(elapsed_ms, 1)
+        if result.status == "queued":
+            row["status"] = "queued"
+        elif result.response.startswith("Error:"):
+            row["status"] = "error"
+            row["error"] = result.response.removeprefix("Error: ")
+        else:
+            row["status"] = "sent"
+        return row
+
+    started = time.perf_counter()
+    rows = await asyncio.gather(
+        *(
+            send(endpoint, update)
+            for endpoint, updates in groups.items()
+            for update in updates
+        )
+    )
+    total_ms = (time.perf_counter() - started) * 1000
+
+    counts = {status: 0 for status in ("sent", "queued", "error")}
+    for row in rows:
+        counts[row["status"]] += 1
+
+    if params.response_format == "json":
+        return json.dumps(
+            {
+                "total_ms": round(total_ms, 1),
+                "sequential_ms": round(sum(row["ms"] for row in rows), 1),
+                "counts": counts,
+                "endpoints": {endpoint: len(u) for endpoint, u in groups.items()},
+                "widgets": rows,
+            },
+            indent=2,
+        )
+
+    lines = [
+        "## Widget Updates",
+        f"\nUpdated {counts['sent']} of {len(rows)} widget(s) in "
+        f"{total_ms:.0f} ms (sum of individual updates: "
+        f"{sum(row['ms'] for row in rows):.0f} ms); {counts['queued']} queued "
+        f"by the rate limit, {counts['error']} failed.",
+        "\n| Widget | Endpoint | Status | ms |",
+        "|---|---|---|---|",
+    ]
+    for row in rows:
+        status = row["status"]
+        if status == "error":
+            status = f"error: {row['error']}"
+        lines.append(
+            f"| {row['uuid']} | {row['endpoint']} | {status} | {row['ms']:.1f} |"
+        )
+    return "\n".join(lines)
 
 
 @mcp.tool(
@@ -80,3 +249,299 @@ async def btt_refresh_widget(params: RefreshWidgetInput) -> str:
         return result
 
     return f"Widget {params.uuid} refreshed."
+
+
+@mcp.tool(
+    name="btt_schedule_widget_refresh",
+    annotations={
+        "title": "Schedule Widget Refresh",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_schedule_widget_refresh(params: ScheduleWidgetRefreshInput) -> str:
+    """Refresh a script widget periodically in the background.
+
+    Refreshes of different widgets are spread out with jitter. When BTT
+    responds slowly, low-priority refreshes are skipped and normal ones
+    delayed. Scheduling a widget again replaces its interval and priority.
+
+    Args:
+        params: Widget UUID, interval, and priority.
+
+    Returns:
+        Confirmation with the widget's schedule.
+    """
+    refresh_scheduler.register(
+        params.uuid, params.interval_seconds, params.priority, params.connection
+    )
+    return (
+        f"Widget {params.uuid} is refreshed every {params.interval_seconds:g}s "
+        f"({params.priority} priority)."
+    )
+
+
+@mcp.tool(
+    name="btt_unschedule_widget_refresh",
+    annotations={
+        "title": "Unschedule Widget Refresh",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_unschedule_widget_refresh(params: UnscheduleWidgetRefreshInput) -> str:
+    """Stop refreshing a widget that was scheduled with btt_schedule_widget_refresh.
+
+    Args:
+        params: Widget UUID.
+
+    Returns:
+        Confirmation, or an error if the widget was not scheduled.
+    """
+    if not refresh_scheduler.unregister(params.uuid):
+        return f"Error: Widget {params.uuid} has no scheduled refresh"
+    return f"Stopped refreshing widget {params.uuid}."
+
+
+@mcp.tool(
+    name="btt_list_refresh_schedule",
+    annotations={
+        "title": "List Widget Refresh Schedule",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_list_refresh_schedule(params: ListRefreshScheduleInput) -> str:
+    """List scheduled widget refreshes with their observed lag.
+
+    Lag is how late a refresh started compared to its due time. Also shows
+    the smoothed refresh_widget latency and whether refreshes are being shed.
+
+    Args:
+        params: Response format.
+
+    Returns:
+        Schedule and per-widget statistics in markdown or JSON format.
+    """
+    now = time.monotonic()
+    entries = refresh_scheduler.entries()
+
+    if params.response_format == "json":
+        return json.dumps(
+            {
+                "latency_ms": round(refresh_scheduler.latency * 1000, 1),
+                "latency_threshold_ms": refresh_scheduler.latency_threshold * 1000,
+                "overloaded": refresh_scheduler.overloaded,
+                "widgets": [
+                    {
+                        "uuid": entry.uuid,
+                        "interval": entry.interval,
+                        "priority": entry.priority,
+                        "next_in_seconds": round(entry.next_due - now, 3),
+                        "runs": entry.runs,
+                        "shed": entry.shed,
+                        "delayed": entry.delayed,
+                        "errors": entry.errors,
+                        "last_lag_ms": round(entry.last_lag * 1000, 1),
+                        "mean_lag_ms": round(entry.mean_lag * 1000, 1),
+                        "max_lag_ms": round(entry.max_lag * 1000, 1),
+                        "last_latency_ms": round(entry.last_latency * 1000, 1),
+                    }
+                    for entry in entries
+                ],
+            },
+            indent=2,
+        )
+
+    state = "shedding low-priority refreshes" if refresh_scheduler.overloaded else "ok"
+    lines = [
+        "## Widget Refresh Schedule",
+        f"\n**BTT latency:** {refresh_scheduler.latency * 1000:.0f} ms "
+        f"(threshold {refresh_scheduler.latency_threshold * 1000:.0f} ms, {state})",
+    ]
+    if not entries:
+        lines.append("\nNo widgets scheduled.")
+        return "\n".join(lines)
+
+    lines.append(
+        "\n| Widget | Every | Priority | Next in | Runs | Shed | Delayed | "
+        "Errors | Lag (mean/max) |"
+    )
+    lines.append("|---|---|---|---|---|---|---|---|---|")
+    for entry in entries:
+        lines.append(
+            f"| {entry.uuid} | {entry.interval:g}s | {entry.priority} | "
+            f"{max(0.0, entry.next_due - now):.1f}s | {entry.runs} | {entry.shed} | "
+            f"{entry.delayed} | {entry.errors} | "
+            f"{entry.mean_lag * 1000:.0f}/{entry.max_lag * 1000:.0f} ms |"
+        )
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_widget_update_stats",
+    annotations={
+        "title": "Widget Update Statistics",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": False,
+        "openWorldHint": False,
+    },
+)
+async def btt_widget_update_stats(params: WidgetUpdateStatsInput) -> str:
+    """Show how many widget updates were sent, merged, or dropped.
+
+    Updates merged into a pending update are counted as merged; merged
+    updates none of whose changes were ever sent (every field superseded
+    by a newer update) are counted as dropped.
+
+    Args:
+        params: Flush and reset options, and response format.
+
+    Returns:
+        Widget update counters in markdown or JSON format.
+    """
+    if params.flush:
+        await widget_scheduler.flush()
+
+    stats = widget_scheduler.stats
+    pending = widget_scheduler.pending()
+    data = {
+        "max_updates_per_second": widget_scheduler.max_rate,
+        "submitted": stats.submitted,
+        "sent": stats.sent,
+        "merged": stats.merged,
+        "dropped": stats.dropped,
+        "errors": stats.errors,
+        "last_error": stats.last_error,
+        "pending": {uuid: count for (_, _, uuid), count in pending.items()},
+    }
+    if params.reset_stats:
+        widget_scheduler.stats = WidgetUpdateStats()
+
+    if params.response_format == "json":
+        return json.dumps(data, indent=2)
+
+    rate = (
+        f"{widget_scheduler.max_rate:g} updates/s per widget"
+        if widget_scheduler.max_rate > 0
+        else "not rate limited"
+    )
+    lines = [
+        "## Widget Updates",
+        f"\n**Rate limit:** {rate}",
+        f"**Submitted:** {stats.submitted} | **Sent:** {stats.sent} | "
+        f"**Merged:** {stats.merged} | **Dropped:** {stats.dropped} | "
+        f"**Errors:** {stats.errors}",
+    ]
+    if stats.last_error:
+        lines.append(f"**Last error:** {stats.last_error}")
+    if pending:
+        lines.append(f"**Pending:** {len(pending)} widget(s)")
+    if params.flush:
+        lines.append("\nPending updates flushed.")
+    if params.reset_stats:
+        lines.append("\nCounters reset.")
+    return "\n".join(lines)
+
+
+@mcp.tool(
+    name="btt_cache_icon",
+    annotations={
+        "title": "Cache Widget Icon",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_cache_icon(params: CacheIconInput) -> str:
+    """Encode an icon once and return a short key for widget updates.
+
+    Pass the returned key as icon_key to btt_update_widget instead of
+    re-sending base64 data. Files are cached by path and modification time,
+    data by content hash, so caching the same icon twice is cheap.
+
+    Args:
+        params: Icon file path or base64 data, and optional maximum size.
+
+    Returns:
+        Icon key and encoded size.
+    """
+    if bool(params.icon_path) == bool(params.icon_data):
+        return "Error: Provide exactly one of icon_path or icon_data"
+
+    try:
+        if params.icon_path:
+            icon = await icon_cache.load_path(params.icon_path, params.max_size)
+        else:
+            icon = await icon_cache.add_data(params.icon_data, params.max_size)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    return (
+        f"Icon cached as `{icon.key}` ({icon.size:,} bytes encoded). "
+        "Use it with btt_update_widget via icon_key."
+    )
+
+
+@mcp.tool(
+    name="btt_list_cached_icons",
+    annotations={
+        "title": "List Cached Icons",
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": False,
+    },
+)
+async def btt_list_cached_icons(params: ListCachedIconsInput) -> str:
+    """List cached widget icons with their keys and sizes.
+
+    Args:
+        params: Clear option and response format.
+
+    Returns:
+        Cached icons and cache statistics in markdown or JSON format.
+    """
+    icons = icon_cache.icons()
+    stats = icon_cache.stats
+    data = {
+        "max_bytes": icon_cache.max_bytes,
+        "total_bytes": icon_cache.total_bytes,
+        "hits": stats.hits,
+        "misses": stats.misses,
+        "evictions": stats.evictions,
+        "icons": [
+            {"key": icon.key, "bytes": icon.size, "source": icon.source}
+            for icon in reversed(icons)
+        ],
+    }
+    if params.clear:
+        icon_cache.clear()
+
+    if params.response_format == "json":
+        return json.dumps(data, indent=2)
+
+    lines = [
+        "## Cached Icons",
+        f"\n**Size:** {data['total_bytes']:,} of {data['max_bytes']:,} bytes | "
+        f"**Hits:** {stats.hits} | **Misses:** {stats.misses} | "
+        f"**Evictions:** {stats.evictions}",
+    ]
+    if icons:
+        lines.append("\n| Key | Bytes | Source |")
+        lines.append("|---|---|---|")
+        for icon in data["icons"]:
+            lines.append(f"| `{icon['key']}` | {icon['bytes']:,} | {icon['source']} |")
+    else:
+        lines.append("\nNo icons cached.")
+    if params.clear:
+        lines.append("\nCache cleared.")
+    return "\n".join(lines)
@@ -0,0 +1,86 @@
+"""
+Shared test fixtures.
+"""
+
+import asyncio
+
+import pytest
+
+from btt_mcp import server
+from btt_mcp.config import VOLATILE_VARIABLE_PATTERNS
+from btt_mcp.services import variables as variable_service
+from btt_mcp.services.action_catalog import action_catalog
+from btt_mcp.services.variable_cache import VariableCache
+from btt_mcp.services.variable_registry import VariableRegistry, variable_registry
+
+
+class FakeBTT:
+    """Serves and stores variables in a dict in place of BTT's webserver.
+
+    Reads are recorded as (endpoint, name) and writes as (endpoint, name,
+    value). Set delay to keep requests in flight; peak is the highest
+    number of concurrent requests seen.
+    """
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.reads: list[tuple[str, str]] = []
+        self.writes: list[tuple[str, str, str]] = []
+        self.delay = 0.0
+        self.peak = 0
+        self._in_flight = 0
+
+    async def request(self, endpoint, params, config):
+        name = params["variableName"]
+        self._in_flight += 1
+        self.peak = max(self.peak, self._in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if endpoint.startswith("set_"):
+                self.writes.append((endpoint, name, params["to"]))
+                self.values[name] = params["to"]
+                return ""
+            self.reads.append((endpoint, name))
+            return self.values.get(name, "")
+        finally:
+            self._in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def isolated_variable_registry(monkeypatch):
+    """Keep the variable registry in memory so tests never touch ~/.config."""
+    registry = VariableRegistry(ignored_patterns=VOLATILE_VARIABLE_PATTERNS)
+    monkeypatch.setattr(variable_service, "variable_registry", registry)
+    monkeypatch.setattr(variable_registry, "path", None)
+    return registry
+
+
+@pytest.fixture(autouse=True)
+def isolated_action_catalog(monkeypatch):
+    """Keep the action catalog in memory so tests never touch ~/.config."""
+    monkeypatch.setattr(action_catalog, "path", None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_tool_schema_cache(monkeypatch, tmp_path):
+    """Keep the tool schema cache out of ~/.config."""
+    monkeypatch.setattr(
+        server, "TOOL_SCHEMA_CACHE_FILE", tmp_path / "tool_schemas.json"
+    )
+
+
+@pytest.fixture
+def variable_cache(monkeypatch):
+    """Give the test a fresh variable cache; override to configure it."""
+    cache = VariableCache()
+    monkeypatch.setattr(variable_service, "variable_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def fake_btt(monkeypatch, variable_cache):
+    """Answer variable requests from a FakeBTT instead of BTT."""
+    fake = FakeBTT()
+    monkeypatch.setattr(variable_service, "btt_request", fake.request)
+    return fake
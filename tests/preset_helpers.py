@@ -0,0 +1,64 @@
+"""
+Helpers for building preset files in tests.
+"""
+
+import gzip
+import io
+import json
+import zipfile
+import zlib
+from pathlib import Path
+
+
+def trigger_uuid(i: int) -> str:
+    return f"{i:08d}-0000-0000-0000-000000000000"
+
+
+def make_trigger(i: int) -> dict:
+    return {
+        "BTTUUID": trigger_uuid(i),
+        "BTTTriggerClass": "BTTTriggerTypeOtherTriggers",
+        "BTTTriggerName": f"Trigger {i}",
+        "BTTLastUpdatedAt": 1764432921.0 + i,
+        "BTTActionsToExecute": [
+            {
+                "BTTUUID": trigger_uuid(10_000 + i),
+                "BTTTriggerParentUUID": trigger_uuid(i),
+                "BTTPredefinedActionType": 248,
+            }
+        ],
+    }
+
+
+def write_preset(
+    path: Path, content: dict | list[dict], compression: str | None = None
+) -> str:
+    """Write a preset file and return its path.
+
+    content is a whole preset, or a list of triggers that are put into a
+    Global app. compression is None, 'gzip', 'zlib' or 'zip'.
+    """
+    preset = content
+    if isinstance(content, list):
+        preset = {
+            "BTTPresetName": "Test",
+            "BTTPresetContent": [
+                {
+                    "BTTAppName": "Global",
+                    "BTTAppBundleIdentifier": "BT.G",
+                    "BTTTriggers": content,
+                }
+            ],
+        }
+    data = json.dumps(preset, indent=2).encode()
+    if compression == "gzip":
+        data = gzip.compress(data)
+    elif compression == "zlib":
+        data = zlib.compress(data)
+    elif compression == "zip":
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("Preset.bttpreset", data)
+        data = buffer.getvalue()
+    path.write_bytes(data)
+    return str(path)
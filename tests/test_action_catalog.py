@@ -0,0 +1,196 @@
+"""
+Tests for the action type catalog.
+"""
+
+import json
+
+import pytest
+from preset_helpers import write_preset
+
+from btt_mcp.models import AddTriggerInput, ScanActionTypesInput
+from btt_mcp.services import action_catalog as catalog_service
+from btt_mcp.services.action_catalog import ActionCatalog, definition_actions
+from btt_mcp.tools.reference import LookupReferenceInput
+
+
+def shell_action(script: str, uuid: str) -> dict:
+    return {
+        "BTTUUID": uuid,
+        "BTTOrder": 0,
+        "BTTPredefinedActionType": 206,
+        "BTTPredefinedActionName": "Execute Shell Script / Task",
+        "BTTShellTaskActionScript": script,
+        "BTTShellTaskActionConfig": "/bin/bash:::-c",
+    }
+
+
+def make_triggers() -> list[dict]:
+    return [
+        {
+            "BTTUUID": "T1",
+            "BTTTriggerClass": "BTTTriggerTypeKeyboardShortcut",
+            "BTTActionsToExecute": [
+                shell_action("echo hi", "A1"),
+                {"BTTUUID": "A2", "BTTPredefinedActionType": "5"},
+            ],
+        },
+        {
+            "BTTUUID": "M1",
+            "BTTTriggerClass": "BTTTriggerTypeFloatingMenu",
+            "BTTMenuItems": [
+                {
+                    "BTTUUID": "I1",
+                    "BTTActionsToExecute": [
+                        shell_action("x" * 500, "A3"),
+                        {"BTTUUID": "A4", "BTTPredefinedActionName": "No type"},
+                    ],
+                }
+            ],
+        },
+    ]
+
+
+class TestActionCatalog:
+    """Tests for building and querying the catalog."""
+
+    def test_actions_are_counted_once(self):
+        catalog = ActionCatalog()
+        result = catalog.add_triggers(make_triggers())
+        assert (result.new_actions, result.new_types) == (3, [5, 206])
+
+        shell = catalog.get(206)
+        assert catalog.find("execute shell script / TASK") is shell
+        assert shell.count == 2
+        assert shell.param_keys == {
+            "BTTShellTaskActionScript": 2,
+            "BTTShellTaskActionConfig": 2,
+        }
+        assert "BTTUUID" not in shell.example
+        assert shell.example["BTTShellTaskActionScript"] == "echo hi"
+
+        # Reading the same triggers again, with new UUIDs, adds nothing
+        again = make_triggers()
+        again[0]["BTTActionsToExecute"][0]["BTTUUID"] = "other"
+        assert catalog.add_triggers(again).new_actions == 0
+        assert catalog.get(206).count == 2
+
+    def test_long_example_values_are_cut(self):
+        catalog = ActionCatalog()
+        assert catalog.add_action(shell_action("x" * 500, "A1"))
+        assert len(catalog.get(206).example["BTTShellTaskActionScript"]) == 201
+        assert not catalog.add_action({"BTTPredefinedActionType": True})
+
+    def test_preset_files_are_scanned_when_changed(self, tmp_path):
+        catalog = ActionCatalog()
+        write_preset(tmp_path / "a.json", make_triggers())
+        (tmp_path / "notes.txt").write_text("not a preset")
+
+        result = catalog.add_preset_files([str(tmp_path)])
+        assert (result.files_scanned, result.new_actions) == (1, 3)
+        result = catalog.add_preset_files([str(tmp_path / "a.json")])
+        assert (result.files_scanned, result.files_unchanged) == (0, 1)
+
+        write_preset(tmp_path / "a.json", [shell_action_trigger("date")])
+        result = catalog.add_preset_files([str(tmp_path / "a.json")])
+        assert (result.files_scanned, result.new_actions) == (1, 1)
+        assert catalog.get(206).count == 3
+
+        result = catalog.add_preset_files([str(tmp_path / "missing.json")])
+        assert result.errors and result.files_scanned == 0
+
+    def test_saved_and_loaded(self, tmp_path):
+        catalog = ActionCatalog(tmp_path / "action_types.json")
+        catalog.add_triggers(make_triggers())
+        catalog.save()
+
+        loaded = ActionCatalog(tmp_path / "action_types.json")
+        assert [t.type_id for t in loaded.all()] == [5, 206]
+        assert loaded.find("Execute Shell Script / Task").count == 2
+        assert loaded.add_triggers(make_triggers()).new_actions == 0
+
+    def test_seen_fingerprints_are_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(catalog_service, "MAX_SEEN_FINGERPRINTS", 3)
+        catalog = ActionCatalog(tmp_path / "action_types.json")
+        for i in range(5):
+            catalog.add_action(shell_action(f"echo {i}", f"A{i}"))
+        assert len(catalog._seen) == 3
+        catalog.save()
+
+        data = json.loads((tmp_path / "action_types.json").read_text())
+        assert len(data["seen"]) == 3
+        assert catalog.get(206).count == 5
+
+    def test_hints(self):
+        catalog = ActionCatalog()
+        catalog.add_triggers(make_triggers())
+        trigger = {"BTTActionsToExecute": [{"BTTPredefinedActionType": 206}]}
+        assert catalog.hints(definition_actions(json.dumps(trigger))) == [
+            "action type 206 (Execute Shell Script / Task) is usually configured "
+            "with BTTShellTaskActionScript, BTTShellTaskActionConfig"
+        ]
+        assert catalog.hints([shell_action("ls", "A9")]) == []
+        assert definition_actions("not json") == []
+
+
+def shell_action_trigger(script: str) -> dict:
+    return {
+        "BTTUUID": "T9",
+        "BTTTriggerClass": "BTTTriggerTypeOtherTriggers",
+        "BTTActionsToExecute": [shell_action(script, "A9")],
+    }
+
+
+class TestActionCatalogTools:
+    """Tests for the tools that feed and query the catalog."""
+
+    @pytest.fixture
+    def catalog(self, monkeypatch):
+        from btt_mcp.tools import actions, reference, triggers
+
+        catalog = ActionCatalog()
+        for module in (actions, reference, triggers):
+            monkeypatch.setattr(module, "action_catalog", catalog)
+
+        async def fake_request(endpoint, params, config):
+            if endpoint == "get_triggers":
+                return json.dumps(make_triggers())
+            return ""
+
+        monkeypatch.setattr(actions, "btt_request", fake_request)
+        monkeypatch.setattr(triggers, "btt_request", fake_request)
+        return catalog
+
+    async def test_scan_and_lookup(self, tmp_path, catalog):
+        from btt_mcp.tools import actions, reference
+
+        path = write_preset(tmp_path / "p.json", [shell_action_trigger("date")])
+        result = await actions.btt_scan_action_types(
+            ScanActionTypesInput(preset_paths=[path])
+        )
+        assert "**New actions:** 4 | **New action types:** 2" in result
+        assert "| 206 | Execute Shell Script / Task | 3 |" in result
+
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(topic="action 206")
+        )
+        assert result.startswith("### Action Type 206: Execute Shell Script / Task")
+        assert '"BTTShellTaskActionConfig": "/bin/bash:::-c"' in result
+
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(topic="action types")
+        )
+        assert "| 5 |  | 1 |  |" in result
+        assert "BTT Predefined Action Types" in result
+
+    async def test_trigger_tools(self, catalog):
+        from btt_mcp.models import GetTriggersInput
+        from btt_mcp.tools import triggers
+
+        await triggers.btt_get_triggers(GetTriggersInput(response_format="json"))
+        assert catalog.get(206).count == 2
+
+        trigger = {"BTTActionsToExecute": [{"BTTPredefinedActionType": 206}]}
+        result = await triggers.btt_add_trigger(
+            AddTriggerInput(trigger_json=json.dumps(trigger))
+        )
+        assert result.startswith("Trigger added successfully.\n\nNote: action type 206")
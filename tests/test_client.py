@@ -53,3 +53,35 @@ class TestConfig:
         # This may return None if BTT is not installed
         path = get_bttcli_path()
         assert path is None or path.endswith("bttcli")
+
+
+class TestHttpClientPool:
+    """Tests for the pooled HTTP clients."""
+
+    async def test_client_reused_per_host(self):
+        from btt_mcp.client import close_http_clients, get_http_client
+
+        config = BTTConnectionConfig()
+        client = get_http_client(config)
+        assert get_http_client(BTTConnectionConfig()) is client
+        assert get_http_client(BTTConnectionConfig(port=9999)) is not client
+
+        await close_http_clients()
+        assert client.is_closed
+        assert get_http_client(config) is not client
+        await close_http_clients()
+
+    async def test_dropped_connection_is_reported(self, monkeypatch):
+        import httpx
+
+        from btt_mcp.client import http
+
+        def drop(request):
+            raise httpx.RemoteProtocolError("Server disconnected", request=request)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(drop))
+        monkeypatch.setattr(http, "get_http_client", lambda config: client)
+        result = await http.http_request("get_triggers", {}, BTTConnectionConfig())
+        assert result.startswith("Error: Connection to BTT webserver at 127.0.0.1")
+        assert "RemoteProtocolError" in result
+        await client.aclose()
@@ -0,0 +1,173 @@
+"""
+Tests for clipboard services and tools.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+
+import httpx
+import pytest
+
+from btt_mcp.client import http as http_client
+from btt_mcp.models import (
+    ClipboardItem,
+    GetClipboardFormatsInput,
+    GetClipboardInput,
+    SetClipboardContentsInput,
+)
+from btt_mcp.models.common import BTTConnectionConfig
+from btt_mcp.services import clipboard as clipboard_service
+from btt_mcp.services.clipboard import Base64StreamDecoder, save_clipboard
+from btt_mcp.tools import clipboard as clipboard_tools
+
+CLIPBOARD = {
+    "NSPasteboardTypeString": "Hello",
+    "NSPasteboardTypeHTML": "<b>Hello</b>",
+}
+
+
+@pytest.fixture
+def fake_btt(monkeypatch):
+    """Serve clipboard formats from CLIPBOARD and record requests."""
+    requests = []
+    in_flight = 0
+    peak = 0
+
+    async def fake_request(endpoint, params, config):
+        nonlocal in_flight, peak
+        requests.append((endpoint, params))
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if endpoint == "get_clipboard_content":
+            return CLIPBOARD.get(params["format"], "")
+        return ""
+
+    monkeypatch.setattr(clipboard_service, "btt_request", fake_request)
+    return requests, lambda: peak
+
+
+class TestClipboardFormats:
+    """Tests for fetching and setting several formats at once."""
+
+    async def test_formats_are_fetched_concurrently(self, fake_btt):
+        requests, peak = fake_btt
+        result = await clipboard_tools.btt_get_clipboard_formats(
+            GetClipboardFormatsInput(response_format="json")
+        )
+        assert json.loads(result) == {
+            "NSPasteboardTypeString": "Hello",
+            "NSPasteboardTypeHTML": "<b>Hello</b>",
+            "NSPasteboardTypeRTF": "",
+        }
+        assert len(requests) == 3
+        assert peak() == 3
+
+    async def test_markdown_marks_missing_formats(self, fake_btt):
+        result = await clipboard_tools.btt_get_clipboard_formats(
+            GetClipboardFormatsInput(
+                formats=["NSPasteboardTypeString", "NSPasteboardTypePNG"]
+            )
+        )
+        assert "### NSPasteboardTypeString\n\n```\nHello\n```" in result
+        assert "### NSPasteboardTypePNG\n\n_Not on the clipboard._" in result
+
+    async def test_set_contents_in_one_request(self, fake_btt):
+        requests, _ = fake_btt
+        result = await clipboard_tools.btt_set_clipboard_contents(
+            SetClipboardContentsInput(
+                items=[
+                    ClipboardItem(content=" Hi ", format="NSPasteboardTypeString"),
+                    ClipboardItem(content="<i>Hi</i>", format="NSPasteboardTypeHTML"),
+                ]
+            )
+        )
+        assert result.startswith("Clipboard content set in 2 format(s)")
+        assert len(requests) == 1
+        endpoint, params = requests[0]
+        assert endpoint == "set_clipboard_contents"
+        assert json.loads(params["contents"]) == [" Hi ", "<i>Hi</i>"]
+        assert json.loads(params["formats"]) == [
+            "NSPasteboardTypeString",
+            "NSPasteboardTypeHTML",
+        ]
+
+
+class TestSaveClipboard:
+    """Tests for streaming clipboard content into a file."""
+
+    @pytest.fixture
+    def serve(self, monkeypatch):
+        """Serve a response body from a mock transport."""
+
+        def serve(status_code: int, body: bytes):
+            transport = httpx.MockTransport(
+                lambda request: httpx.Response(status_code, content=body)
+            )
+            client = httpx.AsyncClient(transport=transport)
+            monkeypatch.setattr(http_client, "get_http_client", lambda config: client)
+
+        return serve
+
+    def test_decoder_handles_split_groups(self):
+        data = os.urandom(1000)
+        encoded = base64.encodebytes(data)  # wrapped with line breaks
+        chunks = []
+        decoder = Base64StreamDecoder(chunks.append)
+        for start in range(0, len(encoded), 7):
+            decoder.feed(encoded[start : start + 7])
+        decoder.close()
+        assert b"".join(chunks) == data
+        assert decoder.size == 1000
+
+    def test_decoder_rejects_invalid_data(self):
+        decoder = Base64StreamDecoder(lambda data: None)
+        with pytest.raises(ValueError):
+            decoder.feed(b"QUJD!!!!")
+        decoder = Base64StreamDecoder(lambda data: None)
+        decoder.feed(b"QUJD")
+        decoder.feed(b"QQ")
+        with pytest.raises(ValueError, match="Truncated"):
+            decoder.close()
+
+    async def test_streams_into_file(self, serve, tmp_path, monkeypatch):
+        data = os.urandom(300_000)
+        serve(200, base64.b64encode(data))
+        monkeypatch.setattr(clipboard_service, "CLIPBOARD_CHUNK_SIZE", 1000)
+
+        saved = await save_clipboard(
+            "NSPasteboardTypePNG", BTTConnectionConfig(), str(tmp_path)
+        )
+        assert saved.path.endswith(".png")
+        assert saved.size == len(data)
+        assert saved.sha256 == hashlib.sha256(data).hexdigest()
+        with open(saved.path, "rb") as file:
+            assert file.read() == data
+
+    async def test_empty_clipboard_leaves_no_file(self, serve, tmp_path):
+        serve(200, b"")
+        with pytest.raises(ValueError, match="No NSPasteboardTypePNG content"):
+            await save_clipboard(
+                "NSPasteboardTypePNG", BTTConnectionConfig(), str(tmp_path)
+            )
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_tool_reports_file(self, serve, tmp_path):
+        serve(200, base64.b64encode(b"Hello"))
+        result = await clipboard_tools.btt_get_clipboard(
+            GetClipboardInput(save_to_file=True, directory=str(tmp_path))
+        )
+        assert "Size:** 5 bytes" in result
+        assert hashlib.sha256(b"Hello").hexdigest() in result
+
+    async def test_tool_reports_http_error(self, serve, tmp_path):
+        serve(403, b"")
+        result = await clipboard_tools.btt_get_clipboard(
+            GetClipboardInput(save_to_file=True, directory=str(tmp_path))
+        )
+        assert result.startswith("Error: Authentication failed")
+        assert list(tmp_path.iterdir()) == []
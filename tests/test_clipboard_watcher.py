@@ -0,0 +1,202 @@
+"""
+Tests for the clipboard watcher and its history.
+"""
+
+import asyncio
+import importlib
+import json
+
+import pytest
+
+from btt_mcp.models import GetClipboardHistoryEntryInput, ListClipboardHistoryInput
+from btt_mcp.services import clipboard as clipboard_service
+from btt_mcp.services.clipboard_watcher import ClipboardWatcher
+
+# The package re-exports the shared instance under the module's name
+watcher_service = importlib.import_module("btt_mcp.services.clipboard_watcher")
+
+
+class FakeSession:
+    """Collects resources/updated notifications."""
+
+    def __init__(self):
+        self.updated = []
+
+    async def send_resource_updated(self, uri):
+        self.updated.append(str(uri))
+
+
+@pytest.fixture
+def clipboard(monkeypatch):
+    """Serve the clipboard from a one-element list and count reads."""
+    content = [""]
+    reads = []
+
+    async def fake_request(endpoint, params, config):
+        assert endpoint == "get_clipboard_content"
+        reads.append(params["format"])
+        return content[0]
+
+    monkeypatch.setattr(clipboard_service, "btt_request", fake_request)
+    return content, reads
+
+
+class TestClipboardHistory:
+    """Tests for deduplication and the bounded history."""
+
+    def test_unchanged_content_is_ignored(self):
+        watcher = ClipboardWatcher()
+        assert watcher.record("one") is not None
+        assert watcher.record("one") is None
+        assert len(watcher) == 1
+
+    def test_repeated_copy_moves_to_front(self):
+        watcher = ClipboardWatcher()
+        first = watcher.record("one")
+        watcher.record("two")
+        again = watcher.record("one")
+        assert again is first
+        assert first.copies == 2
+        assert [entry.content for entry in watcher.history()] == ["one", "two"]
+        assert watcher.stats.repeats == 1
+
+    def test_fingerprint_collision_keeps_contents_apart(self, monkeypatch):
+        monkeypatch.setattr(watcher_service, "fingerprint", lambda data: (len(data), 0))
+        watcher = ClipboardWatcher()
+        first = watcher.record("ab")
+        second = watcher.record("cd")
+        assert second is not first
+        assert second.content == "cd"
+        assert watcher.get(first.id) is None
+        assert [entry.content for entry in watcher.history()] == ["cd"]
+
+    def test_bounded_by_count(self):
+        watcher = ClipboardWatcher(history_size=3)
+        for i in range(5):
+            watcher.record(f"entry {i}")
+        assert [entry.content for entry in watcher.history()] == [
+            "entry 4",
+            "entry 3",
+            "entry 2",
+        ]
+        assert watcher.get(1) is None
+        assert watcher.stats.evictions == 2
+
+    def test_bounded_by_size(self):
+        watcher = ClipboardWatcher(max_bytes=25)
+        for text in ("a" * 10, "b" * 10, "c" * 10):
+            watcher.record(text)
+        assert len(watcher) == 2
+        assert watcher.total_bytes == 20
+
+    def test_oversized_content_is_not_kept(self):
+        watcher = ClipboardWatcher(max_bytes=10)
+        watcher.record("small")
+        entry = watcher.record("x" * 100)
+        assert entry.content is None
+        assert entry.size == 100
+        assert watcher.total_bytes == 5
+        assert len(watcher) == 2
+
+
+class TestClipboardWatcher:
+    """Tests for sampling, notifications and the adaptive rate."""
+
+    async def test_notifies_on_change_only(self, clipboard):
+        content, _ = clipboard
+        watcher = ClipboardWatcher()
+        session = FakeSession()
+        watcher._subscribers.add(session)
+
+        content[0] = "one"
+        assert await watcher.sample_once() is None  # baseline
+        assert await watcher.sample_once() is None
+        content[0] = "two"
+        entry = await watcher.sample_once()
+        assert entry.content == "two"
+        assert session.updated == ["btt://clipboard/latest"]
+        assert len(watcher) == 2
+
+    async def test_concealed_content_is_excluded(self, monkeypatch):
+        requests = []
+
+        async def fake_request(endpoint, params, config):
+            requests.append(params)
+            return ""
+
+        monkeypatch.setattr(clipboard_service, "btt_request", fake_request)
+        await ClipboardWatcher().sample_once()
+        assert requests[0]["excludeConcealed"] == "1"
+
+        from btt_mcp.tools import clipboard as clipboard_tools
+
+        await clipboard_tools.btt_clipboard_resource()
+        assert requests[1]["excludeConcealed"] == "1"
+
+    async def test_interval_backs_off_while_unchanged(self, clipboard):
+        content, reads = clipboard
+        content[0] = "same"
+        watcher = ClipboardWatcher(min_interval=0.01, max_interval=0.04)
+        await watcher.start()
+        await asyncio.sleep(0.15)
+        assert watcher.interval == 0.04
+        count = len(reads)
+
+        content[0] = "changed"
+        await asyncio.sleep(0.06)
+        assert watcher.latest().content == "changed"
+        await watcher.stop()
+        assert not watcher.running
+        assert len(reads) > count
+
+    async def test_subscription_starts_watching(self, clipboard):
+        watcher = ClipboardWatcher(min_interval=0.01)
+        session = FakeSession()
+        watcher.subscribe(session)
+        assert watcher.running
+        watcher.unsubscribe(session)
+        await asyncio.sleep(0.05)
+        assert not watcher.running
+
+
+class TestClipboardHistoryTools:
+    """Tests for the history tools."""
+
+    @pytest.fixture
+    def tools(self, monkeypatch):
+        from btt_mcp.tools import clipboard as clipboard_tools
+
+        watcher = ClipboardWatcher()
+        monkeypatch.setattr(clipboard_tools, "clipboard_watcher", watcher)
+        return clipboard_tools, watcher
+
+    async def test_list_and_fetch(self, tools):
+        clipboard_tools, watcher = tools
+        watcher.record("first | line\nsecond line")
+        watcher.record("other")
+
+        listing = await clipboard_tools.btt_list_clipboard_history(
+            ListClipboardHistoryInput()
+        )
+        assert "| 1 |" in listing
+        assert "first \\| line second line" in listing
+        assert listing.index("| 2 |") < listing.index("| 1 |")
+
+        data = json.loads(
+            await clipboard_tools.btt_list_clipboard_history(
+                ListClipboardHistoryInput(response_format="json", limit=1)
+            )
+        )
+        assert [entry["id"] for entry in data["history"]] == [2]
+
+        content = await clipboard_tools.btt_get_clipboard_history_entry(
+            GetClipboardHistoryEntryInput(entry_id=1)
+        )
+        assert content == "first | line\nsecond line"
+
+    async def test_unknown_entry(self, tools):
+        clipboard_tools, _ = tools
+        result = await clipboard_tools.btt_get_clipboard_history_entry(
+            GetClipboardHistoryEntryInput(entry_id=99)
+        )
+        assert result.startswith("Error: No clipboard history entry")
@@ -3,6 +3,7 @@ Tests for BTT MCP formatters.
 """
 
 from btt_mcp.formatters import (
+    format_action_type,
     format_preset_details,
     format_trigger,
     format_triggers_list,
@@ -136,3 +137,25 @@ class TestFormatPresetDetails:
         presets = [{"name": "Hidden", "hidden": 1}]
         result = format_preset_details(presets)
         assert "Hidden: Yes" in result
+
+
+class TestFormatActionType:
+    """Tests for action type formatting."""
+
+    def test_action_type(self):
+        action_type = {
+            "type_id": 206,
+            "name": "Execute Shell Script / Task",
+            "count": 2,
+            "param_keys": {"BTTShellTaskActionScript": 2},
+            "example": {"BTTPredefinedActionType": 206},
+        }
+        result = format_action_type(action_type)
+        assert result.startswith("### Action Type 206: Execute Shell Script / Task")
+        assert "`BTTShellTaskActionScript` (2)" in result
+        assert '"BTTPredefinedActionType": 206' in result
+
+    def test_unnamed_action_type(self):
+        result = format_action_type({"type_id": 5, "count": 1})
+        assert "### Action Type 5: (unnamed)" in result
+        assert "Parameters" not in result
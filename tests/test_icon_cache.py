@@ -0,0 +1,150 @@
+"""
+Tests for the encoded widget icon cache.
+"""
+
+import base64
+import os
+import pathlib
+import shutil
+
+import pytest
+
+from btt_mcp.models import CacheIconInput, UpdateWidgetInput
+from btt_mcp.services import widget_updates as widget_service
+from btt_mcp.services.icon_cache import IconCache
+from btt_mcp.services.widget_updates import WidgetUpdateScheduler
+
+UUID = "12345678-1234-1234-1234-123456789012"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class TestIconCache:
+    """Tests for caching, keys and eviction."""
+
+    async def test_path_is_read_once(self, tmp_path, monkeypatch):
+        path = tmp_path / "icon.png"
+        path.write_bytes(PNG)
+        cache = IconCache()
+        first = await cache.load_path(str(path))
+
+        reads = []
+        original = pathlib.Path.read_bytes
+        monkeypatch.setattr(
+            pathlib.Path,
+            "read_bytes",
+            lambda self: reads.append(self) or original(self),
+        )
+        second = await cache.load_path(str(path))
+        assert second is first
+        assert reads == []
+        assert base64.b64decode(first.data) == PNG
+        assert first.key.startswith("icon:")
+
+    async def test_changed_file_is_reloaded(self, tmp_path):
+        path = tmp_path / "icon.png"
+        path.write_bytes(PNG)
+        cache = IconCache()
+        first = await cache.load_path(str(path))
+
+        path.write_bytes(PNG + b"\x01")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = await cache.load_path(str(path))
+        assert second.key != first.key
+
+    async def test_same_content_shares_key(self, tmp_path):
+        path = tmp_path / "icon.png"
+        path.write_bytes(PNG)
+        cache = IconCache()
+        from_path = await cache.load_path(str(path))
+        from_data = await cache.add_data(base64.b64encode(PNG).decode())
+        assert from_path.key == from_data.key
+        assert len(cache) == 1
+
+    async def test_byte_bounded_lru(self):
+        cache = IconCache(max_bytes=150)
+        icons = [
+            await cache.add_data(base64.b64encode(PNG + bytes([i])).decode())
+            for i in range(3)
+        ]
+        assert cache.get(icons[0].key) is None
+        assert cache.get(icons[2].key) is not None
+        assert cache.total_bytes <= 150
+        assert cache.stats.evictions == 2
+
+    async def test_invalid_data(self):
+        with pytest.raises(ValueError):
+            await IconCache().add_data("not base64!")
+
+    async def test_missing_file(self, tmp_path):
+        with pytest.raises(ValueError):
+            await IconCache().load_path(str(tmp_path / "missing.png"))
+
+    async def test_downscale_without_sips(self, monkeypatch):
+        monkeypatch.setattr(shutil, "which", lambda name: None)
+        with pytest.raises(ValueError, match="sips"):
+            await IconCache().add_data(base64.b64encode(PNG).decode(), max_size=32)
+
+
+class TestIconTools:
+    """Tests for btt_cache_icon and icon_key in btt_update_widget."""
+
+    @pytest.fixture
+    def widget_tools(self, monkeypatch):
+        from btt_mcp.tools import widgets as widget_tools
+
+        sent = []
+
+        async def fake_request(endpoint, params, config):
+            sent.append(params)
+            return ""
+
+        monkeypatch.setattr(widget_service, "btt_request", fake_request)
+        monkeypatch.setattr(widget_tools, "icon_cache", IconCache())
+        monkeypatch.setattr(
+            widget_tools, "widget_scheduler", WidgetUpdateScheduler(max_rate=0)
+        )
+        return widget_tools, sent
+
+    async def test_update_with_icon_key(self, widget_tools, tmp_path):
+        tools, sent = widget_tools
+        path = tmp_path / "icon.png"
+        path.write_bytes(PNG)
+
+        result = await tools.btt_cache_icon(CacheIconInput(icon_path=str(path)))
+        key = result.split("`")[1]
+        result = await tools.btt_update_widget(
+            UpdateWidgetInput(uuid=UUID, icon_key=key)
+        )
+        assert "updated successfully" in result
+        assert sent[0]["icon_data"] == base64.b64encode(PNG).decode()
+
+    async def test_icon_data_is_cached(self, widget_tools):
+        tools, _ = widget_tools
+        result = await tools.btt_update_widget(
+            UpdateWidgetInput(uuid=UUID, icon_data=base64.b64encode(PNG).decode())
+        )
+        assert "Icon cached as `icon:" in result
+
+    async def test_line_wrapped_icon_data(self, widget_tools):
+        tools, sent = widget_tools
+        data = base64.encodebytes(PNG * 2).decode()
+        assert "\n" in data.strip()
+        result = await tools.btt_update_widget(
+            UpdateWidgetInput(uuid=UUID, icon_data=data)
+        )
+        assert "updated successfully" in result
+        assert sent[0]["icon_data"] == base64.b64encode(PNG * 2).decode()
+
+    async def test_unknown_icon_key(self, widget_tools):
+        tools, sent = widget_tools
+        result = await tools.btt_update_widget(
+            UpdateWidgetInput(uuid=UUID, icon_key="icon:000000000000")
+        )
+        assert result.startswith("Error: Unknown icon key")
+        assert sent == []
+
+    async def test_cache_icon_requires_one_source(self, widget_tools):
+        tools, _ = widget_tools
+        result = await tools.btt_cache_icon(CacheIconInput())
+        assert result.startswith("Error:")
@@ -0,0 +1,149 @@
+"""
+Tests for floating menu templates and cloning.
+"""
+
+import json
+
+from btt_mcp.models import CloneMenuTemplateInput, RegisterMenuTemplateInput
+from btt_mcp.services.menu_templates import MenuTemplate, MenuTemplateRegistry
+
+MENU_UUID = "AAAAAAAA-0000-0000-0000-000000000000"
+ITEM_UUID = "BBBBBBBB-0000-0000-0000-000000000000"
+SUBITEM_UUID = "CCCCCCCC-0000-0000-0000-000000000000"
+
+MENU = {
+    "BTTTriggerType": 767,
+    "BTTTriggerClass": "BTTTriggerTypeFloatingMenu",
+    "BTTUUID": MENU_UUID,
+    "BTTMenuName": "Template",
+    "BTTMenuConfig": {"BTTMenuFrameWidth": 300, "BTTMenuFrameHeight": 200},
+    "BTTMenuItems": [
+        {
+            "BTTTriggerType": 774,
+            "BTTUUID": ITEM_UUID,
+            "BTTTriggerParentUUID": MENU_UUID,
+            "BTTMenuItems": [
+                {
+                    "BTTTriggerType": 773,
+                    "BTTUUID": SUBITEM_UUID,
+                    "BTTTriggerParentUUID": ITEM_UUID,
+                    "BTTMenuItemActions": [
+                        {
+                            "BTTPredefinedActionType": 368,
+                            "BTTFloatingMenuUUID": MENU_UUID,
+                        }
+                    ],
+                }
+            ],
+        }
+    ],
+}
+
+
+class TestMenuTemplate:
+    """Tests for template compilation and rendering."""
+
+    def test_counts(self):
+        template = MenuTemplate.from_trigger("t", MENU)
+        assert template.uuid_count == 3
+        assert template.item_count == 1
+
+    def test_render_reassigns_all_uuids(self):
+        template = MenuTemplate.from_trigger("t", MENU)
+        menu_uuid, text = template.render()
+        clone = json.loads(text)
+
+        item = clone["BTTMenuItems"][0]
+        subitem = item["BTTMenuItems"][0]
+        assert clone["BTTUUID"] == menu_uuid
+        assert menu_uuid != MENU_UUID
+        assert item["BTTUUID"] != ITEM_UUID
+        assert item["BTTTriggerParentUUID"] == menu_uuid
+        assert subitem["BTTTriggerParentUUID"] == item["BTTUUID"]
+        assert subitem["BTTMenuItemActions"][0]["BTTFloatingMenuUUID"] == menu_uuid
+
+    def test_clones_are_distinct(self):
+        template = MenuTemplate.from_trigger("t", MENU)
+        first, _ = template.render()
+        second, _ = template.render()
+        assert first != second
+
+    def test_overrides(self):
+        template = MenuTemplate.from_trigger("t", MENU)
+        _, text = template.render(
+            {"BTTMenuName": "Safari", "BTTMenuConfig": {"BTTMenuFrameWidth": 500}}
+        )
+        clone = json.loads(text)
+        assert clone["BTTMenuName"] == "Safari"
+        assert clone["BTTMenuConfig"] == {
+            "BTTMenuFrameWidth": 500,
+            "BTTMenuFrameHeight": 200,
+        }
+
+    def test_source_is_not_modified(self):
+        before = json.dumps(MENU)
+        MenuTemplate.from_trigger("t", MENU).render({"BTTMenuName": "x"})
+        assert json.dumps(MENU) == before
+
+    def test_menu_without_uuid(self):
+        template = MenuTemplate.from_trigger("t", {"BTTMenuName": "New"})
+        menu_uuid, text = template.render()
+        assert json.loads(text)["BTTUUID"] == menu_uuid
+
+
+class TestMenuTemplateRegistry:
+    """Tests for the template registry."""
+
+    def test_register_get_remove(self):
+        registry = MenuTemplateRegistry()
+        registry.register("b", MENU)
+        registry.register("a", MENU)
+        assert [t.name for t in registry.list()] == ["a", "b"]
+        assert registry.get("a") is not None
+        assert registry.remove("a") is True
+        assert registry.get("a") is None
+        assert registry.remove("a") is False
+
+
+class TestCloneMenuTemplateTool:
+    """Tests for the template tools."""
+
+    async def test_clone_many(self, monkeypatch):
+        from btt_mcp.tools import floating_menus
+
+        created = []
+
+        async def fake_request(endpoint, params, config):
+            assert endpoint == "add_new_trigger"
+            created.append(json.loads(params["json"]))
+            return ""
+
+        monkeypatch.setattr(floating_menus, "btt_request", fake_request)
+        monkeypatch.setattr(floating_menus, "menu_templates", MenuTemplateRegistry())
+
+        await floating_menus.btt_register_menu_template(
+            RegisterMenuTemplateInput(template_name="base", menu_json=json.dumps(MENU))
+        )
+        result = await floating_menus.btt_clone_menu_template(
+            CloneMenuTemplateInput(
+                template_name="base",
+                names=["Safari", "Mail"],
+                app_bundle_identifiers=["com.apple.Safari", "com.apple.mail"],
+            )
+        )
+
+        assert "Created 2/2" in result
+        assert {menu["BTTAppBundleIdentifier"] for menu in created} == {
+            "com.apple.Safari",
+            "com.apple.mail",
+        }
+        assert len({menu["BTTUUID"] for menu in created}) == 2
+
+    async def test_unknown_template(self, monkeypatch):
+        from btt_mcp.tools import floating_menus
+
+        monkeypatch.setattr(floating_menus, "menu_templates", MenuTemplateRegistry())
+        result = await floating_menus.btt_clone_menu_template(
+            CloneMenuTemplateInput(template_name="missing", names=["x"])
+        )
+        assert result.startswith("Error:")
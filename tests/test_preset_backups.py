@@ -0,0 +1,168 @@
+"""
+Tests for content-addressed preset backups.
+"""
+
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+
+from btt_mcp.models import (
+    BackupPresetInput,
+    ListPresetBackupsInput,
+    RestorePresetBackupInput,
+)
+from btt_mcp.services.preset_backups import PresetBackupStore
+
+
+def make_preset(names: list[str]) -> dict:
+    return {
+        "BTTPresetName": "Backup",
+        "BTTPresetUUID": "AAAAAAAA-0000-0000-0000-000000000000",
+        "BTTPresetContent": [
+            {
+                "BTTAppName": "Global",
+                "BTTAppBundleIdentifier": "BT.G",
+                "BTTTriggers": [
+                    {"BTTUUID": f"{i:08d}", "BTTTriggerName": name, "BTTOrder": i}
+                    for i, name in enumerate(names)
+                ],
+            },
+            {"BTTAppName": "Empty", "BTTTriggers": []},
+        ],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PresetBackupStore(tmp_path / "backups")
+
+
+class TestPresetBackupStore:
+    """Tests for backing up and restoring preset files."""
+
+    def test_second_backup_stores_only_changes(self, store, tmp_path):
+        path = tmp_path / "preset.bttpreset"
+        path.write_text(json.dumps(make_preset(["a", "b", "c"])))
+        first = store.backup_file(str(path))
+        # Three triggers, two apps and the metadata
+        assert (first.triggers, first.new_blobs) == (3, 6)
+
+        path.write_text(json.dumps(make_preset(["a", "B", "c"])))
+        second = store.backup_file(str(path))
+        assert (second.triggers, second.new_blobs) == (3, 1)
+        assert [b.id for b in store.list_backups()] == sorted(
+            [first.id, second.id], reverse=True
+        )
+
+    def test_restore_round_trip(self, store, tmp_path):
+        preset = make_preset(["a", "b", "ü"])
+        path = tmp_path / "preset.bttpreset"
+        path.write_bytes(gzip.compress(json.dumps(preset).encode()))
+        summary = store.backup_file(str(path))
+        assert summary.name == "Backup"
+
+        output = tmp_path / "restored.bttpreset"
+        assert store.restore(summary.id, str(output)) == 3
+        assert json.loads(output.read_text()) == preset
+
+        with pytest.raises(ValueError, match="already exists"):
+            store.restore(summary.id, str(output))
+        assert store.restore(summary.id, str(output), overwrite=True) == 3
+
+    async def test_concurrent_backups_of_the_same_preset(self, store, tmp_path):
+        preset = make_preset([f"trigger {i}" * 1000 for i in range(20)])
+        path = tmp_path / "preset.bttpreset"
+        path.write_text(json.dumps(preset))
+
+        summaries = await asyncio.gather(
+            *(asyncio.to_thread(store.backup_file, str(path)) for _ in range(8))
+        )
+        assert not list(store.root.rglob("*.tmp"))
+        output = tmp_path / "restored.bttpreset"
+        assert store.restore(summaries[-1].id, str(output)) == 20
+        assert json.loads(output.read_text()) == preset
+
+    def test_missing_backup_and_blob(self, store, tmp_path):
+        with pytest.raises(ValueError, match="not found"):
+            store.load_manifest("20250101T000000Z-00000000")
+        with pytest.raises(ValueError, match="Invalid backup ID"):
+            store.load_manifest("../escape")
+
+        path = tmp_path / "preset.bttpreset"
+        path.write_text(json.dumps(make_preset(["a"])))
+        summary = store.backup_file(str(path))
+        for blob in store.blob_dir.rglob("*.json"):
+            blob.unlink()
+        with pytest.raises(ValueError, match="missing"):
+            store.restore(summary.id, str(tmp_path / "out.bttpreset"))
+        assert not (tmp_path / "out.bttpreset").exists()
+
+    def test_not_a_preset(self, store, tmp_path):
+        path = tmp_path / "list.json"
+        path.write_text("[]")
+        with pytest.raises(ValueError, match="not an exported BTT preset"):
+            store.backup_file(str(path))
+        assert store.list_backups() == []
+
+    @pytest.mark.parametrize(
+        "compress",
+        [
+            lambda data: gzip.compress(data)[:-40],
+            lambda data: zlib.compress(data)[:2] + b"not zlib" * 10,
+            lambda data: b"\x1f\x8b" + b"not gzip" * 10,
+        ],
+        ids=["truncated gzip", "corrupt zlib", "bad gzip header"],
+    )
+    def test_unreadable_preset(self, store, tmp_path, compress):
+        preset = make_preset([f"trigger {i}" for i in range(50)])
+        path = tmp_path / "preset.bttpreset"
+        path.write_bytes(compress(json.dumps(preset).encode()))
+        with pytest.raises(ValueError, match="Could not read preset file"):
+            store.backup_file(str(path))
+        assert store.list_backups() == []
+
+
+class TestPresetBackupTools:
+    """Tests for the backup tools."""
+
+    async def test_backup_by_name_and_restore(self, store, tmp_path, monkeypatch):
+        from btt_mcp.tools import presets as preset_tools
+
+        async def fake_request(endpoint, params, config):
+            assert endpoint == "export_preset"
+            assert params["compress"] == "0"
+            with open(params["outputPath"], "w") as file:
+                json.dump(make_preset(["a", "b"]), file)
+            return ""
+
+        monkeypatch.setattr(preset_tools, "btt_request", fake_request)
+        monkeypatch.setattr(preset_tools, "preset_backups", store)
+
+        result = await preset_tools.btt_backup_preset(BackupPresetInput(name="Backup"))
+        assert "- Triggers: 2" in result
+        assert "- New blobs: 5" in result
+
+        listing = json.loads(
+            await preset_tools.btt_list_preset_backups(
+                ListPresetBackupsInput(response_format="json")
+            )
+        )
+        assert listing["total"] == 1
+        backup = listing["backups"][0]
+        assert backup["source"] == "preset 'Backup'"
+
+        output = tmp_path / "restored.bttpreset"
+        result = await preset_tools.btt_restore_preset_backup(
+            RestorePresetBackupInput(backup_id=backup["id"], output_path=str(output))
+        )
+        assert "(2 triggers)" in result
+        assert json.loads(output.read_text()) == make_preset(["a", "b"])
+
+    async def test_requires_name_or_path(self):
+        from btt_mcp.tools import presets as preset_tools
+
+        result = await preset_tools.btt_backup_preset(BackupPresetInput())
+        assert result == "Error: Provide exactly one of name or path"
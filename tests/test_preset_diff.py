@@ -0,0 +1,145 @@
+"""
+Tests for structural preset diffs.
+"""
+
+import copy
+import json
+
+import pytest
+from preset_helpers import make_trigger, trigger_uuid, write_preset
+
+from btt_mcp.models import DiffPresetsInput
+from btt_mcp.services.preset_diff import (
+    content_hash,
+    diff_fields,
+    diff_triggers,
+    iter_triggers,
+)
+from btt_mcp.services.preset_index import iter_preset_file
+
+
+@pytest.fixture
+def presets(tmp_path):
+    """An old preset and a copy with every kind of change."""
+    old = [make_trigger(i) for i in range(10)]
+    new = copy.deepcopy(old)
+    new[1]["BTTTriggerName"] = "Renamed"
+    new[2]["BTTActionsToExecute"][0]["BTTPredefinedActionType"] = 5
+    new[3]["BTTLastUpdatedAt"] = 0  # ignored
+    new[4]["BTTUUID"] = trigger_uuid(44)  # same content, new UUID
+    del new[5]
+    new.append(make_trigger(20))
+    return write_preset(tmp_path / "old.json", old), write_preset(
+        tmp_path / "new.json", new
+    )
+
+
+class TestDiffTriggers:
+    """Tests for matching and field-level changes."""
+
+    def test_all_kinds_of_changes(self, presets):
+        old_path, new_path = presets
+        diff = diff_triggers(
+            lambda: iter_preset_file(old_path), lambda: iter_preset_file(new_path)
+        )
+        assert [c.uuid for c in diff.added] == [trigger_uuid(20)]
+        assert [c.uuid for c in diff.removed] == [trigger_uuid(5)]
+        assert [(c.old_uuid, c.uuid) for c in diff.uuid_changed] == [
+            (trigger_uuid(4), trigger_uuid(44))
+        ]
+        assert [c.uuid for c in diff.modified] == [trigger_uuid(1), trigger_uuid(2)]
+        assert diff.unchanged == 6
+        assert (diff.old_count, diff.new_count) == (10, 10)
+
+        renamed, action = diff.modified
+        assert [(f.path, f.old, f.new) for f in renamed.fields] == [
+            ("BTTTriggerName", "Trigger 1", "Renamed")
+        ]
+        assert [f.path for f in action.fields] == [
+            "BTTActionsToExecute[0].BTTPredefinedActionType"
+        ]
+
+    def test_old_side_is_reread_only_for_modifications(self):
+        triggers = [make_trigger(i) for i in range(3)]
+        calls = []
+
+        def old():
+            calls.append("old")
+            return iter_triggers(triggers)
+
+        assert diff_triggers(old, lambda: iter_triggers(triggers)).identical
+        assert calls == ["old"]
+
+    def test_moved_menu_item_is_modified(self):
+        item = {"BTTUUID": trigger_uuid(100), "BTTMenuName": "Item"}
+        old = [make_trigger(1), make_trigger(2)]
+        old[0]["BTTMenuItems"] = [item]
+        new = copy.deepcopy(old)
+        new[1]["BTTMenuItems"] = new[0].pop("BTTMenuItems")
+
+        diff = diff_triggers(lambda: iter_triggers(old), lambda: iter_triggers(new))
+        assert [c.uuid for c in diff.modified] == [trigger_uuid(100)]
+        [change] = diff.modified[0].fields
+        assert (change.path, change.old, change.new) == (
+            "BTTTriggerParentUUID",
+            trigger_uuid(1),
+            trigger_uuid(2),
+        )
+        assert diff.unchanged == 2
+
+    def test_content_hash_ignores_identity_and_timestamps(self):
+        a = make_trigger(1)
+        b = make_trigger(2)
+        b["BTTTriggerName"] = "Trigger 1"
+        assert content_hash(a) == content_hash(b)
+
+    def test_field_changes(self):
+        changes = diff_fields({"a": 1, "b": [1, 2], "c": 1}, {"a": 2, "b": [1], "d": 1})
+        assert [(c.path, c.change) for c in changes] == [
+            ("a", "changed"),
+            ("b", "changed"),
+            ("c", "removed"),
+            ("d", "added"),
+        ]
+
+
+class TestDiffPresetsTool:
+    """Tests for btt_diff_presets."""
+
+    async def test_markdown_summary(self, presets):
+        from btt_mcp.tools import presets as preset_tools
+
+        old_path, new_path = presets
+        result = await preset_tools.btt_diff_presets(
+            DiffPresetsInput(old_path=old_path, new_path=new_path)
+        )
+        assert "**Added:** 1 | **Removed:** 1 | **Modified:** 2" in result
+        assert '  - `BTTTriggerName`: "Trigger 1" → "Renamed"' in result
+        assert f"  - was `{trigger_uuid(4)}`" in result
+
+    async def test_against_live_configuration(self, presets, monkeypatch):
+        from btt_mcp.tools import presets as preset_tools
+
+        old_path, _ = presets
+        live = [make_trigger(i) for i in range(10)]
+
+        async def fake_request(endpoint, params, config):
+            assert endpoint == "get_triggers"
+            return json.dumps(live)
+
+        monkeypatch.setattr(preset_tools, "btt_request", fake_request)
+        result = await preset_tools.btt_diff_presets(
+            DiffPresetsInput(old_path=old_path, response_format="json")
+        )
+        data = json.loads(result)
+        assert data["new"] == "live configuration"
+        assert data["unchanged"] == 10
+        assert data["added_count"] == 0
+
+    async def test_missing_file(self, tmp_path):
+        from btt_mcp.tools import presets as preset_tools
+
+        result = await preset_tools.btt_diff_presets(
+            DiffPresetsInput(old_path=str(tmp_path / "missing"), new_path="x")
+        )
+        assert result.startswith("Error: Could not open preset file")
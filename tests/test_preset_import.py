@@ -0,0 +1,177 @@
+"""
+Tests for staged preset imports.
+"""
+
+import copy
+import json
+
+import pytest
+from preset_helpers import make_trigger, trigger_uuid, write_preset
+
+from btt_mcp.models import StagePresetImportInput
+from btt_mcp.services.preset_import import plan_import
+
+
+def make_menu(i: int, items: list[int]) -> dict:
+    menu = make_trigger(i)
+    menu["BTTTriggerClass"] = "BTTTriggerTypeFloatingMenu"
+    menu["BTTMenuItems"] = [
+        {"BTTUUID": trigger_uuid(item), "BTTMenuName": f"Item {item}"} for item in items
+    ]
+    return menu
+
+
+@pytest.fixture
+def live():
+    return [make_trigger(i) for i in range(50)] + [make_menu(100, [101, 102])]
+
+
+class TestPlanImport:
+    """Tests for validating and planning an import."""
+
+    def test_only_changed_triggers_are_sent(self, tmp_path, live):
+        preset = copy.deepcopy(live)
+        preset[3]["BTTTriggerName"] = "Renamed"
+        preset[4]["BTTLastUpdatedAt"] = 0  # ignored
+        del preset[5]  # only in BTT: left alone
+        preset[-1]["BTTMenuItems"][0]["BTTMenuName"] = "Changed item"
+        preset[-1]["BTTMenuItems"].append(
+            {"BTTUUID": trigger_uuid(103), "BTTMenuName": "New item"}
+        )
+        preset.append(make_menu(200, [201]))
+        plan = plan_import(write_preset(tmp_path / "p.json", preset), live)
+
+        assert not plan.problems
+        steps = {step.uuid: step for step in plan.steps}
+        assert sorted(steps) == sorted(
+            [trigger_uuid(3), trigger_uuid(101), trigger_uuid(103), trigger_uuid(200)]
+        )
+        assert len(plan.diff.removed) == 1
+
+        update = steps[trigger_uuid(3)]
+        assert update.endpoint == "update_trigger"
+        assert update.params["uuid"] == trigger_uuid(3)
+        assert "BTTLastUpdatedAt" not in json.loads(update.params["json"])
+
+        item = steps[trigger_uuid(103)]
+        assert item.endpoint == "add_new_trigger"
+        assert item.params["trigger_parent_uuid"] == trigger_uuid(100)
+
+        menu = json.loads(steps[trigger_uuid(200)].params["json"])
+        assert menu["BTTAppBundleIdentifier"] == "BT.G"
+        # The new menu's item is added with it
+        assert [i["BTTUUID"] for i in menu["BTTMenuItems"]] == [trigger_uuid(201)]
+
+    def test_moved_menu_item_is_updated_with_its_parent(self, tmp_path, live):
+        live.append(make_menu(200, []))
+        preset = copy.deepcopy(live)
+        preset[-1]["BTTMenuItems"].append(preset[-2]["BTTMenuItems"].pop(1))
+        plan = plan_import(write_preset(tmp_path / "p.json", preset), live)
+
+        assert [step.uuid for step in plan.steps] == [trigger_uuid(102)]
+        assert plan.steps[0].endpoint == "update_trigger"
+        update = json.loads(plan.steps[0].params["json"])
+        assert update["BTTTriggerParentUUID"] == trigger_uuid(200)
+
+    def test_new_trigger_in_activation_group(self, tmp_path, live):
+        preset = {
+            "BTTPresetContent": [
+                {
+                    "BTTAppName": "Meetings",
+                    "BTTActivationGroupName": "Meetings",
+                    "BTTTriggers": [make_trigger(300)],
+                }
+            ]
+        }
+        path = tmp_path / "p.json"
+        path.write_text(json.dumps(preset))
+        plan = plan_import(str(path), live)
+
+        added = json.loads(plan.steps[0].params["json"])
+        assert "BTTAppBundleIdentifier" not in added
+        assert added["BTTActivationGroupName"] == "Meetings"
+
+    def test_validation_problems_stop_the_import(self, tmp_path, live):
+        broken = make_trigger(300)
+        del broken["BTTTriggerClass"]
+        broken["BTTActionsToExecute"] = {}
+        preset = live + [broken, make_trigger(1)]
+        plan = plan_import(write_preset(tmp_path / "p.json", preset), live)
+
+        assert plan.steps == []
+        assert plan.problems == [
+            f"Trigger {trigger_uuid(300)} has no BTTTriggerClass",
+            f"Trigger {trigger_uuid(300)}: BTTActionsToExecute must be a list",
+            f"Trigger {trigger_uuid(1)} appears more than once",
+        ]
+
+
+class TestStagePresetImportTool:
+    """Tests for btt_stage_preset_import."""
+
+    @pytest.fixture
+    def requests(self, monkeypatch, live):
+        from btt_mcp.services import preset_import
+        from btt_mcp.tools import presets as preset_tools
+
+        sent = []
+
+        async def fake_get_triggers(endpoint, params, config):
+            assert endpoint == "get_triggers"
+            return json.dumps(live)
+
+        async def fake_request(endpoint, params, config):
+            sent.append((endpoint, params))
+            if params.get("uuid") == trigger_uuid(2):
+                return "Error: HTTP 500 - failed"
+            return ""
+
+        monkeypatch.setattr(preset_tools, "btt_request", fake_get_triggers)
+        monkeypatch.setattr(preset_import, "btt_request", fake_request)
+        return sent
+
+    async def test_applies_changes(self, tmp_path, live, requests):
+        from btt_mcp.tools import presets as preset_tools
+
+        preset = copy.deepcopy(live)
+        preset[1]["BTTTriggerName"] = "Renamed"
+        preset[2]["BTTTriggerName"] = "Fails"
+        preset.append(make_trigger(60))
+        path = write_preset(tmp_path / "p.json", preset)
+
+        result = await preset_tools.btt_stage_preset_import(
+            StagePresetImportInput(path=path)
+        )
+        assert "**Changes:** 3 | **Unchanged:** 51" in result
+        assert "Applied 2/3" in result
+        failed = f"`{trigger_uuid(2)}` (BTTTriggerTypeOtherTriggers, Global) — Error"
+        assert failed in result
+        assert sorted(endpoint for endpoint, _ in requests) == [
+            "add_new_trigger",
+            "update_trigger",
+            "update_trigger",
+        ]
+
+    async def test_dry_run_sends_nothing(self, tmp_path, live, requests):
+        from btt_mcp.tools import presets as preset_tools
+
+        path = write_preset(tmp_path / "p.json", live + [make_trigger(60)])
+        data = json.loads(
+            await preset_tools.btt_stage_preset_import(
+                StagePresetImportInput(path=path, dry_run=True, response_format="json")
+            )
+        )
+        assert (data["added"], data["updated"], data["unchanged"]) == (1, 0, 53)
+        assert data["steps"][0]["result"] is None
+        assert requests == []
+
+    async def test_invalid_preset(self, tmp_path, live, requests):
+        from btt_mcp.tools import presets as preset_tools
+
+        path = write_preset(tmp_path / "p.json", live + [{"BTTTriggerName": "x"}])
+        result = await preset_tools.btt_stage_preset_import(
+            StagePresetImportInput(path=path)
+        )
+        assert result.startswith("Error:")
+        assert "- Trigger x has no BTTUUID" in result
+        assert requests == []
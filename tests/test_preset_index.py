@@ -0,0 +1,208 @@
+"""
+Tests for the offline preset file index.
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+from preset_helpers import trigger_uuid, write_preset
+
+from btt_mcp.models import GetPresetFileTriggerInput, SearchPresetFileInput
+from btt_mcp.services.preset_index import (
+    JsonStreamReader,
+    PresetIndexCache,
+    build_preset_index,
+    load_preset_trigger,
+)
+
+EXAMPLE_PRESET = Path(__file__).parent / "examples" / "example_settings.btt-preset"
+
+
+def make_preset(apps: int = 3, triggers_per_app: int = 20) -> dict:
+    content = []
+    for a in range(apps):
+        triggers = [
+            {
+                "BTTUUID": trigger_uuid(a * 1000 + t),
+                "BTTTriggerClass": (
+                    "BTTTriggerTypeKeyboardShortcut"
+                    if t % 2
+                    else "BTTTriggerTypeOtherTriggers"
+                ),
+                "BTTTriggerName": f"Trigger {a}-{t}",
+                "BTTEnabled": 1,
+                "BTTShortcutKeyCode": 1.5e3,
+                "BTTActionsToExecute": [{"BTTPredefinedActionType": 248}],
+            }
+            for t in range(triggers_per_app)
+        ]
+        # The app's name comes after its triggers for the last app
+        app = {"BTTTriggers": triggers} if a == apps - 1 else {}
+        app.update({"BTTAppName": f"App {a}", "BTTAppBundleIdentifier": f"com.app{a}"})
+        app.setdefault("BTTTriggers", triggers)
+        content.append(app)
+    return {
+        "BTTPresetName": "Synthetic",
+        "BTTPresetUUID": "AAAAAAAA-0000-0000-0000-000000000000",
+        "BTTGeneralSettings": {"BTTUseNewUI": True},
+        "BTTPresetContent": content,
+    }
+
+
+class TestJsonStreamReader:
+    """Tests for the pull parser."""
+
+    def test_walks_structure_across_tiny_chunks(self):
+        text = json.dumps({"a": [1, 22.5, {"b": 'x"y'}], "c": 12345678})
+        reader = JsonStreamReader(io.StringIO(text), chunk_size=3)
+        items = []
+        for key in reader.iter_object():
+            if key == "a":
+                for _ in reader.iter_array():
+                    items.append(reader.read_value())
+            else:
+                items.append(reader.read_value())
+        assert items == [1, 22.5, {"b": 'x"y'}, 12345678]
+        assert reader.peek() == ""
+
+    def test_invalid_json(self):
+        reader = JsonStreamReader(io.StringIO('{"a": [1, 2'), chunk_size=4)
+        with pytest.raises(ValueError):
+            for key in reader.iter_object():
+                for _ in reader.iter_array():
+                    reader.read_value()
+
+
+class TestPresetIndex:
+    """Tests for indexing preset files."""
+
+    @pytest.mark.parametrize("compression", [None, "gzip", "zlib", "zip"])
+    def test_formats(self, tmp_path, compression):
+        path = write_preset(tmp_path / "preset.bttpreset", make_preset(), compression)
+        index = build_preset_index(path)
+        assert index.name == "Synthetic"
+        assert len(index.triggers) == 60
+        assert len(index.by_class["BTTTriggerTypeKeyboardShortcut"]) == 30
+
+    def test_app_fields_after_triggers(self, tmp_path):
+        path = write_preset(tmp_path / "preset.bttpreset", make_preset())
+        index = build_preset_index(path)
+        entry = index.by_uuid[trigger_uuid(2005)]
+        assert (entry.app_name, entry.app_id) == ("App 2", "com.app2")
+
+    def test_search(self, tmp_path):
+        path = write_preset(tmp_path / "preset.bttpreset", make_preset())
+        index = build_preset_index(path)
+        assert [e.name for e in index.search("trigger 1-1")][:2] == [
+            "Trigger 1-1",
+            "Trigger 1-10",
+        ]
+        matches = index.search(
+            trigger_class="BTTTriggerTypeOtherTriggers", app="COM.APP0"
+        )
+        assert len(matches) == 10
+        assert index.search(trigger_uuid(7)) == [index.by_uuid[trigger_uuid(7)]]
+
+    def test_menu_items_are_indexed(self, tmp_path):
+        preset = make_preset(apps=1, triggers_per_app=1)
+        menu = preset["BTTPresetContent"][0]["BTTTriggers"][0]
+        menu["BTTMenuItems"] = [
+            {"BTTUUID": trigger_uuid(99), "BTTMenuName": "Item", "BTTEnabled": 0}
+        ]
+        index = build_preset_index(write_preset(tmp_path / "p.bttpreset", preset))
+        item = index.by_uuid[trigger_uuid(99)]
+        assert item.parent_uuid == trigger_uuid(0)
+        assert item.name == "Item"
+        assert not item.enabled
+
+    def test_load_trigger(self, tmp_path):
+        path = write_preset(tmp_path / "preset.bttpreset", make_preset(), "gzip")
+        entry, trigger = load_preset_trigger(path, trigger_uuid(1003))
+        assert trigger["BTTTriggerName"] == "Trigger 1-3"
+        assert entry.app_name == "App 1"
+        assert load_preset_trigger(path, trigger_uuid(5)) is not None
+        assert load_preset_trigger(path, "missing") is None
+
+    def test_example_preset(self):
+        index = build_preset_index(str(EXAMPLE_PRESET))
+        assert index.name == "Default"
+        assert len(index.triggers) == 13
+        assert [e.name for e in index.search(app="Arc")] == [
+            "Open Current Arc URL in archive.is"
+        ]
+
+    def test_not_a_preset(self, tmp_path):
+        path = tmp_path / "list.json"
+        path.write_text("[]")
+        with pytest.raises(ValueError, match="not an exported BTT preset"):
+            build_preset_index(str(path))
+        path.write_bytes(b"\x1f\x8bbroken")
+        with pytest.raises(ValueError):
+            build_preset_index(str(path))
+
+    async def test_cache_rebuilds_changed_file(self, tmp_path):
+        path = tmp_path / "preset.bttpreset"
+        write_preset(path, make_preset(apps=1))
+        cache = PresetIndexCache()
+        first = await cache.get(str(path))
+        assert await cache.get(str(path)) is first
+
+        write_preset(path, make_preset(apps=2))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = await cache.get(str(path))
+        assert len(second.triggers) == 40
+
+
+class TestPresetFileTools:
+    """Tests for btt_search_preset_file and btt_get_preset_file_trigger."""
+
+    async def test_search_and_get(self, tmp_path):
+        from btt_mcp.tools import presets as preset_tools
+
+        path = write_preset(tmp_path / "preset.bttpreset", make_preset(), "zip")
+        result = await preset_tools.btt_search_preset_file(
+            SearchPresetFileInput(path=path, query="Trigger 0-1", limit=2)
+        )
+        assert "**Matches:** 11" in result
+        assert "| Trigger 0-1 | BTTTriggerTypeKeyboardShortcut | App 0 |" in result
+        assert "9 more" in result
+
+        result = await preset_tools.btt_get_preset_file_trigger(
+            GetPresetFileTriggerInput(
+                path=path, uuid=trigger_uuid(1), response_format="json"
+            )
+        )
+        assert json.loads(result)["BTTTriggerName"] == "Trigger 0-1"
+
+        result = await preset_tools.btt_get_preset_file_trigger(
+            GetPresetFileTriggerInput(path=path, uuid=trigger_uuid(999))
+        )
+        assert result.startswith("Error: Trigger")
+
+    async def test_get_without_index(self, tmp_path, monkeypatch):
+        from btt_mcp.services import preset_index as index_service
+        from btt_mcp.tools import presets as preset_tools
+
+        def not_built(path):
+            raise AssertionError("index was built")
+
+        monkeypatch.setattr(preset_tools, "preset_indexes", PresetIndexCache())
+        monkeypatch.setattr(index_service, "build_preset_index", not_built)
+        path = write_preset(tmp_path / "preset.bttpreset", make_preset())
+        result = await preset_tools.btt_get_preset_file_trigger(
+            GetPresetFileTriggerInput(path=path, uuid=trigger_uuid(2001))
+        )
+        assert "Trigger 2-1" in result
+        assert "App: App 2" in result
+
+    async def test_missing_file(self, tmp_path):
+        from btt_mcp.tools import presets as preset_tools
+
+        result = await preset_tools.btt_search_preset_file(
+            SearchPresetFileInput(path=str(tmp_path / "missing.bttpreset"))
+        )
+        assert result.startswith("Error: Could not read preset file")
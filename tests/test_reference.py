@@ -0,0 +1,258 @@
+"""
+Tests for the reference documentation index and lookup tool.
+"""
+
+import pytest
+
+from btt_mcp.services.reference_index import (
+    ReferenceIndex,
+    content_hash,
+    parse_blocks,
+    parse_sections,
+    tokenize,
+)
+from btt_mcp.tools import reference
+from btt_mcp.tools.reference import LookupReferenceInput
+
+MARKDOWN = """---
+noteId: "x"
+---
+
+# Title
+Intro
+
+## First
+```
+# not a heading
+```
+### Nested
+Nested text
+
+## Second
+Second text
+"""
+
+
+class TestParseSections:
+    """Tests for splitting markdown into sections."""
+
+    def test_tree_and_content(self):
+        sections = parse_sections("doc", MARKDOWN)
+        assert [(s.title, s.level) for s in sections] == [
+            ("Title", 1),
+            ("First", 2),
+            ("Nested", 3),
+            ("Second", 2),
+        ]
+        title, first, nested, second = sections
+        assert first.parent is title
+        assert first.children == [nested]
+        assert first.content.startswith("## First")
+        assert first.content.endswith("Nested text")
+        assert "# not a heading" in first.content
+        assert second.content == "## Second\nSecond text"
+        assert "noteId" not in title.content
+
+    def test_blocks(self):
+        text = (
+            "## Section\nFirst paragraph\ncontinued\n\n| A | B |\n|---|---|\n"
+            "| `x` | 1 |\n| `y` | 2 |\n- item\n  more\n- other\n### Sub\nsub text\n"
+        )
+        sections = parse_sections("doc", text)
+        blocks = parse_blocks(sections, text)
+        assert [(b.section.title, b.kind, b.text) for b in blocks] == [
+            ("Section", "paragraph", "First paragraph\ncontinued"),
+            ("Section", "row", "| `x` | 1 |"),
+            ("Section", "row", "| `y` | 2 |"),
+            ("Section", "item", "- item\n  more"),
+            ("Section", "item", "- other"),
+            ("Sub", "paragraph", "sub text"),
+        ]
+        assert blocks[1].table_header == "| A | B |\n|---|---|"
+
+    def test_section_ids(self):
+        text = (
+            "# Doc\n## Named Trigger: 643\n### [Link](http://x) text\n"
+            "## Named Trigger\n"
+        )
+        sections = parse_sections("triggers", text)
+        assert [s.id for s in sections] == [
+            "triggers/doc",
+            "triggers/named-trigger",
+            "triggers/named-trigger/link-text",
+            "triggers/named-trigger-2",
+        ]
+
+    def test_tokenize(self):
+        assert tokenize("BTTNowPlaying paste_text selected\\_text") == [
+            "bttnowplaying",
+            "btt",
+            "now",
+            "playing",
+            "paste_text",
+            "paste",
+            "text",
+            "selected_text",
+            "selected",
+            "text",
+        ]
+
+
+class TestReferenceIndex:
+    """Tests for resolving topics against the bundled docs."""
+
+    def test_every_topic_resolves(self):
+        index = ReferenceIndex()
+        unresolved = [
+            (file_key, pattern)
+            for _keywords, file_key, pattern in reference.SECTION_INDEX
+            if index.find(file_key, pattern) is None
+        ]
+        assert unresolved == []
+
+    def test_docs_are_read_once(self, tmp_path):
+        (tmp_path / "a.md").write_text("# A\n## B\nb text\n")
+        index = ReferenceIndex(tmp_path, {"a": "a.md", "missing": "missing.md"})
+        section = index.find("a", r"^## B")
+        (tmp_path / "a.md").write_text("# changed\n")
+        assert index.find("a", r"^## B") is section
+        assert section.content == "## B\nb text"
+        assert index.find("missing", r"^# A") is None
+
+        index.clear()
+        assert index.find("a", r"^## B") is None
+
+    def test_bm25_ranking(self, tmp_path):
+        (tmp_path / "a.md").write_text(
+            "# Doc\n## Colors\nRGBA values\n\nanother colors note\n"
+            "## Icons\nSF Symbol icons\n"
+        )
+        (tmp_path / "extra.md").write_text("# Extra\nRGBA everywhere RGBA\n")
+        index = ReferenceIndex(tmp_path, {"a": "a.md"})
+        hits = index.search("rgba")
+        assert [h.block.section.file_key for h in hits] == ["extra", "a"]
+        # Heading words count for every block under the heading
+        assert [h.block.text for h in index.search("colors")] == [
+            "another colors note",
+            "RGBA values",
+        ]
+        icons = index.find("a", r"^## Icons")
+        assert index.search("zzz", boost=[icons])[0].block.section is icons
+
+
+class TestLookupReferenceTool:
+    """Tests for btt_lookup_reference."""
+
+    async def test_lookup(self):
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(topic="modifier keys")
+        )
+        assert "Cmd=1048576" in result
+        assert result.startswith(
+            "**Source: Trigger JSON Reference › Modifier Key Flags**"
+        )
+
+    def test_topic_sections_are_not_repeated(self):
+        # Both topics live in the same CLI section
+        sections = reference._topic_sections("add trigger update trigger")
+        assert len(sections) == len(set(sections))
+
+    async def test_identifiers_outside_topics(self):
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(topic="paste_text")
+        )
+        assert result.startswith("**Source: CLI Command Reference › UI & Widgets**")
+        # Table rows come with their table's header
+        assert "| Command | Key Params |\n|---|---|\n| `paste_text` |" in result
+        assert "refresh_widget" not in result
+
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(topic="BTTNowPlaying")
+        )
+        assert "BTTNowPlayingInfoArtist" in result
+
+    @pytest.mark.parametrize(
+        "budget", [{"max_chars": 300}, {"max_tokens": 75}, {"max_chars": 1200}]
+    )
+    async def test_budget(self, budget):
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(topic="variable", **budget)
+        )
+        limit = budget.get("max_chars") or budget["max_tokens"] * 4
+        assert len(result) <= limit
+        assert "more matches left out" in result
+        assert '_Full section: section="' in result
+
+    async def test_best_match_is_cut_to_a_tiny_budget(self):
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(topic="paste_text", max_chars=260)
+        )
+        assert len(result) <= 260
+        assert "|---|---|\n| `paste_text` | `text`…\n" in result
+
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(topic="paste_text", max_chars=200)
+        )
+        assert len(result) <= 200
+
+    async def test_full_section(self):
+        index = reference.reference_index
+        section = index.find("cli", r"^## Presets")
+        assert section.id == "cli/presets"
+        assert index.get_section("cli/variables/special-readable-string-variables")
+
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(section="cli/presets", topic="ignored")
+        )
+        assert result.endswith(section.content)
+        result = await reference.btt_lookup_reference(
+            LookupReferenceInput(section="cli/missing")
+        )
+        assert result.startswith("Error: Unknown section")
+
+    @pytest.mark.parametrize("topic", [None, "zzzz"])
+    async def test_topics_listing(self, topic):
+        result = await reference.btt_lookup_reference(LookupReferenceInput(topic=topic))
+        assert "## Available BTT Reference Topics" in result
+
+
+class TestDocResources:
+    """Tests for the docs exposed as MCP resources."""
+
+    def test_resources_of_a_doc(self, tmp_path):
+        (tmp_path / "a.md").write_text("# A\n## B\nb text\n")
+        index = ReferenceIndex(tmp_path, {"cli": "a.md"})
+        index.load()
+        file, title, section = reference.doc_resources(index.docs["cli"])
+        assert str(file.uri) == "btt://docs/cli"
+        assert file.meta == {"sha256": content_hash("# A\n## B\nb text\n")}
+        assert str(section.uri) == "btt://docs/cli/b"
+        assert section.title == "CLI Command Reference › B"
+        assert section.text == "## B\nb text"
+        assert section.size == len(section.text)
+        assert section.meta == {"sha256": content_hash("## B\nb text")}
+
+    async def test_list_and_read(self):
+        from mcp.shared.memory import create_connected_server_and_client_session
+        from pydantic import AnyUrl
+
+        from btt_mcp.server import mcp
+
+        async with create_connected_server_and_client_session(mcp) as client:
+            listed = {
+                str(r.uri): r
+                for r in (await client.list_resources()).resources
+                if str(r.uri).startswith(reference.DOCS_URI_PREFIX)
+            }
+            uri = "btt://docs/triggers/modifier-key-flags"
+            assert "btt://docs/cli" in listed
+            assert len(listed) == len(reference.reference_index.docs) + len(
+                reference.reference_index.sections
+            )
+            read = await client.read_resource(AnyUrl(uri))
+
+        text = read.contents[0].text
+        assert text.startswith("## Modifier Key Flags")
+        assert listed[uri].meta == {"sha256": content_hash(text)}
+        assert listed[uri].size == len(text.encode())
+        assert listed[uri].mimeType == "text/markdown"
@@ -0,0 +1,135 @@
+"""
+Tests for scheduled widget refreshes.
+"""
+
+import asyncio
+import importlib
+import random
+
+import pytest
+
+from btt_mcp.models import ListRefreshScheduleInput, ScheduleWidgetRefreshInput
+from btt_mcp.services.refresh_scheduler import RefreshScheduler
+
+# The package re-exports the shared instance under the module's name
+scheduler_service = importlib.import_module("btt_mcp.services.refresh_scheduler")
+
+UUID = "12345678-1234-1234-1234-123456789012"
+
+
+def widget_uuid(i: int) -> str:
+    return f"{i:08d}-1234-1234-1234-123456789012"
+
+
+@pytest.fixture
+def refreshed(monkeypatch):
+    """Record refreshed widget UUIDs."""
+    uuids = []
+
+    async def fake_request(endpoint, params, config):
+        assert endpoint == "refresh_widget"
+        uuids.append(params["uuid"])
+        return ""
+
+    monkeypatch.setattr(scheduler_service, "btt_request", fake_request)
+    return uuids
+
+
+class TestRefreshScheduler:
+    """Tests for periodic refreshes, jitter and load shedding."""
+
+    async def test_refreshes_periodically(self, refreshed):
+        scheduler = RefreshScheduler(jitter=0)
+        scheduler.register(UUID, 0.02)
+        await asyncio.sleep(0.15)
+        await scheduler.stop()
+        assert 4 <= refreshed.count(UUID) <= 9
+
+    async def test_initial_phase_is_spread(self, refreshed):
+        scheduler = RefreshScheduler(rng=random.Random(1))
+        entries = [scheduler.register(widget_uuid(i), 10) for i in range(10)]
+        dues = sorted(entry.next_due for entry in entries)
+        assert dues[-1] - dues[0] > 5
+        await scheduler.stop()
+
+    async def test_unregister(self, refreshed):
+        scheduler = RefreshScheduler(jitter=0)
+        scheduler.register(UUID, 0.01)
+        await asyncio.sleep(0.05)
+        assert scheduler.unregister(UUID)
+        count = len(refreshed)
+        await asyncio.sleep(0.05)
+        assert len(refreshed) == count
+        assert not scheduler.running
+        assert not scheduler.unregister(UUID)
+
+    async def test_register_again_after_unregister(self, refreshed):
+        scheduler = RefreshScheduler(jitter=0)
+        scheduler.register(UUID, 0.02)
+        scheduler.unregister(UUID)
+        entry = scheduler.register(UUID, 0.02)
+        live = [item for item in scheduler._heap if item[3] == entry.generation]
+        assert len(live) == 1
+        await asyncio.sleep(0.15)
+        await scheduler.stop()
+        assert refreshed.count(UUID) <= 9
+
+    async def test_low_priority_is_shed_when_overloaded(self, refreshed):
+        now = [0.0]
+        scheduler = RefreshScheduler(latency_threshold=0.5, clock=lambda: now[0])
+        low = scheduler.register(widget_uuid(1), 10, "low")
+        normal = scheduler.register(widget_uuid(2), 10, "normal")
+        high = scheduler.register(widget_uuid(3), 10, "high")
+        await scheduler.stop()
+        scheduler.latency = 2.0
+
+        for entry in (low, normal, high):
+            scheduler._dispatch(entry, now[0])
+        await asyncio.sleep(0)
+        assert (low.shed, low.runs) == (1, 0)
+        assert (normal.delayed, normal.runs) == (1, 0)
+        assert high.runs == 1
+
+        # Never backed off twice in a row, so latency keeps being measured
+        scheduler._dispatch(low, now[0])
+        scheduler._dispatch(normal, now[0])
+        await asyncio.sleep(0)
+        assert low.runs == 1 and normal.runs == 1
+
+    async def test_latency_is_tracked(self, monkeypatch):
+        async def slow_request(endpoint, params, config):
+            await asyncio.sleep(0.02)
+            return ""
+
+        monkeypatch.setattr(scheduler_service, "btt_request", slow_request)
+        scheduler = RefreshScheduler(latency_threshold=0.001)
+        entry = scheduler.register(UUID, 60)
+        scheduler._dispatch(entry, entry.next_due)
+        await asyncio.sleep(0.05)
+        assert entry.last_latency >= 0.02
+        assert scheduler.overloaded
+        await scheduler.stop()
+
+    def test_invalid_priority(self):
+        with pytest.raises(ValueError):
+            RefreshScheduler().register(UUID, 1, "urgent")
+
+
+class TestRefreshScheduleTools:
+    """Tests for the schedule tools."""
+
+    async def test_schedule_and_list(self, refreshed, monkeypatch):
+        from btt_mcp.tools import widgets as widget_tools
+
+        scheduler = RefreshScheduler()
+        monkeypatch.setattr(widget_tools, "refresh_scheduler", scheduler)
+        result = await widget_tools.btt_schedule_widget_refresh(
+            ScheduleWidgetRefreshInput(uuid=UUID, interval_seconds=30, priority="low")
+        )
+        assert "every 30s" in result
+
+        listing = await widget_tools.btt_list_refresh_schedule(
+            ListRefreshScheduleInput()
+        )
+        assert f"| {UUID} | 30s | low |" in listing
+        await scheduler.stop()
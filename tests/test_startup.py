@@ -0,0 +1,143 @@
+"""
+Tests for lazy tool loading, the tool schema cache and the startup profiler.
+"""
+
+import json
+
+import pytest
+
+from btt_mcp import main, server, startup_profile
+from btt_mcp.startup_profile import format_profile, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   encodings
+btt-mcp-profile-stage: server
+import time:      2000 |       2000 |     mcp.types
+import time:       500 |       2500 |   mcp
+import time:       300 |       2800 | btt_mcp.server
+btt-mcp-profile-stage: tools
+import time:      4000 |       4000 |   btt_mcp.tools.triggers
+import time:       100 |       4100 | btt_mcp.tools
+"""
+
+
+class TestToolLoading:
+    """Tests for load_tools and the tool schema cache."""
+
+    async def test_tools_are_listed_from_the_cache(self, monkeypatch):
+        monkeypatch.setattr(server, "_tools_loaded", False)
+        tools = await server._list_tools()
+        assert server._tools_loaded
+        assert "btt_get_triggers" in [tool.name for tool in tools]
+        cache = json.loads(server.TOOL_SCHEMA_CACHE_FILE.read_text())
+        assert cache["key"] == server.tool_sources_key()
+
+        async def not_loaded():
+            raise AssertionError("tools were loaded")
+
+        monkeypatch.setattr(server, "_tools_loaded", False)
+        monkeypatch.setattr(server, "load_tools", not_loaded)
+        cached = await server._list_tools()
+        assert cached == tools
+
+    async def test_resources_are_listed_from_the_cache(self, monkeypatch):
+        monkeypatch.setattr(server, "_tools_loaded", False)
+        resources = await server._list_resources()
+        assert "btt://clipboard/latest" in [str(r.uri) for r in resources]
+
+        async def not_loaded():
+            raise AssertionError("tools were loaded")
+
+        monkeypatch.setattr(server, "_tools_loaded", False)
+        monkeypatch.setattr(server, "load_tools", not_loaded)
+        assert await server._list_resources() == resources
+        templates = await server._list_resource_templates()
+        assert "btt_variable" in [t.name for t in templates]
+
+    def test_stale_cache_is_ignored(self):
+        empty = {"tools": [], "resources": [], "resource_templates": []}
+        server._write_schema_cache("old", empty)
+        assert server._read_schema_cache("old") == empty
+        assert server._read_schema_cache("new") is None
+        server.TOOL_SCHEMA_CACHE_FILE.write_text("not json")
+        assert server._read_schema_cache("old") is None
+
+    async def test_startup_hooks_of_loaded_modules_run(self, monkeypatch):
+        calls = []
+
+        async def hook():
+            calls.append("hook")
+
+        def import_tools(name):
+            server.on_startup(hook)
+
+        monkeypatch.setattr(server, "_startup_hooks", [])
+        monkeypatch.setattr(server, "_tools_loaded", False)
+        monkeypatch.setattr(server, "_started", True)
+        monkeypatch.setattr(server.importlib, "import_module", import_tools)
+        await server.load_tools()
+        await server.load_tools()
+        assert calls == ["hook"]
+
+    @pytest.mark.parametrize(
+        "timeseries, clipboard, loaded",
+        [(False, False, False), (True, False, True), (False, True, True)],
+    )
+    async def test_background_services_start_with_the_server(
+        self, monkeypatch, timeseries, clipboard, loaded
+    ):
+        calls = []
+
+        async def load_tools():
+            calls.append("load")
+
+        monkeypatch.setattr(server, "_startup_hooks", [])
+        monkeypatch.setattr(server, "_shutdown_hooks", [])
+        monkeypatch.setattr(server, "get_timeseries_enabled", lambda: timeseries)
+        monkeypatch.setattr(server, "get_clipboard_watch_enabled", lambda: clipboard)
+        monkeypatch.setattr(server, "load_tools", load_tools)
+        async with server.lifespan(server.mcp):
+            assert calls == (["load"] if loaded else [])
+
+
+class TestStartupProfile:
+    """Tests for --profile-startup."""
+
+    def test_parse_importtime(self):
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+        assert [(t.module, t.stage, t.depth) for t in timings] == [
+            ("encodings", "interpreter", 1),
+            ("mcp.types", "server", 2),
+            ("mcp", "server", 1),
+            ("btt_mcp.server", "server", 0),
+            ("btt_mcp.tools.triggers", "tools", 1),
+            ("btt_mcp.tools", "tools", 0),
+        ]
+        assert timings[1].package == "mcp"
+
+    def test_format_profile(self):
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+        report = format_profile({"server": 0.0031, "tools": 0.0042}, timings, top=2)
+        lines = report.splitlines()
+        assert lines[4].split()[-3:] == ["3", "2.8", "3.1"]
+        assert lines[5].split()[-3:] == ["2", "4.1", "4.2"]
+        assert ["mcp", "server", "2", "2.5"] in [line.split() for line in lines]
+        slowest = lines[lines.index("Slowest modules (self time)") + 2 :]
+        assert [line.split()[0] for line in slowest] == [
+            "btt_mcp.tools.triggers",
+            "mcp.types",
+        ]
+
+    @pytest.mark.parametrize(
+        "argv, expected",
+        [(["--profile-startup", "--top", "3"], "profile 3"), ([], "server")],
+    )
+    def test_command_line(self, monkeypatch, capsys, argv, expected):
+        monkeypatch.setattr("sys.argv", ["btt-mcp-server", *argv])
+        monkeypatch.setattr(
+            startup_profile, "profile_startup", lambda top: f"profile {top}"
+        )
+        monkeypatch.setattr(server, "main", lambda: print("server"))
+        main()
+        assert capsys.readouterr().out.strip() == expected
@@ -0,0 +1,130 @@
+"""
+Tests for sampled time series of numeric variables.
+"""
+
+import json
+
+import pytest
+
+from btt_mcp.models import VariableStatsInput
+from btt_mcp.services.timeseries import (
+    RingBuffer,
+    TimeSeriesSampler,
+    compute_stats,
+    percentile,
+)
+
+
+class TestRingBuffer:
+    """Tests for the fixed-size sample buffer."""
+
+    def test_chronological_order_after_wrap(self):
+        buffer = RingBuffer(4)
+        for i in range(10):
+            buffer.append(float(i), float(i * 10))
+        times, values = buffer.samples()
+        assert list(times) == [6.0, 7.0, 8.0, 9.0]
+        assert list(values) == [60.0, 70.0, 80.0, 90.0]
+        assert len(buffer) == 4
+
+    def test_memory_is_constant(self):
+        buffer = RingBuffer(100)
+        size = buffer._values.buffer_info()[1]
+        for i in range(10_000):
+            buffer.append(float(i), 1.0)
+        assert buffer._values.buffer_info()[1] == size
+
+    def test_window(self):
+        buffer = RingBuffer(10)
+        for i in range(5):
+            buffer.append(float(i), float(i))
+        times, _ = buffer.samples(since=2.5)
+        assert list(times) == [3.0, 4.0]
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+
+class TestStatistics:
+    """Tests for window statistics."""
+
+    def test_percentile_interpolates(self):
+        data = [1.0, 2.0, 3.0, 4.0]
+        assert percentile(data, 0) == 1.0
+        assert percentile(data, 50) == 2.5
+        assert percentile(data, 100) == 4.0
+
+    def test_basic_stats(self):
+        stats = compute_stats([0.0, 1.0, 2.0], [10.0, 30.0, 20.0], [50])
+        assert (stats.min, stats.max, stats.mean, stats.last) == (10, 30, 20, 20)
+        assert stats.percentiles == {50: 20.0}
+
+    def test_change_points_ignore_steady_drift(self):
+        # Idle time counts up and resets twice
+        values = [0, 5, 10, 15, 20, 0, 5, 10, 15, 20, 0, 5]
+        times = list(range(len(values)))
+        stats = compute_stats(times, [float(v) for v in values], [])
+        assert [(c.timestamp, c.before, c.after) for c in stats.change_points] == [
+            (5, 20.0, 0.0),
+            (10, 20.0, 0.0),
+        ]
+
+    def test_change_points_of_step_function(self):
+        values = [1.0, 1.0, 1.0, 2.0, 2.0, 3.0]
+        stats = compute_stats(list(range(6)), values, [])
+        assert [c.after for c in stats.change_points] == [2.0, 3.0]
+
+    def test_empty_window(self):
+        assert compute_stats([], [], [50]) is None
+
+
+class TestTimeSeriesSampler:
+    """Tests for sampling into ring buffers."""
+
+    async def test_sample_once(self, fake_btt):
+        now = [100.0]
+        sampler = TimeSeriesSampler(
+            ["OutputVolume", "Missing"], capacity=3, clock=lambda: now[0]
+        )
+        for volume in ("10", "20", "30", "40"):
+            fake_btt.values["OutputVolume"] = volume
+            assert await sampler.sample_once() == 1
+            now[0] += 1
+
+        times, values = sampler.series("OutputVolume").samples()
+        assert list(values) == [20.0, 30.0, 40.0]
+        assert list(times) == [101.0, 102.0, 103.0]
+        assert len(sampler.series("Missing")) == 0
+        assert sampler.errors == 4
+
+    async def test_tool_reports_stats(self, fake_btt, monkeypatch):
+        from btt_mcp.tools import variables as variable_tools
+
+        sampler = TimeSeriesSampler(["ActiveSpace"], interval=3600)
+        monkeypatch.setattr(variable_tools, "timeseries_sampler", sampler)
+        for space in ("1", "1", "2", "2"):
+            fake_btt.values["ActiveSpace"] = space
+            await sampler.sample_once()
+
+        result = await variable_tools.btt_variable_stats(
+            VariableStatsInput(response_format="json", percentiles=[50])
+        )
+        data = json.loads(result)["variables"]["ActiveSpace"]
+        assert data["count"] == 4
+        assert data["min"] == 1.0 and data["max"] == 2.0
+        assert data["percentiles"] == {"p50": 1.5}
+        assert data["change_point_count"] == 1
+
+        markdown = await variable_tools.btt_variable_stats(VariableStatsInput())
+        assert "| ActiveSpace | 4 |" in markdown
+        assert "1 → 2" in markdown
+        await sampler.stop()
+
+    async def test_tool_rejects_invalid_percentiles(self):
+        from btt_mcp.tools import variables as variable_tools
+
+        result = await variable_tools.btt_variable_stats(
+            VariableStatsInput(percentiles=[150])
+        )
+        assert result.startswith("Error:")
@@ -0,0 +1,144 @@
+"""
+Tests for variable subscriptions and the background sampler.
+"""
+
+import asyncio
+
+from mcp import types
+
+from btt_mcp.services.variable_sampler import (
+    VariableSampler,
+    parse_variable_uri,
+    variable_uri,
+)
+
+
+class FakeSession:
+    """Collects resources/updated notifications."""
+
+    def __init__(self, fail=False):
+        self.updated = []
+        self.fail = fail
+
+    async def send_resource_updated(self, uri):
+        if self.fail:
+            raise RuntimeError("session closed")
+        self.updated.append(str(uri))
+
+
+class TestVariableUri:
+    """Tests for variable resource URIs."""
+
+    def test_round_trip(self):
+        uri = variable_uri("BluetoothConnectionState-My Pods", "number")
+        assert uri == "btt://variables/number/BluetoothConnectionState-My%20Pods"
+        assert parse_variable_uri(uri) == ("BluetoothConnectionState-My Pods", "number")
+
+    def test_invalid(self):
+        assert parse_variable_uri("btt://variables/bool/x") is None
+        assert parse_variable_uri("btt://docs/x") is None
+        assert parse_variable_uri("btt://variables/string/") is None
+
+
+class TestVariableSampler:
+    """Tests for batch sampling and change notifications."""
+
+    async def test_notifies_on_change_only(self, fake_btt):
+        values = fake_btt.values
+        sampler = VariableSampler(interval=3600)
+        session = FakeSession()
+        key = ("BTTIdleTime", "number")
+        sampler._subscribers[key] = {session}
+
+        values["BTTIdleTime"] = "1"
+        assert await sampler.sample_once() == []
+        assert await sampler.sample_once() == []
+        values["BTTIdleTime"] = "2"
+        assert await sampler.sample_once() == [key]
+        assert session.updated == ["btt://variables/number/BTTIdleTime"]
+
+    async def test_cost_scales_with_distinct_variables(self, fake_btt):
+        sampler = VariableSampler(interval=3600)
+        sessions = [FakeSession() for _ in range(10)]
+        for session in sessions:
+            sampler._subscribers.setdefault(("A", "string"), set()).add(session)
+            sampler._subscribers.setdefault(("B", "string"), set()).add(session)
+
+        await sampler.sample_once()
+        assert sorted(name for _, name in fake_btt.reads) == ["A", "B"]
+
+    async def test_failed_session_is_dropped(self, fake_btt):
+        values = fake_btt.values
+        sampler = VariableSampler(interval=3600)
+        good, bad = FakeSession(), FakeSession(fail=True)
+        sampler._subscribers[("v", "string")] = {good, bad}
+
+        values["v"] = "1"
+        await sampler.sample_once()
+        values["v"] = "2"
+        await sampler.sample_once()
+        assert sampler.subscriptions() == {("v", "string"): 1}
+        assert good.updated
+
+    async def test_background_task_lifecycle(self, fake_btt):
+        values = fake_btt.values
+        sampler = VariableSampler(interval=0.01)
+        session = FakeSession()
+
+        values["v"] = "1"
+        sampler.subscribe(("v", "string"), session)
+        assert sampler.running
+        await asyncio.sleep(0.03)
+        values["v"] = "2"
+        await asyncio.sleep(0.05)
+        assert session.updated == ["btt://variables/string/v"]
+
+        sampler.unsubscribe(("v", "string"), session)
+        await asyncio.sleep(0.03)
+        assert not sampler.running
+        await sampler.stop()
+
+
+class TestVariableResources:
+    """End-to-end tests through an MCP client session."""
+
+    async def test_subscribe_and_receive_update(self, fake_btt, monkeypatch):
+        from mcp.shared.memory import create_connected_server_and_client_session
+        from pydantic import AnyUrl
+
+        import btt_mcp.tools  # noqa: F401
+        from btt_mcp.server import mcp
+        from btt_mcp.tools import variables as variable_tools
+
+        values = fake_btt.values
+        sampler = VariableSampler(interval=0.01)
+        monkeypatch.setattr(variable_tools, "variable_sampler", sampler)
+        updates = []
+
+        async def on_message(message):
+            if isinstance(message, types.ServerNotification) and isinstance(
+                message.root, types.ResourceUpdatedNotification
+            ):
+                updates.append(str(message.root.params.uri))
+
+        values["OutputVolume"] = "40"
+        uri = "btt://variables/number/OutputVolume"
+        async with create_connected_server_and_client_session(
+            mcp, message_handler=on_message
+        ) as client:
+            capabilities = client.get_server_capabilities()
+            assert capabilities.resources.subscribe is True
+
+            read = await client.read_resource(AnyUrl(uri))
+            assert read.contents[0].text == "40"
+
+            await client.subscribe_resource(AnyUrl(uri))
+            await asyncio.sleep(0.03)
+            values["OutputVolume"] = "60"
+            for _ in range(50):
+                if updates:
+                    break
+                await asyncio.sleep(0.01)
+            await sampler.stop()
+
+        assert updates == [uri]
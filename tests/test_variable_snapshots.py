@@ -0,0 +1,187 @@
+"""
+Tests for the variable registry and snapshot export/import tools.
+"""
+
+import json
+
+import pytest
+
+from btt_mcp.models import (
+    BTTConnectionConfig,
+    ExportVariablesInput,
+    ImportVariablesInput,
+)
+from btt_mcp.services import variables as variable_service
+from btt_mcp.services.variable_registry import VariableRegistry
+from btt_mcp.tools import variables as variable_tools
+
+CONFIG = BTTConnectionConfig()
+
+
+@pytest.fixture
+def registry(monkeypatch, isolated_variable_registry):
+    monkeypatch.setattr(variable_tools, "variable_registry", isolated_variable_registry)
+    return isolated_variable_registry
+
+
+class TestVariableRegistry:
+    """Tests for tracking variable names."""
+
+    async def test_reads_and_writes_are_recorded(self, registry, fake_btt):
+        await variable_service.get_variable("a", "number", CONFIG)
+        await variable_service.set_variable("b", "x", "string", True, CONFIG)
+        await variable_service.set_variable("a", "1", "number", False, CONFIG)
+
+        assert [(v.name, v.variable_type, v.persistent) for v in registry.select()] == [
+            ("a", "number", False),
+            ("b", "string", True),
+        ]
+        assert [v.name for v in registry.select(persistent_only=True)] == ["b"]
+        assert [v.name for v in registry.select(["a*"])] == ["a"]
+
+    async def test_volatile_variables_are_not_recorded(self, registry, fake_btt):
+        await variable_service.get_variable("BTTIdleTime", "number", CONFIG)
+        await variable_service.get_variable("BTTNowPlayingTitle", "string", CONFIG)
+        await variable_service.get_variable("mine", "string", CONFIG)
+        assert [v.name for v in registry.select()] == ["mine"]
+
+    async def test_failed_reads_are_not_recorded(self, registry, monkeypatch):
+        async def failing_request(endpoint, params, config):
+            return "Error: BTT not reachable"
+
+        monkeypatch.setattr(variable_service, "btt_request", failing_request)
+        await variable_service.get_variable("a", "string", CONFIG, use_cache=False)
+        assert len(registry) == 0
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / "variables.json"
+        registry = VariableRegistry(path)
+        registry.record("a", "number", True)
+        registry.save()
+
+        loaded = VariableRegistry(path)
+        assert [(v.name, v.persistent) for v in loaded.select()] == [("a", True)]
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "variables.json"
+        path.write_text("{not json")
+        assert len(VariableRegistry(path)) == 0
+
+
+class TestVariableSnapshots:
+    """Tests for btt_export_variables and btt_import_variables."""
+
+    async def test_round_trip(self, registry, fake_btt, tmp_path):
+        values, writes = fake_btt.values, fake_btt.writes
+        await variable_service.set_variable("count", "3", "number", True, CONFIG)
+        await variable_service.set_variable("label", "hi", "string", False, CONFIG)
+        path = tmp_path / "snapshot.json"
+
+        result = await variable_tools.btt_export_variables(
+            ExportVariablesInput(output_path=str(path))
+        )
+        assert result.startswith("Exported 2 variable(s)")
+        snapshot = json.loads(path.read_text())
+        assert snapshot["format"] == "btt-mcp-variables"
+        assert {v["name"]: v["value"] for v in snapshot["variables"]} == {
+            "count": "3",
+            "label": "hi",
+        }
+
+        values.clear()
+        writes.clear()
+        result = await variable_tools.btt_import_variables(
+            ImportVariablesInput(path=str(path))
+        )
+        assert result.startswith("Restored 2 of 2 variable(s)")
+        assert sorted(writes) == [
+            ("set_persistent_number_variable", "count", "3"),
+            ("set_string_variable", "label", "hi"),
+        ]
+
+    async def test_read_only_tracked_variable_stays_persistent(
+        self, registry, fake_btt, tmp_path
+    ):
+        values, writes = fake_btt.values, fake_btt.writes
+        values["theme"] = "dark"
+        await variable_service.get_variable("theme", "string", CONFIG)
+        path = tmp_path / "snapshot.json"
+
+        await variable_tools.btt_export_variables(
+            ExportVariablesInput(output_path=str(path), persistent_only=True)
+        )
+        snapshot = json.loads(path.read_text())
+        assert snapshot["variables"] == [
+            {"name": "theme", "type": "string", "persistent": None, "value": "dark"}
+        ]
+
+        result = await variable_tools.btt_import_variables(
+            ImportVariablesInput(path=str(path))
+        )
+        assert result.startswith("Restored 1 of 1")
+        assert writes == [("set_persistent_string_variable", "theme", "dark")]
+
+        writes.clear()
+        await variable_tools.btt_import_variables(
+            ImportVariablesInput(path=str(path), persistent=False)
+        )
+        assert writes == [("set_string_variable", "theme", "dark")]
+
+    async def test_import_bounded_parallelism(self, registry, fake_btt, tmp_path):
+        fake_btt.delay = 0.001
+        path = tmp_path / "snapshot.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "format": "btt-mcp-variables",
+                    "version": 1,
+                    "variables": [
+                        {"name": f"v{i}", "type": "string", "value": str(i)}
+                        for i in range(20)
+                    ],
+                }
+            )
+        )
+
+        result = await variable_tools.btt_import_variables(
+            ImportVariablesInput(path=str(path), max_concurrency=4)
+        )
+        assert result.startswith("Restored 20 of 20")
+        assert len(fake_btt.writes) == 20
+        assert 1 < fake_btt.peak <= 4
+
+    async def test_import_skips_volatile_variables(self, registry, fake_btt, tmp_path):
+        writes = fake_btt.writes
+        path = tmp_path / "snapshot.json"
+        variables = [
+            {"name": "BTTActiveWindowTitle", "type": "string", "value": "Mail"},
+            {"name": "label", "type": "string", "persistent": False, "value": "hi"},
+        ]
+        path.write_text(
+            json.dumps({"format": "btt-mcp-variables", "variables": variables})
+        )
+
+        result = await variable_tools.btt_import_variables(
+            ImportVariablesInput(path=str(path))
+        )
+        assert result.startswith("Restored 1 of 1")
+        assert writes == [("set_string_variable", "label", "hi")]
+
+    async def test_export_without_tracked_variables(self, registry, tmp_path):
+        result = await variable_tools.btt_export_variables(
+            ExportVariablesInput(output_path=str(tmp_path / "out.json"))
+        )
+        assert result.startswith("No tracked variables")
+
+    async def test_import_rejects_other_files(self, registry, tmp_path):
+        path = tmp_path / "other.json"
+        path.write_text(json.dumps({"variables": []}))
+        result = await variable_tools.btt_import_variables(
+            ImportVariablesInput(path=str(path))
+        )
+        assert result.startswith("Error:")
+
+        result = await variable_tools.btt_import_variables(
+            ImportVariablesInput(path=str(tmp_path / "missing.json"))
+        )
+        assert result.startswith("Error: Could not read")
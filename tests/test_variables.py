@@ -0,0 +1,215 @@
+"""
+Tests for BTT variable services and batch tools.
+"""
+
+import asyncio
+
+import pytest
+
+from btt_mcp.models import (
+    BTTConnectionConfig,
+    GetVariableInput,
+    GetVariablesInput,
+    SetVariableInput,
+    VariableCacheStatsInput,
+)
+from btt_mcp.services import variables as variable_service
+from btt_mcp.services.variable_cache import VariableCache
+
+VOLATILE = ["BTTIdleTime", "BTTActiveWindowTitle", "OutputVolume", "ActiveSpace"]
+
+
+@pytest.fixture(autouse=True)
+def variable_cache(monkeypatch):
+    """Give every test its own variable cache."""
+    cache = VariableCache(static_ttl=60.0, volatile_patterns=VOLATILE)
+    monkeypatch.setattr(variable_service, "variable_cache", cache)
+    return cache
+
+
+class TestEndpoints:
+    """Tests for endpoint selection."""
+
+    def test_get_endpoint(self):
+        assert variable_service.get_endpoint("string") == "get_string_variable"
+        assert variable_service.get_endpoint("number") == "get_number_variable"
+
+    def test_set_endpoint(self):
+        assert variable_service.set_endpoint("string", False) == "set_string_variable"
+        assert (
+            variable_service.set_endpoint("number", True)
+            == "set_persistent_number_variable"
+        )
+
+
+class TestGetVariables:
+    """Tests for concurrent variable reads."""
+
+    async def test_deduplicates(self, fake_btt):
+        fake_btt.values["a"] = "1"
+        result = await variable_service.get_variables(
+            [("a", "string"), ("a", "string"), ("a", "number")],
+            BTTConnectionConfig(),
+        )
+        assert len(fake_btt.reads) == 2
+        assert result[("a", "string")] == "1"
+
+    async def test_concurrency_is_bounded(self, fake_btt):
+        fake_btt.delay = 0.01
+        await variable_service.get_variables(
+            [(f"v{i}", "string") for i in range(10)],
+            BTTConnectionConfig(),
+            max_concurrency=3,
+        )
+        assert fake_btt.peak == 3
+
+
+class TestGetVariablesTool:
+    """Tests for the btt_get_variables tool."""
+
+    async def test_markdown_table(self, fake_btt):
+        from btt_mcp.tools.variables import btt_get_variables
+
+        fake_btt.values.update(
+            {"BTTActiveWindowTitle": "a | b", "OutputVolume": "Error: HTTP 500 - x"}
+        )
+        result = await btt_get_variables(
+            GetVariablesInput(
+                variables=[
+                    {"name": "BTTActiveWindowTitle"},
+                    {"name": "OutputVolume", "variable_type": "number"},
+                ]
+            )
+        )
+        assert "| BTTActiveWindowTitle | string | `a \\| b` |" in result
+        assert "| OutputVolume | number | Error: HTTP 500 - x |" in result
+
+    async def test_json(self, fake_btt):
+        from btt_mcp.tools.variables import btt_get_variables
+
+        fake_btt.values["ActiveSpace"] = "3"
+        result = await btt_get_variables(
+            GetVariablesInput(
+                variables=[{"name": "ActiveSpace", "variable_type": "number"}],
+                response_format="json",
+            )
+        )
+        assert '"ActiveSpace": "3"' in result
+
+
+class TestVariableCache:
+    """Tests for the read-through variable cache."""
+
+    def test_policies(self):
+        cache = VariableCache(
+            static_ttl=300,
+            volatile_ttl=0,
+            volatile_patterns=["BTTNowPlaying*", "BTTIdleTime"],
+            ttl_overrides={"fast_*": 1, "exact": 5},
+        )
+        assert cache.volatility("BTTNowPlayingInfoTitle") == "volatile"
+        assert cache.ttl_for("BTTIdleTime") == 0
+        assert cache.ttl_for("myUserVar") == 300
+        assert cache.ttl_for("fast_counter") == 1
+        assert cache.ttl_for("exact") == 5
+
+    async def test_ttl_expiry(self):
+        now = [0.0]
+        cache = VariableCache(static_ttl=10, clock=lambda: now[0])
+        fetched = []
+
+        async def fetch():
+            fetched.append(1)
+            return str(len(fetched))
+
+        key = ("h", 1, "v", "string")
+        assert await cache.get(key, fetch) == "1"
+        assert await cache.get(key, fetch) == "1"
+        now[0] = 11
+        assert await cache.get(key, fetch) == "2"
+        assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+    async def test_errors_not_cached(self):
+        cache = VariableCache(static_ttl=10)
+
+        async def fetch():
+            return "Error: Request timed out."
+
+        key = ("h", 1, "v", "string")
+        await cache.get(key, fetch)
+        await cache.get(key, fetch)
+        assert cache.stats.misses == 2
+        assert len(cache) == 0
+
+    async def test_concurrent_misses_share_request(self):
+        cache = VariableCache(static_ttl=10)
+        fetched = []
+
+        async def fetch():
+            fetched.append(1)
+            await asyncio.sleep(0.01)
+            return "x"
+
+        key = ("h", 1, "v", "string")
+        results = await asyncio.gather(*(cache.get(key, fetch) for _ in range(5)))
+        assert results == ["x"] * 5
+        assert len(fetched) == 1
+
+    async def test_disabled(self):
+        cache = VariableCache(enabled=False)
+
+        async def fetch():
+            return "x"
+
+        await cache.get(("h", 1, "v", "string"), fetch)
+        assert cache.stats.uncached == 1
+
+
+class TestVariableCacheIntegration:
+    """Tests for caching in the variable tools."""
+
+    async def test_static_cached_volatile_not(self, fake_btt, variable_cache):
+        from btt_mcp.tools.variables import btt_get_variable
+
+        fake_btt.values.update({"myVar": "1", "BTTIdleTime": "5"})
+        for _ in range(3):
+            await btt_get_variable(GetVariableInput(variable_name="myVar"))
+            await btt_get_variable(
+                GetVariableInput(variable_name="BTTIdleTime", variable_type="number")
+            )
+        assert fake_btt.reads.count(("get_string_variable", "myVar")) == 1
+        assert fake_btt.reads.count(("get_number_variable", "BTTIdleTime")) == 3
+        assert variable_cache.stats.hits == 2
+
+    async def test_set_invalidates(self, fake_btt):
+        from btt_mcp.tools.variables import btt_get_variable, btt_set_variable
+
+        fake_btt.values["myVar"] = "old"
+        assert "old" in await btt_get_variable(GetVariableInput(variable_name="myVar"))
+        await btt_set_variable(SetVariableInput(variable_name="myVar", value="new"))
+        assert "new" in await btt_get_variable(GetVariableInput(variable_name="myVar"))
+
+    async def test_bypass_cache(self, fake_btt):
+        from btt_mcp.tools.variables import btt_get_variable
+
+        fake_btt.values["myVar"] = "1"
+        await btt_get_variable(GetVariableInput(variable_name="myVar"))
+        await btt_get_variable(
+            GetVariableInput(variable_name="myVar", bypass_cache=True)
+        )
+        assert len(fake_btt.reads) == 2
+
+    async def test_stats_tool(self, monkeypatch, fake_btt, variable_cache):
+        from btt_mcp.tools import variables as variable_tools
+
+        monkeypatch.setattr(variable_tools, "variable_cache", variable_cache)
+        fake_btt.values["myVar"] = "1"
+        await variable_tools.btt_get_variable(GetVariableInput(variable_name="myVar"))
+        await variable_tools.btt_get_variable(GetVariableInput(variable_name="myVar"))
+
+        result = await variable_tools.btt_variable_cache_stats(
+            VariableCacheStatsInput(variable_names=["BTTIdleTime"], reset_stats=True)
+        )
+        assert "**Hits:** 1 | **Misses:** 1" in result
+        assert "| BTTIdleTime | volatile | 0s |" in result
+        assert variable_cache.stats.hits == 0
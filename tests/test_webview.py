@@ -0,0 +1,131 @@
+"""
+Tests for incremental webview menu item updates.
+"""
+
+from btt_mcp.models import UpdateWebviewMenuItemInput
+from btt_mcp.services.webview import WebviewPatcher, build_patch_script, diff_html
+
+UUID = "12345678-1234-1234-1234-123456789012"
+
+PAGE = (
+    "<html><head><style>body {{ font: 12px sans-serif; }}</style></head>"
+    "<body><h1>Status dashboard</h1>"
+    '<div id="cpu">CPU <b>{cpu}</b>%</div>\n'
+    '<ul id="jobs"><li>build</li><li id="state">{state}</li></ul>'
+    "<footer>" + "padding " * 50 + "</footer></body></html>"
+)
+
+
+class TestDiffHtml:
+    """Tests for the element-level HTML diff."""
+
+    def test_identical(self):
+        html = PAGE.format(cpu=10, state="ok")
+        assert diff_html(html, html) == []
+
+    def test_changes_inside_ids(self):
+        old = PAGE.format(cpu=10, state="ok")
+        new = PAGE.format(cpu=20, state="failed")
+        assert diff_html(old, new) == [
+            ("cpu", "CPU <b>20</b>%", False),
+            ("state", "failed", True),
+        ]
+
+    def test_body_is_addressable(self):
+        assert diff_html("<body>hi</body>", "<body>ho</body>") == [(None, "ho", True)]
+
+    def test_change_outside_anchors(self):
+        old = '<h1>A</h1><div id="x">1</div>'
+        new = '<h1>B</h1><div id="x">1</div>'
+        assert diff_html(old, new) is None
+
+    def test_structure_change(self):
+        old = '<div id="x">1</div>'
+        new = '<div id="x">1</div><div id="y">2</div>'
+        assert diff_html(old, new) is None
+
+    def test_duplicate_ids(self):
+        old = '<p id="x">1</p><p id="x">2</p>'
+        new = '<p id="x">1</p><p id="x">3</p>'
+        assert diff_html(old, new) is None
+
+    def test_duplicate_nested_ids(self):
+        old = '<div id="a"><p id="x">1</p></div><div id="b"><p id="x">2</p></div>'
+        new = '<div id="a"><p id="x">1</p></div><div id="b"><p id="x">9</p></div>'
+        assert diff_html(old, new) is None
+
+    def test_void_elements(self):
+        old = '<div id="x">a<br>b</div><img src="i.png">'
+        new = '<div id="x">c<br>b</div><img src="i.png">'
+        assert diff_html(old, new) == [("x", "c<br>b", False)]
+
+
+class TestWebviewPatcher:
+    """Tests for update planning."""
+
+    def test_first_update_is_full(self):
+        patcher = WebviewPatcher()
+        update = patcher.plan(UUID, PAGE.format(cpu=1, state="ok"))
+        assert update.kind == "full"
+
+    def test_unchanged_is_noop(self):
+        patcher = WebviewPatcher()
+        html = PAGE.format(cpu=1, state="ok")
+        patcher.commit(UUID, html)
+        assert patcher.plan(UUID, html).kind == "noop"
+
+    def test_patch(self):
+        patcher = WebviewPatcher()
+        patcher.commit(UUID, PAGE.format(cpu=1, state="ok"))
+        update = patcher.plan(UUID, PAGE.format(cpu=2, state="ok"))
+        assert update.kind == "patch"
+        assert update.script == build_patch_script([("cpu", "CPU <b>2</b>%", False)])
+        assert len(update.script) < len(update.html)
+
+    def test_force_full(self):
+        patcher = WebviewPatcher()
+        patcher.commit(UUID, PAGE.format(cpu=1, state="ok"))
+        update = patcher.plan(UUID, PAGE.format(cpu=2, state="ok"), force_full=True)
+        assert update.kind == "full"
+
+    def test_forget(self):
+        patcher = WebviewPatcher()
+        html = PAGE.format(cpu=1, state="ok")
+        patcher.commit(UUID, html)
+        patcher.forget(UUID)
+        assert patcher.plan(UUID, html).kind == "full"
+
+    def test_bounded(self):
+        patcher = WebviewPatcher(max_items=2)
+        for name in ("a", "b", "c"):
+            patcher.commit(name, "<p>x</p>")
+        assert patcher.plan("a", "<p>x</p>").kind == "full"
+        assert patcher.plan("c", "<p>x</p>").kind == "noop"
+
+
+class TestUpdateWebviewTool:
+    """Tests for the btt_update_webview_menu_item tool."""
+
+    async def test_sends_patch_after_full_load(self, monkeypatch):
+        from btt_mcp.tools import floating_menus
+
+        sent = []
+
+        async def fake_request(endpoint, params, config):
+            sent.append((endpoint, params))
+            return ""
+
+        monkeypatch.setattr(floating_menus, "btt_request", fake_request)
+        monkeypatch.setattr(floating_menus, "webview_patcher", WebviewPatcher())
+
+        await floating_menus.btt_update_webview_menu_item(
+            UpdateWebviewMenuItemInput(uuid=UUID, html=PAGE.format(cpu=1, state="ok"))
+        )
+        result = await floating_menus.btt_update_webview_menu_item(
+            UpdateWebviewMenuItemInput(uuid=UUID, html=PAGE.format(cpu=2, state="ok"))
+        )
+
+        assert "html_or_url" in sent[0][1]
+        assert "javascript_to_execute" in sent[1][1]
+        assert "html_or_url" not in sent[1][1]
+        assert "patched" in result
@@ -0,0 +1,186 @@
+"""
+Tests for rate-limited, coalescing widget updates.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from btt_mcp.models import BTTConnectionConfig, UpdateWidgetInput
+from btt_mcp.services import widget_updates as widget_service
+from btt_mcp.services.widget_updates import WidgetUpdateScheduler
+
+CONFIG = BTTConnectionConfig()
+UUID = "12345678-1234-1234-1234-123456789012"
+ENDPOINT = "update_stream_deck_widget"
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Record every request sent to BTT."""
+    requests = []
+
+    async def fake_request(endpoint, params, config):
+        requests.append((endpoint, params))
+        return ""
+
+    monkeypatch.setattr(widget_service, "btt_request", fake_request)
+    return requests
+
+
+class TestWidgetUpdateScheduler:
+    """Tests for merging and rate limiting."""
+
+    async def test_first_update_is_sent_immediately(self, sent):
+        scheduler = WidgetUpdateScheduler(max_rate=10)
+        result = await scheduler.submit(ENDPOINT, UUID, {"text": "a"}, CONFIG)
+        assert result.status == "sent"
+        assert sent == [(ENDPOINT, {"uuid": UUID, "text": "a"})]
+
+    async def test_burst_is_merged(self, sent):
+        scheduler = WidgetUpdateScheduler(max_rate=20)
+        await scheduler.submit(ENDPOINT, UUID, {"text": "0"}, CONFIG)
+        for i in range(1, 10):
+            result = await scheduler.submit(ENDPOINT, UUID, {"text": str(i)}, CONFIG)
+            assert result.status == "queued"
+        await scheduler.submit(
+            ENDPOINT, UUID, {"background_color": "1,2,3,255"}, CONFIG
+        )
+        assert len(sent) == 1
+
+        await asyncio.sleep(0.08)
+        assert sent[-1] == (
+            ENDPOINT,
+            {"uuid": UUID, "text": "9", "background_color": "1,2,3,255"},
+        )
+        assert scheduler.stats.sent == 2
+        assert scheduler.stats.merged == 9
+        # Texts 1-8 were superseded before being sent
+        assert scheduler.stats.dropped == 8
+
+    async def test_new_icon_replaces_both_icon_fields(self, sent):
+        scheduler = WidgetUpdateScheduler(max_rate=1)
+        await scheduler.submit(ENDPOINT, UUID, {"text": "x"}, CONFIG)
+        await scheduler.submit(ENDPOINT, UUID, {"icon_data": "AAAA"}, CONFIG)
+        await scheduler.submit(ENDPOINT, UUID, {"icon_path": "/tmp/a.png"}, CONFIG)
+        await scheduler.flush()
+        assert sent[-1][1] == {"uuid": UUID, "icon_path": "/tmp/a.png"}
+
+    async def test_widgets_are_limited_independently(self, sent):
+        scheduler = WidgetUpdateScheduler(max_rate=1)
+        other = UUID.replace("1", "2")
+        await scheduler.submit(ENDPOINT, UUID, {"text": "a"}, CONFIG)
+        result = await scheduler.submit(ENDPOINT, other, {"text": "b"}, CONFIG)
+        assert result.status == "sent"
+        assert len(sent) == 2
+
+    async def test_zero_rate_disables_limiting(self, sent):
+        scheduler = WidgetUpdateScheduler(max_rate=0)
+        for i in range(5):
+            result = await scheduler.submit(ENDPOINT, UUID, {"text": str(i)}, CONFIG)
+            assert result.status == "sent"
+        assert len(sent) == 5
+
+    async def test_flush_sends_pending(self, sent):
+        scheduler = WidgetUpdateScheduler(max_rate=0.01)
+        await scheduler.submit(ENDPOINT, UUID, {"text": "a"}, CONFIG)
+        await scheduler.submit(ENDPOINT, UUID, {"text": "b"}, CONFIG)
+        await scheduler.flush()
+        assert [params["text"] for _, params in sent] == ["a", "b"]
+        assert scheduler.pending() == {}
+
+    async def test_update_during_flush_keeps_its_timer(self, sent):
+        scheduler = WidgetUpdateScheduler(max_rate=0.01)
+        await scheduler.submit(ENDPOINT, UUID, {"text": "a"}, CONFIG)
+        await scheduler.submit(ENDPOINT, UUID, {"text": "b"}, CONFIG)
+        flushing = asyncio.create_task(scheduler.flush())
+        await asyncio.sleep(0)
+        # Queued while flush() waits for the cancelled timer to finish
+        await scheduler.submit(ENDPOINT, UUID, {"text": "c"}, CONFIG)
+        await flushing
+
+        assert len(scheduler._timers) == 1
+        await scheduler.submit(ENDPOINT, UUID, {"text": "d"}, CONFIG)
+        assert len(scheduler._timers) == 1
+        await scheduler.flush()
+        assert [params["text"] for _, params in sent] == ["a", "c", "d"]
+
+
+class TestUpdateWidgetTool:
+    """Tests for btt_update_widget through the scheduler."""
+
+    async def test_rate_limited_call_reports_queued(self, sent, monkeypatch):
+        from btt_mcp.tools import widgets as widget_tools
+
+        scheduler = WidgetUpdateScheduler(max_rate=0.01)
+        monkeypatch.setattr(widget_tools, "widget_scheduler", scheduler)
+        params = UpdateWidgetInput(uuid=UUID, widget_type="menubar", text="1")
+
+        assert "updated successfully" in await widget_tools.btt_update_widget(params)
+        assert "queued" in await widget_tools.btt_update_widget(params)
+        assert sent[0][0] == "update_menubar_item"
+        await scheduler.flush()
+
+
+class TestUpdateWidgetsTool:
+    """Tests for the btt_update_widgets batch tool."""
+
+    async def test_page_is_sent_concurrently(self, monkeypatch):
+        from btt_mcp.models import UpdateWidgetsInput, WidgetUpdate
+        from btt_mcp.tools import widgets as widget_tools
+
+        in_flight = 0
+        peak = 0
+        sent = []
+
+        async def slow_request(endpoint, params, config):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            sent.append((endpoint, params["uuid"]))
+            return ""
+
+        monkeypatch.setattr(widget_service, "btt_request", slow_request)
+        monkeypatch.setattr(
+            widget_tools, "widget_scheduler", WidgetUpdateScheduler(max_rate=0)
+        )
+        uuids = [f"{i:08d}-1234-1234-1234-123456789012" for i in range(15)]
+        updates = [
+            WidgetUpdate(uuid=uuid, widget_type="stream_deck", text=str(i))
+            for i, uuid in enumerate(uuids)
+        ]
+        updates.append(WidgetUpdate(uuid=UUID, widget_type="menubar", text="m"))
+
+        result = await widget_tools.btt_update_widgets(
+            UpdateWidgetsInput(updates=updates, response_format="json")
+        )
+        data = json.loads(result)
+        assert data["counts"] == {"sent": 16, "queued": 0, "error": 0}
+        assert data["endpoints"] == {
+            "update_stream_deck_widget": 15,
+            "update_menubar_item": 1,
+        }
+        assert peak == 16
+        assert data["total_ms"] < data["sequential_ms"] / 4
+        assert len(sent) == 16
+
+    async def test_errors_are_reported_per_widget(self, sent, monkeypatch):
+        from btt_mcp.models import UpdateWidgetsInput, WidgetUpdate
+        from btt_mcp.tools import widgets as widget_tools
+
+        monkeypatch.setattr(
+            widget_tools, "widget_scheduler", WidgetUpdateScheduler(max_rate=0)
+        )
+        result = await widget_tools.btt_update_widgets(
+            UpdateWidgetsInput(
+                updates=[
+                    WidgetUpdate(uuid=UUID, text="ok"),
+                    WidgetUpdate(uuid=UUID, icon_key="icon:missing"),
+                ]
+            )
+        )
+        assert "Updated 1 of 2 widget(s)" in result
+        assert "error: Unknown icon key" in result
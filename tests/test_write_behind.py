@@ -0,0 +1,152 @@
+"""
+Tests for write-behind buffering of variable writes.
+"""
+
+import asyncio
+
+import pytest
+
+from btt_mcp.models import BTTConnectionConfig, FlushVariablesInput, SetVariableInput
+from btt_mcp.services import variables as variable_service
+from btt_mcp.services.write_behind import VariableWriteBuffer
+
+CONFIG = BTTConnectionConfig()
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    """Install a fresh write buffer with a long flush interval."""
+    buffer = VariableWriteBuffer(enabled=True, flush_interval=3600, max_pending=5)
+    monkeypatch.setattr(variable_service, "write_buffer", buffer)
+    return buffer
+
+
+class TestVariableWriteBuffer:
+    """Tests for coalescing and flushing."""
+
+    async def test_coalesces_to_latest_value(self, fake_btt, buffer):
+        writes = fake_btt.writes
+        for i in range(10):
+            buffer.enqueue("counter", str(i), "number", False, CONFIG)
+        buffer.enqueue("label", "x", "string", True, CONFIG)
+
+        assert writes == []
+        assert len(buffer) == 2
+        result = await buffer.flush()
+        assert result.sent == 2
+        assert sorted(writes) == [
+            ("set_number_variable", "counter", "9"),
+            ("set_persistent_string_variable", "label", "x"),
+        ]
+        assert buffer.stats.coalesced == 9
+        await buffer.close()
+
+    async def test_reads_see_pending_value(self, fake_btt, buffer):
+        values = fake_btt.values
+        values["v"] = "old"
+        buffer.enqueue("v", "new", "string", False, CONFIG)
+        assert await variable_service.get_variable("v", "string", CONFIG) == "new"
+        await buffer.close()
+        assert values["v"] == "new"
+
+    async def test_flushes_when_full(self, fake_btt, buffer):
+        writes = fake_btt.writes
+        for i in range(5):
+            buffer.enqueue(f"v{i}", "1", "string", False, CONFIG)
+        for _ in range(20):
+            if len(writes) == 5:
+                break
+            await asyncio.sleep(0.01)
+        assert len(writes) == 5
+        await buffer.close()
+
+    async def test_flushes_on_interval(self, fake_btt):
+        writes = fake_btt.writes
+        buffer = VariableWriteBuffer(enabled=True, flush_interval=0.01)
+        buffer.enqueue("v", "1", "string", False, CONFIG)
+        await asyncio.sleep(0.05)
+        assert writes == [("set_string_variable", "v", "1")]
+        await buffer.close()
+
+    async def test_close_flushes_pending(self, fake_btt, buffer):
+        writes = fake_btt.writes
+        buffer.enqueue("v", "1", "string", False, CONFIG)
+        await buffer.close()
+        assert writes == [("set_string_variable", "v", "1")]
+        assert len(buffer) == 0
+
+    async def test_failed_writes_are_reported(
+        self, monkeypatch, variable_cache, buffer
+    ):
+        async def failing_request(endpoint, params, config):
+            return "Error: BTT not reachable"
+
+        monkeypatch.setattr(variable_service, "btt_request", failing_request)
+        buffer.enqueue("v", "1", "string", False, CONFIG)
+        result = await buffer.flush()
+        assert result.errors == [("v", "Error: BTT not reachable")]
+        assert buffer.stats.failed == 1
+        await buffer.close()
+
+    async def test_flusher_survives_exceptions(self, monkeypatch, variable_cache):
+        async def broken_request(endpoint, params, config):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(variable_service, "btt_request", broken_request)
+        buffer = VariableWriteBuffer(enabled=True, flush_interval=0.01)
+        buffer.enqueue("v", "1", "string", False, CONFIG)
+        await asyncio.sleep(0.05)
+        assert list(buffer.stats.recent_errors) == [("v", "Error: RuntimeError: boom")]
+        await buffer.close()
+
+
+class TestWriteBehindTools:
+    """Tests for btt_set_variable with write-behind and btt_flush_variables."""
+
+    async def test_set_and_flush(self, fake_btt, buffer, monkeypatch):
+        from btt_mcp.tools import variables as variable_tools
+
+        monkeypatch.setattr(variable_tools, "write_buffer", buffer)
+        writes = fake_btt.writes
+
+        for value in ("1", "2", "3"):
+            result = await variable_tools.btt_set_variable(
+                SetVariableInput(variable_name="v", value=value)
+            )
+            assert result.startswith("Queued")
+        assert writes == []
+
+        result = await variable_tools.btt_flush_variables(FlushVariablesInput())
+        assert "Flushed 1 variable write(s)" in result
+        assert writes == [("set_string_variable", "v", "3")]
+
+    async def test_per_call_override(self, fake_btt, buffer, monkeypatch):
+        from btt_mcp.tools import variables as variable_tools
+
+        monkeypatch.setattr(variable_tools, "write_buffer", buffer)
+        writes = fake_btt.writes
+
+        result = await variable_tools.btt_set_variable(
+            SetVariableInput(variable_name="v", value="1", write_behind=False)
+        )
+        assert result.startswith("Set variable")
+        assert writes == [("set_string_variable", "v", "1")]
+
+    async def test_direct_write_drops_buffered_value(
+        self, fake_btt, buffer, monkeypatch
+    ):
+        from btt_mcp.tools import variables as variable_tools
+
+        monkeypatch.setattr(variable_tools, "write_buffer", buffer)
+        values, writes = fake_btt.values, fake_btt.writes
+
+        await variable_tools.btt_set_variable(
+            SetVariableInput(variable_name="v", value="1", write_behind=True)
+        )
+        await variable_tools.btt_set_variable(
+            SetVariableInput(variable_name="v", value="2", write_behind=False)
+        )
+        assert await variable_service.get_variable("v", "string", CONFIG) == "2"
+        await buffer.flush()
+        assert writes == [("set_string_variable", "v", "2")]
+        assert values["v"] == "2"